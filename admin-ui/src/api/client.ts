@@ -4,6 +4,7 @@ import type {
   ContactInput,
   Email,
   EmailInput,
+  MeetingHold,
   SystemConfig,
 } from '../types'
 
@@ -286,6 +287,18 @@ export class ApiClient {
       method: 'DELETE',
     })
   }
+
+  async getMeetingHolds(status?: MeetingHold['status']): Promise<MeetingHold[]> {
+    const query = status ? `?status=${status}` : ''
+    return this.request<MeetingHold[]>(`/calendar/holds${query}`)
+  }
+
+  async retryMeetingHold(holdId: string): Promise<{ status: string; id: string }> {
+    return this.request(`/calendar/holds/${encodeURIComponent(holdId)}/retry`, {
+      method: 'POST',
+      skipRetry: true,
+    })
+  }
 }
 
 // Default client instance
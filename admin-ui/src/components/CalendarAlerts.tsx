@@ -1,4 +1,6 @@
 import { useState } from 'react'
+import { useApi, getApiClient, getErrorMessage } from '../api'
+import type { MeetingHold } from '../types'
 
 interface CalendarEvent {
   id: string
@@ -46,6 +48,18 @@ export default function CalendarAlerts() {
   const [events] = useState<CalendarEvent[]>(demoEvents)
   const [alerts] = useState<Alert[]>(demoAlerts)
   const [controls, setControls] = useState<AIControl[]>(defaultControls)
+  const [retrying, setRetrying] = useState<string | null>(null)
+  const [holdError, setHoldError] = useState<string | null>(null)
+
+  // Meetings booked on calls that are not yet in Google Calendar
+  const { data: holds, refetch: refetchHolds } = useApi(async client => {
+    const [pending, failed] = await Promise.all([
+      client.getMeetingHolds('pending'),
+      client.getMeetingHolds('failed'),
+    ])
+    return [...failed, ...pending]
+  }, [])
+  const openHolds = holds ?? []
 
   const todayEvents = events.filter(e => e.isToday)
   const upcomingEvents = events.filter(e => !e.isToday)
@@ -93,6 +107,22 @@ export default function CalendarAlerts() {
     }
   }
 
+  const retryHold = async (hold: MeetingHold) => {
+    setRetrying(hold.id)
+    setHoldError(null)
+    try {
+      await getApiClient().retryMeetingHold(hold.id)
+      await refetchHolds()
+    } catch (err) {
+      setHoldError(getErrorMessage(err as Error))
+    } finally {
+      setRetrying(null)
+    }
+  }
+
+  const formatHoldTime = (value: string): string =>
+    new Date(value).toLocaleString([], { weekday: 'short', hour: 'numeric', minute: '2-digit' })
+
   const formatAlertTime = (date: Date): string => {
     const now = new Date()
     const diffMs = now.getTime() - date.getTime()
@@ -162,6 +192,45 @@ export default function CalendarAlerts() {
         </div>
       </section>
 
+      {/* Pending Bookings */}
+      {openHolds.length > 0 && (
+        <section>
+          <h2 className="text-sm font-semibold text-gray-900 uppercase tracking-wide mb-3">
+            Pending Bookings
+          </h2>
+
+          <div className="card divide-y divide-gray-100">
+            {openHolds.map(hold => (
+              <div key={hold.id} className="p-3 flex items-start gap-3">
+                <span className="text-sm font-medium text-gray-900 w-24">{formatHoldTime(hold.start_at)}</span>
+                <div className="flex-1 min-w-0">
+                  <p className="text-sm text-gray-700 truncate">{hold.title}</p>
+                  {hold.status === 'failed' ? (
+                    <p className="text-xs text-red-600 truncate">
+                      Not saved to calendar{hold.last_error ? `: ${hold.last_error}` : ''}
+                    </p>
+                  ) : (
+                    <p className="text-xs text-gray-400">
+                      Saving to calendar{hold.attempts > 0 ? ` (attempt ${hold.attempts + 1})` : ''}
+                    </p>
+                  )}
+                </div>
+                {hold.status === 'failed' && (
+                  <button
+                    onClick={() => retryHold(hold)}
+                    disabled={retrying === hold.id}
+                    className="text-xs font-medium text-blue-600 hover:text-blue-700 disabled:opacity-50"
+                  >
+                    {retrying === hold.id ? 'Retrying...' : 'Retry'}
+                  </button>
+                )}
+              </div>
+            ))}
+          </div>
+          {holdError && <p className="text-xs text-red-600 mt-2">{holdError}</p>}
+        </section>
+      )}
+
       {/* Important Alerts */}
       <section>
         <h2 className="text-sm font-semibold text-gray-900 uppercase tracking-wide mb-3">
@@ -42,6 +42,21 @@ export interface EmailInput {
   timestamp?: Date
 }
 
+// Meeting Hold Types (meetings booked on calls, written to Google in the background)
+export interface MeetingHold {
+  id: string
+  call_sid: string
+  title: string
+  start_at: string
+  end_at: string
+  status: 'pending' | 'confirmed' | 'failed'
+  attempts: number
+  last_error: string | null
+  html_link: string
+  created_at: string
+  updated_at: string
+}
+
 // System Config Types
 export interface SystemConfig {
   twilioAccountSid: string
@@ -54,21 +54,17 @@ async def backfill():
         logger.info("No emails to process.")
         return
 
-    # 2. Process in batches
-    batch_size = 20
-    for i in range(0, total, batch_size):
-        batch = emails_to_process[i:i+batch_size]
-        logger.info(f"Processing batch {i//batch_size + 1}/{(total + batch_size - 1)//batch_size} (Items {i+1}-{min(i+batch_size, total)})")
-        
-        try:
-            # DataIngestion.bulk_ingest_emails generates embeddings and updates DB
-            processed_count = await ingestion.bulk_ingest_emails(batch)
-            logger.info(f"Successfully processed {processed_count} emails in this batch.")
-        except Exception as e:
-            logger.error(f"Error processing batch: {e}")
+    # 2. Embed and write through the batched ingestion pipeline
+    try:
+        # DataIngestion.bulk_ingest_emails packs Voyage requests, runs them
+        # concurrently and writes the results with chunked bulk upserts
+        processed_count = await ingestion.bulk_ingest_emails(emails_to_process)
+        logger.info(f"Successfully processed {processed_count} of {total} emails.")
+    except Exception as e:
+        logger.error(f"Error during backfill: {e}")
             
     logger.info("Backfill complete!")
-    db_manager.close()
+    await db_manager.aclose()
 
 if __name__ == "__main__":
     asyncio.run(backfill())
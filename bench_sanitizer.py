@@ -0,0 +1,147 @@
+"""Micro-benchmark for the response sanitizer.
+
+Checks that ``clean_response`` gives the same result as the previous
+implementation on the corpus of model outputs in tests/data, then times both,
+plus the streaming path on a reply that opens with a long reasoning block.
+
+Usage: python bench_sanitizer.py [iterations]
+"""
+
+import json
+import re
+import sys
+import timeit
+from pathlib import Path
+
+from src.receptionist.reasoning_engine import SentenceSplitter
+from src.receptionist.response_sanitizer import StreamingSanitizer, clean_response
+
+CORPUS = Path(__file__).parent / "tests" / "data" / "model_outputs.jsonl"
+
+
+def legacy_clean(content: str) -> str:
+    """The cleaner as it was before ``response_sanitizer`` (patterns compiled per call)."""
+    
+    # First pass: Remove all XML-style tags and their content
+    content = re.sub(r'<thinking>.*?</thinking>', '', content, flags=re.DOTALL | re.IGNORECASE)
+    content = re.sub(r'<reasoning>.*?</reasoning>', '', content, flags=re.DOTALL | re.IGNORECASE)
+    content = re.sub(r'<scratchpad>.*?</scratchpad>', '', content, flags=re.DOTALL | re.IGNORECASE)
+    content = re.sub(r'<reflection>.*?</reflection>', '', content, flags=re.DOTALL | re.IGNORECASE)
+    content = re.sub(r'<internal>.*?</internal>', '', content, flags=re.DOTALL | re.IGNORECASE)
+    content = re.sub(r'<response>.*?</response>', '', content, flags=re.DOTALL | re.IGNORECASE)
+    content = re.sub(r'<output>.*?</output>', '', content, flags=re.DOTALL | re.IGNORECASE)
+    content = re.sub(r'<[^>]+>.*?</[^>]+>', '', content, flags=re.DOTALL | re.IGNORECASE)
+    content = re.sub(r'</?[a-z_]+/?>', '', content, flags=re.IGNORECASE)
+    
+    # Remove asterisk/bracket-wrapped actions (stage directions)
+    content = re.sub(r'\*[^*]+\*', '', content)
+    content = re.sub(r'\[[^\]]+\]', '', content)
+    
+    # Remove parenthetical asides about internal processing
+    content = re.sub(r'\([^)]*(?:check|search|look|find|use|tool|calendar|email|system|internal)[^)]*\)', '', content, flags=re.IGNORECASE)
+    
+    # Reasoning indicators that signal internal thought (case insensitive)
+    reasoning_patterns = [
+        r"^(?:The user|They|So,?\s+the|According to|Looking at|Here,|Actually,|Following|My instructions)",
+        r"^(?:I need to|I should|I will|I'll|Let me|I'm going to|I am going to)",
+        r"^(?:First,|Then,|Next,|After that,|Finally,|Now,|Step \d)",
+        r"^(?:The caller|This means|Based on|Given that|Since)",
+        r"^(?:Checking|Searching|Looking up|Using|Calling|Invoking)",
+        r"^(?:Okay so|Alright so|So basically|Hmm,|Well,\s+(?:the|I|let))",
+    ]
+    
+    lines = content.split('\n')
+    clean_lines = []
+    
+    for line in lines:
+        line_stripped = line.strip()
+        
+        # Skip empty lines at the start
+        if not line_stripped and not clean_lines:
+            continue
+        
+        # Skip lines with reasoning indicators
+        if any(re.match(pattern, line_stripped, re.IGNORECASE) for pattern in reasoning_patterns):
+            continue
+        
+        # Skip bullet points that look like reasoning
+        if line_stripped.startswith("- ") and len(line_stripped) > 40:
+            continue
+        
+        # Skip lines with emojis commonly used for internal notes
+        if "❌" in line_stripped or "✓" in line_stripped or "✔" in line_stripped:
+            continue
+        
+        # Skip numbered lists that look like internal steps
+        if re.match(r'^\d+\.\s+', line_stripped) and any(
+            word in line_stripped.lower() for word in ['check', 'search', 'find', 'use', 'look', 'call', 'need']
+        ):
+            continue
+        
+        # Skip lines that mention tools by name
+        if any(tool in line_stripped.lower() for tool in ['search_emails', 'search_contacts', 'check_calendar', 'schedule_meeting']):
+            continue
+        
+        clean_lines.append(line_stripped)
+    
+    content = ' '.join(clean_lines)
+    
+    # Remove remaining tool call narration patterns
+    content = re.sub(r"(?:Let me|I'll|I will|I'm going to)\s+(?:check|search|look up|use|call|invoke|see|find).*?(?:\.|!|$)", '', content, flags=re.IGNORECASE)
+    content = re.sub(r"(?:Using|Calling|Invoking|Checking|Looking at|Searching)\s+(?:the\s+)?(?:search_emails|search_contacts|check_calendar|schedule_meeting|calendar|tool|system).*?(?:\.|!|$)", '', content, flags=re.IGNORECASE)
+    
+    # Remove ellipsis lines
+    content = re.sub(r'\.{3,}', '', content)
+    
+    # Clean up whitespace
+    content = re.sub(r'\s{2,}', ' ', content)
+    content = content.strip()
+    
+    # Remove trailing/leading punctuation artifacts
+    content = re.sub(r'^[.,!?\s]+', '', content)
+    content = re.sub(r'\s+[.,]+$', '.', content)
+    
+    # If content is empty or too short after cleaning, return empty to trigger contextual fallback
+    if len(content) < 5:
+        return ""
+    
+    return content
+
+
+def stream(deltas, sanitize):
+    """Split and clean streamed deltas the way ``stream_response`` does."""
+    sanitizer, splitter, spoken = StreamingSanitizer(), SentenceSplitter(), []
+    for delta in deltas:
+        spoken += splitter.feed(sanitizer.feed(delta) if sanitize else delta)
+    if sanitize:
+        spoken += splitter.feed(sanitizer.flush())
+    spoken.append(splitter.flush())
+    return [c for c in map(clean_response, spoken) if c]
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    outputs = [json.loads(line)["output"] for line in CORPUS.open() if line.strip()]
+
+    mismatches = [o for o in outputs if clean_response(o) != legacy_clean(o)]
+    print(f"corpus: {len(outputs)} outputs, {len(mismatches)} mismatches")
+    if mismatches:
+        for output in mismatches:
+            print(f"  {output!r}")
+        sys.exit(1)
+
+    for name, clean in (("legacy", legacy_clean), ("clean_response", clean_response)):
+        seconds = timeit.timeit(lambda: [clean(o) for o in outputs], number=iterations)
+        print(f"{name:>16}: {seconds / iterations / len(outputs) * 1e6:7.1f} us/output")
+
+    reasoning = "<thinking>" + "The caller wants to book a meeting. I should check the calendar. " * 40 + "</thinking>"
+    reply = reasoning + "Friday at 3 works for Dr. Patel. Shall I book it?"
+    deltas = [reply[i:i + 4] for i in range(0, len(reply), 4)]
+    assert stream(deltas, True) == stream(deltas, False)
+    for name, sanitize in (("split only", False), ("sanitize+split", True)):
+        seconds = timeit.timeit(lambda: stream(deltas, sanitize), number=max(1, iterations // 10))
+        print(f"{name:>16}: {seconds / max(1, iterations // 10) * 1e3:7.2f} ms/stream ({len(deltas)} deltas)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""Free/busy computation and meeting slot suggestions.
+
+``AvailabilityEngine`` reads events from the calendar mirror (or Google when
+the mirror is stale), merges them into sorted, non-overlapping busy blocks
+and walks the gaps inside working hours to find open slots. When a caller
+asks for a time that is taken, ``schedule_meeting`` offers the best few
+alternatives in the same turn instead of the model having to check the
+calendar again.
+
+All times are computed in the calendar's timezone (Pacific by default), so
+working hours follow daylight saving time.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from .calendar_gateway import CalendarGateway
+from .calendar_mirror import CalendarMirror, parse_event_time
+from .scheduling_queue import SchedulingQueue
+
+logger = logging.getLogger(__name__)
+
+Interval = tuple[datetime, datetime]
+
+
+@dataclass
+class WorkingHours:
+    """Hours in which meetings may be booked."""
+
+    start: time = time(9, 0)
+    end: time = time(17, 0)
+    weekdays: frozenset[int] = field(default_factory=lambda: frozenset(range(5)))  # Mon-Fri
+
+    def windows(self, start: datetime, end: datetime, tz: ZoneInfo) -> list[Interval]:
+        """Working-hour windows that intersect ``[start, end)``, in order."""
+        windows = []
+        day = start.astimezone(tz).date()
+        last_day = end.astimezone(tz).date()
+        while day <= last_day:
+            if day.weekday() in self.weekdays:
+                open_at = datetime.combine(day, self.start, tzinfo=tz)
+                close_at = datetime.combine(day, self.end, tzinfo=tz)
+                window = (max(open_at, start), min(close_at, end))
+                if window[0] < window[1]:
+                    windows.append(window)
+            day += timedelta(days=1)
+        return windows
+
+
+def merge_busy(intervals: list[Interval]) -> list[Interval]:
+    """Sort intervals and merge overlapping or touching ones."""
+    merged: list[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def free_gaps(busy: list[Interval], windows: list[Interval]) -> list[Interval]:
+    """Subtract merged busy blocks from ordered windows."""
+    gaps = []
+    i = 0
+    for window_start, window_end in windows:
+        cursor = window_start
+        # Skip busy blocks that end before this window
+        while i < len(busy) and busy[i][1] <= cursor:
+            i += 1
+        j = i
+        while j < len(busy) and busy[j][0] < window_end:
+            if busy[j][0] > cursor:
+                gaps.append((cursor, busy[j][0]))
+            cursor = max(cursor, busy[j][1])
+            j += 1
+        if cursor < window_end:
+            gaps.append((cursor, window_end))
+    return gaps
+
+
+def _align(moment: datetime, step: timedelta) -> datetime:
+    """Round up to the next multiple of ``step`` past the hour."""
+    minutes = step.total_seconds() / 60
+    floored = moment.replace(second=0, microsecond=0)
+    past = (floored.minute % minutes) if minutes else 0
+    aligned = floored - timedelta(minutes=past)
+    return aligned if aligned >= moment else aligned + step
+
+
+def pick_slots(
+    gaps: list[Interval],
+    duration: timedelta,
+    limit: int,
+    preferred: datetime | None = None,
+    step: timedelta = timedelta(minutes=30),
+) -> list[datetime]:
+    """Choose up to ``limit`` slot start times from free gaps.
+
+    Candidates start on ``step`` boundaries. They are ranked by closeness
+    to ``preferred`` (earliest first without one), and suggestions are at
+    least ``duration`` apart so they are real alternatives.
+
+    Args:
+        gaps: Free intervals, ordered
+        duration: Meeting length
+        limit: Maximum slots to return
+        preferred: Time the caller asked for (optional)
+        step: Granularity of slot start times
+
+    Returns:
+        Slot start times, in chronological order
+    """
+    candidates = []
+    for gap_start, gap_end in gaps:
+        slot = _align(gap_start, step)
+        while slot + duration <= gap_end:
+            candidates.append(slot)
+            slot += step
+
+    if preferred is not None:
+        # Same day first, then the nearest time of day ("same time tomorrow"
+        # beats "first thing tomorrow")
+        wanted = preferred.hour * 60 + preferred.minute
+
+        def closeness(slot: datetime) -> tuple[int, int, datetime]:
+            local = slot.astimezone(preferred.tzinfo)
+            days = abs((local.date() - preferred.date()).days)
+            return days, abs(local.hour * 60 + local.minute - wanted), slot
+
+        candidates.sort(key=closeness)
+
+    chosen: list[datetime] = []
+    for slot in candidates:
+        if all(abs(slot - other) >= duration for other in chosen):
+            chosen.append(slot)
+            if len(chosen) == limit:
+                break
+    return sorted(chosen)
+
+
+def describe_slot(slot: datetime, tz: ZoneInfo) -> str:
+    """Format a slot the way the receptionist reads times out."""
+    local = slot.astimezone(tz)
+    return f"{local.strftime('%A, %B %d')} at {local.strftime('%I:%M %p').lstrip('0')}"
+
+
+class AvailabilityEngine:
+    """Answers free/busy questions over the mirrored (or live) calendar."""
+
+    DEFAULT_SEARCH_DAYS = 5
+    DEFAULT_SUGGESTIONS = 3
+
+    def __init__(
+        self,
+        gateway: CalendarGateway,
+        mirror: CalendarMirror | None = None,
+        tz: ZoneInfo = ZoneInfo("America/Los_Angeles"),
+        working_hours: WorkingHours | None = None,
+        search_days: int = DEFAULT_SEARCH_DAYS,
+        suggestions: int = DEFAULT_SUGGESTIONS,
+        holds: SchedulingQueue | None = None,
+    ):
+        """Initialize the engine.
+
+        Args:
+            gateway: Google Calendar client, used when the mirror is stale
+            mirror: Local calendar copy (optional)
+            tz: Calendar timezone
+            working_hours: Bookable hours (defaults to 9-5, Monday to Friday)
+            search_days: Days searched for alternatives after a requested time
+            suggestions: Alternatives offered when a time is busy
+            holds: Queue of booked meetings not yet written to Google (or
+                not yet mirrored), which also count as busy (optional)
+        """
+        self._gateway = gateway
+        self._mirror = mirror
+        self.tz = tz
+        self.working_hours = working_hours or WorkingHours()
+        self._search_days = search_days
+        self.suggestions = suggestions
+        self._holds = holds
+
+        self.local_queries = 0
+        self.live_queries = 0
+
+    async def events_between(self, start: datetime, end: datetime) -> list[dict[str, Any]]:
+        """Events overlapping a range, from the mirror if fresh, else from Google.
+
+        Raises:
+            CalendarUnavailable: If the mirror is stale and Google is not connected
+        """
+        events = self._mirror.events_between(start, end) if self._mirror else None
+        if events is not None:
+            self.local_queries += 1
+            return events
+        self.live_queries += 1
+        return await self._gateway.list_events(start, end, max_results=250)
+
+    async def busy_blocks(
+        self, events: list[dict[str, Any]], start: datetime, end: datetime
+    ) -> list[Interval]:
+        """Merged busy blocks of events and held meetings overlapping a range.
+
+        Free ("transparent") events are not busy.
+        """
+        busy = []
+        if self._holds:
+            mirrored_until = self._mirror.synced_at if self._mirror else None
+            busy = await self._holds.busy_between(start, end, mirrored_until)
+        for event in events:
+            if event.get("transparency") == "transparent":
+                continue
+            event_start = parse_event_time(event.get("start") or {}, self.tz)
+            event_end = parse_event_time(event.get("end") or {}, self.tz)
+            if event_start is None or event_end is None:
+                continue
+            busy.append((
+                datetime.fromtimestamp(event_start, self.tz),
+                datetime.fromtimestamp(event_end, self.tz),
+            ))
+        return merge_busy(busy)
+
+    async def busy_between(self, start: datetime, end: datetime) -> list[Interval]:
+        """Merged busy blocks overlapping a range."""
+        return await self.busy_blocks(await self.events_between(start, end), start, end)
+
+    async def is_free(self, start: datetime, end: datetime) -> bool:
+        """Whether no busy event overlaps ``[start, end)``."""
+        return not await self.busy_between(start, end)
+
+    async def open_slots(
+        self,
+        start: datetime,
+        end: datetime,
+        duration: timedelta,
+        limit: int | None = None,
+        preferred: datetime | None = None,
+        events: list[dict[str, Any]] | None = None,
+    ) -> list[datetime]:
+        """Open slots of ``duration`` within working hours between two times.
+
+        Args:
+            start: Start of the search range
+            end: End of the search range
+            duration: Meeting length
+            limit: Maximum slots (defaults to ``suggestions``)
+            preferred: Time to rank slots by closeness to (optional)
+            events: Events already fetched for the range (fetched if omitted)
+
+        Returns:
+            Slot start times, in chronological order
+        """
+        windows = self.working_hours.windows(start, end, self.tz)
+        if not windows:
+            return []
+        if events is None:
+            events = await self.events_between(windows[0][0], windows[-1][1])
+        busy = await self.busy_blocks(events, windows[0][0], windows[-1][1])
+        return pick_slots(
+            free_gaps(busy, windows),
+            duration,
+            limit or self.suggestions,
+            preferred,
+        )
+
+    async def alternatives(self, requested: datetime, duration: timedelta) -> list[datetime]:
+        """Open slots near a requested time, from its day through ``search_days``.
+
+        Slots are never in the past.
+        """
+        day_start = datetime.combine(requested.astimezone(self.tz).date(), time(0), tzinfo=self.tz)
+        start = max(day_start, datetime.now(self.tz))
+        end = day_start + timedelta(days=self._search_days)
+        return await self.open_slots(start, end, duration, preferred=requested)
+
+    def stats(self) -> dict[str, int]:
+        """Get where free/busy queries were answered."""
+        return {"local_queries": self.local_queries, "live_queries": self.live_queries}
@@ -0,0 +1,391 @@
+"""Non-blocking access to the Google Calendar API for live calls.
+
+The Google API client is synchronous: building a service, refreshing a token
+and every ``.execute()`` block the calling thread. ``CalendarGateway`` keeps
+that work off the event loop and off the per-call latency path:
+
+- credentials are loaded once and kept in memory; a background task
+  refreshes the access token shortly before it expires, so calls never wait
+  on a token refresh
+- the discovery client is built once per worker thread and reused (service
+  objects share an ``httplib2`` connection, which is not thread-safe)
+- requests run on a small dedicated thread pool, so a slow calendar lookup
+  occupies one of its workers instead of the event loop or the default
+  executor shared with other blocking work
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, TypeVar
+
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import Resource, build
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CredentialsLoader = Callable[[], Credentials | None]
+CredentialsSaver = Callable[[Credentials], None]
+ServiceBuilder = Callable[[Credentials], Resource]
+
+
+class CalendarUnavailable(Exception):
+    """Raised when no usable Google Calendar credentials are available."""
+
+
+def build_calendar_service(credentials: Credentials) -> Resource:
+    """Build a Calendar v3 client from the bundled discovery document.
+
+    Args:
+        credentials: Authorized user credentials
+
+    Returns:
+        Calendar API service instance
+    """
+    return build("calendar", "v3", credentials=credentials, cache_discovery=False)
+
+
+class CalendarGateway:
+    """Async Google Calendar client with cached credentials and services."""
+
+    DEFAULT_MAX_WORKERS = 4
+    # Refresh the access token this long before it expires
+    DEFAULT_REFRESH_MARGIN_SECONDS = 300.0
+    # Wait before trying to load credentials again after they were missing
+    DEFAULT_RETRY_SECONDS = 60.0
+    # Retries of reads on 429 and 5xx responses, done by the API client
+    NUM_RETRIES = 2
+
+    def __init__(
+        self,
+        load_credentials: CredentialsLoader,
+        save_credentials: CredentialsSaver | None = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        refresh_margin_seconds: float = DEFAULT_REFRESH_MARGIN_SECONDS,
+        calendar_id: str = "primary",
+        build_service: ServiceBuilder = build_calendar_service,
+    ):
+        """Initialize the gateway.
+
+        Args:
+            load_credentials: Blocking function returning credentials (or None
+                if Google is not connected), e.g. ``google_auth.authenticate_google``
+            save_credentials: Blocking function persisting refreshed credentials
+                (optional)
+            max_workers: Threads for Google API calls (bounds concurrent requests)
+            refresh_margin_seconds: How long before expiry the token is refreshed
+            calendar_id: Calendar to read and write
+            build_service: Builds a service object from credentials
+        """
+        self._load_credentials = load_credentials
+        self._save_credentials = save_credentials
+        self._max_workers = max(1, max_workers)
+        self._refresh_margin = refresh_margin_seconds
+        self._calendar_id = calendar_id
+        self._build_service = build_service
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._max_workers, thread_name_prefix="calendar"
+        )
+        self._local = threading.local()
+        self._credentials: Credentials | None = None
+        # Bumped whenever the credentials object is replaced, so worker
+        # threads rebuild their service; in-place refreshes keep it
+        self._generation = 0
+        self._credentials_lock = asyncio.Lock()
+        self._retry_at = 0.0
+        self._refresh_task: asyncio.Task[None] | None = None
+
+        self.calls = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.service_builds = 0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start refreshing the access token in the background."""
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_forever())
+
+    async def stop(self) -> None:
+        """Stop background refreshes and shut down the worker threads."""
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _refresh_forever(self) -> None:
+        while True:
+            try:
+                await self._credentials_ready(self._refresh_margin)
+                delay = self._seconds_until_refresh()
+            except CalendarUnavailable:
+                delay = self.DEFAULT_RETRY_SECONDS
+            except Exception as e:
+                logger.error(f"Calendar token refresh loop error: {e}")
+                delay = self.DEFAULT_RETRY_SECONDS
+            await asyncio.sleep(delay)
+
+    def _seconds_until_refresh(self) -> float:
+        expiry = self._credentials.expiry if self._credentials else None
+        if expiry is None:
+            return self.DEFAULT_RETRY_SECONDS
+        # google-auth keeps expiry as naive UTC
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        remaining = (expiry - now).total_seconds() - self._refresh_margin
+        # After a failed refresh, retry soon but not in a tight loop
+        return max(30.0, remaining)
+
+    # ------------------------------------------------------------------
+    # Credentials and services
+    # ------------------------------------------------------------------
+
+    def _needs_refresh(self, credentials: Credentials, margin: float) -> bool:
+        if not credentials.refresh_token:
+            return False
+        if not credentials.valid:
+            return True
+        expiry = credentials.expiry
+        if expiry is None or margin <= 0:
+            return False
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return (expiry - now).total_seconds() <= margin
+
+    def _refresh_sync(self, credentials: Credentials) -> None:
+        credentials.refresh(Request())
+        if self._save_credentials:
+            try:
+                self._save_credentials(credentials)
+            except Exception as e:
+                logger.warning(f"Failed to persist refreshed Google credentials: {e}")
+
+    async def _credentials_ready(self, margin: float = 0.0) -> Credentials:
+        """Return loaded credentials, refreshed if they expire within ``margin``.
+
+        Requests pass no margin, so they only wait on a refresh if the
+        background refresh did not happen in time.
+
+        Raises:
+            CalendarUnavailable: If Google is not connected or the refresh failed
+        """
+        credentials = self._credentials
+        if credentials is not None and not self._needs_refresh(credentials, margin):
+            return credentials
+
+        async with self._credentials_lock:
+            loop = asyncio.get_running_loop()
+            credentials = self._credentials
+            if credentials is None:
+                if time.monotonic() < self._retry_at:
+                    raise CalendarUnavailable("Google Calendar not connected")
+                credentials = await loop.run_in_executor(self._executor, self._load_credentials)
+                if credentials is None:
+                    self._retry_at = time.monotonic() + self.DEFAULT_RETRY_SECONDS
+                    raise CalendarUnavailable("Google Calendar not connected")
+                self._credentials = credentials
+                self._generation += 1
+
+            if self._needs_refresh(credentials, margin):
+                try:
+                    await loop.run_in_executor(self._executor, self._refresh_sync, credentials)
+                    self.refreshes += 1
+                    logger.info("Refreshed Google Calendar access token")
+                except Exception as e:
+                    self.refresh_failures += 1
+                    logger.error(f"Failed to refresh Google Calendar token: {e}")
+                    if not credentials.valid:
+                        raise CalendarUnavailable(f"Token refresh failed: {e}") from e
+            return credentials
+
+    def _thread_service(self, credentials: Credentials, generation: int) -> Resource:
+        """Get this worker thread's service, building it on first use."""
+        cached = getattr(self._local, "service", None)
+        if cached is None or cached[0] != generation:
+            cached = (generation, self._build_service(credentials))
+            self._local.service = cached
+            self.service_builds += 1
+        return cached[1]
+
+    async def _call(self, name: str, request: Callable[[Resource], T]) -> T:
+        """Run a request against the calendar on the worker pool.
+
+        Args:
+            name: Request name for logging
+            request: Blocking function taking the service and returning a result
+        """
+        credentials = await self._credentials_ready()
+        generation = self._generation
+
+        def run() -> T:
+            return request(self._thread_service(credentials, generation))
+
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        self.calls += 1
+        self.in_flight += 1
+        try:
+            return await loop.run_in_executor(self._executor, run)
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Google Calendar {name} failed: {e}")
+            raise
+        finally:
+            self.in_flight -= 1
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+
+    # ------------------------------------------------------------------
+    # Requests
+    # ------------------------------------------------------------------
+
+    async def list_events(
+        self,
+        time_min: datetime,
+        time_max: datetime,
+        max_results: int = 10,
+    ) -> list[dict[str, Any]]:
+        """List single events between two times, ordered by start time.
+
+        Args:
+            time_min: Start of the time range (timezone-aware)
+            time_max: End of the time range (timezone-aware)
+            max_results: Maximum events to return
+
+        Returns:
+            Event resources as returned by the API
+
+        Raises:
+            CalendarUnavailable: If Google Calendar is not connected
+            HttpError: If the API call fails
+        """
+        def request(service: Resource) -> list[dict[str, Any]]:
+            result = service.events().list(
+                calendarId=self._calendar_id,
+                timeMin=time_min.isoformat(),
+                timeMax=time_max.isoformat(),
+                maxResults=max_results,
+                singleEvents=True,
+                orderBy="startTime",
+            ).execute(num_retries=self.NUM_RETRIES)
+            return result.get("items", [])
+
+        return await self._call("list_events", request)
+
+    async def insert_event(self, body: dict[str, Any]) -> dict[str, Any]:
+        """Create an event.
+
+        Args:
+            body: Event resource to insert
+
+        Returns:
+            The created event resource
+
+        Raises:
+            CalendarUnavailable: If Google Calendar is not connected
+            HttpError: If the API call fails
+        """
+        def request(service: Resource) -> dict[str, Any]:
+            # Not retried: a retried insert can create the event twice
+            return service.events().insert(calendarId=self._calendar_id, body=body).execute()
+
+        return await self._call("insert_event", request)
+
+    async def list_changes(
+        self,
+        sync_token: str | None = None,
+        page_token: str | None = None,
+        time_min: datetime | None = None,
+    ) -> dict[str, Any]:
+        """Get one page of events changed since a sync token.
+
+        Without a sync token this is a full listing (from ``time_min``);
+        the last page carries the ``nextSyncToken`` for the next call.
+
+        Args:
+            sync_token: ``nextSyncToken`` from the previous sync (optional)
+            page_token: ``nextPageToken`` of the previous page (optional)
+            time_min: Earliest event end for a full listing
+
+        Returns:
+            The API response: ``items`` plus ``nextPageToken`` or ``nextSyncToken``
+
+        Raises:
+            CalendarUnavailable: If Google Calendar is not connected
+            HttpError: If the API call fails (status 410 if the sync token expired)
+        """
+        params: dict[str, Any] = {
+            "calendarId": self._calendar_id,
+            "singleEvents": True,
+            "showDeleted": True,
+            "maxResults": 250,
+        }
+        if sync_token:
+            params["syncToken"] = sync_token
+        elif time_min:
+            params["timeMin"] = time_min.isoformat()
+        if page_token:
+            params["pageToken"] = page_token
+
+        def request(service: Resource) -> dict[str, Any]:
+            return service.events().list(**params).execute(num_retries=self.NUM_RETRIES)
+
+        return await self._call("list_changes", request)
+
+    async def watch_events(self, channel_id: str, address: str, token: str) -> dict[str, Any]:
+        """Open a push notification channel for event changes.
+
+        Args:
+            channel_id: Unique ID for the channel
+            address: HTTPS URL Google posts notifications to
+            token: Secret echoed back in ``X-Goog-Channel-Token``
+
+        Returns:
+            The channel resource, including ``resourceId`` and ``expiration`` (ms)
+        """
+        body = {"id": channel_id, "type": "web_hook", "address": address, "token": token}
+
+        def request(service: Resource) -> dict[str, Any]:
+            return service.events().watch(calendarId=self._calendar_id, body=body).execute()
+
+        return await self._call("watch_events", request)
+
+    async def stop_channel(self, channel_id: str, resource_id: str) -> None:
+        """Close a push notification channel."""
+        def request(service: Resource) -> None:
+            service.channels().stop(body={"id": channel_id, "resourceId": resource_id}).execute()
+
+        await self._call("stop_channel", request)
+
+    def stats(self) -> dict[str, Any]:
+        """Get request and token refresh counters."""
+        return {
+            "connected": self._credentials is not None,
+            "max_workers": self._max_workers,
+            "in_flight": self.in_flight,
+            "calls": self.calls,
+            "errors": self.errors,
+            "avg_ms": round(self.total_ms / self.calls, 1) if self.calls else 0.0,
+            "max_ms": round(self.max_ms, 1),
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "service_builds": self.service_builds,
+        }
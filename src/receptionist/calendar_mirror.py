@@ -0,0 +1,416 @@
+"""Local mirror of the Google Calendar for availability checks during calls.
+
+``CalendarMirror`` keeps the calendar's events in memory (an interval index
+sorted by start time) and in the ``calendar_events`` collection, so
+``check_calendar`` is answered without a Google round trip:
+
+- the first sync lists events from a day ago onwards; later syncs send the
+  stored ``syncToken`` and only receive what changed (an expired token, HTTP
+  410, triggers a new full sync)
+- a background task syncs every ``sync_interval`` seconds, and immediately
+  when a push notification arrives (if a push channel is configured)
+- lookups are only answered locally while the last successful sync is at
+  most ``max_staleness_seconds`` old; otherwise callers get None and fall
+  back to a live query
+
+The sync token is stored next to the events, so a restart resumes with an
+incremental sync.
+"""
+
+import asyncio
+import bisect
+import logging
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from operator import itemgetter
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from googleapiclient.errors import HttpError
+from pymongo import DeleteOne, ReplaceOne
+from pymongo.asynchronous.collection import AsyncCollection
+
+from .calendar_gateway import CalendarGateway, CalendarUnavailable
+
+logger = logging.getLogger(__name__)
+
+# Event fields kept in the mirror (enough for availability answers)
+_EVENT_FIELDS = ("id", "summary", "start", "end", "transparency", "updated")
+
+# Document in the events collection that holds the sync position
+_STATE_ID = "_sync_state"
+
+
+def parse_event_time(value: dict[str, Any], tz: ZoneInfo) -> float | None:
+    """Convert an event ``start``/``end`` to a POSIX timestamp.
+
+    All-day events (``date``) start at midnight in the calendar's timezone.
+    """
+    if value.get("dateTime"):
+        return datetime.fromisoformat(value["dateTime"].replace("Z", "+00:00")).timestamp()
+    if value.get("date"):
+        day = date.fromisoformat(value["date"])
+        return datetime(day.year, day.month, day.day, tzinfo=tz).timestamp()
+    return None
+
+
+class EventIntervalIndex:
+    """Events sorted by start time, with overlap queries in O(log n + k)."""
+
+    def __init__(self) -> None:
+        # (start, end, event_id), sorted
+        self._entries: list[tuple[float, float, str]] = []
+        self._events: dict[str, tuple[float, float, dict[str, Any]]] = {}
+        # Upper bound of any event's duration, to bound the backwards search
+        self._max_duration = 0.0
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def upsert(self, event_id: str, start: float, end: float, event: dict[str, Any]) -> None:
+        """Add or replace an event."""
+        self.remove(event_id)
+        bisect.insort(self._entries, (start, end, event_id))
+        self._events[event_id] = (start, end, event)
+        self._max_duration = max(self._max_duration, end - start)
+
+    def remove(self, event_id: str) -> bool:
+        """Remove an event; returns whether it was present."""
+        existing = self._events.pop(event_id, None)
+        if existing is None:
+            return False
+        entry = (existing[0], existing[1], event_id)
+        i = bisect.bisect_left(self._entries, entry)
+        if i < len(self._entries) and self._entries[i] == entry:
+            del self._entries[i]
+        return True
+
+    def overlapping(self, start: float, end: float) -> list[dict[str, Any]]:
+        """Events that overlap ``[start, end)``, ordered by start time."""
+        i = bisect.bisect_left(self._entries, start - self._max_duration, key=itemgetter(0))
+        found = []
+        for event_start, event_end, event_id in self._entries[i:]:
+            if event_start >= end:
+                break
+            if event_end > start:
+                found.append(self._events[event_id][2])
+        return found
+
+    def prune(self, before: float) -> int:
+        """Drop events that ended before a timestamp; returns how many."""
+        stale = [event_id for event_id, (_, end, _) in self._events.items() if end < before]
+        for event_id in stale:
+            self.remove(event_id)
+        self._max_duration = max((e - s for s, e, _ in self._entries), default=0.0)
+        return len(stale)
+
+    def clear(self) -> None:
+        """Remove all events."""
+        self._entries.clear()
+        self._events.clear()
+        self._max_duration = 0.0
+
+
+class CalendarMirror:
+    """Keeps a local, incrementally synced copy of the calendar."""
+
+    DEFAULT_SYNC_INTERVAL = 30.0
+    DEFAULT_MAX_STALENESS_SECONDS = 120.0
+    # Past events kept (and listed on a full sync)
+    HISTORY = timedelta(days=1)
+    # Re-open the push channel this long before Google expires it
+    CHANNEL_RENEW_MARGIN = timedelta(hours=1)
+    RETRY_DELAY = 5.0
+
+    def __init__(
+        self,
+        gateway: CalendarGateway,
+        collection: AsyncCollection | None = None,
+        tz: ZoneInfo = ZoneInfo("America/Los_Angeles"),
+        sync_interval: float = DEFAULT_SYNC_INTERVAL,
+        max_staleness_seconds: float = DEFAULT_MAX_STALENESS_SECONDS,
+        push_address: str = "",
+        push_token: str = "",
+    ):
+        """Initialize the mirror.
+
+        Args:
+            gateway: Google Calendar client
+            collection: Where mirrored events and the sync token are stored,
+                e.g. ``db_manager.aio.calendar_events`` (optional)
+            tz: Calendar timezone, used for all-day events
+            sync_interval: Seconds between background syncs
+            max_staleness_seconds: Oldest sync that local answers may rely on
+            push_address: HTTPS URL for Google push notifications; no push
+                channel is opened if empty
+            push_token: Secret Google echoes back with each notification
+        """
+        self._gateway = gateway
+        self._collection = collection
+        self._tz = tz
+        self._sync_interval = sync_interval
+        self._max_staleness = max_staleness_seconds
+        self._push_address = push_address
+        self._push_token = push_token
+
+        self._index = EventIntervalIndex()
+        self._sync_token: str | None = None
+        self._last_synced: float | None = None
+        # Wall-clock start of the last successful sync; changes made in
+        # Google before then are in the mirror
+        self.synced_at: datetime | None = None
+        self._lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._channel: dict[str, Any] | None = None
+
+        self.syncs = 0
+        self.full_syncs = 0
+        self.sync_failures = 0
+        self.applied_changes = 0
+        self.notifications = 0
+        self.local_answers = 0
+        self.stale_misses = 0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def load(self) -> None:
+        """Load mirrored events and the sync token from MongoDB."""
+        if self._collection is None:
+            return
+        state = await self._collection.find_one({"_id": _STATE_ID})
+        self._sync_token = state.get("sync_token") if state else None
+
+        cutoff = datetime.now(timezone.utc) - self.HISTORY
+        async for doc in self._collection.find({"end_at": {"$gte": cutoff}}):
+            self._apply_event({field: doc.get(field) for field in _EVENT_FIELDS} | {"id": doc["_id"]})
+        logger.info(f"Loaded {len(self._index)} mirrored calendar events")
+
+    def start(self) -> None:
+        """Start syncing in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop syncing and close the push channel."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._channel:
+            try:
+                await self._gateway.stop_channel(self._channel["id"], self._channel["resourceId"])
+            except Exception as e:
+                logger.warning(f"Failed to close calendar push channel: {e}")
+            self._channel = None
+
+    async def _run(self) -> None:
+        while True:
+            delay = self._sync_interval
+            try:
+                await self.sync()
+                await self._ensure_channel()
+            except CalendarUnavailable:
+                pass
+            except Exception as e:
+                logger.error(f"Calendar sync failed: {e}")
+                delay = min(delay, self.RETRY_DELAY)
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+
+    async def sync(self) -> int:
+        """Fetch changes since the last sync and apply them.
+
+        Returns:
+            Number of changed events applied
+
+        Raises:
+            CalendarUnavailable: If Google Calendar is not connected
+            HttpError: If the API call fails
+        """
+        async with self._lock:
+            started = datetime.now(timezone.utc)
+            try:
+                changed = await self._sync_pages(self._sync_token)
+            except HttpError as e:
+                if getattr(e.resp, "status", None) != 410:
+                    self.sync_failures += 1
+                    raise
+                logger.info("Calendar sync token expired, running a full sync")
+                changed = await self._sync_pages(None)
+            except Exception:
+                self.sync_failures += 1
+                raise
+
+            self._last_synced = time.monotonic()
+            self.synced_at = started
+            self.syncs += 1
+            self._index.prune((datetime.now(timezone.utc) - self.HISTORY).timestamp())
+            return changed
+
+    async def _sync_pages(self, sync_token: str | None) -> int:
+        """Page through changes (a full listing without a sync token)."""
+        full = sync_token is None
+        time_min = datetime.now(timezone.utc) - self.HISTORY if full else None
+        items: list[dict[str, Any]] = []
+        page_token = None
+        while True:
+            page = await self._gateway.list_changes(sync_token, page_token, time_min)
+            items.extend(page.get("items", []))
+            page_token = page.get("nextPageToken")
+            if not page_token:
+                break
+
+        # Only replace the mirror once the whole listing has arrived
+        if full:
+            self._index.clear()
+            self.full_syncs += 1
+        for item in items:
+            self._apply_event(item)
+        self._sync_token = page.get("nextSyncToken")
+        self.applied_changes += len(items)
+        await self._persist(items, full)
+        return len(items)
+
+    def _apply_event(self, item: dict[str, Any]) -> None:
+        event_id = item.get("id")
+        if not event_id:
+            return
+        if item.get("status") == "cancelled":
+            self._index.remove(event_id)
+            return
+        start = parse_event_time(item.get("start") or {}, self._tz)
+        end = parse_event_time(item.get("end") or {}, self._tz)
+        if start is None or end is None:
+            return
+        event = {field: item.get(field) for field in _EVENT_FIELDS if item.get(field) is not None}
+        self._index.upsert(event_id, start, end, event)
+
+    async def _persist(self, items: list[dict[str, Any]], full: bool) -> None:
+        """Write changed events and the new sync token to MongoDB."""
+        if self._collection is None:
+            return
+        if full:
+            await self._collection.delete_many({"_id": {"$ne": _STATE_ID}})
+
+        operations: list[DeleteOne | ReplaceOne] = []
+        for item in items:
+            event_id = item.get("id")
+            if not event_id:
+                continue
+            start = parse_event_time(item.get("start") or {}, self._tz)
+            end = parse_event_time(item.get("end") or {}, self._tz)
+            if item.get("status") == "cancelled" or start is None or end is None:
+                operations.append(DeleteOne({"_id": event_id}))
+                continue
+            doc = {field: item.get(field) for field in _EVENT_FIELDS if field != "id"}
+            doc["start_at"] = datetime.fromtimestamp(start, timezone.utc)
+            doc["end_at"] = datetime.fromtimestamp(end, timezone.utc)
+            operations.append(ReplaceOne({"_id": event_id}, doc, upsert=True))
+
+        if operations:
+            await self._collection.bulk_write(operations, ordered=False)
+        await self._collection.replace_one(
+            {"_id": _STATE_ID},
+            {"sync_token": self._sync_token, "synced_at": datetime.now(timezone.utc)},
+            upsert=True,
+        )
+
+    # ------------------------------------------------------------------
+    # Push notifications
+    # ------------------------------------------------------------------
+
+    async def _ensure_channel(self) -> None:
+        """Open (or renew) the push channel if one is configured."""
+        if not self._push_address:
+            return
+        if self._channel:
+            expires_at = datetime.fromtimestamp(int(self._channel["expiration"]) / 1000, timezone.utc)
+            if expires_at - datetime.now(timezone.utc) > self.CHANNEL_RENEW_MARGIN:
+                return
+
+        previous = self._channel
+        self._channel = await self._gateway.watch_events(
+            str(uuid.uuid4()), self._push_address, self._push_token
+        )
+        logger.info(f"Opened calendar push channel {self._channel.get('id')}")
+        if previous:
+            try:
+                await self._gateway.stop_channel(previous["id"], previous["resourceId"])
+            except Exception as e:
+                logger.warning(f"Failed to close old calendar push channel: {e}")
+
+    def notify(self, channel_id: str, token: str) -> bool:
+        """Handle a push notification by syncing soon.
+
+        Args:
+            channel_id: ``X-Goog-Channel-ID`` header
+            token: ``X-Goog-Channel-Token`` header
+
+        Returns:
+            False if the notification is not for this mirror's channel
+        """
+        if not self._channel or channel_id != self._channel.get("id") or token != self._push_token:
+            return False
+        self.notifications += 1
+        self._wake.set()
+        return True
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @property
+    def staleness_seconds(self) -> float | None:
+        """Seconds since the last successful sync (None before the first)."""
+        if self._last_synced is None:
+            return None
+        return time.monotonic() - self._last_synced
+
+    def events_between(self, start: datetime, end: datetime) -> list[dict[str, Any]] | None:
+        """Events overlapping a time range, if the mirror is fresh enough.
+
+        Args:
+            start: Start of the range (timezone-aware)
+            end: End of the range (timezone-aware)
+
+        Returns:
+            Events in the shape the Calendar API returns them, ordered by
+            start time, or None if the last sync is older than the
+            staleness bound (query Google instead)
+        """
+        staleness = self.staleness_seconds
+        if staleness is None or staleness > self._max_staleness:
+            self.stale_misses += 1
+            return None
+        self.local_answers += 1
+        return self._index.overlapping(start.timestamp(), end.timestamp())
+
+    def stats(self) -> dict[str, Any]:
+        """Get sync and lookup counters."""
+        staleness = self.staleness_seconds
+        return {
+            "events": len(self._index),
+            "staleness_seconds": round(staleness, 1) if staleness is not None else None,
+            "push_channel": bool(self._channel),
+            "syncs": self.syncs,
+            "full_syncs": self.full_syncs,
+            "sync_failures": self.sync_failures,
+            "applied_changes": self.applied_changes,
+            "notifications": self.notifications,
+            "local_answers": self.local_answers,
+            "stale_misses": self.stale_misses,
+        }
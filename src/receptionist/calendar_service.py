@@ -1,15 +1,16 @@
 """Google Calendar integration service for creating and managing events."""
 
 import logging
+import threading
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from pymongo.collection import Collection
 
+from .calendar_gateway import build_calendar_service
 from .models import GoogleCalendarToken
 
 logger = logging.getLogger(__name__)
@@ -18,7 +19,9 @@ logger = logging.getLogger(__name__)
 class CalendarService:
     """Service for Google Calendar OAuth and event management.
 
-    Uses desktop/installed app OAuth flow for authentication.
+    Uses desktop/installed app OAuth flow for authentication. Credentials
+    are kept in memory per user (reloaded from MongoDB only once they
+    expire), and each thread reuses its own service object.
     """
 
     SCOPES = ["https://www.googleapis.com/auth/calendar.events"]
@@ -42,7 +45,10 @@ class CalendarService:
         self._client_secret = client_secret
         self._redirect_uri = redirect_uri
         self._tokens_collection = tokens_collection
-        self._credentials: Credentials | None = None
+        self._credentials: dict[str, Credentials] = {}
+        self._credentials_lock = threading.Lock()
+        # Service objects are not thread-safe, so each thread builds its own
+        self._local = threading.local()
 
     def _get_client_config(self) -> dict[str, Any]:
         """Get OAuth client configuration for installed/desktop app."""
@@ -110,7 +116,8 @@ class CalendarService:
             upsert=True,
         )
 
-        self._credentials = credentials
+        with self._credentials_lock:
+            self._credentials[user_id] = credentials
         return token
 
     def _load_credentials(self, user_id: str = "default") -> Credentials | None:
@@ -128,6 +135,11 @@ class CalendarService:
 
         token = GoogleCalendarToken.from_dict(token_doc)
 
+        # google-auth compares expiry as naive UTC
+        expiry = token.expires_at
+        if expiry.tzinfo is not None:
+            expiry = expiry.astimezone(timezone.utc).replace(tzinfo=None)
+
         credentials = Credentials(
             token=token.access_token,
             refresh_token=token.refresh_token,
@@ -135,6 +147,7 @@ class CalendarService:
             client_id=self._client_id,
             client_secret=self._client_secret,
             scopes=self.SCOPES,
+            expiry=expiry,
         )
 
         # Refresh if expired
@@ -174,11 +187,21 @@ class CalendarService:
         Raises:
             ValueError: If not authenticated
         """
-        credentials = self._load_credentials(user_id)
-        if not credentials:
-            raise ValueError("Google Calendar not connected. Please authenticate first.")
-
-        return build("calendar", "v3", credentials=credentials)
+        with self._credentials_lock:
+            credentials = self._credentials.get(user_id)
+            if credentials is None or not credentials.valid:
+                credentials = self._load_credentials(user_id)
+                if not credentials:
+                    self._credentials.pop(user_id, None)
+                    raise ValueError("Google Calendar not connected. Please authenticate first.")
+                self._credentials[user_id] = credentials
+
+        services = self._local.__dict__.setdefault("services", {})
+        cached = services.get(user_id)
+        if cached is None or cached[0] is not credentials:
+            cached = (credentials, build_calendar_service(credentials))
+            services[user_id] = cached
+        return cached[1]
 
     def is_connected(self, user_id: str = "default") -> bool:
         """Check if Google Calendar is connected for user.
@@ -348,5 +371,6 @@ class CalendarService:
             True if tokens were removed
         """
         result = self._tokens_collection.delete_one({"_id": user_id})
-        self._credentials = None
+        with self._credentials_lock:
+            self._credentials.pop(user_id, None)
         return result.deleted_count > 0
@@ -1,10 +1,20 @@
 """Call management for active call state and conversation flow."""
 
+import asyncio
+import copy
+import json
+import logging
+import time
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import Any
 
+from .call_state_store import CallStateStore, InMemoryCallStateStore
+
+logger = logging.getLogger(__name__)
+
 
 class CallStatus(Enum):
     """Status of a call session."""
@@ -26,6 +36,8 @@ class CallState:
         context: Accumulated context from searches and reasoning
         status: Current status of the call
         started_at: Timestamp when the call started
+        version: Store version this state was read at (bumped on every write)
+        updated_at: Timestamp of the last write, used to find abandoned calls
     """
     
     call_sid: str
@@ -34,6 +46,39 @@ class CallState:
     context: dict[str, Any] = field(default_factory=dict)
     status: CallStatus = CallStatus.INITIATED
     started_at: datetime = field(default_factory=datetime.now)
+    version: int = 0
+    updated_at: datetime = field(default_factory=datetime.now)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a store document."""
+        return {
+            "call_sid": self.call_sid,
+            "caller_number": self.caller_number,
+            "transcript_history": self.transcript_history,
+            "context": self.context,
+            "status": self.status.value,
+            "started_at": self.started_at,
+            "version": self.version,
+            "updated_at": self.updated_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "CallState":
+        """Create from a store document."""
+        return cls(
+            call_sid=data["call_sid"],
+            caller_number=data.get("caller_number", ""),
+            transcript_history=data.get("transcript_history", []),
+            context=data.get("context", {}),
+            status=CallStatus(data.get("status", CallStatus.IN_PROGRESS.value)),
+            started_at=data.get("started_at") or datetime.now(),
+            version=data.get("version", 0),
+            updated_at=data.get("updated_at") or datetime.now(),
+        )
+
+
+class CallStateConflict(Exception):
+    """Raised when a call's state keeps changing underneath an update."""
 
 
 class CallManager:
@@ -42,17 +87,71 @@ class CallManager:
     Maintains context across multiple exchanges within a call session,
     ensuring transcript history and accumulated context persist throughout
     the conversation.
+    
+    State lives in a ``CallStateStore`` (in memory by default, or shared
+    between workers). Updates are read-modify-write with optimistic
+    versioning and are retried on conflict. Reads go through a short-lived
+    local cache, since one request reads the same call several times; it
+    hands out copies, so edits are only seen once they are written.
+    
+    Each call's history is capped on write, and an optional background
+    reaper finalizes calls whose status callback never arrived.
     """
     
-    def __init__(self) -> None:
-        """Initialize the call manager with empty active calls."""
-        self.active_calls: dict[str, CallState] = {}
+    DEFAULT_TTL_SECONDS = 4 * 60 * 60
+    DEFAULT_CACHE_SECONDS = 1.0
+    MAX_UPDATE_ATTEMPTS = 5
+    
+    DEFAULT_MAX_HISTORY_TURNS = 50
+    DEFAULT_MAX_CONTEXT_BYTES = 256 * 1024
+    DEFAULT_IDLE_TIMEOUT_SECONDS = 15 * 60
+    DEFAULT_MAX_CALL_SECONDS = 2 * 60 * 60
+    
+    def __init__(
+        self,
+        store: CallStateStore | None = None,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        cache_seconds: float = DEFAULT_CACHE_SECONDS,
+        max_history_turns: int = DEFAULT_MAX_HISTORY_TURNS,
+        max_context_bytes: int = DEFAULT_MAX_CONTEXT_BYTES,
+        idle_timeout_seconds: float = DEFAULT_IDLE_TIMEOUT_SECONDS,
+        max_call_seconds: float = DEFAULT_MAX_CALL_SECONDS,
+    ) -> None:
+        """Initialize the call manager.
+        
+        Args:
+            store: Call state backend (defaults to in-process memory)
+            ttl_seconds: How long a call's state outlives its last update
+            cache_seconds: How long a read is reused before the store is
+                consulted again (0 disables the local cache)
+            max_history_turns: Entries kept in ``context["history"]`` and
+                ``transcript_history`` (oldest dropped first)
+            max_context_bytes: Approximate serialized size a call's context
+                is trimmed to by dropping its oldest history
+            idle_timeout_seconds: Calls not updated for this long are reaped
+            max_call_seconds: Calls older than this are reaped
+        """
+        self._store = store or InMemoryCallStateStore()
+        self._ttl_seconds = ttl_seconds
+        self._cache_seconds = cache_seconds
+        self._cache: dict[str, tuple[CallState, float]] = {}
+        self._max_history_turns = max_history_turns
+        self._max_context_bytes = max_context_bytes
+        self._idle_timeout_seconds = idle_timeout_seconds
+        self._max_call_seconds = max_call_seconds
+        self._reaper: asyncio.Task[None] | None = None
+        
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.version_conflicts = 0
+        self.trimmed = 0
+        self.reaped = 0
 
     async def start_call(self, call_sid: str, caller_number: str) -> CallState:
         """Initialize a new call session.
         
         Creates a new CallState for the incoming call and stores it
-        in the active calls dictionary.
+        in the call state store.
         
         Args:
             call_sid: Unique identifier for the call (from Twilio)
@@ -69,7 +168,8 @@ class CallManager:
             status=CallStatus.IN_PROGRESS,
             started_at=datetime.now(),
         )
-        self.active_calls[call_sid] = call_state
+        await self._store.create(call_sid, call_state.to_dict(), self._ttl_seconds)
+        self._remember(call_state)
         return call_state
 
     async def update_transcript(self, call_sid: str, text: str) -> None:
@@ -85,10 +185,7 @@ class CallManager:
         Raises:
             KeyError: If the call_sid is not found in active calls
         """
-        if call_sid not in self.active_calls:
-            raise KeyError(f"Call {call_sid} not found in active calls")
-        
-        self.active_calls[call_sid].transcript_history.append(text)
+        await self._modify(call_sid, lambda state: state.transcript_history.append(text))
 
     async def update_context(self, call_sid: str, context_update: dict[str, Any]) -> None:
         """Update the accumulated context for a call.
@@ -103,10 +200,28 @@ class CallManager:
         Raises:
             KeyError: If the call_sid is not found in active calls
         """
-        if call_sid not in self.active_calls:
-            raise KeyError(f"Call {call_sid} not found in active calls")
+        await self._modify(call_sid, lambda state: state.context.update(context_update))
+
+    async def edit_context(
+        self, call_sid: str, edit: Callable[[dict[str, Any]], None]
+    ) -> CallState:
+        """Change a call's context in place, based on its latest value.
+        
+        Unlike ``update_context``, the edit sees the stored context, so it
+        can append to or trim values written by other requests. It may run
+        more than once if the write conflicts.
         
-        self.active_calls[call_sid].context.update(context_update)
+        Args:
+            call_sid: Unique identifier for the call
+            edit: Function that modifies the context dict
+            
+        Returns:
+            The updated call state
+            
+        Raises:
+            KeyError: If the call_sid is not found in active calls
+        """
+        return await self._modify(call_sid, lambda state: edit(state.context))
 
     async def get_call_state(self, call_sid: str) -> CallState | None:
         """Get the current state of a call.
@@ -117,7 +232,20 @@ class CallManager:
         Returns:
             The CallState if found, None otherwise
         """
-        return self.active_calls.get(call_sid)
+        self._expire_cache()
+        cached = self._cache.get(call_sid)
+        if cached:
+            self.cache_hits += 1
+            return copy.deepcopy(cached[0])
+        
+        self.cache_misses += 1
+        doc = await self._store.get(call_sid)
+        if doc is None:
+            self._cache.pop(call_sid, None)
+            return None
+        call_state = CallState.from_dict(doc)
+        self._remember(call_state)
+        return call_state
 
     async def end_call(self, call_sid: str) -> None:
         """Clean up call session.
@@ -130,9 +258,220 @@ class CallManager:
         Raises:
             KeyError: If the call_sid is not found in active calls
         """
-        if call_sid not in self.active_calls:
+        call_state = await self.get_call_state(call_sid)
+        if call_state is None:
             raise KeyError(f"Call {call_sid} not found in active calls")
         
-        call_state = self.active_calls[call_sid]
         call_state.status = CallStatus.COMPLETED
-        del self.active_calls[call_sid]
+        await self._store.delete(call_sid)
+        self._cache.pop(call_sid, None)
+
+    async def active_call_sids(self) -> list[str]:
+        """Get the IDs of calls that have not ended or expired."""
+        return await self._store.call_sids()
+
+    async def _modify(self, call_sid: str, change: Callable[[CallState], None]) -> CallState:
+        """Apply a change to a call's state with optimistic concurrency.
+        
+        The change is applied to the latest state and written only if no
+        other writer has bumped the version meanwhile; otherwise the state
+        is re-read and the change applied again.
+        
+        Raises:
+            KeyError: If the call is not active
+            CallStateConflict: If every attempt lost the race
+        """
+        for attempt in range(self.MAX_UPDATE_ATTEMPTS):
+            if attempt:
+                self._cache.pop(call_sid, None)
+            call_state = await self.get_call_state(call_sid)
+            if call_state is None:
+                raise KeyError(f"Call {call_sid} not found in active calls")
+            
+            change(call_state)
+            self._bound(call_state)
+            call_state.updated_at = datetime.now()
+            written = await self._store.replace(
+                call_sid, call_state.to_dict(), call_state.version, self._ttl_seconds
+            )
+            if written:
+                call_state.version += 1
+                self._remember(call_state)
+                return call_state
+            self.version_conflicts += 1
+        
+        self._cache.pop(call_sid, None)
+        raise CallStateConflict(f"Call {call_sid} changed during {self.MAX_UPDATE_ATTEMPTS} update attempts")
+
+    async def claim_call(self, call_sid: str) -> CallState | None:
+        """Mark a call completed so exactly one finalizer handles it.
+        
+        Used by the status callback and the reaper, which may race each
+        other (possibly on different workers).
+        
+        Args:
+            call_sid: Unique identifier for the call
+            
+        Returns:
+            The call's final state if this caller won the claim, None if the
+            call is unknown or was already claimed
+        """
+        self._cache.pop(call_sid, None)
+        for _ in range(self.MAX_UPDATE_ATTEMPTS):
+            call_state = await self.get_call_state(call_sid)
+            if call_state is None or call_state.status == CallStatus.COMPLETED:
+                return None
+            call_state.status = CallStatus.COMPLETED
+            if await self._store.replace(
+                call_sid, call_state.to_dict(), call_state.version, self._ttl_seconds
+            ):
+                call_state.version += 1
+                self._remember(call_state)
+                return call_state
+            self.version_conflicts += 1
+            self._cache.pop(call_sid, None)
+        return None
+
+    def _bound(self, call_state: CallState) -> None:
+        """Cap a call's history so its state cannot grow without limit."""
+        if len(call_state.transcript_history) > self._max_history_turns:
+            del call_state.transcript_history[: -self._max_history_turns]
+            self.trimmed += 1
+        
+        history = call_state.context.get("history")
+        if not isinstance(history, list):
+            return
+        if len(history) > self._max_history_turns:
+            del history[: -self._max_history_turns]
+            self.trimmed += 1
+        if self._max_context_bytes and _approx_size(call_state.context) > self._max_context_bytes:
+            while history and _approx_size(call_state.context) > self._max_context_bytes:
+                del history[0]
+            self.trimmed += 1
+            logger.warning(f"Trimmed history of call {call_state.call_sid} to fit its context budget")
+
+    def start_reaper(
+        self,
+        finalize: Callable[[CallState, str], Awaitable[None]] | None = None,
+        interval: float = 60.0,
+    ) -> None:
+        """Periodically finalize and evict abandoned calls in the background.
+        
+        Args:
+            finalize: Called with the call's state and the reason ("idle" or
+                "max_duration") before it is evicted, e.g. to persist it
+            interval: Seconds between sweeps
+        """
+        if self._reaper is None:
+            self._reaper = asyncio.create_task(self._reap_forever(finalize, interval))
+
+    async def stop_reaper(self) -> None:
+        """Stop the background reaper."""
+        if self._reaper:
+            self._reaper.cancel()
+            try:
+                await self._reaper
+            except asyncio.CancelledError:
+                pass
+            self._reaper = None
+
+    async def _reap_forever(
+        self,
+        finalize: Callable[[CallState, str], Awaitable[None]] | None,
+        interval: float,
+    ) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.reap_stale_calls(finalize)
+            except Exception as e:
+                logger.error(f"Call reaper error: {e}")
+
+    async def reap_stale_calls(
+        self, finalize: Callable[[CallState, str], Awaitable[None]] | None = None
+    ) -> int:
+        """Finalize and evict calls that are idle or have run too long.
+        
+        Args:
+            finalize: Called with each reaped call's state and the reason
+            
+        Returns:
+            Number of calls reaped by this sweep
+        """
+        now = datetime.now()
+        reaped = 0
+        for call_sid in await self.active_call_sids():
+            self._cache.pop(call_sid, None)
+            call_state = await self.get_call_state(call_sid)
+            if call_state is None:
+                continue
+            
+            if (now - call_state.updated_at).total_seconds() >= self._idle_timeout_seconds:
+                reason = "idle"
+            elif (now - call_state.started_at).total_seconds() >= self._max_call_seconds:
+                reason = "max_duration"
+            else:
+                continue
+            
+            call_state = await self.claim_call(call_sid)
+            if call_state is None:
+                continue
+            logger.warning(f"Reaping call {call_sid} ({reason}) - no status callback received")
+            if finalize:
+                try:
+                    await finalize(call_state, reason)
+                except Exception as e:
+                    logger.error(f"Failed to finalize reaped call {call_sid}: {e}")
+            await self._store.delete(call_sid)
+            self._cache.pop(call_sid, None)
+            reaped += 1
+        
+        self.reaped += reaped
+        return reaped
+
+    async def live_stats(self) -> dict[str, Any]:
+        """Get live-call counts and the approximate size of their state."""
+        sizes = []
+        for call_sid in await self.active_call_sids():
+            doc = await self._store.get(call_sid)
+            if doc is not None:
+                sizes.append(_approx_size(doc))
+        return {
+            **self.stats(),
+            "live_calls": len(sizes),
+            "state_bytes": sum(sizes),
+            "largest_call_bytes": max(sizes, default=0),
+        }
+
+    def _remember(self, call_state: CallState) -> None:
+        if self._cache_seconds > 0:
+            # Re-insert so the cache stays ordered by time cached
+            self._cache.pop(call_state.call_sid, None)
+            self._cache[call_state.call_sid] = (copy.deepcopy(call_state), time.monotonic())
+            self._expire_cache()
+
+    def _expire_cache(self) -> None:
+        """Drop expired entries, including calls ended on other workers."""
+        cutoff = time.monotonic() - self._cache_seconds
+        while self._cache:
+            call_sid, (_, cached_at) = next(iter(self._cache.items()))
+            if cached_at > cutoff:
+                break
+            del self._cache[call_sid]
+
+    def stats(self) -> dict[str, Any]:
+        """Get local cache and concurrency counters."""
+        return {
+            "backend": type(self._store).__name__,
+            "cached_calls": len(self._cache),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "version_conflicts": self.version_conflicts,
+            "trimmed": self.trimmed,
+            "reaped": self.reaped,
+        }
+
+
+def _approx_size(value: Any) -> int:
+    """Approximate serialized size of call state, in bytes."""
+    return len(json.dumps(value, default=str))
@@ -0,0 +1,168 @@
+"""Backends for live call state.
+
+``CallManager`` keeps each call's state in a ``CallStateStore`` so any worker
+can serve any request of a call. Every stored document carries a ``version``
+that is bumped on each write; ``replace`` only succeeds if the caller saw the
+latest version (optimistic concurrency). Documents also carry an expiry so
+calls that are never ended (lost status callbacks) disappear on their own.
+
+- ``InMemoryCallStateStore``: single process (the default).
+- ``MongoCallStateStore``: shared by all workers and nodes, using a TTL index.
+"""
+
+import copy
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from pymongo.asynchronous.collection import AsyncCollection
+
+
+class CallStateStore:
+    """Interface for call state backends.
+
+    Documents are plain dicts (see ``CallState.to_dict``) with a ``version``.
+    """
+
+    async def get(self, call_sid: str) -> dict[str, Any] | None:
+        """Get a call's state document, or None if unknown or expired."""
+        raise NotImplementedError
+
+    async def create(self, call_sid: str, doc: dict[str, Any], ttl_seconds: float) -> None:
+        """Store a new call's state (version 0), replacing any previous one."""
+        raise NotImplementedError
+
+    async def replace(
+        self,
+        call_sid: str,
+        doc: dict[str, Any],
+        expected_version: int,
+        ttl_seconds: float,
+    ) -> bool:
+        """Write a call's state if it is still at ``expected_version``.
+
+        Returns:
+            True if written (the stored version is now ``expected_version + 1``),
+            False if another writer got there first or the call is gone
+        """
+        raise NotImplementedError
+
+    async def delete(self, call_sid: str) -> None:
+        """Remove a call's state."""
+        raise NotImplementedError
+
+    async def call_sids(self) -> list[str]:
+        """Get the IDs of all unexpired calls."""
+        raise NotImplementedError
+
+
+class InMemoryCallStateStore(CallStateStore):
+    """Process-local store. Documents are copied so callers never share them."""
+
+    def __init__(self) -> None:
+        self._docs: dict[str, tuple[dict[str, Any], float]] = {}
+
+    def _live(self, call_sid: str) -> dict[str, Any] | None:
+        entry = self._docs.get(call_sid)
+        if entry is None:
+            return None
+        doc, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._docs[call_sid]
+            return None
+        return doc
+
+    async def get(self, call_sid: str) -> dict[str, Any] | None:
+        doc = self._live(call_sid)
+        return copy.deepcopy(doc) if doc is not None else None
+
+    async def create(self, call_sid: str, doc: dict[str, Any], ttl_seconds: float) -> None:
+        self._docs[call_sid] = (
+            {**copy.deepcopy(doc), "version": 0},
+            time.monotonic() + ttl_seconds,
+        )
+
+    async def replace(
+        self,
+        call_sid: str,
+        doc: dict[str, Any],
+        expected_version: int,
+        ttl_seconds: float,
+    ) -> bool:
+        current = self._live(call_sid)
+        if current is None or current.get("version") != expected_version:
+            return False
+        self._docs[call_sid] = (
+            {**copy.deepcopy(doc), "version": expected_version + 1},
+            time.monotonic() + ttl_seconds,
+        )
+        return True
+
+    async def delete(self, call_sid: str) -> None:
+        self._docs.pop(call_sid, None)
+
+    async def call_sids(self) -> list[str]:
+        return [call_sid for call_sid in list(self._docs) if self._live(call_sid) is not None]
+
+
+class MongoCallStateStore(CallStateStore):
+    """Shared store in a MongoDB collection (``call_states``).
+
+    MongoDB's TTL monitor removes expired documents about once a minute, so
+    reads also filter on ``expires_at``.
+    """
+
+    def __init__(self, collection: AsyncCollection):
+        """Initialize the store.
+
+        Args:
+            collection: Collection for call state, e.g. ``db_manager.aio.call_states``
+        """
+        self._collection = collection
+
+    async def ensure_indexes(self) -> None:
+        """Create the TTL index that expires abandoned calls."""
+        await self._collection.create_index("expires_at", expireAfterSeconds=0)
+
+    @staticmethod
+    def _expiry(ttl_seconds: float) -> datetime:
+        return datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds)
+
+    async def get(self, call_sid: str) -> dict[str, Any] | None:
+        doc = await self._collection.find_one(
+            {"_id": call_sid, "expires_at": {"$gt": datetime.now(timezone.utc)}}
+        )
+        if doc is None:
+            return None
+        doc.pop("_id", None)
+        doc.pop("expires_at", None)
+        return doc
+
+    async def create(self, call_sid: str, doc: dict[str, Any], ttl_seconds: float) -> None:
+        await self._collection.replace_one(
+            {"_id": call_sid},
+            {**doc, "version": 0, "expires_at": self._expiry(ttl_seconds)},
+            upsert=True,
+        )
+
+    async def replace(
+        self,
+        call_sid: str,
+        doc: dict[str, Any],
+        expected_version: int,
+        ttl_seconds: float,
+    ) -> bool:
+        result = await self._collection.replace_one(
+            {"_id": call_sid, "version": expected_version},
+            {**doc, "version": expected_version + 1, "expires_at": self._expiry(ttl_seconds)},
+        )
+        return result.matched_count == 1
+
+    async def delete(self, call_sid: str) -> None:
+        await self._collection.delete_one({"_id": call_sid})
+
+    async def call_sids(self) -> list[str]:
+        cursor = self._collection.find(
+            {"expires_at": {"$gt": datetime.now(timezone.utc)}}, {"_id": 1}
+        )
+        return [doc["_id"] async for doc in cursor]
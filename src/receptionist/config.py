@@ -15,23 +15,79 @@ class Settings(BaseSettings):
     # MongoDB Atlas
     mongodb_uri: str
     database_name: str = "donna_dev"
+    mongodb_max_pool_size: int = 100
+    mongodb_min_pool_size: int = 0
+    mongodb_max_idle_time_ms: int = 60000
+    mongodb_connect_timeout_ms: int = 5000
+    mongodb_socket_timeout_ms: int = 0  # 0 = no timeout
+    mongodb_server_selection_timeout_ms: int = 5000
+    mongodb_wait_queue_timeout_ms: int = 2000
 
     # Voyage AI (embeddings)
     voyage_api_key: str
+    embedding_batch_concurrency: int = 4
+    embedding_cache_size: int = 1024
+    embedding_cache_ttl_seconds: float = 3600.0
+    embedding_cache_path: str = ""  # SQLite file; empty keeps the cache in memory only
+
+    # Email vector search: "atlas" ($vectorSearch) or "local" (in-process index)
+    vector_search_mode: str = "atlas"
+    local_index_path: str = ""  # Directory for the memory-mapped index; empty builds in memory
+    local_index_nlist: int = 0  # IVF lists; 0 = exact search
+    local_index_nprobe: int = 8
+    index_sync_poll_interval: float = 2.0  # Seconds between polls when change streams are unavailable
+    index_sync_reconcile_interval: float = 600.0  # Seconds between full delete reconciliations when polling
+    index_snapshot_interval: float = 60.0  # Minimum seconds between local index snapshots
 
     # Deepgram (STT)
     deepgram_api_key: str
+    deepgram_pool_min_idle: int = 2  # Pre-opened live sessions (media streams)
+    deepgram_pool_max_sessions: int = 50  # Live session limit (idle + in use)
+    tts_cache_max_bytes: int = 64 * 1024 * 1024  # In-memory TTS audio budget
+    tts_cache_dir: str = ""  # Shared on-disk TTS cache; empty = memory only
+    tts_cache_max_disk_bytes: int = 512 * 1024 * 1024
+    tts_phrase_warm_timeout: float = 15.0  # Startup wait for canned phrase audio
+    tts_streaming: bool = True  # Stream TTS frames onto media streams
 
     # ElevenLabs (TTS)
     elevenlabs_api_key: str = ""
 
     # Fireworks AI (reasoning)
     fireworks_api_key: str
+    llm_streaming: bool = True  # Stream replies and start TTS per sentence
+    llm_fast_path: bool = True  # Answer tool-free turns in a single completion
+    llm_history_turns: int = 8  # Recent turns sent verbatim; older ones are summarized
+    llm_history_token_budget: int = 1200  # Tokens of history (summary + turns) per prompt
+    llm_timeout_seconds: float = 10.0  # Longest single completion request
+    llm_turn_budget_seconds: float = 12.0  # All LLM requests of one caller turn share this deadline
+    llm_max_retries: int = 2  # Retries on 429/5xx/connection errors (jittered backoff)
+    llm_hedge: bool = False  # Re-send a completion that runs past its endpoint's p95
+    llm_fallback_model: str = ""  # Used while the primary model's circuit breaker is open
+    llm_breaker_failures: int = 5  # Consecutive failures that open the circuit
+    llm_breaker_reset_seconds: float = 30.0  # How long the circuit stays open
+    llm_http2: bool = True
+    llm_max_connections: int = 20
 
     # Twilio (telephony)
     twilio_account_sid: str
     twilio_auth_token: str
     twilio_phone_number: str
+    media_streams: bool = False  # Converse over /audio-stream instead of <Gather>
+
+    # Call state: "memory" (single worker) or "mongo" (shared by all workers)
+    call_state_backend: str = "memory"
+    call_state_ttl_seconds: float = 4 * 60 * 60  # Abandoned calls expire after this
+    call_state_cache_seconds: float = 1.0  # Local read-through cache lifetime
+    call_idle_timeout_seconds: float = 15 * 60  # Reap calls with no activity for this long
+    call_max_duration_seconds: float = 2 * 60 * 60  # Reap calls older than this
+    call_reaper_interval: float = 60.0  # Seconds between stale-call sweeps
+    call_max_history_turns: int = 50  # Conversation turns kept per call
+    call_max_context_bytes: int = 256 * 1024  # Per-call context budget (oldest turns dropped)
+
+    # Post-call analysis queue (needs MongoDB)
+    post_call_workers: int = 2  # Concurrent analysis requests
+    post_call_batch_size: int = 4  # Finished calls analyzed per LLM request
+    post_call_max_attempts: int = 5  # Analysis attempts before a call is recorded unanalyzed
 
     # Server
     server_host: str = "0.0.0.0"
@@ -42,6 +98,16 @@ class Settings(BaseSettings):
 
     # Google Auth
     google_credentials_path: str = ""
+    calendar_max_workers: int = 4  # Threads for Google Calendar API calls
+    calendar_refresh_margin_seconds: float = 300.0  # Refresh the access token this long before expiry
+    calendar_sync_interval: float = 30.0  # Seconds between incremental calendar syncs
+    calendar_max_staleness_seconds: float = 120.0  # Older mirrors fall back to live Google queries
+    calendar_push_address: str = ""  # HTTPS URL of /calendar/notifications (enables push sync)
+    calendar_push_token: str = ""  # Secret checked on push notifications
+    calendar_work_start_hour: int = 9  # Meetings are suggested within working hours (Pacific)
+    calendar_work_end_hour: int = 17
+    calendar_slot_suggestions: int = 3  # Alternatives offered when a requested time is busy
+    calendar_write_max_attempts: int = 5  # Google writes of a booked meeting before it is marked failed
 
 
 def get_settings() -> Settings:
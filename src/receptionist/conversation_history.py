@@ -0,0 +1,211 @@
+"""Bounded conversation history with a rolling summary of older turns.
+
+Each call keeps its history in the call context (plain dicts, so it is stored
+with the rest of the call state):
+
+- ``history``: the most recent turns, each with an estimated token count
+- ``history_pending``: turns that left ``history`` but are not summarized yet
+- ``history_summary``: a short summary of every turn before that
+
+``ConversationHistory`` appends turns and builds the history part of an LLM
+prompt within a token budget. ``HistorySummarizer`` folds pending turns into
+the summary in the background, so a turn never waits on summarization.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from .call_manager import CallManager
+
+logger = logging.getLogger(__name__)
+
+Summarize = Callable[[str, list[dict[str, Any]]], Awaitable[str | None]]
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of text (about four characters per token)."""
+    return (len(text) + 3) // 4 if text else 0
+
+
+class ConversationHistory:
+    """Ring buffer of recent turns plus a rolling summary, stored in call context."""
+
+    DEFAULT_MAX_TURNS = 8
+    DEFAULT_TOKEN_BUDGET = 1200
+    # Turns kept for summarization if the summarizer is failing
+    DEFAULT_MAX_PENDING_TURNS = 24
+
+    def __init__(
+        self,
+        max_turns: int = DEFAULT_MAX_TURNS,
+        token_budget: int = DEFAULT_TOKEN_BUDGET,
+        max_pending_turns: int = DEFAULT_MAX_PENDING_TURNS,
+    ):
+        """Initialize the history policy.
+
+        Args:
+            max_turns: Recent turns kept verbatim
+            token_budget: Tokens of summary plus turns sent with each prompt
+            max_pending_turns: Evicted turns kept until they are summarized
+                (oldest dropped beyond this)
+        """
+        self._max_turns = max(1, max_turns)
+        self._token_budget = token_budget
+        self._max_pending_turns = max_pending_turns
+
+    def append(self, context: dict[str, Any], user: str, assistant: str, **extra: Any) -> None:
+        """Add a turn, moving turns beyond ``max_turns`` to the pending list.
+
+        Args:
+            context: Call context to update in place
+            user: What the caller said
+            assistant: The receptionist's reply
+            **extra: Other fields stored with the turn (e.g. tool timings)
+        """
+        history = context.setdefault("history", [])
+        history.append({
+            "user": user,
+            "assistant": assistant,
+            "tokens": estimate_tokens(user) + estimate_tokens(assistant),
+            **extra,
+        })
+        if len(history) > self._max_turns:
+            evicted = history[: -self._max_turns]
+            del history[: -self._max_turns]
+            pending = context.setdefault("history_pending", [])
+            pending.extend({"user": t.get("user", ""), "assistant": t.get("assistant", "")} for t in evicted)
+            if len(pending) > self._max_pending_turns:
+                del pending[: -self._max_pending_turns]
+
+    @staticmethod
+    def needs_summary(context: dict[str, Any]) -> bool:
+        """Whether the context has evicted turns waiting to be summarized."""
+        return bool(context.get("history_pending"))
+
+    def messages(self, context: dict[str, Any]) -> list[dict[str, Any]]:
+        """Build the history messages for a prompt, within the token budget.
+
+        The summary comes first, then as many of the most recent turns as
+        fit (the latest turn is always included).
+
+        Args:
+            context: Call context
+
+        Returns:
+            Chat messages to place between the system prompt and the
+            caller's current message
+        """
+        budget = self._token_budget
+        messages: list[dict[str, Any]] = []
+
+        summary = context.get("history_summary")
+        if summary:
+            messages.append({
+                "role": "system",
+                "content": f"Summary of the earlier conversation: {summary}",
+            })
+            budget -= estimate_tokens(summary)
+
+        turns: list[dict[str, Any]] = []
+        for entry in reversed(context.get("history") or []):
+            tokens = entry.get("tokens")
+            if tokens is None:
+                tokens = estimate_tokens(entry.get("user", "")) + estimate_tokens(entry.get("assistant", ""))
+            if turns and tokens > budget:
+                break
+            budget -= tokens
+            turns.append(entry)
+
+        for entry in reversed(turns):
+            messages.append({"role": "user", "content": entry.get("user", "")})
+            if entry.get("assistant"):
+                messages.append({"role": "assistant", "content": entry["assistant"]})
+        return messages
+
+
+class HistorySummarizer:
+    """Folds each call's pending turns into its summary in the background.
+
+    At most one summarization runs per call; turns evicted meanwhile are
+    picked up by a follow-up run.
+    """
+
+    def __init__(self, call_manager: CallManager, summarize: Summarize):
+        """Initialize the summarizer.
+
+        Args:
+            call_manager: Where call contexts are stored
+            summarize: Coroutine ``(summary, turns) -> new summary`` (None on
+                failure), e.g. ``ReasoningEngine.summarize_history``
+        """
+        self._call_manager = call_manager
+        self._summarize = summarize
+        self._tasks: dict[str, asyncio.Task[None]] = {}
+        self._rerun: set[str] = set()
+
+        self.summaries = 0
+        self.failures = 0
+
+    def schedule(self, call_sid: str) -> None:
+        """Summarize a call's pending turns soon, without waiting for it."""
+        if call_sid in self._tasks:
+            self._rerun.add(call_sid)
+            return
+        self._tasks[call_sid] = asyncio.create_task(self._run(call_sid))
+
+    async def _run(self, call_sid: str) -> None:
+        try:
+            while True:
+                self._rerun.discard(call_sid)
+                await self._summarize_once(call_sid)
+                if call_sid not in self._rerun:
+                    return
+        finally:
+            self._tasks.pop(call_sid, None)
+
+    async def _summarize_once(self, call_sid: str) -> None:
+        call_state = await self._call_manager.get_call_state(call_sid)
+        if call_state is None:
+            return
+        pending = list(call_state.context.get("history_pending") or [])
+        if not pending:
+            return
+
+        try:
+            summary = await self._summarize(call_state.context.get("history_summary", ""), pending)
+        except Exception as e:
+            logger.warning(f"History summarization failed for {call_sid}: {e}")
+            summary = None
+        if not summary:
+            self.failures += 1
+            return
+
+        def apply(context: dict[str, Any]) -> None:
+            # Turns evicted while summarizing stay pending for the next run
+            remaining = context.get("history_pending") or []
+            done = len(pending) if remaining[: len(pending)] == pending else 0
+            context["history_pending"] = remaining[done:]
+            context["history_summary"] = summary
+
+        try:
+            await self._call_manager.edit_context(call_sid, apply)
+        except KeyError:
+            return
+        self.summaries += 1
+
+    async def close(self) -> None:
+        """Cancel running summarizations."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict[str, Any]:
+        """Get summarization counters."""
+        return {
+            "running": len(self._tasks),
+            "summaries": self.summaries,
+            "failures": self.failures,
+        }
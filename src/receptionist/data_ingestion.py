@@ -1,164 +1,214 @@
 """Data ingestion for emails and contacts into MongoDB with embeddings."""
 
+import asyncio
+import logging
+from typing import Any
+
 from pymongo import UpdateOne
+from pymongo.asynchronous.collection import AsyncCollection
 from pymongo.errors import BulkWriteError
 from bson import ObjectId # Import ObjectId
 
 from .models import Contact, Email
 from .vector_search import VectorSearch
 
+logger = logging.getLogger(__name__)
+
 
 class DataIngestion:
     """Handles ingesting emails and contacts into MongoDB.
-    
+
     Generates embeddings for emails using Voyage AI and stores them
     in MongoDB Atlas with upsert semantics to handle duplicates.
     """
 
+    # Emails embedded and written per bulk_write call
+    WRITE_CHUNK_SIZE = 500
+
     def __init__(self, vector_search: VectorSearch):
         """Initialize DataIngestion with a VectorSearch instance.
-        
+
         Args:
             vector_search: VectorSearch instance for embedding generation
         """
         self._vector_search = vector_search
 
+    @staticmethod
+    def embedding_text(email: Email) -> str:
+        """Combine subject and body for better semantic representation."""
+        return f"{email.subject}\n\n{email.body}"
+
+    @staticmethod
+    def _document_id(record_id: str) -> Any:
+        """Convert a record ID to the stored _id type.
+
+        Imported records use ObjectId keys while records created through
+        the REST API use UUID strings, so only valid ObjectIds are converted.
+        """
+        return ObjectId(record_id) if ObjectId.is_valid(record_id) else record_id
+
     async def ingest_email(self, email: Email) -> None:
         """Generate embedding and store email in MongoDB.
-        
+
         Uses upsert to update existing records rather than creating duplicates.
-        
+
         Args:
             email: Email object to ingest
         """
         # Generate embedding if not already present
         if email.embedding is None:
-            # Combine subject and body for better semantic representation
-            text_to_embed = f"{email.subject}\n\n{email.body}"
-            email.embedding = await self._vector_search.embed_text(text_to_embed)
-        
+            email.embedding = await self._vector_search.embed_text(self.embedding_text(email))
+
         # Convert to dict for MongoDB
         doc = email.to_dict()
         doc.pop("_id", None) # Remove _id to prevent type issues on update
-        
+
         # Upsert: update if exists, insert if not
-        self._vector_search.emails_collection.update_one(
-            {"_id": ObjectId(email.id)}, # Convert string ID to ObjectId
-            {"$set": doc},
+        await self._vector_search.emails_collection.update_one(
+            {"_id": self._document_id(email.id)},
+            {"$set": doc, "$currentDate": {"updated_at": True}},
             upsert=True,
         )
 
     async def ingest_contact(self, contact: Contact) -> None:
         """Store contact in MongoDB.
-        
+
         Uses upsert to update existing records rather than creating duplicates.
-        
+
         Args:
             contact: Contact object to ingest
         """
         doc = contact.to_dict()
         doc.pop("_id", None) # Remove _id to prevent type issues on update
-        
+
         # Upsert: update if exists, insert if not
-        self._vector_search.contacts_collection.update_one(
-            {"_id": ObjectId(contact.id)}, # Convert string ID to ObjectId
+        await self._vector_search.contacts_collection.update_one(
+            {"_id": self._document_id(contact.id)},
             {"$set": doc},
             upsert=True,
         )
 
-    async def bulk_ingest_emails(self, emails: list[Email]) -> int:
+    async def bulk_ingest_emails(
+        self, emails: list[Email], keep_unembedded: bool = False
+    ) -> int:
         """Bulk ingest emails with embeddings.
-        
-        Generates embeddings for all emails and performs bulk upsert.
-        
+
+        Emails are processed in chunks of ``WRITE_CHUNK_SIZE``. Each chunk is
+        embedded with batched Voyage requests and written with a single
+        ``bulk_write``; the write of one chunk overlaps with embedding the next.
+
         Args:
             emails: List of Email objects to ingest
-            
+            keep_unembedded: Write emails whose embedding failed without a
+                vector instead of skipping them
+
         Returns:
             Count of successfully ingested records
         """
         if not emails:
             return 0
-        
-        operations = []
+
+        collection = self._vector_search.emails_collection
         ingested_count = 0
-        
-        for email in emails:
+        pending_write: asyncio.Task[int] | None = None
+
+        for start in range(0, len(emails), self.WRITE_CHUNK_SIZE):
+            chunk = emails[start:start + self.WRITE_CHUNK_SIZE]
+            operations = await self._prepare_email_operations(chunk, keep_unembedded)
+
+            if pending_write is not None:
+                ingested_count += await pending_write
+            pending_write = asyncio.create_task(self._bulk_upsert(collection, operations))
+            logger.info(
+                f"Embedded emails {start + 1}-{start + len(chunk)} of {len(emails)}"
+            )
+
+        if pending_write is not None:
+            ingested_count += await pending_write
+
+        return ingested_count
+
+    async def _prepare_email_operations(
+        self, emails: list[Email], keep_unembedded: bool
+    ) -> list[UpdateOne]:
+        """Embed a chunk of emails and build its upsert operations."""
+        missing = [email for email in emails if email.embedding is None]
+
+        if missing:
             try:
-                # Generate embedding if not already present
-                if email.embedding is None:
-                    text_to_embed = f"{email.subject}\n\n{email.body}"
-                    email.embedding = await self._vector_search.embed_text(text_to_embed)
-                
-                doc = email.to_dict()
-                doc.pop("_id", None) # Remove _id to prevent type issues on update
-                
-                # Create upsert operation
-                operations.append(
-                    UpdateOne(
-                        {"_id": ObjectId(email.id)}, # Convert string ID to ObjectId
-                        {"$set": doc},
-                        upsert=True,
-                    )
+                # Batches that fail leave None; the rest of the chunk is kept
+                vectors = await self._vector_search.embed_texts(
+                    [self.embedding_text(email) for email in missing], allow_partial=True
                 )
-                ingested_count += 1
-            except Exception:
+                for email, vector in zip(missing, vectors):
+                    email.embedding = vector
+            except Exception as e:
+                logger.error(f"Failed to embed {len(missing)} emails: {e}")
+
+            failed = sum(1 for email in missing if email.embedding is None)
+            if failed:
                 # Skip records that fail embedding generation
                 # Error is logged but processing continues
-                continue
-        
-        if operations:
-            try:
-                result = self._vector_search.emails_collection.bulk_write(
-                    operations, ordered=False
-                )
-                # Return count of modified + upserted documents
-                return result.modified_count + result.upserted_count
-            except BulkWriteError as e:
-                # Some operations may have succeeded
-                # Return the count of successful writes
-                return e.details.get("nModified", 0) + len(
-                    e.details.get("upserted", [])
+                logger.error(f"Failed to embed {failed} of {len(missing)} emails")
+                if not keep_unembedded:
+                    emails = [email for email in emails if email.embedding is not None]
+
+        operations = []
+        for email in emails:
+            doc = email.to_dict()
+            doc.pop("_id", None) # Remove _id to prevent type issues on update
+            operations.append(
+                UpdateOne(
+                    {"_id": self._document_id(email.id)},
+                    # updated_at is the watermark EmailIndexSync polls on
+                    {"$set": doc, "$currentDate": {"updated_at": True}},
+                    upsert=True,
                 )
-        
-        return 0
+            )
+        return operations
+
+    @staticmethod
+    async def _bulk_upsert(collection: AsyncCollection, operations: list[UpdateOne]) -> int:
+        """Run unordered bulk upserts and return the number of written records."""
+        if not operations:
+            return 0
+
+        try:
+            result = await collection.bulk_write(operations, ordered=False)
+            # Return count of modified + upserted documents
+            return result.modified_count + result.upserted_count
+        except BulkWriteError as e:
+            # Some operations may have succeeded
+            # Return the count of successful writes
+            return e.details.get("nModified", 0) + len(
+                e.details.get("upserted", [])
+            )
 
     async def bulk_ingest_contacts(self, contacts: list[Contact]) -> int:
         """Bulk ingest contacts.
-        
+
         Performs bulk upsert for all contacts.
-        
+
         Args:
             contacts: List of Contact objects to ingest
-            
+
         Returns:
             Count of successfully ingested records
         """
         if not contacts:
             return 0
-        
+
         operations = []
-        
+
         for contact in contacts:
             doc = contact.to_dict()
             doc.pop("_id", None) # Remove _id to prevent type issues on update
             operations.append(
                 UpdateOne(
-                    {"_id": ObjectId(contact.id)}, # Convert string ID to ObjectId
+                    {"_id": self._document_id(contact.id)},
                     {"$set": doc},
                     upsert=True,
                 )
             )
-        
-        if operations:
-            try:
-                result = self._vector_search.contacts_collection.bulk_write(
-                    operations, ordered=False
-                )
-                return result.modified_count + result.upserted_count
-            except BulkWriteError as e:
-                return e.details.get("nModified", 0) + len(
-                    e.details.get("upserted", [])
-                )
-        
-        return 0
+
+        return await self._bulk_upsert(self._vector_search.contacts_collection, operations)
@@ -1,35 +1,165 @@
-"""MongoDB database connection and collection management."""
+"""MongoDB database connection and collection management.
 
-from pymongo import MongoClient
+Two client flavours share the same pool configuration:
+
+- ``DatabaseManager.client`` / ``db`` and the collection properties return
+  blocking pymongo objects for scripts and synchronous code.
+- ``DatabaseManager.aio`` exposes the same collections backed by pymongo's
+  ``AsyncMongoClient`` so request handlers never block the event loop on
+  database I/O.
+
+Both clients are created lazily, so a process only opens the pool it uses.
+"""
+
+from typing import Any
+
+from pymongo import AsyncMongoClient, MongoClient
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.asynchronous.database import AsyncDatabase
 from pymongo.collection import Collection
 from pymongo.database import Database
 
-from .config import get_settings
+from .config import Settings, get_settings
+
+
+class AsyncCollections:
+    """Async counterparts of the DatabaseManager collection properties."""
+
+    def __init__(self, manager: "DatabaseManager"):
+        """Initialize with the owning database manager."""
+        self._manager = manager
+
+    @property
+    def db(self) -> AsyncDatabase:
+        """Get the receptionist database (async)."""
+        return self._manager.async_db
+
+    @property
+    def emails(self) -> AsyncCollection:
+        """Get the emails collection."""
+        return self.db["emails"]
+
+    @property
+    def contacts(self) -> AsyncCollection:
+        """Get the contacts collection."""
+        return self.db["contacts"]
+
+    @property
+    def calls(self) -> AsyncCollection:
+        """Get the calls collection for call history."""
+        return self.db["calls"]
+
+    @property
+    def business_config(self) -> AsyncCollection:
+        """Get the business_config collection for CEO/company settings."""
+        return self.db["business_config"]
+
+    @property
+    def calendar_events(self) -> AsyncCollection:
+        """Get the calendar_events collection."""
+        return self.db["calendar_events"]
+
+    @property
+    def calendar_tokens(self) -> AsyncCollection:
+        """Get the calendar_tokens collection."""
+        return self.db["calendar_tokens"]
+
+    @property
+    def post_call_jobs(self) -> AsyncCollection:
+        """Get the post_call_jobs collection for finished calls awaiting analysis."""
+        return self.db["post_call_jobs"]
+
+    @property
+    def meeting_holds(self) -> AsyncCollection:
+        """Get the meeting_holds collection for meetings awaiting their Google write."""
+        return self.db["meeting_holds"]
+
+    @property
+    def call_states(self) -> AsyncCollection:
+        """Get the call_states collection for live call state shared by workers."""
+        return self.db["call_states"]
 
 
 class DatabaseManager:
     """Manages MongoDB connection and provides access to collections."""
 
-    def __init__(self, uri: str | None = None):
-        """Initialize database connection."""
-        self._uri = uri or get_settings().mongodb_uri
+    DEFAULT_DATABASE = "donna_dev"
+
+    def __init__(self, uri: str | None = None, settings: Settings | None = None):
+        """Initialize database connection.
+
+        Args:
+            uri: MongoDB connection string (defaults to settings)
+            settings: Application settings used for the database name and
+                connection pool options. Loaded from the environment when
+                neither ``uri`` nor ``settings`` is given.
+        """
+        if settings is None and uri is None:
+            settings = get_settings()
+
+        self._uri = uri or settings.mongodb_uri
+        self._database_name = settings.database_name if settings else self.DEFAULT_DATABASE
+        self._client_options = self._build_client_options(settings)
+
         self._client: MongoClient | None = None
         self._db: Database | None = None
+        self._async_client: AsyncMongoClient | None = None
+        self._async_db: AsyncDatabase | None = None
+        self._aio = AsyncCollections(self)
+
+    @staticmethod
+    def _build_client_options(settings: Settings | None) -> dict[str, Any]:
+        """Build pool, timeout and server-selection options for both clients."""
+        if settings is None:
+            return {}
+
+        options: dict[str, Any] = {
+            "maxPoolSize": settings.mongodb_max_pool_size,
+            "minPoolSize": settings.mongodb_min_pool_size,
+            "maxIdleTimeMS": settings.mongodb_max_idle_time_ms,
+            "connectTimeoutMS": settings.mongodb_connect_timeout_ms,
+            "serverSelectionTimeoutMS": settings.mongodb_server_selection_timeout_ms,
+            "waitQueueTimeoutMS": settings.mongodb_wait_queue_timeout_ms,
+            "appname": "ai-receptionist",
+        }
+        # 0 means "no socket timeout" to pymongo, so only pass it when set
+        if settings.mongodb_socket_timeout_ms:
+            options["socketTimeoutMS"] = settings.mongodb_socket_timeout_ms
+        return options
 
     @property
     def client(self) -> MongoClient:
         """Get MongoDB client (lazy initialization)."""
         if self._client is None:
-            self._client = MongoClient(self._uri)
+            self._client = MongoClient(self._uri, **self._client_options)
         return self._client
 
     @property
     def db(self) -> Database:
         """Get the receptionist database."""
         if self._db is None:
-            self._db = self.client["donna_dev"]
+            self._db = self.client[self._database_name]
         return self._db
 
+    @property
+    def async_client(self) -> AsyncMongoClient:
+        """Get the async MongoDB client (lazy initialization)."""
+        if self._async_client is None:
+            self._async_client = AsyncMongoClient(self._uri, **self._client_options)
+        return self._async_client
+
+    @property
+    def async_db(self) -> AsyncDatabase:
+        """Get the receptionist database through the async client."""
+        if self._async_db is None:
+            self._async_db = self.async_client[self._database_name]
+        return self._async_db
+
+    @property
+    def aio(self) -> AsyncCollections:
+        """Get async (non-blocking) access to the collections."""
+        return self._aio
+
     @property
     def emails(self) -> Collection:
         """Get the emails collection."""
@@ -61,12 +191,20 @@ class DatabaseManager:
         return self.db["calendar_tokens"]
 
     def close(self) -> None:
-        """Close the database connection."""
+        """Close the synchronous database connection."""
         if self._client is not None:
             self._client.close()
             self._client = None
             self._db = None
 
+    async def aclose(self) -> None:
+        """Close both the async and synchronous database connections."""
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+            self._async_db = None
+        self.close()
+
 
 # Global database instance
 _db_manager: DatabaseManager | None = None
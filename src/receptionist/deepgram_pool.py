@@ -0,0 +1,339 @@
+"""Pool of pre-opened Deepgram live transcription sessions.
+
+Opening a Deepgram live WebSocket takes a TLS and WebSocket handshake plus the
+``Open`` event, which would otherwise sit at the start of every call.
+``DeepgramLivePool`` keeps a few sessions open ahead of time, sends KeepAlive
+messages so Deepgram does not close them, hands one to each call and opens a
+replacement in the background.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from deepgram import DeepgramClient, LiveOptions
+
+logger = logging.getLogger(__name__)
+
+
+class DeepgramPoolExhausted(Exception):
+    """Raised when every allowed Deepgram session is in use."""
+
+
+class LiveSession:
+    """A Deepgram live connection and the transcripts it produces.
+
+    Event handlers are bound when the connection is opened, before it is known
+    which call will use it, so they write to this object and the call reads
+    from ``transcripts`` and sets ``on_speech_started``.
+    """
+
+    def __init__(self, connection: Any):
+        self.connection = connection
+        self.transcripts: asyncio.Queue[str | None] = asyncio.Queue()
+        self.on_speech_started: Callable[[], Awaitable[None]] | None = None
+        self.opened_at = time.monotonic()
+        self.closed = False
+
+    async def send(self, chunk: bytes) -> None:
+        await self.connection.send(chunk)
+
+    async def keep_alive(self) -> None:
+        await self.connection.keep_alive()
+
+    async def finish(self) -> None:
+        """Close the connection (flushing any final transcript)."""
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            await self.connection.finish()
+        except Exception as e:
+            logger.debug(f"Error closing Deepgram session: {e}")
+
+
+async def open_live_session(
+    client: DeepgramClient,
+    options: LiveOptions,
+    timeout: float = 5.0,
+) -> LiveSession:
+    """Open a Deepgram live connection and wait until it is ready.
+
+    Args:
+        client: Deepgram client
+        options: Live transcription options
+        timeout: Seconds to wait for the ``Open`` event
+
+    Returns:
+        The open session
+
+    Raises:
+        ConnectionError: If the connection could not be started
+        asyncio.TimeoutError: If Deepgram did not open it in time
+    """
+    connection = client.listen.asyncwebsocket.v("1")
+    session = LiveSession(connection)
+    ready = asyncio.Event()
+
+    async def on_open(self_conn, open_response, **kwargs):
+        ready.set()
+
+    async def on_message(self_conn, result, **kwargs):
+        try:
+            sentence = result.channel.alternatives[0].transcript
+            if sentence and result.is_final:
+                logger.info(f"Deepgram transcript: {sentence}")
+                await session.transcripts.put(sentence)
+        except Exception as e:
+            logger.error(f"Error in on_message: {e}")
+
+    async def on_speech_started(self_conn, speech_started, **kwargs):
+        if session.on_speech_started:
+            try:
+                await session.on_speech_started()
+            except Exception as e:
+                logger.error(f"Error in on_speech_started: {e}")
+
+    async def on_error(self_conn, error, **kwargs):
+        logger.error(f"Deepgram error: {error}")
+
+    async def on_close(self_conn, close, **kwargs):
+        session.closed = True
+        await session.transcripts.put(None)
+
+    connection.on("Open", on_open)
+    connection.on("Results", on_message)
+    connection.on("SpeechStarted", on_speech_started)
+    connection.on("Error", on_error)
+    connection.on("Close", on_close)
+
+    if await connection.start(options) is False:
+        raise ConnectionError("Failed to start Deepgram live connection")
+    try:
+        await asyncio.wait_for(ready.wait(), timeout=timeout)
+    except asyncio.TimeoutError:
+        await session.finish()
+        raise
+    session.opened_at = time.monotonic()
+    return session
+
+
+class DeepgramLivePool:
+    """Keeps warm Deepgram live sessions ready for incoming calls.
+
+    Sessions are single use: a call's session is closed when the call ends
+    and a fresh one is opened in the background to replace it.
+    """
+
+    DEFAULT_MIN_IDLE = 2
+    DEFAULT_MAX_SESSIONS = 50
+    # Deepgram closes a connection after about ten seconds without audio
+    KEEPALIVE_INTERVAL = 5.0
+
+    def __init__(
+        self,
+        client: DeepgramClient,
+        options: LiveOptions,
+        min_idle: int = DEFAULT_MIN_IDLE,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        max_idle_seconds: float = 300.0,
+        connect_timeout: float = 5.0,
+        keepalive_interval: float = KEEPALIVE_INTERVAL,
+    ):
+        """Initialize the pool.
+
+        Args:
+            client: Deepgram client shared by all sessions
+            options: Live transcription options for every session
+            min_idle: Sessions to keep open and waiting for a call
+            max_sessions: Limit on idle plus in-use sessions (e.g. the
+                Deepgram project's concurrency limit)
+            max_idle_seconds: Idle sessions older than this are recycled
+            connect_timeout: Seconds to wait for a session to open
+            keepalive_interval: Seconds between KeepAlive messages
+        """
+        self._client = client
+        self._options = options
+        self._min_idle = max(0, min_idle)
+        self._max_sessions = max(1, max_sessions)
+        self._max_idle_seconds = max_idle_seconds
+        self._connect_timeout = connect_timeout
+        self._keepalive_interval = keepalive_interval
+
+        self._idle: list[LiveSession] = []
+        self._in_use = 0
+        self._opening = 0
+        self._task: asyncio.Task[None] | None = None
+        self._wakeup = asyncio.Event()
+        self._stopped = False
+
+        self.opened = 0
+        self.open_failures = 0
+        self.warm_acquires = 0
+        self.cold_acquires = 0
+        self.recycled = 0
+        self._connect_ms: list[float] = []
+        self._acquire_ms: list[float] = []
+
+    def start(self) -> None:
+        """Start filling the pool and sending keepalives in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._maintain())
+
+    async def stop(self) -> None:
+        """Stop maintenance and close idle sessions."""
+        self._stopped = True
+        self._wakeup.set()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        idle, self._idle = self._idle, []
+        await asyncio.gather(*(session.finish() for session in idle))
+
+    async def acquire(self) -> LiveSession:
+        """Get an open session for a call.
+
+        Returns a warm session when one is idle, otherwise opens one.
+
+        Raises:
+            DeepgramPoolExhausted: If ``max_sessions`` are already in use
+        """
+        started = time.perf_counter()
+        while self._idle:
+            session = self._idle.pop()
+            if not session.closed:
+                self._in_use += 1
+                self.warm_acquires += 1
+                self._record(self._acquire_ms, started)
+                self._wakeup.set()
+                return session
+
+        if self._in_use + self._opening >= self._max_sessions:
+            raise DeepgramPoolExhausted(
+                f"All {self._max_sessions} Deepgram sessions are in use"
+            )
+        self._in_use += 1
+        try:
+            session = await self._open()
+        except Exception:
+            self._in_use -= 1
+            raise
+        self.cold_acquires += 1
+        self._record(self._acquire_ms, started)
+        self._wakeup.set()
+        return session
+
+    async def release(self, session: LiveSession) -> None:
+        """Close a call's session; a replacement is opened in the background."""
+        self._in_use = max(0, self._in_use - 1)
+        await session.finish()
+        self._wakeup.set()
+
+    async def _open(self) -> LiveSession:
+        """Open a session, recording the handshake time."""
+        started = time.perf_counter()
+        try:
+            session = await open_live_session(
+                self._client, self._options, self._connect_timeout
+            )
+        except Exception:
+            self.open_failures += 1
+            raise
+        self.opened += 1
+        self._record(self._connect_ms, started)
+        return session
+
+    async def _fill(self) -> None:
+        """Open sessions until ``min_idle`` are waiting (within the limit)."""
+        room = self._max_sessions - self._in_use - len(self._idle) - self._opening
+        wanted = min(self._min_idle - len(self._idle) - self._opening, room)
+        if wanted <= 0:
+            return
+
+        self._opening += wanted
+        try:
+            results = await asyncio.gather(
+                *(self._open() for _ in range(wanted)), return_exceptions=True
+            )
+        finally:
+            self._opening -= wanted
+        for result in results:
+            if isinstance(result, LiveSession):
+                self._idle.append(result)
+            else:
+                logger.warning(f"Failed to pre-open Deepgram session: {result}")
+
+    async def _maintain(self) -> None:
+        """Keep idle sessions alive, recycle stale ones and refill the pool."""
+        while not self._stopped:
+            try:
+                now = time.monotonic()
+                keep, stale = [], []
+                for session in self._idle:
+                    if session.closed:
+                        continue
+                    if now - session.opened_at > self._max_idle_seconds or len(keep) >= self._min_idle:
+                        stale.append(session)
+                    else:
+                        keep.append(session)
+                self._idle = keep
+                self.recycled += len(stale)
+                await asyncio.gather(*(session.finish() for session in stale))
+
+                for session in list(self._idle):
+                    try:
+                        await session.keep_alive()
+                    except Exception as e:
+                        logger.warning(f"Deepgram keepalive failed: {e}")
+                        session.closed = True
+                self._idle = [session for session in self._idle if not session.closed]
+
+                await self._fill()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Deepgram pool maintenance error: {e}")
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._keepalive_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    @staticmethod
+    def _record(samples: list[float], started: float, limit: int = 200) -> None:
+        samples.append((time.perf_counter() - started) * 1000)
+        if len(samples) > limit:
+            del samples[: len(samples) - limit]
+
+    @staticmethod
+    def _summary(samples: list[float]) -> dict[str, float]:
+        if not samples:
+            return {"avg": 0.0, "p50": 0.0, "max": 0.0}
+        ordered = sorted(samples)
+        return {
+            "avg": round(sum(ordered) / len(ordered), 1),
+            "p50": round(ordered[len(ordered) // 2], 1),
+            "max": round(ordered[-1], 1),
+        }
+
+    def stats(self) -> dict[str, Any]:
+        """Get pool sizes and connect/acquire timings (milliseconds)."""
+        return {
+            "idle": len(self._idle),
+            "in_use": self._in_use,
+            "opening": self._opening,
+            "opened": self.opened,
+            "open_failures": self.open_failures,
+            "warm_acquires": self.warm_acquires,
+            "cold_acquires": self.cold_acquires,
+            "recycled": self.recycled,
+            "connect_ms": self._summary(self._connect_ms),
+            "acquire_ms": self._summary(self._acquire_ms),
+        }
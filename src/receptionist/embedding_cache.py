@@ -0,0 +1,245 @@
+"""LRU cache with TTL for query embeddings, optionally backed by SQLite on disk."""
+
+import asyncio
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """Caches embedding vectors keyed by normalized text and model name.
+
+    Entries are evicted least-recently-used once ``max_entries`` is reached
+    and expire ``ttl_seconds`` after they were stored. When ``path`` is set,
+    entries are also written to a SQLite file so the cache survives restarts.
+
+    ``get`` and ``put`` only touch memory. ``fetch`` and ``store`` also use
+    the SQLite file, in a worker thread so the event loop never blocks on
+    disk; ``fetch`` falls through to disk before counting a miss.
+    """
+
+    DEFAULT_MAX_ENTRIES = 1024
+    DEFAULT_TTL_SECONDS = 3600.0
+
+    _WHITESPACE = re.compile(r"\s+")
+    _EDGE_PUNCTUATION = re.compile(r"^[\s\"'.,!?;:]+|[\s\"'.,!?;:]+$")
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        path: str | None = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of vectors kept in memory
+            ttl_seconds: Seconds after which an entry is considered stale
+            path: Optional SQLite file for the persistent backing store
+            clock: Time source returning seconds since the epoch
+        """
+        self._max_entries = max(1, max_entries)
+        self._ttl = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, list[float]]] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+        self._db: sqlite3.Connection | None = None
+        # Serializes worker threads sharing the connection
+        self._db_lock = threading.Lock()
+        if path:
+            try:
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings ("
+                    "key TEXT PRIMARY KEY, vector BLOB NOT NULL, created_at REAL NOT NULL)"
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding cache store unavailable at {path}: {e}")
+                self._db = None
+
+    @classmethod
+    def normalize(cls, text: str) -> str:
+        """Normalize query text so cosmetic variations share a cache entry."""
+        text = cls._WHITESPACE.sub(" ", text.lower())
+        return cls._EDGE_PUNCTUATION.sub("", text)
+
+    def _key(self, text: str, model: str) -> str:
+        """Build the cache key for a text/model pair."""
+        return hashlib.sha256(f"{model}\x00{self.normalize(text)}".encode()).hexdigest()
+
+    def _expired(self, created_at: float) -> bool:
+        """Check whether an entry stored at ``created_at`` has outlived the TTL."""
+        return self._clock() - created_at > self._ttl
+
+    def get(self, text: str, model: str) -> list[float] | None:
+        """Look up a cached embedding in memory.
+
+        Args:
+            text: Text that was embedded
+            model: Embedding model name
+
+        Returns:
+            The cached vector, or None on a miss or expired entry
+        """
+        vector = self._lookup(self._key(text, model))
+        if vector is not None:
+            self.hits += 1
+            return vector
+
+        self.misses += 1
+        return None
+
+    async def fetch(self, text: str, model: str) -> list[float] | None:
+        """Look up a cached embedding in memory, then in the backing store.
+
+        Args:
+            text: Text that was embedded
+            model: Embedding model name
+
+        Returns:
+            The cached vector, or None on a miss or expired entry
+        """
+        key = self._key(text, model)
+        vector = self._lookup(key)
+        if vector is not None:
+            self.hits += 1
+            return vector
+
+        if self._db is not None:
+            row = await asyncio.to_thread(self._load, key)
+            if row is not None:
+                created_at, vector = row
+                self._remember(key, created_at, vector)
+                self.hits += 1
+                self.disk_hits += 1
+                return vector
+
+        self.misses += 1
+        return None
+
+    def put(self, text: str, model: str, embedding: list[float]) -> None:
+        """Store an embedding in memory.
+
+        Args:
+            text: Text that was embedded
+            model: Embedding model name
+            embedding: The embedding vector
+        """
+        self._remember(self._key(text, model), self._clock(), embedding)
+
+    async def store(self, text: str, model: str, embedding: list[float]) -> None:
+        """Store an embedding in memory and in the backing store.
+
+        Args:
+            text: Text that was embedded
+            model: Embedding model name
+            embedding: The embedding vector
+        """
+        key = self._key(text, model)
+        created_at = self._clock()
+        self._remember(key, created_at, embedding)
+        if self._db is not None:
+            await asyncio.to_thread(self._persist, key, created_at, embedding)
+
+    def _lookup(self, key: str) -> list[float] | None:
+        """Get a non-expired vector from memory, marking it recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        created_at, vector = entry
+        if self._expired(created_at):
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return vector
+
+    def _remember(self, key: str, created_at: float, embedding: list[float]) -> None:
+        """Insert into the in-memory LRU, evicting the oldest entries if full."""
+        self._entries[key] = (created_at, embedding)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _persist(self, key: str, created_at: float, embedding: list[float]) -> None:
+        """Write an entry to the backing store (runs in a worker thread)."""
+        with self._db_lock:
+            if self._db is None:
+                return
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO embeddings (key, vector, created_at) VALUES (?, ?, ?)",
+                    (key, array("d", embedding).tobytes(), created_at),
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to persist embedding: {e}")
+
+    def _load(self, key: str) -> tuple[float, list[float]] | None:
+        """Read a non-expired entry from the backing store (runs in a worker thread)."""
+        with self._db_lock:
+            if self._db is None:
+                return None
+            try:
+                row = self._db.execute(
+                    "SELECT vector, created_at FROM embeddings WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                blob, created_at = row
+                if self._expired(created_at):
+                    self._db.execute("DELETE FROM embeddings WHERE key = ?", (key,))
+                    self._db.commit()
+                    return None
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to read embedding cache store: {e}")
+                return None
+
+        vector = array("d")
+        vector.frombytes(blob)
+        return created_at, vector.tolist()
+
+    def stats(self) -> dict[str, Any]:
+        """Get hit/miss counters and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "max_entries": self._max_entries,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "persistent": self._db is not None,
+        }
+
+    def clear(self) -> None:
+        """Remove all entries from memory and the backing store."""
+        self._entries.clear()
+        with self._db_lock:
+            if self._db is not None:
+                self._db.execute("DELETE FROM embeddings")
+                self._db.commit()
+
+    def close(self) -> None:
+        """Close the backing store."""
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -73,16 +73,21 @@ def authenticate_google() -> Credentials | None:
                 return None
         
         # Save credentials for next run
-        try:
-            with open(TOKEN_FILE, "w") as token:
-                token.write(creds.to_json())
-            logger.info("Saved new Google credentials to token.json")
-        except Exception as e:
-            logger.error(f"Failed to save token: {e}")
+        save_credentials(creds)
 
     return creds
 
 
+def save_credentials(creds: Credentials) -> None:
+    """Write credentials to token.json so the next run can reuse them."""
+    try:
+        with open(TOKEN_FILE, "w") as token:
+            token.write(creds.to_json())
+        logger.info("Saved new Google credentials to token.json")
+    except Exception as e:
+        logger.error(f"Failed to save token: {e}")
+
+
 def retry_with_backoff(func, max_retries=3, initial_delay=1.0):
     """Execute a function with exponential backoff for transient errors."""
     for attempt in range(max_retries):
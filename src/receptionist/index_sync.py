@@ -0,0 +1,271 @@
+"""Background sync that keeps the local email index in step with MongoDB.
+
+The task tails the ``emails`` collection with a change stream and applies
+inserts, updates and deletes to a ``LocalVectorIndex`` as they happen. On
+deployments without change streams (standalone mongod, local stand-ins) it
+falls back to polling an ``updated_at`` watermark. Polling cannot see
+deletes: emails deleted through the API are removed via ``remove``, and a
+full ID reconciliation every few minutes catches any other deletes.
+
+The change-feed position (resume token or watermark) is stored in the index
+snapshot's ``sync_state``. Because the position is saved with the index
+contents, a restart only replays changes made after the snapshot.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from bson import Timestamp
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import OperationFailure, PyMongoError
+
+from .local_index import LocalVectorIndex
+from .vector_search import VectorSearch
+
+logger = logging.getLogger(__name__)
+
+# Server error codes meaning change streams are unavailable on this deployment
+_CHANGE_STREAM_UNSUPPORTED = {
+    40573,  # $changeStream is only supported on replica sets
+    40324,  # Unrecognized pipeline stage name
+    115,  # CommandNotSupported
+}
+
+
+class EmailIndexSync:
+    """Applies email changes from MongoDB to a local vector index."""
+
+    DEFAULT_POLL_INTERVAL = 2.0
+    # Reconciling scans every email ID, so it runs rarely
+    DEFAULT_RECONCILE_INTERVAL = 600.0
+    DEFAULT_SNAPSHOT_INTERVAL = 60.0
+    RETRY_DELAY = 5.0
+
+    def __init__(
+        self,
+        collection: AsyncCollection,
+        index: LocalVectorIndex,
+        index_path: str | None = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        reconcile_interval: float = DEFAULT_RECONCILE_INTERVAL,
+        snapshot_interval: float = DEFAULT_SNAPSHOT_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the sync task.
+
+        Args:
+            collection: The emails collection (async)
+            index: Index to keep up to date; its ``sync_state`` is the
+                starting position
+            index_path: Directory for periodic index snapshots (optional)
+            poll_interval: Seconds between polls in fallback mode
+            reconcile_interval: Seconds between delete reconciliations when polling
+            snapshot_interval: Minimum seconds between index snapshots
+            clock: Monotonic time source for the reconcile and snapshot intervals
+        """
+        self._collection = collection
+        self._index = index
+        self._index_path = index_path
+        self._poll_interval = poll_interval
+        self._reconcile_interval = reconcile_interval
+        self._snapshot_interval = snapshot_interval
+        self._clock = clock
+
+        self._task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+        self._dirty = False
+        self._last_snapshot = clock()
+
+        self.mode = "stopped"
+        self.applied_changes = 0
+
+    @staticmethod
+    async def initial_state(db: AsyncDatabase) -> dict[str, Any]:
+        """Capture the change-feed position before building an index from scratch.
+
+        Recording the position first means changes made while the build
+        runs are replayed afterwards instead of being lost.
+
+        Args:
+            db: The receptionist database (async)
+
+        Returns:
+            A sync state usable as ``LocalVectorIndex.sync_state``
+        """
+        state: dict[str, Any] = {"watermark": datetime.now(timezone.utc).isoformat()}
+        try:
+            reply = await db.command("ping")
+            operation_time = reply.get("operationTime")
+            if operation_time is not None:
+                state["operation_time"] = [operation_time.time, operation_time.inc]
+        except PyMongoError as e:
+            logger.debug(f"Could not read cluster operation time: {e}")
+        return state
+
+    def start(self) -> None:
+        """Start tailing changes in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task and write a final snapshot."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.mode = "stopped"
+        await self._snapshot(force=True)
+
+    async def remove(self, doc_id: str) -> None:
+        """Remove an email from the index immediately (e.g. on API delete)."""
+        async with self._lock:
+            if self._index.remove(doc_id):
+                self._dirty = True
+
+    def stats(self) -> dict[str, Any]:
+        """Get sync mode and progress counters."""
+        return {
+            "mode": self.mode,
+            "indexed": len(self._index),
+            "applied_changes": self.applied_changes,
+        }
+
+    async def _run(self) -> None:
+        """Tail changes, falling back to polling and retrying on errors."""
+        use_change_stream = True
+        while True:
+            try:
+                if use_change_stream:
+                    await self._watch()
+                else:
+                    await self._poll()
+            except asyncio.CancelledError:
+                raise
+            except OperationFailure as e:
+                if use_change_stream and e.code in _CHANGE_STREAM_UNSUPPORTED:
+                    logger.info("Change streams unavailable, polling emails on updated_at")
+                    use_change_stream = False
+                    continue
+                logger.error(f"Email index sync failed: {e}")
+                self._index.sync_state.pop("resume_token", None)
+                await asyncio.sleep(self.RETRY_DELAY)
+            except Exception as e:
+                logger.error(f"Email index sync failed: {e}")
+                await asyncio.sleep(self.RETRY_DELAY)
+
+    async def _watch(self) -> None:
+        """Apply changes from a change stream, checkpointing its resume token."""
+        state = self._index.sync_state
+        kwargs: dict[str, Any] = {"full_document": "updateLookup", "max_await_time_ms": 1000}
+        if state.get("resume_token"):
+            kwargs["resume_after"] = state["resume_token"]
+        elif state.get("operation_time"):
+            kwargs["start_at_operation_time"] = Timestamp(*state["operation_time"])
+
+        pipeline = [{"$match": {"operationType": {"$in": ["insert", "update", "replace", "delete"]}}}]
+        async with await self._collection.watch(pipeline, **kwargs) as stream:
+            self.mode = "change_stream"
+            logger.info("Email index sync tailing change stream")
+            while stream.alive:
+                change = await stream.try_next()
+                if change is not None:
+                    await self._apply_change(change)
+                if stream.resume_token is not None:
+                    state["resume_token"] = dict(stream.resume_token)
+                await self._snapshot()
+
+    async def _apply_change(self, change: dict[str, Any]) -> None:
+        """Apply one change event to the index."""
+        doc_id = str(change["documentKey"]["_id"])
+        async with self._lock:
+            if change["operationType"] == "delete":
+                self._index.remove(doc_id)
+            else:
+                self._apply_document(doc_id, change.get("fullDocument"))
+            self._dirty = True
+            self.applied_changes += 1
+
+    def _apply_document(self, doc_id: str, doc: dict[str, Any] | None) -> None:
+        """Upsert a document, or drop it if it no longer has a usable embedding."""
+        embedding = doc.get("embedding") if doc else None
+        if embedding and len(embedding) == VectorSearch.EMBEDDING_DIMENSIONS:
+            self._index.upsert(doc_id, embedding, VectorSearch.email_payload(doc))
+        else:
+            self._index.remove(doc_id)
+
+    async def _poll(self) -> None:
+        """Apply documents changed since the ``updated_at`` watermark."""
+        self.mode = "polling"
+        state = self._index.sync_state
+        # Reconcile once on start to catch deletes made while stopped
+        last_reconcile: float | None = None
+        # IDs already applied at the watermark timestamp
+        applied_at_watermark: set[str] = set()
+
+        while True:
+            watermark = datetime.fromisoformat(
+                state.get("watermark", datetime.now(timezone.utc).isoformat())
+            )
+            # $gte re-reads documents sharing the watermark timestamp, so skip
+            # those already applied
+            cursor = self._collection.find({"updated_at": {"$gte": watermark}}).sort("updated_at", 1)
+            async for doc in cursor:
+                doc_id = str(doc["_id"])
+                updated_at = doc["updated_at"]
+                if updated_at.tzinfo is None:
+                    updated_at = updated_at.replace(tzinfo=timezone.utc)
+                if updated_at > watermark:
+                    watermark = updated_at
+                    applied_at_watermark = set()
+                elif doc_id in applied_at_watermark:
+                    continue
+                applied_at_watermark.add(doc_id)
+
+                async with self._lock:
+                    self._apply_document(doc_id, doc)
+                    self._dirty = True
+                    self.applied_changes += 1
+            state["watermark"] = watermark.isoformat()
+
+            now = self._clock()
+            if last_reconcile is None or now - last_reconcile >= self._reconcile_interval:
+                await self._reconcile_deletes()
+                last_reconcile = now
+
+            await self._snapshot()
+            await asyncio.sleep(self._poll_interval)
+
+    async def _reconcile_deletes(self) -> None:
+        """Drop indexed emails that no longer exist in MongoDB."""
+        existing = {str(doc["_id"]) async for doc in self._collection.find({}, {"_id": 1})}
+        async with self._lock:
+            stale = [doc_id for doc_id in self._index.ids() if doc_id not in existing]
+            for doc_id in stale:
+                self._index.remove(doc_id)
+            if stale:
+                self._dirty = True
+                self.applied_changes += len(stale)
+
+    async def _snapshot(self, force: bool = False) -> None:
+        """Persist the index and its sync position if due."""
+        if not self._index_path or not self._dirty:
+            return
+        if not force and self._clock() - self._last_snapshot < self._snapshot_interval:
+            return
+
+        async with self._lock:
+            try:
+                await asyncio.to_thread(self._index.save, Path(self._index_path))
+                self._dirty = False
+            except Exception as e:
+                logger.error(f"Failed to snapshot local email index: {e}")
+            self._last_snapshot = self._clock()
@@ -0,0 +1,422 @@
+"""Resilient HTTP transport for Fireworks chat completions.
+
+``LLMTransport`` wraps a pooled HTTP/2 ``httpx.AsyncClient`` and adds what a
+live call needs from an LLM endpoint:
+
+- deadlines: each request's timeout is capped by what is left of the current
+  turn's budget (see ``turn_budget``), so a stuck completion cannot hold the
+  caller for the full client timeout
+- retries with exponential backoff and full jitter on 429, 5xx and
+  connection errors, honouring ``Retry-After``
+- optional hedging: if a completion takes longer than that endpoint's recent
+  p95, a second identical request is sent and the first answer wins
+- a circuit breaker per model: after repeated failures requests go to a
+  fallback model (or fail fast) until a cool-down has passed
+- latency histograms per request kind, reported by ``stats``
+"""
+
+import asyncio
+import contextvars
+import logging
+import random
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open
+LATENCY_BUCKETS_MS = (100, 250, 500, 1000, 2000, 4000, 8000)
+
+# Absolute (monotonic) deadline of the turn being answered, if any
+_turn_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar(
+    "llm_turn_deadline", default=None
+)
+
+
+class LLMUnavailable(Exception):
+    """Raised when no request can be made: the circuit is open or the turn is out of time."""
+
+
+def build_client(
+    http2: bool = True,
+    max_connections: int = 20,
+    max_keepalive_connections: int = 10,
+    timeout: float = 10.0,
+) -> httpx.AsyncClient:
+    """Create the pooled HTTP client used for completions.
+
+    Args:
+        http2: Multiplex requests over HTTP/2 (needs the ``h2`` package)
+        max_connections: Limit on open connections
+        max_keepalive_connections: Idle connections kept for reuse
+        timeout: Default timeout in seconds (requests usually pass their own)
+    """
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=60.0,
+        ),
+        timeout=httpx.Timeout(timeout, connect=min(timeout, 3.0)),
+    )
+
+
+class LatencyHistogram:
+    """Latency counts per bucket plus a window of recent samples for percentiles."""
+
+    def __init__(self, window: int = 200):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def record(self, ms: float) -> None:
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if ms <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self._samples.append(ms)
+
+    def percentile(self, p: float) -> float | None:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def summary(self) -> dict[str, Any]:
+        labels = [f"le_{bound}" for bound in LATENCY_BUCKETS_MS] + ["inf"]
+        return {
+            "count": sum(self.counts),
+            "p50_ms": round(self.percentile(0.5) or 0.0, 1),
+            "p95_ms": round(self.percentile(0.95) or 0.0, 1),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class LLMTransport:
+    """Sends chat completion requests with deadlines, retries, hedging and a circuit breaker."""
+
+    DEFAULT_TIMEOUT = 10.0
+    DEFAULT_TURN_BUDGET = 12.0
+    RETRY_BACKOFF = 0.25
+    MAX_RETRY_AFTER = 2.0
+
+    def __init__(
+        self,
+        url: str,
+        api_key: str,
+        model: str,
+        fallback_model: str | None = None,
+        client: httpx.AsyncClient | None = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        turn_budget_seconds: float = DEFAULT_TURN_BUDGET,
+        max_retries: int = 2,
+        hedge: bool = False,
+        hedge_min_samples: int = 20,
+        breaker_failures: int = 5,
+        breaker_reset_seconds: float = 30.0,
+    ):
+        """Initialize the transport.
+
+        Args:
+            url: Chat completions endpoint
+            api_key: Bearer token
+            model: Primary model (replaces the ``model`` of each request body)
+            fallback_model: Model used while the primary's circuit is open;
+                without one, requests fail fast instead
+            client: HTTP client (defaults to ``build_client()``)
+            timeout: Longest single request, in seconds
+            turn_budget_seconds: Budget ``turn_budget`` gives a caller turn
+            max_retries: Retries after the first attempt
+            hedge: Send a second request when one exceeds its endpoint's p95
+            hedge_min_samples: Samples needed before hedging an endpoint
+            breaker_failures: Consecutive failed requests that open the circuit
+            breaker_reset_seconds: How long the circuit stays open before the
+                primary model is tried again
+        """
+        self.client = client or build_client(timeout=timeout)
+        self._url = url
+        self._api_key = api_key
+        self._model = model
+        self._fallback_model = fallback_model or None
+        self._timeout = timeout
+        self.turn_budget_seconds = turn_budget_seconds
+        self._max_retries = max_retries
+        self._hedge = hedge
+        self._hedge_min_samples = hedge_min_samples
+        self._breaker_failures = breaker_failures
+        self._breaker_reset_seconds = breaker_reset_seconds
+
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._histograms: dict[str, LatencyHistogram] = {}
+
+        self.requests = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.fallbacks = 0
+        self.failures = 0
+        self.circuit_opens = 0
+        self.deadline_exceeded = 0
+
+    @contextmanager
+    def turn_budget(self, seconds: float | None = None) -> Iterator[None]:
+        """Cap every request made inside the block by a shared deadline.
+
+        Args:
+            seconds: Budget for the block (defaults to ``turn_budget_seconds``)
+        """
+        token = _turn_deadline.set(time.monotonic() + (seconds or self.turn_budget_seconds))
+        try:
+            yield
+        finally:
+            _turn_deadline.reset(token)
+
+    def _time_left(self) -> float:
+        """Timeout for the next request, within the turn's deadline."""
+        deadline = _turn_deadline.get()
+        if deadline is None:
+            return self._timeout
+        left = deadline - time.monotonic()
+        if left <= 0.05:
+            self.deadline_exceeded += 1
+            raise LLMUnavailable("Turn budget exhausted before the LLM request")
+        return min(self._timeout, left)
+
+    @property
+    def circuit_open(self) -> bool:
+        """Whether the primary model is currently bypassed."""
+        if self._opened_at is None:
+            return False
+        # After the cool-down the next request probes the primary (half open)
+        return time.monotonic() - self._opened_at < self._breaker_reset_seconds
+
+    def _model_for_request(self) -> str:
+        if not self.circuit_open:
+            return self._model
+        if self._fallback_model:
+            self.fallbacks += 1
+            return self._fallback_model
+        raise LLMUnavailable(f"Circuit open for {self._model}")
+
+    def _record_outcome(self, model: str, ok: bool) -> None:
+        if model != self._model:
+            return
+        if ok:
+            self._failures = 0
+            self._opened_at = None
+            return
+        self._failures += 1
+        if self._failures >= self._breaker_failures and not self.circuit_open:
+            self._opened_at = time.monotonic()
+            self.circuit_opens += 1
+            logger.warning(
+                f"LLM circuit opened for {self._model} after {self._failures} failures"
+                + (f", using {self._fallback_model}" if self._fallback_model else "")
+            )
+
+    @staticmethod
+    def _retryable(error: Exception) -> bool:
+        if isinstance(error, httpx.HTTPStatusError):
+            status = error.response.status_code
+            return status == 429 or status >= 500
+        return isinstance(error, httpx.TransportError)
+
+    def _backoff(self, error: Exception, attempt: int) -> float:
+        """Delay before the next retry: Retry-After if given, else jittered exponential."""
+        if isinstance(error, httpx.HTTPStatusError):
+            retry_after = error.response.headers.get("retry-after")
+            if retry_after:
+                try:
+                    return min(float(retry_after), self.MAX_RETRY_AFTER)
+                except ValueError:
+                    pass
+        return random.uniform(0, self.RETRY_BACKOFF * 2 ** attempt)
+
+    def _histogram(self, kind: str) -> LatencyHistogram:
+        return self._histograms.setdefault(kind, LatencyHistogram())
+
+    @property
+    def _headers(self) -> dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self._api_key}",
+            "Content-Type": "application/json",
+        }
+
+    async def complete(self, body: dict[str, Any], kind: str) -> dict[str, Any]:
+        """Send a (non-streaming) completion request.
+
+        Args:
+            body: Request body; its ``model`` is set by the transport
+            kind: Request kind for latency accounting, e.g. "respond"
+
+        Returns:
+            The parsed JSON response
+
+        Raises:
+            LLMUnavailable: If the circuit is open without a fallback or the
+                turn ran out of time
+            httpx.HTTPError: If the request failed after retries
+        """
+        model = self._model_for_request()
+        body = {**body, "model": model}
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            self.requests += 1
+            try:
+                data = await self._hedged(body, kind, self._time_left())
+            except LLMUnavailable:
+                raise
+            except Exception as e:
+                if (
+                    self._retryable(e)
+                    and attempt < self._max_retries
+                    and self._deadline_allows(delay := self._backoff(e, attempt))
+                ):
+                    attempt += 1
+                    self.retries += 1
+                    logger.warning(f"LLM {kind} request failed ({e!r}), retry {attempt} in {delay:.2f}s")
+                    await asyncio.sleep(delay)
+                    continue
+                self.failures += 1
+                if self._retryable(e):
+                    # Client errors (4xx) say nothing about the model's health
+                    self._record_outcome(model, ok=False)
+                raise
+            self._record_outcome(model, ok=True)
+            self._histogram(kind).record((time.perf_counter() - started) * 1000)
+            return data
+
+    def _deadline_allows(self, delay: float) -> bool:
+        deadline = _turn_deadline.get()
+        return deadline is None or time.monotonic() + delay < deadline - 0.5
+
+    async def _post(self, body: dict[str, Any], timeout: float) -> dict[str, Any]:
+        response = await self.client.post(self._url, headers=self._headers, json=body, timeout=timeout)
+        if response.status_code == 404:
+            logger.error(f"Model not found: {body.get('model')}. Response: {response.text}")
+        response.raise_for_status()
+        return response.json()
+
+    async def _hedged(self, body: dict[str, Any], kind: str, timeout: float) -> dict[str, Any]:
+        """Send a request, plus a hedge if it runs past the endpoint's p95."""
+        histogram = self._histogram(kind)
+        delay = (
+            histogram.percentile(0.95) / 1000
+            if self._hedge and len(histogram) >= self._hedge_min_samples
+            else None
+        )
+        if delay is None or delay >= timeout:
+            return await self._post(body, timeout)
+
+        primary = asyncio.create_task(self._post(body, timeout))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+
+        self.hedges += 1
+        hedge = asyncio.create_task(self._post(body, timeout - delay))
+        pending = {primary, hedge}
+        error: BaseException | None = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    @asynccontextmanager
+    async def stream(self, body: dict[str, Any], kind: str) -> AsyncIterator[httpx.Response]:
+        """Send a streaming completion request.
+
+        Retries apply until response headers arrive; the histogram records
+        time to headers. Streams are not hedged.
+
+        Yields:
+            The open response with a 2xx status
+
+        Raises:
+            LLMUnavailable: If the circuit is open without a fallback or the
+                turn ran out of time
+            httpx.HTTPError: If the request failed after retries
+        """
+        model = self._model_for_request()
+        body = {**body, "model": model}
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            self.requests += 1
+            response: httpx.Response | None = None
+            try:
+                request = self.client.build_request(
+                    "POST", self._url, headers=self._headers, json=body, timeout=self._time_left()
+                )
+                response = await self.client.send(request, stream=True)
+                if response.status_code >= 400:
+                    await response.aread()
+                    response.raise_for_status()
+                break
+            except LLMUnavailable:
+                raise
+            except Exception as e:
+                if response is not None:
+                    await response.aclose()
+                if (
+                    self._retryable(e)
+                    and attempt < self._max_retries
+                    and self._deadline_allows(delay := self._backoff(e, attempt))
+                ):
+                    attempt += 1
+                    self.retries += 1
+                    logger.warning(f"LLM {kind} stream failed ({e!r}), retry {attempt} in {delay:.2f}s")
+                    await asyncio.sleep(delay)
+                    continue
+                self.failures += 1
+                if self._retryable(e):
+                    # Client errors (4xx) say nothing about the model's health
+                    self._record_outcome(model, ok=False)
+                raise
+
+        self._record_outcome(model, ok=True)
+        self._histogram(kind).record((time.perf_counter() - started) * 1000)
+        try:
+            yield response
+        finally:
+            await response.aclose()
+
+    def stats(self) -> dict[str, Any]:
+        """Get request counters, circuit state and per-kind latency histograms."""
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "fallbacks": self.fallbacks,
+            "circuit_open": self.circuit_open,
+            "circuit_opens": self.circuit_opens,
+            "deadline_exceeded": self.deadline_exceeded,
+            "latency": {kind: h.summary() for kind, h in self._histograms.items()},
+        }
+
+    async def close(self) -> None:
+        """Close the HTTP client."""
+        await self.client.aclose()
@@ -0,0 +1,337 @@
+"""In-process vector index for email search without MongoDB Atlas.
+
+Embeddings are kept in a row-normalized float32 NumPy matrix so a query is a
+single matrix-vector product followed by a partial sort. The matrix can be
+saved to disk and memory-mapped on load. For large mailboxes an optional IVF
+(inverted file) layer clusters rows with spherical k-means and only scores
+the clusters closest to the query.
+"""
+
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class LocalVectorIndex:
+    """Exact or IVF-accelerated cosine similarity search over email embeddings.
+
+    Each row stores the embedding of one email together with a payload
+    (sender, subject, body, timestamp) so results can be returned without a
+    database round trip. Scores use the same ``(1 + cosine) / 2`` scale as
+    Atlas ``vectorSearchScore``.
+    """
+
+    VECTORS_FILE = "vectors.npy"
+    CENTROIDS_FILE = "centroids.npy"
+    METADATA_FILE = "metadata.json"
+
+    DEFAULT_NPROBE = 8
+    # Minimum training points per IVF list before clustering is worthwhile
+    MIN_POINTS_PER_LIST = 39
+
+    def __init__(self, dimensions: int = 1024, nlist: int = 0, nprobe: int = DEFAULT_NPROBE):
+        """Initialize an empty index.
+
+        Args:
+            dimensions: Embedding dimensionality
+            nlist: Number of IVF lists (0 disables the IVF layer)
+            nprobe: Number of IVF lists scanned per query
+        """
+        self._dimensions = dimensions
+        self._nlist = nlist
+        self._nprobe = max(1, nprobe)
+
+        self._vectors: np.ndarray = np.zeros((0, dimensions), dtype=np.float32)
+        self._size = 0
+        self._ids: list[str] = []
+        self._positions: dict[str, int] = {}
+        self._payloads: list[dict[str, Any]] = []
+
+        self._centroids: np.ndarray | None = None
+        self._assignments: np.ndarray = np.zeros(0, dtype=np.int32)
+
+        # Change-feed position the index contents correspond to (see index_sync)
+        self.sync_state: dict[str, Any] = {}
+
+    def __len__(self) -> int:
+        """Get the number of indexed emails."""
+        return self._size
+
+    def __contains__(self, doc_id: str) -> bool:
+        """Check whether an email is indexed."""
+        return doc_id in self._positions
+
+    def ids(self) -> list[str]:
+        """Get the IDs of all indexed emails."""
+        return list(self._ids)
+
+    @property
+    def is_trained(self) -> bool:
+        """Whether the IVF layer is active."""
+        return self._centroids is not None
+
+    def _normalize(self, vectors: np.ndarray) -> np.ndarray:
+        """L2-normalize rows so dot products are cosine similarities."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.shape[-1] != self._dimensions:
+            raise ValueError(
+                f"Expected {self._dimensions}-dimensional vectors, got {vectors.shape[-1]}"
+            )
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def _ensure_capacity(self, rows: int) -> None:
+        """Grow the backing arrays (geometrically) to hold ``rows`` rows."""
+        capacity = self._vectors.shape[0]
+        if rows <= capacity:
+            return
+
+        new_capacity = max(rows, capacity * 2, 64)
+        vectors = np.zeros((new_capacity, self._dimensions), dtype=np.float32)
+        vectors[:self._size] = self._vectors[:self._size]
+        self._vectors = vectors
+
+        assignments = np.zeros(new_capacity, dtype=np.int32)
+        assignments[:self._size] = self._assignments[:self._size]
+        self._assignments = assignments
+
+    def _nearest_centroids(self, vectors: np.ndarray) -> np.ndarray:
+        """Assign each row to its most similar centroid."""
+        return np.argmax(vectors @ self._centroids.T, axis=1).astype(np.int32)
+
+    def upsert(self, doc_id: str, embedding: list[float], payload: dict[str, Any]) -> None:
+        """Add or replace an email in the index.
+
+        Args:
+            doc_id: Email ID
+            embedding: Email embedding vector
+            payload: Fields returned with search results
+        """
+        vector = self._normalize(np.asarray(embedding, dtype=np.float32)[None, :])
+
+        row = self._positions.get(doc_id)
+        if row is None:
+            row = self._size
+            self._ensure_capacity(row + 1)
+            self._ids.append(doc_id)
+            self._payloads.append(payload)
+            self._positions[doc_id] = row
+            self._size += 1
+        else:
+            self._payloads[row] = payload
+
+        self._vectors[row] = vector[0]
+        if self._centroids is not None:
+            self._assignments[row] = self._nearest_centroids(vector)[0]
+
+    def remove(self, doc_id: str) -> bool:
+        """Remove an email from the index.
+
+        The last row is moved into the freed slot so the matrix stays dense.
+
+        Args:
+            doc_id: Email ID
+
+        Returns:
+            True if the email was indexed
+        """
+        row = self._positions.pop(doc_id, None)
+        if row is None:
+            return False
+
+        last = self._size - 1
+        if row != last:
+            moved_id = self._ids[last]
+            self._vectors[row] = self._vectors[last]
+            self._assignments[row] = self._assignments[last]
+            self._ids[row] = moved_id
+            self._payloads[row] = self._payloads[last]
+            self._positions[moved_id] = row
+
+        self._ids.pop()
+        self._payloads.pop()
+        self._size = last
+        return True
+
+    def search(self, query: list[float], limit: int) -> list[tuple[str, float, dict[str, Any]]]:
+        """Find the emails most similar to a query embedding.
+
+        Args:
+            query: Query embedding vector
+            limit: Maximum number of results
+
+        Returns:
+            ``(doc_id, score, payload)`` tuples sorted by score, highest first
+        """
+        if self._size == 0 or limit <= 0:
+            return []
+
+        q = self._normalize(np.asarray(query, dtype=np.float32))
+
+        if self._centroids is not None:
+            probes = np.argsort(self._centroids @ q)[::-1][:self._nprobe]
+            rows = np.flatnonzero(np.isin(self._assignments[:self._size], probes))
+            scores = self._vectors[rows] @ q
+        else:
+            rows = None
+            scores = self._vectors[:self._size] @ q
+
+        k = min(limit, scores.shape[0])
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        results = []
+        for index in top:
+            row = int(rows[index]) if rows is not None else int(index)
+            score = (1.0 + float(scores[index])) / 2.0
+            results.append((self._ids[row], score, self._payloads[row]))
+        return results
+
+    def train(self, nlist: int | None = None, iterations: int = 10, seed: int = 0) -> bool:
+        """Cluster the indexed vectors to enable the IVF layer.
+
+        Uses spherical k-means on a sample of the rows, then assigns every
+        row to its nearest centroid. Training is skipped when there are too
+        few rows for the requested number of lists.
+
+        Args:
+            nlist: Number of lists (defaults to the value given at construction)
+            iterations: k-means iterations
+            seed: Random seed for initialization and sampling
+
+        Returns:
+            True if the IVF layer is active after training
+        """
+        nlist = nlist if nlist is not None else self._nlist
+        if nlist <= 0 or self._size < nlist * self.MIN_POINTS_PER_LIST:
+            self._centroids = None
+            return False
+
+        rng = np.random.default_rng(seed)
+        data = self._vectors[:self._size]
+        sample_size = min(self._size, nlist * 256)
+        sample = data[rng.choice(self._size, size=sample_size, replace=False)]
+
+        centroids = sample[rng.choice(sample_size, size=nlist, replace=False)].copy()
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            for cluster in range(nlist):
+                members = sample[labels == cluster]
+                if len(members):
+                    centroids[cluster] = members.sum(axis=0)
+                else:
+                    # Re-seed empty clusters from a random sample point
+                    centroids[cluster] = sample[rng.integers(sample_size)]
+            centroids = self._normalize(centroids)
+
+        self._nlist = nlist
+        self._centroids = centroids.astype(np.float32)
+
+        # Assign in chunks to bound the temporary score matrix
+        for start in range(0, self._size, 8192):
+            end = min(start + 8192, self._size)
+            self._assignments[start:end] = self._nearest_centroids(data[start:end])
+
+        logger.info(f"Trained IVF layer with {nlist} lists over {self._size} vectors")
+        return True
+
+    def save(self, directory: str | Path) -> None:
+        """Write the index and its ``sync_state`` to a directory.
+
+        Args:
+            directory: Target directory (created if missing)
+        """
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+
+        _atomic_save(path / self.VECTORS_FILE, self._vectors[:self._size])
+        if self._centroids is not None:
+            _atomic_save(path / self.CENTROIDS_FILE, self._centroids)
+        elif (path / self.CENTROIDS_FILE).exists():
+            (path / self.CENTROIDS_FILE).unlink()
+
+        metadata = {
+            "dimensions": self._dimensions,
+            "nlist": self._nlist,
+            "nprobe": self._nprobe,
+            "ids": self._ids,
+            "payloads": [_encode_payload(p) for p in self._payloads],
+            "sync_state": self.sync_state,
+        }
+        tmp_path = path / f"{self.METADATA_FILE}.tmp"
+        tmp_path.write_text(json.dumps(metadata))
+        tmp_path.replace(path / self.METADATA_FILE)
+
+    @classmethod
+    def load(cls, directory: str | Path, mmap: bool = True) -> "LocalVectorIndex":
+        """Load an index written by ``save``.
+
+        Args:
+            directory: Directory containing the index files
+            mmap: Memory-map the vector matrix (copy-on-write) instead of
+                reading it into memory
+
+        Returns:
+            The loaded index
+        """
+        path = Path(directory)
+        metadata = json.loads((path / cls.METADATA_FILE).read_text())
+
+        index = cls(
+            dimensions=metadata["dimensions"],
+            nlist=metadata.get("nlist", 0),
+            nprobe=metadata.get("nprobe", cls.DEFAULT_NPROBE),
+        )
+        index._vectors = np.load(path / cls.VECTORS_FILE, mmap_mode="c" if mmap else None)
+        index._size = index._vectors.shape[0]
+        index._ids = list(metadata["ids"])
+        index._payloads = [_decode_payload(p) for p in metadata["payloads"]]
+        index._positions = {doc_id: row for row, doc_id in enumerate(index._ids)}
+        index._assignments = np.zeros(index._size, dtype=np.int32)
+        index.sync_state = metadata.get("sync_state", {})
+
+        centroids_path = path / cls.CENTROIDS_FILE
+        if centroids_path.exists():
+            index._centroids = np.load(centroids_path)
+            for start in range(0, index._size, 8192):
+                end = min(start + 8192, index._size)
+                index._assignments[start:end] = index._nearest_centroids(
+                    index._vectors[start:end]
+                )
+
+        return index
+
+
+def _atomic_save(path: Path, array: np.ndarray) -> None:
+    """Write an array via a temporary file so live memory maps stay valid."""
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    with open(tmp_path, "wb") as f:
+        np.save(f, np.ascontiguousarray(array))
+    tmp_path.replace(path)
+
+
+def _encode_payload(payload: dict[str, Any]) -> dict[str, Any]:
+    """Make a payload JSON-serializable (datetimes become ISO strings)."""
+    encoded = dict(payload)
+    if isinstance(encoded.get("timestamp"), datetime):
+        encoded["timestamp"] = encoded["timestamp"].isoformat()
+    return encoded
+
+
+def _decode_payload(payload: dict[str, Any]) -> dict[str, Any]:
+    """Restore datetimes in a payload written by ``_encode_payload``."""
+    decoded = dict(payload)
+    if isinstance(decoded.get("timestamp"), str):
+        try:
+            decoded["timestamp"] = datetime.fromisoformat(decoded["timestamp"])
+        except ValueError:
+            pass
+    return decoded
@@ -7,27 +7,44 @@ This module provides:
 - Audio TTS endpoint for ElevenLabs voice synthesis
 """
 
+import asyncio
 import base64
-import hashlib
 import logging
 import uuid
 from contextlib import asynccontextmanager
-from datetime import datetime
+from datetime import datetime, time as dt_time, timezone
+from pathlib import Path
 from typing import Any
 
+from deepgram import DeepgramClient
 from fastapi import FastAPI, Form, HTTPException, Query, Request, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import FileResponse, Response
 from pydantic import BaseModel, Field
 
 from .call_manager import CallManager
+from .conversation_history import ConversationHistory
+from .llm_transport import LLMTransport, build_client
+from .call_state_store import MongoCallStateStore
 from .config import Settings, get_settings
 
-from .database import DatabaseManager, get_database
-from .google_auth import authenticate_google, SCOPES
+from .database import DatabaseManager
+from .google_auth import authenticate_google, save_credentials, SCOPES
+from .availability import AvailabilityEngine, WorkingHours
+from .calendar_gateway import CalendarGateway
+from .calendar_mirror import CalendarMirror
 from .calendar_service import CalendarService
+from .data_ingestion import DataIngestion
+from .deepgram_pool import DeepgramLivePool
+from .embedding_cache import EmbeddingCache
+from .index_sync import EmailIndexSync
+from .local_index import LocalVectorIndex
 from .models import BusinessConfig, Contact, Email, ValidationError
+from .phrase_bank import PhraseBank
 from .reasoning_engine import ReasoningEngine
+from .post_call import PostCallQueue
+from .scheduling_queue import SchedulingQueue
+from .tts_cache import TTSCache, parse_byte_range
 from .vector_search import VectorSearch
 from .voice_pipeline import VoicePipeline
 from .webhook_handler import (
@@ -149,25 +166,55 @@ call_manager: CallManager | None = None
 voice_pipeline: VoicePipeline | None = None
 reasoning_engine: ReasoningEngine | None = None
 vector_search: VectorSearch | None = None
+data_ingestion: DataIngestion | None = None
 webhook_handler: WebhookHandler | None = None
 db_manager: DatabaseManager | None = None
 calendar_service: CalendarService | None = None
-
-# Audio cache for TTS (text hash -> audio bytes)
-audio_cache: dict[str, bytes] = {}
+calendar_gateway: CalendarGateway | None = None
+calendar_mirror: CalendarMirror | None = None
+availability: AvailabilityEngine | None = None
+scheduling_queue: SchedulingQueue | None = None
+post_call_queue: PostCallQueue | None = None
+index_sync: EmailIndexSync | None = None
+
+tts_cache: TTSCache | None = None
+phrase_bank: PhraseBank | None = None
+deepgram_pool: DeepgramLivePool | None = None
+
+
+async def _load_local_index(settings: Settings) -> LocalVectorIndex:
+    """Load the local email index from disk, or build it from MongoDB."""
+    index_path = settings.local_index_path
+    if index_path and (Path(index_path) / LocalVectorIndex.METADATA_FILE).exists():
+        index = LocalVectorIndex.load(index_path)
+        logger.info(f"Loaded local email index with {len(index)} vectors from {index_path}")
+        return index
+    
+    # Record the change-feed position first so writes made during the build are replayed
+    sync_state = await EmailIndexSync.initial_state(db_manager.aio.db)
+    index = await vector_search.build_local_index(
+        nlist=settings.local_index_nlist,
+        nprobe=settings.local_index_nprobe,
+    )
+    index.sync_state = sync_state
+    if index_path:
+        index.save(index_path)
+    return index
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     global call_manager, voice_pipeline, reasoning_engine, vector_search
-    global webhook_handler, db_manager, calendar_service
+    global data_ingestion, webhook_handler, db_manager, calendar_service, index_sync
+    global tts_cache, phrase_bank, deepgram_pool, calendar_gateway, calendar_mirror
+    global availability, scheduling_queue, post_call_queue
     
     settings = get_settings()
     
     # Initialize database first (needed to load config)
     try:
-        db_manager = get_database()
+        db_manager = DatabaseManager(settings=settings)
         logger.info("Database connection initialized")
     except Exception as e:
         logger.warning(f"Database initialization failed: {e}")
@@ -176,25 +223,129 @@ async def lifespan(app: FastAPI):
     # Load business config from MongoDB (no hardcoded defaults)
     business_config = None
     if db_manager:
-        config_doc = db_manager.business_config.find_one({"_id": "business_config"})
-        if config_doc:
-            business_config = BusinessConfig.from_dict(config_doc)
-            logger.info(f"Loaded business config: CEO is {business_config.ceo_name}")
-        else:
-            logger.info("No business config found - configure via PUT /config/business")
+        try:
+            config_doc = await db_manager.aio.business_config.find_one({"_id": "business_config"})
+            if config_doc:
+                business_config = BusinessConfig.from_dict(config_doc)
+                logger.info(f"Loaded business config: CEO is {business_config.ceo_name}")
+            else:
+                logger.info("No business config found - configure via PUT /config/business")
+        except Exception as e:
+            logger.warning(f"Failed to load business config: {e}")
     
     # Initialize core components
-    call_manager = CallManager()
+    call_state_store = None
+    if settings.call_state_backend == "mongo" and db_manager:
+        try:
+            call_state_store = MongoCallStateStore(db_manager.aio.call_states)
+            await call_state_store.ensure_indexes()
+            logger.info("Call state shared via MongoDB")
+        except Exception as e:
+            logger.warning(f"Shared call state unavailable, using memory: {e}")
+            call_state_store = None
+    call_manager = CallManager(
+        store=call_state_store,
+        ttl_seconds=settings.call_state_ttl_seconds,
+        cache_seconds=settings.call_state_cache_seconds,
+        max_history_turns=settings.call_max_history_turns,
+        max_context_bytes=settings.call_max_context_bytes,
+        idle_timeout_seconds=settings.call_idle_timeout_seconds,
+        max_call_seconds=settings.call_max_duration_seconds,
+    )
     voice_pipeline = VoicePipeline(settings)
-    reasoning_engine = ReasoningEngine(settings, business_config=business_config)
+    tts_cache = TTSCache(
+        voice_pipeline.synthesize_speech,
+        max_bytes=settings.tts_cache_max_bytes,
+        directory=settings.tts_cache_dir or None,
+        max_disk_bytes=settings.tts_cache_max_disk_bytes,
+        namespace=VoicePipeline.TTS_MODEL,
+    )
+    if settings.tts_cache_dir:
+        removed = await asyncio.to_thread(tts_cache.prune)
+        if removed:
+            logger.info(f"Pruned {removed} files from the TTS disk cache")
+    
+    # Have the greeting and canned replies ready before the first call
+    voice_pipeline.set_business_config(business_config)
+    phrase_bank = PhraseBank(
+        tts_cache,
+        encodings=("mp3", "mulaw") if settings.media_streams else ("mp3",),
+    )
+    phrase_bank.start(business_config)
+    if not await phrase_bank.wait(settings.tts_phrase_warm_timeout):
+        logger.warning("Phrase bank still warming up; continuing startup")
+    reasoning_engine = ReasoningEngine(
+        settings,
+        business_config=business_config,
+        history=ConversationHistory(
+            max_turns=settings.llm_history_turns,
+            token_budget=settings.llm_history_token_budget,
+        ),
+        transport=LLMTransport(
+            ReasoningEngine.FIREWORKS_API_URL,
+            settings.fireworks_api_key,
+            ReasoningEngine.MODEL,
+            fallback_model=settings.llm_fallback_model,
+            client=build_client(
+                http2=settings.llm_http2,
+                max_connections=settings.llm_max_connections,
+                timeout=settings.llm_timeout_seconds,
+            ),
+            timeout=settings.llm_timeout_seconds,
+            turn_budget_seconds=settings.llm_turn_budget_seconds,
+            max_retries=settings.llm_max_retries,
+            hedge=settings.llm_hedge,
+            breaker_failures=settings.llm_breaker_failures,
+            breaker_reset_seconds=settings.llm_breaker_reset_seconds,
+        ),
+    )
+    
+    # Keep Deepgram live sessions open ahead of media stream calls
+    if settings.media_streams and settings.deepgram_pool_min_idle > 0:
+        deepgram_pool = DeepgramLivePool(
+            DeepgramClient(settings.deepgram_api_key),
+            VoicePipeline.live_options(),
+            min_idle=settings.deepgram_pool_min_idle,
+            max_sessions=settings.deepgram_pool_max_sessions,
+        )
+        deepgram_pool.start()
+        voice_pipeline.set_live_pool(deepgram_pool)
     
     # Initialize vector search
     try:
-        vector_search = VectorSearch(voyage_api_key=settings.voyage_api_key)
+        vector_search = VectorSearch(
+            voyage_api_key=settings.voyage_api_key,
+            db_manager=db_manager,
+            max_concurrent_batches=settings.embedding_batch_concurrency,
+            embedding_cache=EmbeddingCache(
+                max_entries=settings.embedding_cache_size,
+                ttl_seconds=settings.embedding_cache_ttl_seconds,
+                path=settings.embedding_cache_path or None,
+            ),
+        )
+        data_ingestion = DataIngestion(vector_search)
         logger.info("VectorSearch initialized")
     except Exception as e:
         logger.warning(f"VectorSearch initialization failed: {e}")
         vector_search = None
+        data_ingestion = None
+    
+    # Optionally serve email search from an in-process index instead of Atlas
+    if vector_search and settings.vector_search_mode == "local":
+        try:
+            local_index = await _load_local_index(settings)
+            vector_search.set_local_index(local_index)
+            index_sync = EmailIndexSync(
+                collection=db_manager.aio.emails,
+                index=local_index,
+                index_path=settings.local_index_path or None,
+                poll_interval=settings.index_sync_poll_interval,
+                reconcile_interval=settings.index_sync_reconcile_interval,
+                snapshot_interval=settings.index_snapshot_interval,
+            )
+            index_sync.start()
+        except Exception as e:
+            logger.warning(f"Local email index unavailable, using Atlas search: {e}")
     
     # Initialize calendar service (before webhook handler)
     try:
@@ -215,6 +366,74 @@ async def lifespan(app: FastAPI):
         logger.warning(f"Calendar service initialization failed: {e}")
         calendar_service = None
     
+    # Calendar tools share cached credentials, refreshed in the background
+    calendar_gateway = CalendarGateway(
+        authenticate_google,
+        save_credentials,
+        max_workers=settings.calendar_max_workers,
+        refresh_margin_seconds=settings.calendar_refresh_margin_seconds,
+    )
+    calendar_gateway.start()
+    
+    # Availability checks are answered from a local, incrementally synced copy
+    calendar_mirror = CalendarMirror(
+        calendar_gateway,
+        db_manager.aio.calendar_events if db_manager else None,
+        sync_interval=settings.calendar_sync_interval,
+        max_staleness_seconds=settings.calendar_max_staleness_seconds,
+        push_address=settings.calendar_push_address,
+        push_token=settings.calendar_push_token,
+    )
+    try:
+        await calendar_mirror.load()
+    except Exception as e:
+        logger.warning(f"Failed to load mirrored calendar events: {e}")
+    calendar_mirror.start()
+    
+    # Booked meetings are confirmed at once and written to Google behind the call
+    scheduling_queue = None
+    if db_manager:
+        try:
+            scheduling_queue = SchedulingQueue(
+                calendar_gateway,
+                db_manager.aio.meeting_holds,
+                max_attempts=settings.calendar_write_max_attempts,
+            )
+            await scheduling_queue.ensure_indexes()
+            scheduling_queue.start()
+        except Exception as e:
+            logger.warning(f"Meeting write-behind queue unavailable, booking inline: {e}")
+            scheduling_queue = None
+    
+    availability = AvailabilityEngine(
+        calendar_gateway,
+        calendar_mirror,
+        working_hours=WorkingHours(
+            start=dt_time(settings.calendar_work_start_hour),
+            end=dt_time(settings.calendar_work_end_hour),
+        ),
+        suggestions=settings.calendar_slot_suggestions,
+        holds=scheduling_queue,
+    )
+    
+    # Finished calls are analyzed and recorded in batches after Twilio is answered
+    post_call_queue = None
+    if db_manager:
+        try:
+            post_call_queue = PostCallQueue(
+                db_manager.aio.post_call_jobs,
+                db_manager.aio.calls,
+                analyze=reasoning_engine.analyze_call_outcomes if reasoning_engine else None,
+                workers=settings.post_call_workers,
+                batch_size=settings.post_call_batch_size,
+                max_attempts=settings.post_call_max_attempts,
+            )
+            await post_call_queue.ensure_indexes()
+            post_call_queue.start()
+        except Exception as e:
+            logger.warning(f"Post-call queue unavailable, recording calls inline: {e}")
+            post_call_queue = None
+    
     # Initialize webhook handler with all services
     webhook_handler = WebhookHandler(
         call_manager=call_manager,
@@ -223,17 +442,43 @@ async def lifespan(app: FastAPI):
         vector_search=vector_search,
         calendar_service=calendar_service,
         base_url=settings.base_url,
-        audio_cache=audio_cache,
+        tts_cache=tts_cache,
+        db_manager=db_manager,
+        stream_responses=settings.llm_streaming,
+        fast_path=settings.llm_fast_path,
+        media_streams=settings.media_streams,
+        stream_tts=settings.tts_streaming,
+        calendar_gateway=calendar_gateway,
+        calendar_mirror=calendar_mirror,
+        availability=availability,
+        scheduling_queue=scheduling_queue,
+        post_call_queue=post_call_queue,
+    )
+    
+    # Finalize calls whose status callback never arrives
+    call_manager.start_reaper(
+        webhook_handler.finalize_stale_call, interval=settings.call_reaper_interval
     )
     
     logger.info("AI Receptionist started")
     yield
     
     # Cleanup
+    await call_manager.stop_reaper()
+    if post_call_queue:
+        await post_call_queue.stop()
+    if scheduling_queue:
+        await scheduling_queue.stop()
+    await calendar_mirror.stop()
+    await calendar_gateway.stop()
+    if index_sync:
+        await index_sync.stop()
+    if deepgram_pool:
+        await deepgram_pool.stop()
     if reasoning_engine:
         await reasoning_engine.close()
     if db_manager:
-        db_manager.close()
+        await db_manager.aclose()
     
     logger.info("AI Receptionist stopped")
 
@@ -359,7 +604,7 @@ async def transcription_stream(websocket: WebSocket):
 # =============================================================================
 
 @app.get("/contacts", response_model=list[ContactResponse])
-def get_contacts(
+async def get_contacts(
     limit: int = Query(default=100, ge=1, le=1000),
     skip: int = Query(default=0, ge=0),
 ):
@@ -367,9 +612,7 @@ def get_contacts(
     if not db_manager:
         raise HTTPException(status_code=503, detail="Database not available")
     
-    contacts = list(
-        db_manager.contacts.find().skip(skip).limit(limit)
-    )
+    contacts = await db_manager.aio.contacts.find().skip(skip).limit(limit).to_list(None)
     
     return [
         ContactResponse(
@@ -384,12 +627,12 @@ def get_contacts(
 
 
 @app.get("/contacts/{contact_id}", response_model=ContactResponse)
-def get_contact(contact_id: str):
+async def get_contact(contact_id: str):
     """Get a specific contact by ID."""
     if not db_manager:
         raise HTTPException(status_code=503, detail="Database not available")
     
-    contact = db_manager.contacts.find_one({"_id": contact_id})
+    contact = await db_manager.aio.contacts.find_one({"_id": contact_id})
     if not contact:
         raise HTTPException(status_code=404, detail="Contact not found")
     
@@ -403,7 +646,7 @@ def get_contact(contact_id: str):
 
 
 @app.post("/contacts", response_model=ContactResponse, status_code=201)
-def create_contact(contact_input: ContactInput):
+async def create_contact(contact_input: ContactInput):
     """Create a new contact."""
     if not db_manager:
         raise HTTPException(status_code=503, detail="Database not available")
@@ -421,7 +664,7 @@ def create_contact(contact_input: ContactInput):
     except ValidationError as e:
         raise HTTPException(status_code=400, detail=str(e))
     
-    db_manager.contacts.insert_one(contact.to_dict())
+    await db_manager.aio.contacts.insert_one(contact.to_dict())
     
     return ContactResponse(
         id=contact_id,
@@ -433,12 +676,12 @@ def create_contact(contact_input: ContactInput):
 
 
 @app.put("/contacts/{contact_id}", response_model=ContactResponse)
-def update_contact(contact_id: str, contact_input: ContactInput):
+async def update_contact(contact_id: str, contact_input: ContactInput):
     """Update an existing contact."""
     if not db_manager:
         raise HTTPException(status_code=503, detail="Database not available")
     
-    existing = db_manager.contacts.find_one({"_id": contact_id})
+    existing = await db_manager.aio.contacts.find_one({"_id": contact_id})
     if not existing:
         raise HTTPException(status_code=404, detail="Contact not found")
     
@@ -453,7 +696,7 @@ def update_contact(contact_id: str, contact_input: ContactInput):
     except ValidationError as e:
         raise HTTPException(status_code=400, detail=str(e))
     
-    db_manager.contacts.update_one(
+    await db_manager.aio.contacts.update_one(
         {"_id": contact_id},
         {"$set": contact.to_dict()},
     )
@@ -468,12 +711,12 @@ def update_contact(contact_id: str, contact_input: ContactInput):
 
 
 @app.delete("/contacts/{contact_id}", status_code=204)
-def delete_contact(contact_id: str):
+async def delete_contact(contact_id: str):
     """Delete a contact."""
     if not db_manager:
         raise HTTPException(status_code=503, detail="Database not available")
     
-    result = db_manager.contacts.delete_one({"_id": contact_id})
+    result = await db_manager.aio.contacts.delete_one({"_id": contact_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Contact not found")
     
@@ -485,7 +728,7 @@ def delete_contact(contact_id: str):
 # =============================================================================
 
 @app.get("/emails", response_model=list[EmailResponse])
-def get_emails(
+async def get_emails(
     limit: int = Query(default=100, ge=1, le=1000),
     skip: int = Query(default=0, ge=0),
 ):
@@ -493,8 +736,8 @@ def get_emails(
     if not db_manager:
         raise HTTPException(status_code=503, detail="Database not available")
     
-    emails = list(
-        db_manager.emails.find().sort("timestamp", -1).skip(skip).limit(limit)
+    emails = await (
+        db_manager.aio.emails.find().sort("timestamp", -1).skip(skip).limit(limit).to_list(None)
     )
     
     return [
@@ -510,12 +753,12 @@ def get_emails(
 
 
 @app.get("/emails/{email_id}", response_model=EmailResponse)
-def get_email(email_id: str):
+async def get_email(email_id: str):
     """Get a specific email by ID."""
     if not db_manager:
         raise HTTPException(status_code=503, detail="Database not available")
     
-    email = db_manager.emails.find_one({"_id": email_id})
+    email = await db_manager.aio.emails.find_one({"_id": email_id})
     if not email:
         raise HTTPException(status_code=404, detail="Email not found")
     
@@ -556,7 +799,9 @@ async def create_email(email_input: EmailInput):
         except Exception as e:
             logger.warning(f"Failed to generate embedding: {e}")
     
-    db_manager.emails.insert_one(email.to_dict())
+    await db_manager.aio.emails.insert_one(
+        {**email.to_dict(), "updated_at": datetime.now(timezone.utc)}
+    )
     
     return EmailResponse(
         id=email_id,
@@ -575,34 +820,38 @@ async def import_emails(bulk_import: BulkEmailImport):
     
     imported_count = 0
     errors = []
+    emails = []
     
     for email_input in bulk_import.emails:
         try:
-            email_id = str(uuid.uuid4())
-            timestamp = email_input.timestamp or datetime.now()
-            
-            email = Email(
-                id=email_id,
-                sender=email_input.sender,
-                subject=email_input.subject,
-                body=email_input.body,
-                timestamp=timestamp,
+            emails.append(
+                Email(
+                    id=str(uuid.uuid4()),
+                    sender=email_input.sender,
+                    subject=email_input.subject,
+                    body=email_input.body,
+                    timestamp=email_input.timestamp or datetime.now(),
+                )
             )
-            
-            # Generate embedding if vector search is available
-            if vector_search:
-                try:
-                    text_to_embed = f"{email.subject}\n\n{email.body}"
-                    email.embedding = await vector_search.embed_text(text_to_embed)
-                except Exception:
-                    pass  # Continue without embedding
-            
-            db_manager.emails.insert_one(email.to_dict())
-            imported_count += 1
-            
-        except Exception as e:
+        except ValidationError as e:
             errors.append(str(e))
     
+    try:
+        if data_ingestion:
+            # Batched embeddings + chunked bulk writes; keep emails whose
+            # embedding failed so the import itself never loses records
+            imported_count = await data_ingestion.bulk_ingest_emails(
+                emails, keep_unembedded=True
+            )
+        elif emails:
+            updated_at = datetime.now(timezone.utc)
+            await db_manager.aio.emails.insert_many(
+                [{**e.to_dict(), "updated_at": updated_at} for e in emails]
+            )
+            imported_count = len(emails)
+    except Exception as e:
+        errors.append(str(e))
+    
     return {
         "imported": imported_count,
         "total": len(bulk_import.emails),
@@ -611,15 +860,19 @@ async def import_emails(bulk_import: BulkEmailImport):
 
 
 @app.delete("/emails/{email_id}", status_code=204)
-def delete_email(email_id: str):
+async def delete_email(email_id: str):
     """Delete an email."""
     if not db_manager:
         raise HTTPException(status_code=503, detail="Database not available")
     
-    result = db_manager.emails.delete_one({"_id": email_id})
+    result = await db_manager.aio.emails.delete_one({"_id": email_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Email not found")
     
+    # Drop from the local index now rather than waiting for the change feed
+    if index_sync:
+        await index_sync.remove(email_id)
+    
     return None
 
 
@@ -628,7 +881,7 @@ def delete_email(email_id: str):
 # =============================================================================
 
 @app.get("/calls", response_model=list[CallRecord])
-def get_calls(
+async def get_calls(
     limit: int = Query(default=100, ge=1, le=1000),
     skip: int = Query(default=0, ge=0),
 ):
@@ -636,8 +889,8 @@ def get_calls(
     if not db_manager:
         raise HTTPException(status_code=503, detail="Database not available")
     
-    calls = list(
-        db_manager.calls.find().sort("timestamp", -1).skip(skip).limit(limit)
+    calls = await (
+        db_manager.aio.calls.find().sort("timestamp", -1).skip(skip).limit(limit).to_list(None)
     )
     
     return [
@@ -662,12 +915,12 @@ def get_calls(
 
 
 @app.get("/calls/{call_sid}", response_model=CallRecord)
-def get_call(call_sid: str):
+async def get_call(call_sid: str):
     """Get details of a specific call."""
     if not db_manager:
         raise HTTPException(status_code=503, detail="Database not available")
     
-    call = db_manager.calls.find_one({"call_sid": call_sid})
+    call = await db_manager.aio.calls.find_one({"call_sid": call_sid})
     if not call:
         raise HTTPException(status_code=404, detail="Call not found")
     
@@ -723,12 +976,12 @@ def update_config(config: SystemConfig):
 # =============================================================================
 
 @app.get("/config/business", response_model=BusinessConfigResponse)
-def get_business_config():
+async def get_business_config():
     """Get business configuration (CEO, company info)."""
     if not db_manager:
         raise HTTPException(status_code=503, detail="Database not available")
     
-    config_doc = db_manager.business_config.find_one({"_id": "business_config"})
+    config_doc = await db_manager.aio.business_config.find_one({"_id": "business_config"})
     if not config_doc:
         raise HTTPException(status_code=404, detail="Business config not found")
     
@@ -740,7 +993,7 @@ def get_business_config():
 
 
 @app.put("/config/business", response_model=BusinessConfigResponse)
-def update_business_config(config_input: BusinessConfigInput):
+async def update_business_config(config_input: BusinessConfigInput):
     """Update business configuration."""
     if not db_manager:
         raise HTTPException(status_code=503, detail="Database not available")
@@ -755,7 +1008,7 @@ def update_business_config(config_input: BusinessConfigInput):
         raise HTTPException(status_code=400, detail=str(e))
     
     # Upsert the config
-    db_manager.business_config.update_one(
+    await db_manager.aio.business_config.update_one(
         {"_id": "business_config"},
         {"$set": config.to_dict()},
         upsert=True,
@@ -765,6 +1018,11 @@ def update_business_config(config_input: BusinessConfigInput):
     if reasoning_engine:
         reasoning_engine.set_business_config(config)
         logger.info(f"Updated business config: CEO is {config.ceo_name}")
+    if voice_pipeline:
+        voice_pipeline.set_business_config(config)
+    if phrase_bank:
+        # The greeting names the boss and company; prepare the new one
+        phrase_bank.start(config)
     
     return BusinessConfigResponse(
         ceo_name=config.ceo_name,
@@ -794,8 +1052,32 @@ async def health_check():
     return status
 
 
+@app.get("/metrics")
+async def get_metrics():
+    """Runtime performance counters for caches and pools."""
+    return {
+        "embedding_cache": vector_search.cache_stats() if vector_search else None,
+        "call_state": await call_manager.live_stats() if call_manager else None,
+        "index_sync": index_sync.stats() if index_sync else None,
+        "tools": webhook_handler.tool_executor.stats() if webhook_handler else None,
+        "tts_cache": tts_cache.stats() if tts_cache else None,
+        "phrase_bank": phrase_bank.stats() if phrase_bank else None,
+        "media_streams": webhook_handler.media_stream_stats() if webhook_handler else None,
+        "history_summaries": webhook_handler.history_stats() if webhook_handler else None,
+        "deepgram_pool": deepgram_pool.stats() if deepgram_pool else None,
+        "reasoning_paths": reasoning_engine.path_stats() if reasoning_engine else None,
+        "prompts": reasoning_engine.prompt_stats() if reasoning_engine else None,
+        "llm_transport": reasoning_engine.transport_stats() if reasoning_engine else None,
+        "calendar": calendar_gateway.stats() if calendar_gateway else None,
+        "calendar_mirror": calendar_mirror.stats() if calendar_mirror else None,
+        "availability": availability.stats() if availability else None,
+        "scheduling_queue": scheduling_queue.stats() if scheduling_queue else None,
+        "post_call": post_call_queue.stats() if post_call_queue else None,
+    }
+
+
 @app.get("/stats")
-def get_dashboard_stats():
+async def get_dashboard_stats():
     """Get dashboard statistics."""
     from datetime import timedelta
     
@@ -809,15 +1091,15 @@ def get_dashboard_stats():
     if db_manager:
         # Count calls from today
         today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        stats["callsToday"] = db_manager.calls.count_documents({
+        stats["callsToday"] = await db_manager.aio.calls.count_documents({
             "timestamp": {"$gte": today_start}
         })
         
         # Count total contacts
-        stats["totalContacts"] = db_manager.contacts.count_documents({})
+        stats["totalContacts"] = await db_manager.aio.contacts.count_documents({})
         
         # Count indexed emails
-        stats["emailsIndexed"] = db_manager.emails.count_documents({})
+        stats["emailsIndexed"] = await db_manager.aio.emails.count_documents({})
     
     return stats
 
@@ -850,19 +1132,57 @@ async def get_google_status():
 
 
 @app.post("/calendar/sync")
-def sync_calendar():
-    """Sync calendar events to MongoDB."""
-    if not calendar_service:
+async def sync_calendar():
+    """Sync calendar events to MongoDB (incrementally, after the first sync)."""
+    if not calendar_mirror:
         raise HTTPException(status_code=503, detail="Calendar service not available")
     
     try:
-        count = calendar_service.sync_events_to_db()
+        count = await calendar_mirror.sync()
         return {"synced_events": count}
     except Exception as e:
         logger.error(f"Sync failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/calendar/notifications")
+async def calendar_notification(request: Request):
+    """Google Calendar push notification: sync the mirror now."""
+    if not calendar_mirror:
+        raise HTTPException(status_code=503, detail="Calendar service not available")
+    
+    accepted = calendar_mirror.notify(
+        request.headers.get("X-Goog-Channel-ID", ""),
+        request.headers.get("X-Goog-Channel-Token", ""),
+    )
+    if not accepted:
+        raise HTTPException(status_code=404, detail="Unknown channel")
+    return Response(status_code=200)
+
+
+@app.get("/calendar/holds")
+async def list_meeting_holds(
+    status: str | None = Query(default=None, pattern="^(pending|confirmed|failed)$"),
+    limit: int = Query(default=100, ge=1, le=500),
+):
+    """List meetings booked on calls and the state of their Google write."""
+    if not scheduling_queue:
+        raise HTTPException(status_code=503, detail="Scheduling queue not available")
+    
+    return await scheduling_queue.list_holds(status=status, limit=limit)
+
+
+@app.post("/calendar/holds/{hold_id}/retry")
+async def retry_meeting_hold(hold_id: str):
+    """Requeue a meeting whose Google write failed."""
+    if not scheduling_queue:
+        raise HTTPException(status_code=503, detail="Scheduling queue not available")
+    
+    if not await scheduling_queue.retry(hold_id):
+        raise HTTPException(status_code=404, detail="No failed hold with that ID")
+    return {"status": "pending", "id": hold_id}
+
+
 @app.get("/calendar/events")
 def list_calendar_events(
     start: datetime | None = None,
@@ -877,7 +1197,7 @@ def list_calendar_events(
         start = datetime.utcnow()
     end = start + timedelta(days=days)
     
-    return calendar_service.list_events(start_time=start, end_time=end)
+    return calendar_service.list_events(time_min=start, time_max=end)
 
 
 @app.post("/calendar/events")
@@ -905,27 +1225,75 @@ def create_calendar_event(event: EventInput):
 # =============================================================================
 
 @app.get("/tts/{audio_id}")
-async def get_tts_audio(audio_id: str):
+async def get_tts_audio(audio_id: str, request: Request):
     """Serve cached TTS audio for Twilio to play.
     
+    Audio IDs are content hashes, so the ID doubles as a strong ETag and
+    responses never change. Supports ``If-None-Match`` (304) and single
+    byte ranges (206). Audio in the shared disk tier is sent straight from
+    the file; otherwise it is taken from memory or synthesized again from
+    its recorded text.
+    
     Args:
         audio_id: Hash ID of the cached audio.
+        request: Incoming request (for conditional and range headers).
         
     Returns:
-        Audio file in MP3 format.
+        Audio file in the encoding it was synthesized with (MP3 for <Play>).
     """
-    if audio_id not in audio_cache:
+    if not tts_cache or not TTSCache.is_valid_id(audio_id):
         raise HTTPException(status_code=404, detail="Audio not found")
     
-    audio_bytes = audio_cache[audio_id]
+    etag = f'"{audio_id}"'
+    encoding, path = await tts_cache.locate(audio_id)
+    extension = TTSCache.EXTENSIONS.get(encoding, "bin")
+    headers = {
+        "Content-Disposition": f"inline; filename={audio_id}.{extension}",
+        "Cache-Control": "public, max-age=86400, immutable",
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+    }
+    
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    
+    media_type = TTSCache.MEDIA_TYPES.get(encoding, "application/octet-stream")
+    
+    # Serve straight from the disk tier (sendfile); FileResponse handles
+    # Range and If-Range against our ETag
+    if path is not None:
+        return FileResponse(path, media_type=media_type, headers=headers)
+    
+    # Segments of a streamed reply may still be synthesizing when Twilio asks
+    audio_bytes = await tts_cache.get_or_synthesize(audio_id)
+    if audio_bytes is None:
+        raise HTTPException(status_code=404, detail="Audio not found")
+    
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or if_range.strip() == etag):
+        size = len(audio_bytes)
+        try:
+            byte_range = parse_byte_range(range_header, size)
+        except ValueError:
+            return Response(
+                status_code=416,
+                headers={**headers, "Content-Range": f"bytes */{size}"},
+            )
+        if byte_range is not None:
+            start, end = byte_range
+            return Response(
+                content=audio_bytes[start:end + 1],
+                status_code=206,
+                media_type=media_type,
+                headers={**headers, "Content-Range": f"bytes {start}-{end}/{size}"},
+            )
     
     return Response(
         content=audio_bytes,
-        media_type="audio/mpeg",
-        headers={
-            "Content-Disposition": f"inline; filename={audio_id}.mp3",
-            "Cache-Control": "public, max-age=3600",
-        }
+        media_type=media_type,
+        headers=headers,
     )
 
 
@@ -939,28 +1307,14 @@ async def generate_tts(text: str = Form(...)):
     Returns:
         URL to the generated audio.
     """
-    if not voice_pipeline:
+    if not voice_pipeline or not tts_cache:
         raise HTTPException(status_code=503, detail="Voice pipeline not initialized")
     
-    # Generate hash for caching
-    text_hash = hashlib.md5(text.encode()).hexdigest()[:12]
-    
-    # Check cache first
-    if text_hash not in audio_cache:
-        try:
-            audio_bytes = await voice_pipeline.synthesize_speech(text)
-            audio_cache[text_hash] = audio_bytes
-            
-            # Limit cache size (keep last 100 entries)
-            if len(audio_cache) > 100:
-                oldest_key = next(iter(audio_cache))
-                del audio_cache[oldest_key]
-                
-        except Exception as e:
-            logger.error(f"TTS generation failed: {e}")
-            raise HTTPException(status_code=500, detail="TTS generation failed")
+    audio_id = tts_cache.start(text)
+    if await tts_cache.get(audio_id) is None:
+        raise HTTPException(status_code=500, detail="TTS generation failed")
     
-    return {"audio_id": text_hash, "url": f"/tts/{text_hash}"}
+    return {"audio_id": audio_id, "url": f"/tts/{audio_id}"}
 
 
 if __name__ == "__main__":
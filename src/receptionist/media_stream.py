@@ -0,0 +1,376 @@
+"""Real-time conversation over a Twilio bidirectional media stream.
+
+Caller audio arrives as base64 mulaw ``media`` events on the ``/audio-stream``
+WebSocket. ``MediaStreamSession`` pipes it into streaming STT, hands each final
+transcript to a reply callback and plays the reply back as ``media`` events on
+the same socket, without a ``<Gather>``/webhook round trip per turn.
+"""
+
+import asyncio
+import base64
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any
+
+from fastapi import WebSocket
+
+from .reasoning_engine import split_sentences
+from .tts_cache import TTSCache
+
+logger = logging.getLogger(__name__)
+
+SpeechStartedCallback = Callable[[], Awaitable[None]]
+Transcriber = Callable[[AsyncIterator[bytes], SpeechStartedCallback], AsyncIterator[str]]
+StreamingSynthesizer = Callable[[str], AsyncIterator[bytes]]
+
+# 20ms of 8kHz mulaw, the frame size Twilio sends and expects
+FRAME_BYTES = 160
+MULAW_SILENCE = b"\xff"
+
+
+async def frame_audio(
+    chunks: AsyncIterator[bytes], frame_bytes: int = FRAME_BYTES
+) -> AsyncIterator[bytes]:
+    """Re-chunk a mulaw stream into fixed-size frames.
+
+    The last frame is padded with silence.
+    """
+    buffer = bytearray()
+    async for chunk in chunks:
+        buffer += chunk
+        while len(buffer) >= frame_bytes:
+            yield bytes(buffer[:frame_bytes])
+            del buffer[:frame_bytes]
+    if buffer:
+        yield bytes(buffer) + MULAW_SILENCE * (frame_bytes - len(buffer))
+
+
+async def _once(audio: bytes) -> AsyncIterator[bytes]:
+    yield audio
+
+
+class StreamReply:
+    """A reply whose sentences arrive while it is still being generated.
+
+    The producer calls ``put`` for each sentence and ``finish`` once the
+    reply is complete; ``end_call`` is final after iteration ends.
+    """
+
+    def __init__(self, sentences: list[str] | None = None, end_call: bool = False):
+        """Initialize the reply, optionally already complete.
+
+        Args:
+            sentences: Sentences of a reply that is already complete
+            end_call: Whether to hang up after a complete reply
+        """
+        self._queue: asyncio.Queue[str | None] = asyncio.Queue()
+        self.end_call = False
+        if sentences is not None:
+            for sentence in sentences:
+                self.put(sentence)
+            self.finish(end_call)
+
+    def put(self, sentence: str) -> None:
+        """Add a sentence to the reply."""
+        self._queue.put_nowait(sentence)
+
+    def finish(self, end_call: bool = False) -> None:
+        """Mark the reply complete."""
+        self.end_call = end_call
+        self._queue.put_nowait(None)
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        while (sentence := await self._queue.get()) is not None:
+            yield sentence
+
+
+Responder = Callable[[str], Awaitable[StreamReply]]
+
+
+class MediaStreamSession:
+    """Audio loop for one call on a Twilio media stream.
+
+    Backpressure is per call: inbound frames go through a bounded queue that
+    drops the oldest audio when STT falls behind (so the socket reader never
+    stalls), and reply clips go through a bounded queue the reply producer
+    waits on. When the caller starts talking, queued and playing audio is
+    cleared (barge-in).
+    """
+
+    # 20ms frames, so about ten seconds of caller audio
+    DEFAULT_MAX_INBOUND_FRAMES = 500
+    DEFAULT_MAX_OUTBOUND_CLIPS = 8
+
+    # How long to wait for the last reply to finish playing before hanging up
+    FINAL_PLAYBACK_TIMEOUT = 30.0
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        stream_sid: str,
+        tts_cache: TTSCache,
+        transcribe: Transcriber,
+        respond: Responder,
+        max_inbound_frames: int = DEFAULT_MAX_INBOUND_FRAMES,
+        max_outbound_clips: int = DEFAULT_MAX_OUTBOUND_CLIPS,
+        synthesize_stream: StreamingSynthesizer | None = None,
+    ):
+        """Initialize the session.
+
+        Args:
+            websocket: The media stream WebSocket
+            stream_sid: Twilio stream identifier
+            tts_cache: Cache used to synthesize mulaw reply audio
+            transcribe: Streaming STT, e.g. ``VoicePipeline.transcribe_stream``,
+                called with the caller audio and a speech-started callback
+            respond: Coroutine ``(transcript) -> StreamReply``; each sentence
+                is queued for playback as soon as it is generated
+            max_inbound_frames: Caller audio frames buffered for STT
+            max_outbound_clips: Reply clips queued ahead of playback
+            synthesize_stream: Streaming TTS yielding mulaw chunks, e.g.
+                ``VoicePipeline.synthesize_speech_stream``. Sentences not
+                already cached are streamed to the caller as they are
+                synthesized; without it each clip is synthesized whole.
+        """
+        self._websocket = websocket
+        self._stream_sid = stream_sid
+        self._tts_cache = tts_cache
+        self._transcribe = transcribe
+        self._respond = respond
+        self._synthesize_stream = synthesize_stream
+
+        self._inbound: asyncio.Queue[bytes | None] = asyncio.Queue(max(1, max_inbound_frames))
+        self._outbound: asyncio.Queue[tuple[int, str]] = asyncio.Queue(max(1, max_outbound_clips))
+        self._turns: asyncio.Queue[str] = asyncio.Queue()
+
+        # Bumped on barge-in so clips queued before it are not played
+        self._generation = 0
+        self._unplayed: set[str] = set()
+        self._played = asyncio.Event()
+        self._played.set()
+        self._tasks: list[asyncio.Task[None]] = []
+
+        self.dropped_frames = 0
+        self.barge_ins = 0
+        self.clips_sent = 0
+        self.turns = 0
+        self.streamed_clips = 0
+        self.stream_errors = 0
+
+    def start(self, greeting: str | None = None) -> None:
+        """Start transcribing, replying and playing audio.
+
+        Args:
+            greeting: Phrase to speak as soon as the stream opens
+        """
+        self._tasks = []
+        if greeting:
+            self._tasks.append(
+                asyncio.create_task(self.say(split_sentences(greeting) or [greeting]))
+            )
+        self._tasks += [
+            asyncio.create_task(self._listen()),
+            asyncio.create_task(self._reply()),
+            asyncio.create_task(self._play()),
+        ]
+
+    def feed(self, audio: bytes) -> None:
+        """Queue a frame of caller audio, dropping the oldest if STT is behind."""
+        self._put_inbound(audio)
+
+    def _put_inbound(self, audio: bytes | None) -> None:
+        if self._inbound.full():
+            self._inbound.get_nowait()
+            self.dropped_frames += 1
+        self._inbound.put_nowait(audio)
+
+    async def _audio(self) -> AsyncIterator[bytes]:
+        """Caller audio for STT, until the stream stops."""
+        while (frame := await self._inbound.get()) is not None:
+            yield frame
+
+    async def _listen(self) -> None:
+        """Run STT and queue each final transcript as a turn."""
+        try:
+            async for transcript in self._transcribe(self._audio(), self.interrupt):
+                if not transcript.strip():
+                    continue
+                # A transcript can arrive without a speech-started event
+                await self.interrupt()
+                self._turns.put_nowait(transcript)
+        except Exception as e:
+            logger.error(f"Media stream transcription error: {e}")
+
+    async def _reply(self) -> None:
+        """Answer turns one at a time, in order."""
+        while True:
+            transcript = await self._turns.get()
+            # A barge-in while the reply is generated makes it stale
+            generation = self._generation
+            try:
+                reply = await self._respond(transcript)
+                async for sentence in reply:
+                    await self.say([sentence], generation)
+            except Exception as e:
+                logger.error(f"Media stream reply error: {e}")
+                continue
+            self.turns += 1
+
+            if reply.end_call:
+                await self.wait_played(self.FINAL_PLAYBACK_TIMEOUT)
+                # Closing the stream lets Twilio continue to <Hangup/>
+                await self._websocket.close()
+                return
+
+    async def say(self, sentences: list[str], generation: int | None = None) -> None:
+        """Queue sentences for playback.
+
+        Waits while the outbound queue is full. Sentences still queued when
+        the caller barges in are dropped.
+
+        Args:
+            sentences: Sentences to speak
+            generation: Barge-in generation the sentences belong to (the
+                current one if omitted); stale sentences are dropped
+        """
+        if generation is None:
+            generation = self._generation
+        for sentence in sentences:
+            if generation != self._generation:
+                return
+            if self._synthesize_stream is None:
+                # Synthesize ahead while earlier sentences play
+                self._tts_cache.start(sentence, encoding="mulaw")
+            await self._outbound.put((generation, sentence))
+
+    async def _play(self) -> None:
+        """Send reply clips in order, skipping those cleared by barge-in."""
+        while True:
+            generation, sentence = await self._outbound.get()
+            try:
+                if generation != self._generation:
+                    continue
+                audio_id = self._tts_cache.key(sentence, "mulaw")
+                if self._synthesize_stream and not await self._tts_cache.has(audio_id):
+                    sent = await self._stream_sentence(generation, sentence)
+                else:
+                    audio = await self._tts_cache.get(
+                        self._tts_cache.start(sentence, encoding="mulaw")
+                    )
+                    sent = audio is not None and (
+                        await self._send_frames(generation, _once(audio)) is not None
+                    )
+                if not sent:
+                    continue
+                mark = f"clip-{self.clips_sent}"
+                # Twilio echoes the mark once the audio before it has played
+                await self._send({"event": "mark", "mark": {"name": mark}})
+                self._unplayed.add(mark)
+                self._played.clear()
+                self.clips_sent += 1
+            finally:
+                self._outbound.task_done()
+
+    async def _stream_sentence(self, generation: int, sentence: str) -> bool:
+        """Synthesize a sentence and send it frame by frame as audio arrives.
+
+        Returns:
+            True if the whole clip was sent
+        """
+        try:
+            audio = await self._send_frames(generation, self._synthesize_stream(sentence))
+        except Exception as e:
+            logger.error(f"Streaming TTS failed: {e}")
+            self.stream_errors += 1
+            return False
+        if audio is None:
+            return False
+        self.streamed_clips += 1
+        # Keep the clip so a repeat of the sentence is served from the cache
+        await self._tts_cache.store(sentence, audio, encoding="mulaw")
+        return True
+
+    async def _send_frames(
+        self, generation: int, chunks: AsyncIterator[bytes]
+    ) -> bytes | None:
+        """Send audio as 20ms media frames.
+
+        Returns:
+            The audio sent, or None if a barge-in interrupted it
+        """
+        sent = bytearray()
+        async for frame in frame_audio(chunks):
+            if generation != self._generation:
+                return None
+            await self._send({
+                "event": "media",
+                "media": {"payload": base64.b64encode(frame).decode()},
+            })
+            sent += frame
+        return bytes(sent)
+
+    async def _send(self, message: dict[str, Any]) -> None:
+        await self._websocket.send_json({**message, "streamSid": self._stream_sid})
+
+    def on_mark(self, name: str) -> None:
+        """Record that Twilio finished playing audio up to a mark."""
+        self._unplayed.discard(name)
+        if not self._unplayed:
+            self._played.set()
+
+    @property
+    def speaking(self) -> bool:
+        """Whether reply audio is queued or still playing."""
+        return bool(self._unplayed) or not self._outbound.empty()
+
+    async def interrupt(self) -> None:
+        """Barge-in: drop queued replies and clear audio Twilio has buffered."""
+        speaking = self.speaking
+        # Also stops clips that are synthesizing or about to be queued
+        self._generation += 1
+        while not self._outbound.empty():
+            self._outbound.get_nowait()
+            self._outbound.task_done()
+        if not speaking:
+            return
+        self._unplayed.clear()
+        self._played.set()
+        self.barge_ins += 1
+        try:
+            await self._send({"event": "clear"})
+        except Exception as e:
+            logger.warning(f"Failed to clear media stream audio: {e}")
+
+    async def wait_played(self, timeout: float) -> bool:
+        """Wait until all queued reply audio has been sent and played.
+
+        Returns:
+            True if playback finished within ``timeout``
+        """
+        try:
+            await asyncio.wait_for(self._drained(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _drained(self) -> None:
+        await self._outbound.join()
+        await self._played.wait()
+
+    async def close(self) -> None:
+        """Stop the session and its background tasks."""
+        self._put_inbound(None)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> dict[str, Any]:
+        """Get per-call counters."""
+        return {
+            "turns": self.turns,
+            "clips_sent": self.clips_sent,
+            "barge_ins": self.barge_ins,
+            "dropped_frames": self.dropped_frames,
+            "streamed_clips": self.streamed_clips,
+            "stream_errors": self.stream_errors,
+        }
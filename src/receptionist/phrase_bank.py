@@ -0,0 +1,160 @@
+"""Pre-synthesized audio for the receptionist's fixed phrases.
+
+The greeting and the canned fallback and goodbye lines are spoken on almost
+every call. ``PhraseBank`` synthesizes them once at startup (or finds them in
+the persistent TTS cache) and pins them in memory, so a live call never waits
+on the TTS API for them.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+from .models import BusinessConfig
+from .reasoning_engine import ReasoningEngine, split_sentences
+from .tts_cache import TTSCache
+from .voice_pipeline import VoicePipeline
+
+logger = logging.getLogger(__name__)
+
+NO_SPEECH_PROMPT = "I didn't catch that. Could you please repeat?"
+NOT_UNDERSTOOD_PROMPT = "I'm sorry, I didn't catch that. Could you please repeat?"
+DEFAULT_REPLY = "Thank you for calling. How can I assist you today?"
+GOODBYE = "You're welcome! Have a great day. Goodbye!"
+TECHNICAL_DIFFICULTIES_GOODBYE = (
+    "I'm having some technical difficulties. Please try calling back in a moment. Goodbye!"
+)
+LOOP_GOODBYE = (
+    "I'm sorry, I'm having trouble understanding. Please call back and I'll be happy to help. Goodbye!"
+)
+
+STOCK_PHRASES = (
+    NO_SPEECH_PROMPT,
+    NOT_UNDERSTOOD_PROMPT,
+    DEFAULT_REPLY,
+    GOODBYE,
+    TECHNICAL_DIFFICULTIES_GOODBYE,
+    LOOP_GOODBYE,
+    ReasoningEngine.ERROR_RESPONSE,
+    ReasoningEngine.DEFAULT_FALLBACK,
+)
+
+
+class PhraseBank:
+    """Keeps the audio for fixed phrases synthesized and pinned in a TTSCache."""
+
+    def __init__(
+        self,
+        tts_cache: TTSCache,
+        encodings: tuple[str, ...] = ("mp3",),
+    ):
+        """Initialize the phrase bank.
+
+        Args:
+            tts_cache: Cache the phrases are synthesized into
+            encodings: Audio encodings to prepare each phrase in
+        """
+        self._tts_cache = tts_cache
+        self._encodings = encodings
+        self._pinned: set[str] = set()
+        self._warm_task: asyncio.Task[int] | None = None
+
+        self.warmups = 0
+        self.ready = 0
+        self.failed = 0
+        self.last_warm_ms = 0.0
+
+    def phrases(self, business_config: BusinessConfig | None = None) -> list[str]:
+        """Get the fixed phrases to prepare.
+
+        Args:
+            business_config: Current business configuration, which the
+                greeting names the boss and company from
+
+        Returns:
+            Phrases in the order they are most likely to be needed
+        """
+        phrases = [VoicePipeline.greeting_for(business_config), *STOCK_PHRASES]
+        return list(dict.fromkeys(phrases))
+
+    def segments(self, business_config: BusinessConfig | None = None) -> list[str]:
+        """Get the clips the phrases are played as.
+
+        Speech is synthesized one sentence at a time, so the bank prepares
+        the same sentences ``WebhookHandler`` will ask the cache for.
+        """
+        segments = []
+        for phrase in self.phrases(business_config):
+            segments.extend(split_sentences(phrase) or [phrase])
+        return list(dict.fromkeys(segments))
+
+    async def warm(self, business_config: BusinessConfig | None = None) -> int:
+        """Synthesize (or load) every phrase and pin it in memory.
+
+        Phrases that are no longer in the bank are unpinned and become
+        ordinary LRU entries.
+
+        Args:
+            business_config: Current business configuration
+
+        Returns:
+            Number of clips ready to play
+        """
+        started = time.perf_counter()
+        audio_ids = []
+        for segment in self.segments(business_config):
+            for encoding in self._encodings:
+                audio_id = self._tts_cache.start(segment, encoding)
+                self._tts_cache.pin(audio_id)
+                audio_ids.append(audio_id)
+
+        for audio_id in self._pinned - set(audio_ids):
+            self._tts_cache.unpin(audio_id)
+        self._pinned = set(audio_ids)
+
+        results = await asyncio.gather(*(self._tts_cache.get(i) for i in audio_ids))
+        self.ready = sum(1 for audio in results if audio is not None)
+        self.failed = len(results) - self.ready
+        self.warmups += 1
+        self.last_warm_ms = (time.perf_counter() - started) * 1000
+        logger.info(
+            f"Phrase bank warmed: {self.ready}/{len(results)} clips ready "
+            f"in {self.last_warm_ms:.0f}ms"
+        )
+        return self.ready
+
+    def start(self, business_config: BusinessConfig | None = None) -> None:
+        """Warm the bank in the background, e.g. at startup or after a config change."""
+        if self._warm_task and not self._warm_task.done():
+            self._warm_task.cancel()
+        self._warm_task = asyncio.create_task(self._warm_logged(business_config))
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait for a background warm-up started by ``start``.
+
+        Returns:
+            True if the warm-up finished within ``timeout``
+        """
+        if not self._warm_task:
+            return True
+        done, _ = await asyncio.wait({self._warm_task}, timeout=timeout)
+        return bool(done)
+
+    async def _warm_logged(self, business_config: BusinessConfig | None) -> int:
+        """Run ``warm`` as a background task, logging instead of raising."""
+        try:
+            return await self.warm(business_config)
+        except Exception as e:
+            logger.warning(f"Phrase bank warm-up failed: {e}")
+            return 0
+
+    def stats(self) -> dict[str, Any]:
+        """Get warm-up counters."""
+        return {
+            "clips": len(self._pinned),
+            "ready": self.ready,
+            "failed": self.failed,
+            "warmups": self.warmups,
+            "last_warm_ms": round(self.last_warm_ms, 1),
+        }
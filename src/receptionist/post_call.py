@@ -0,0 +1,289 @@
+"""Durable queue for analyzing and recording finished calls.
+
+The status callback used to run the call outcome analysis (a full LLM
+completion) and insert the call record before answering Twilio, which tied
+up request workers and risked Twilio retrying the webhook. ``PostCallQueue``
+instead stores a job per call in the ``post_call_jobs`` collection and
+returns; a small pool of workers analyzes jobs in the background.
+
+- A job's ``_id`` is the call SID and it is created with an upsert, so a
+  repeated callback does not queue the call twice.
+- Each worker claims up to ``batch_size`` due jobs and analyzes them in a
+  single completion, so a burst of finished calls costs one LLM request per
+  batch. The number of workers bounds concurrent analysis requests.
+- Results are upserted into ``calls`` by call SID and the job is deleted.
+- When a batch fails, its calls are analyzed one by one so a single bad
+  transcript does not hold back the rest. Calls that still fail are retried
+  with exponential backoff; after ``max_attempts`` the call is recorded
+  with a "Processing Error" outcome.
+- A claim pushes the job's ``next_attempt_at`` past a lease, so jobs held
+  by a worker that died are picked up again once the lease runs out.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from pymongo import ReturnDocument
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.errors import DuplicateKeyError
+
+from .reasoning_engine import CallOutcome
+
+logger = logging.getLogger(__name__)
+
+Analyze = Callable[[list[list[str]]], Awaitable[list[CallOutcome]]]
+
+PENDING = "pending"
+
+
+def outcome_fields(outcome: dict[str, Any], summary: str | None = None) -> dict[str, Any]:
+    """Call record fields for an analysis result (defaults if it is empty).
+
+    Args:
+        outcome: ``CallOutcome.to_dict()``, or an empty dict without analysis
+        summary: Summary to use when the call was not analyzed
+    """
+    return {
+        "summary": outcome.get("summary", summary or "No summary available"),
+        "decision": outcome.get("decision", "handled"),
+        "decision_label": outcome.get("decision_label", "Call Processed"),
+        "reasoning": outcome.get("reasoning", ""),
+        "action_taken": outcome.get("action_taken", ""),
+    }
+
+
+class PostCallQueue:
+    """Analyzes finished calls in batches and upserts their records."""
+
+    DEFAULT_WORKERS = 2
+    DEFAULT_BATCH_SIZE = 4
+    DEFAULT_MAX_ATTEMPTS = 5
+    DEFAULT_POLL_INTERVAL = 5.0
+    RETRY_BASE_SECONDS = 5.0
+    # How long a claimed job is left alone before another worker may retry it
+    LEASE = timedelta(seconds=120)
+
+    def __init__(
+        self,
+        jobs: AsyncCollection,
+        calls: AsyncCollection,
+        analyze: Analyze | None = None,
+        workers: int = DEFAULT_WORKERS,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ):
+        """Initialize the queue.
+
+        Args:
+            jobs: Job storage, e.g. ``db_manager.aio.post_call_jobs``
+            calls: Where call records are upserted
+            analyze: Coroutine analyzing a batch of transcripts, e.g.
+                ``reasoning_engine.analyze_call_outcomes`` (calls are recorded
+                without analysis if omitted)
+            workers: Concurrent analysis batches
+            batch_size: Calls analyzed per LLM request
+            max_attempts: Analysis attempts before a call is recorded as failed
+            poll_interval: Seconds between scans for due jobs
+        """
+        self._jobs = jobs
+        self._calls = calls
+        self._analyze = analyze
+        self._workers = max(1, workers)
+        self._batch_size = max(1, batch_size)
+        self._max_attempts = max_attempts
+        self._poll_interval = poll_interval
+
+        self._wake = asyncio.Event()
+        self._tasks: list[asyncio.Task[None]] = []
+
+        self.enqueued = 0
+        self.duplicates = 0
+        self.batches = 0
+        self.split_batches = 0
+        self.recorded = 0
+        self.retries = 0
+        self.failures = 0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def ensure_indexes(self) -> None:
+        """Create the indexes for the due-job scan and call record upserts."""
+        await self._jobs.create_index([("status", 1), ("next_attempt_at", 1)])
+        await self._calls.create_index("call_sid")
+
+    def start(self) -> None:
+        """Start the worker pool."""
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._run()) for _ in range(self._workers)]
+
+    async def stop(self) -> None:
+        """Stop the workers (queued jobs stay in the collection)."""
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if await self.process_batch():
+                    continue
+            except Exception as e:
+                logger.error(f"Post-call processing failed: {e}")
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), self._poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    # ------------------------------------------------------------------
+    # Jobs
+    # ------------------------------------------------------------------
+
+    async def enqueue(
+        self,
+        call: dict[str, Any],
+        transcript: list[str],
+        summary: str | None = None,
+    ) -> bool:
+        """Queue a finished call for analysis and recording.
+
+        Args:
+            call: Call record without analysis fields (must have ``call_sid``)
+            transcript: Transcript segments to analyze
+            summary: Summary to record if the call is not analyzed
+
+        Returns:
+            False if the call was already queued
+        """
+        now = datetime.now(timezone.utc)
+        job = {
+            "call": call,
+            "transcript": transcript,
+            "summary": summary,
+            "status": PENDING,
+            "attempts": 0,
+            "last_error": None,
+            "created_at": now,
+            "next_attempt_at": now,
+        }
+        try:
+            result = await self._jobs.update_one(
+                {"_id": call["call_sid"]}, {"$setOnInsert": job}, upsert=True
+            )
+        except DuplicateKeyError:
+            # A concurrent upsert of the same call won
+            result = None
+
+        if result is None or result.upserted_id is None:
+            self.duplicates += 1
+            logger.info(f"Call {call['call_sid']} is already queued for post-call processing")
+            return False
+
+        self.enqueued += 1
+        self._wake.set()
+        return True
+
+    async def _claim(self) -> list[dict[str, Any]]:
+        """Claim up to ``batch_size`` due jobs, oldest first."""
+        claimed = []
+        while len(claimed) < self._batch_size:
+            now = datetime.now(timezone.utc)
+            job = await self._jobs.find_one_and_update(
+                {"status": PENDING, "next_attempt_at": {"$lte": now}},
+                {"$set": {"next_attempt_at": now + self.LEASE}},
+                sort=[("next_attempt_at", 1)],
+                return_document=ReturnDocument.AFTER,
+            )
+            if job is None:
+                break
+            claimed.append(job)
+        return claimed
+
+    async def process_batch(self) -> int:
+        """Analyze and record one batch of due jobs; returns its size."""
+        jobs = await self._claim()
+        if not jobs:
+            return 0
+
+        self.batches += 1
+        await self._process(jobs)
+        return len(jobs)
+
+    async def _process(self, jobs: list[dict[str, Any]]) -> None:
+        """Analyze and record jobs, one by one if analyzing them together fails."""
+        try:
+            if self._analyze:
+                outcomes = [o.to_dict() for o in await self._analyze([j["transcript"] for j in jobs])]
+            else:
+                outcomes = [{} for _ in jobs]
+        except Exception as e:
+            if len(jobs) == 1:
+                await self._fail(jobs[0], e)
+                return
+            self.split_batches += 1
+            logger.warning(f"Analyzing {len(jobs)} calls together failed, retrying one by one: {e}")
+            for job in jobs:
+                await self._process([job])
+            return
+
+        for job, outcome in zip(jobs, outcomes):
+            await self._record(job, outcome)
+
+    async def _record(self, job: dict[str, Any], outcome: dict[str, Any]) -> None:
+        call_doc = {**job["call"], **outcome_fields(outcome, job.get("summary"))}
+        await self._calls.update_one(
+            {"call_sid": job["_id"]}, {"$set": call_doc}, upsert=True
+        )
+        await self._jobs.delete_one({"_id": job["_id"]})
+        self.recorded += 1
+        logger.info(f"Saved call record for {job['_id']} ({call_doc['decision_label']})")
+
+    async def _fail(self, job: dict[str, Any], error: Exception) -> None:
+        attempts = job.get("attempts", 0) + 1
+        if attempts >= self._max_attempts:
+            self.failures += 1
+            logger.error(f"Giving up analyzing call {job['_id']} after {attempts} attempts: {error}")
+            await self._record(job, {
+                "summary": job.get("summary") or "Failed to analyze call",
+                "decision": "handled",
+                "decision_label": "Processing Error",
+                "reasoning": f"Error during analysis: {error}",
+                "action_taken": "Logged for review",
+            })
+            return
+
+        self.retries += 1
+        logger.warning(f"Analyzing call {job['_id']} failed (attempt {attempts}): {error}")
+        await self._jobs.update_one(
+            {"_id": job["_id"]},
+            {"$set": {
+                "attempts": attempts,
+                "last_error": str(error),
+                "next_attempt_at": datetime.now(timezone.utc) + timedelta(
+                    seconds=self.RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+                ),
+            }},
+        )
+
+    def stats(self) -> dict[str, int]:
+        """Get job and batch counters."""
+        return {
+            "enqueued": self.enqueued,
+            "duplicates": self.duplicates,
+            "batches": self.batches,
+            "split_batches": self.split_batches,
+            "recorded": self.recorded,
+            "retries": self.retries,
+            "failures": self.failures,
+        }
@@ -0,0 +1,153 @@
+"""System prompt assembly that keeps the prompt prefix byte-stable.
+
+Fireworks (like most providers) caches the longest previously seen prompt
+prefix, so a request only skips re-processing up to the first byte that
+differs. ``PromptBuilder`` therefore splits the system prompt in two:
+
+- a prefix (base instructions plus business info) that is built once per
+  ``BusinessConfig`` and reused verbatim, sent as the first message
+- a volatile tail (current date, retrieved context, per-turn instructions)
+  sent as a system message right before the caller's latest words
+
+It also records the prompt and cached token counts the API reports, so the
+cache hit rate is visible in ``/metrics``.
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Any
+
+from .conversation_history import estimate_tokens
+from .models import BusinessConfig
+
+
+def current_date_line(now: datetime | None = None) -> str:
+    """The date line the model uses to resolve relative dates."""
+    now = now or datetime.now()
+    return f"CURRENT DATE AND TIME: {now.strftime('%A, %B %d, %Y %H:%M')}"
+
+
+class PromptBuilder:
+    """Builds chat messages from a cached system prefix plus a volatile tail."""
+
+    def __init__(self, base_prompt: str, business_config: BusinessConfig | None = None):
+        """Initialize the builder.
+
+        Args:
+            base_prompt: Fixed instructions at the start of every prompt
+            business_config: Business configuration with CEO/company info
+        """
+        self._base_prompt = base_prompt
+        self._business_config = business_config
+        self._prefix: str | None = None
+        self._prefix_key: tuple[str | None, ...] | None = None
+
+        self.prefix_builds = 0
+        self._usage: dict[str, dict[str, int]] = {}
+
+    def set_business_config(self, config: BusinessConfig | None) -> None:
+        """Use a new business configuration (rebuilds the prefix if it changed)."""
+        self._business_config = config
+
+    @property
+    def prefix(self) -> str:
+        """The stable part of the system prompt, rebuilt only when the business config changes."""
+        config = self._business_config
+        key = (
+            (config.ceo_name, config.company_name, config.company_description)
+            if config
+            else (None,)
+        )
+        if self._prefix is None or key != self._prefix_key:
+            prefix = self._base_prompt
+            if config:
+                prefix += f"\n\nYou work for {config.ceo_name}."
+                if config.company_name:
+                    prefix += f" The company is {config.company_name}."
+                if config.company_description:
+                    prefix += f" {config.company_description}"
+            self._prefix, self._prefix_key = prefix, key
+            self.prefix_builds += 1
+        return self._prefix
+
+    @property
+    def prefix_hash(self) -> str:
+        """Short hash of the prefix, to tell prompt versions apart in logs."""
+        return hashlib.sha256(self.prefix.encode()).hexdigest()[:12]
+
+    def messages(
+        self,
+        history: list[dict[str, Any]],
+        transcript: str,
+        tail: str | None = None,
+        tool_messages: list[dict[str, Any]] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Assemble the messages for a chat completion.
+
+        Args:
+            history: Conversation history messages (see ``ConversationHistory.messages``)
+            transcript: The caller's latest words
+            tail: Volatile system content, placed after the history
+            tool_messages: Tool calls and results to append after the
+                caller's message
+
+        Returns:
+            Messages for the chat completions API
+        """
+        messages: list[dict[str, Any]] = [{"role": "system", "content": self.prefix}]
+        messages.extend(history)
+        if tail:
+            messages.append({"role": "system", "content": tail})
+        messages.append({"role": "user", "content": transcript})
+        if tool_messages:
+            messages.extend(tool_messages)
+        return messages
+
+    def record_usage(
+        self,
+        kind: str,
+        usage: dict[str, Any] | None,
+        messages: list[dict[str, Any]] | None = None,
+    ) -> None:
+        """Record the token usage of a completion.
+
+        Args:
+            kind: Kind of request, e.g. "decide" or "respond"
+            usage: The ``usage`` object of the API response, if any
+            messages: Messages sent, used to estimate prompt tokens when the
+                API did not report usage
+        """
+        totals = self._usage.setdefault(
+            kind, {"requests": 0, "prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0}
+        )
+        totals["requests"] += 1
+        if usage:
+            totals["prompt_tokens"] += usage.get("prompt_tokens") or 0
+            totals["completion_tokens"] += usage.get("completion_tokens") or 0
+            details = usage.get("prompt_tokens_details") or {}
+            totals["cached_tokens"] += details.get("cached_tokens") or 0
+        elif messages:
+            totals["prompt_tokens"] += sum(
+                estimate_tokens(str(m.get("content") or "")) for m in messages
+            )
+
+    def stats(self) -> dict[str, Any]:
+        """Get prefix size and per-kind token usage."""
+        usage = {}
+        for kind, totals in self._usage.items():
+            requests = totals["requests"]
+            usage[kind] = {
+                **totals,
+                "avg_prompt_tokens": round(totals["prompt_tokens"] / requests, 1) if requests else 0.0,
+                "cache_hit_ratio": (
+                    round(totals["cached_tokens"] / totals["prompt_tokens"], 3)
+                    if totals["prompt_tokens"]
+                    else 0.0
+                ),
+            }
+        return {
+            "prefix_tokens": estimate_tokens(self.prefix),
+            "prefix_hash": self.prefix_hash,
+            "prefix_builds": self.prefix_builds,
+            "usage": usage,
+        }
@@ -3,7 +3,8 @@
 import json
 import logging
 import re
-from datetime import datetime
+from collections.abc import AsyncIterator
+from contextlib import AbstractContextManager
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any
@@ -11,10 +12,28 @@ from typing import Any
 import httpx
 
 from .config import Settings
+from .conversation_history import ConversationHistory
+from .llm_transport import LLMTransport
 from .models import BusinessConfig
+from .prompt_builder import PromptBuilder, current_date_line
+from .response_sanitizer import StreamingSanitizer, clean_response
 
 logger = logging.getLogger(__name__)
 
+# Fields and decision rules shared by the single and batched call analysis prompts
+OUTCOME_GUIDELINES = """- summary: A concise 1-sentence summary of what the caller wanted.
+- decision: One of ['handled', 'scheduled', 'escalated', 'rejected'].
+- decision_label: A short 2-3 word label for the decision (e.g., "Meeting booked", "Spam rejected").
+- reasoning: Why you made this decision.
+- action_taken: What specific action was taken during the call.
+
+Decision Guidelines:
+- scheduled: If a meeting, appointment, or follow-up was explicitly booked/confirmed.
+- escalated: If the caller needs to speak to the boss/human and you couldn't resolve it, or if it's high priority.
+- rejected: If it was spam, wrong number, or explicitly turned away.
+- handled: If the caller's question was answered or issue resolved automatically without needing further action.
+"""
+
 
 class Tool(Enum):
     """Available tools for the reasoning engine."""
@@ -31,6 +50,14 @@ class ToolCall:
     """Represents a tool call decision."""
     tool: Tool
     arguments: dict[str, Any]
+    call_id: str | None = None  # Model-assigned ID, needed to return results
+
+
+@dataclass
+class TurnDecision:
+    """Outcome of a fast-path completion: a final reply or tool calls."""
+    tool_calls: list[ToolCall]
+    response: str | None = None
 
 
 @dataclass
@@ -42,6 +69,17 @@ class CallOutcome:
     reasoning: str
     action_taken: str
 
+    @classmethod
+    def from_dict(cls, result: dict[str, Any]) -> "CallOutcome":
+        """Build an outcome from the model's JSON, with defaults for missing fields."""
+        return cls(
+            summary=result.get("summary", "No summary available"),
+            decision=result.get("decision", "handled"),
+            decision_label=result.get("decision_label", "Call processed"),
+            reasoning=result.get("reasoning", "No reasoning provided"),
+            action_taken=result.get("action_taken", "Call logged")
+        )
+
     def to_dict(self) -> dict[str, Any]:
         return {
             "summary": self.summary,
@@ -52,6 +90,75 @@ class CallOutcome:
         }
 
 
+class SentenceSplitter:
+    """Splits streamed text into sentences for early speech synthesis.
+
+    Text is fed in arbitrary chunks (e.g. LLM tokens) and complete sentences
+    are returned as soon as their terminating punctuation and the following
+    whitespace arrive. Boundaries inside unclosed tags, brackets, parentheses
+    or ``*actions*`` are ignored so response cleaning still sees them whole,
+    and very short fragments are merged into the next sentence.
+    """
+
+    MIN_SENTENCE_CHARS = 12
+
+    _BOUNDARY = re.compile(r"(?<=[.!?])[\"')\]]*\s+|\n+")
+    _ABBREVIATION = re.compile(r"\b(?:Mr|Mrs|Ms|Dr|Prof|Sr|Jr|St|vs|etc|e\.g|i\.e|a\.m|p\.m)\.$", re.IGNORECASE)
+    _OPENERS = (("<", ">"), ("(", ")"), ("[", "]"))
+
+    def __init__(self) -> None:
+        """Initialize an empty buffer."""
+        self._buffer = ""
+
+    def _is_open(self, text: str) -> bool:
+        """Check whether text ends inside a tag, bracket group or *action*."""
+        if text.count("*") % 2:
+            return True
+        if re.search(r"<(thinking|reasoning|scratchpad|reflection|internal)>(?!.*</\1>)", text, re.DOTALL | re.IGNORECASE):
+            return True
+        return any(text.count(open_) > text.count(close) for open_, close in self._OPENERS)
+
+    def feed(self, text: str) -> list[str]:
+        """Add streamed text and return the sentences it completed.
+
+        Args:
+            text: Next chunk of streamed text.
+
+        Returns:
+            Completed sentences (possibly empty).
+        """
+        self._buffer += text
+        sentences = []
+        start = 0
+        for match in self._BOUNDARY.finditer(self._buffer):
+            candidate = self._buffer[start:match.end()].strip()
+            if (
+                len(candidate) < self.MIN_SENTENCE_CHARS
+                and "\n" not in match.group()
+            ) or self._ABBREVIATION.search(candidate) or self._is_open(candidate):
+                continue
+            if candidate:
+                sentences.append(candidate)
+            start = match.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self) -> str:
+        """Return any buffered text that did not end in a sentence boundary."""
+        remainder, self._buffer = self._buffer.strip(), ""
+        return remainder
+
+
+def split_sentences(text: str) -> list[str]:
+    """Split complete text into sentences using ``SentenceSplitter`` rules."""
+    splitter = SentenceSplitter()
+    sentences = splitter.feed(text)
+    remainder = splitter.flush()
+    if remainder:
+        sentences.append(remainder)
+    return sentences
+
+
 class ReasoningEngine:
     """Uses Fireworks AI for tool calling decisions and response generation.
     
@@ -65,6 +172,9 @@ class ReasoningEngine:
     FIREWORKS_API_URL = "https://api.fireworks.ai/inference/v1/chat/completions"
     MODEL = "accounts/fireworks/models/minimax-m2p1"
 
+    ERROR_RESPONSE = "I apologize, I'm having trouble processing your request. Could you please repeat that?"
+    DEFAULT_FALLBACK = "How can I help you?"
+
     TOOL_SCHEMAS = [
         {
             "type": "function",
@@ -208,12 +318,21 @@ NEVER DO: Repeat greetings, ask "how can I help" multiple times, ignore what cal
 
 
 
-    def __init__(self, settings: Settings | None = None, business_config: BusinessConfig | None = None):
+    def __init__(
+        self,
+        settings: Settings | None = None,
+        business_config: BusinessConfig | None = None,
+        history: ConversationHistory | None = None,
+        transport: LLMTransport | None = None,
+    ):
         """Initialize the ReasoningEngine with Fireworks AI client.
         
         Args:
             settings: Application settings. If None, loads from environment.
             business_config: Business configuration with CEO/company info.
+            history: How much conversation history goes into each prompt.
+            transport: HTTP transport for completions (retries, deadlines,
+                circuit breaker). Defaults to one with standard settings.
         """
         if settings is None:
             from .config import get_settings
@@ -221,119 +340,27 @@ NEVER DO: Repeat greetings, ask "how can I help" multiple times, ignore what cal
         
         self._settings = settings
         self._api_key = settings.fireworks_api_key
-        self._client = httpx.AsyncClient(timeout=30.0)
+        self._transport = transport or LLMTransport(
+            self.FIREWORKS_API_URL, self._api_key, self.MODEL
+        )
         self._business_config = business_config
+        self.history = history or ConversationHistory()
+        # Byte-stable prompt prefix, rebuilt only when the business config changes
+        self._prompts = PromptBuilder(self.BASE_SYSTEM_PROMPT, business_config)
+        
+        # Turns by reasoning path: fast_direct (one round trip), fast_tools
+        # (tool calls + continuation), fast_error, legacy (decide_action)
+        self._path_counts = {"fast_direct": 0, "fast_tools": 0, "fast_error": 0, "legacy": 0}
+        self._round_trips = 0
 
     def set_business_config(self, config: BusinessConfig) -> None:
         """Update the business configuration."""
         self._business_config = config
+        self._prompts.set_business_config(config)
 
     def _clean_ai_response(self, content: str) -> str:
         """Aggressively clean AI response to remove all reasoning/thinking artifacts."""
-        
-        # First pass: Remove all XML-style tags and their content
-        content = re.sub(r'<thinking>.*?</thinking>', '', content, flags=re.DOTALL | re.IGNORECASE)
-        content = re.sub(r'<reasoning>.*?</reasoning>', '', content, flags=re.DOTALL | re.IGNORECASE)
-        content = re.sub(r'<scratchpad>.*?</scratchpad>', '', content, flags=re.DOTALL | re.IGNORECASE)
-        content = re.sub(r'<reflection>.*?</reflection>', '', content, flags=re.DOTALL | re.IGNORECASE)
-        content = re.sub(r'<internal>.*?</internal>', '', content, flags=re.DOTALL | re.IGNORECASE)
-        content = re.sub(r'<response>.*?</response>', '', content, flags=re.DOTALL | re.IGNORECASE)
-        content = re.sub(r'<output>.*?</output>', '', content, flags=re.DOTALL | re.IGNORECASE)
-        content = re.sub(r'<[^>]+>.*?</[^>]+>', '', content, flags=re.DOTALL | re.IGNORECASE)
-        content = re.sub(r'</?[a-z_]+/?>', '', content, flags=re.IGNORECASE)
-        
-        # Remove asterisk/bracket-wrapped actions (stage directions)
-        content = re.sub(r'\*[^*]+\*', '', content)
-        content = re.sub(r'\[[^\]]+\]', '', content)
-        
-        # Remove parenthetical asides about internal processing
-        content = re.sub(r'\([^)]*(?:check|search|look|find|use|tool|calendar|email|system|internal)[^)]*\)', '', content, flags=re.IGNORECASE)
-        
-        # Reasoning indicators that signal internal thought (case insensitive)
-        reasoning_patterns = [
-            r"^(?:The user|They|So,?\s+the|According to|Looking at|Here,|Actually,|Following|My instructions)",
-            r"^(?:I need to|I should|I will|I'll|Let me|I'm going to|I am going to)",
-            r"^(?:First,|Then,|Next,|After that,|Finally,|Now,|Step \d)",
-            r"^(?:The caller|This means|Based on|Given that|Since)",
-            r"^(?:Checking|Searching|Looking up|Using|Calling|Invoking)",
-            r"^(?:Okay so|Alright so|So basically|Hmm,|Well,\s+(?:the|I|let))",
-        ]
-        
-        lines = content.split('\n')
-        clean_lines = []
-        
-        for line in lines:
-            line_stripped = line.strip()
-            
-            # Skip empty lines at the start
-            if not line_stripped and not clean_lines:
-                continue
-            
-            # Skip lines with reasoning indicators
-            if any(re.match(pattern, line_stripped, re.IGNORECASE) for pattern in reasoning_patterns):
-                continue
-            
-            # Skip bullet points that look like reasoning
-            if line_stripped.startswith("- ") and len(line_stripped) > 40:
-                continue
-            
-            # Skip lines with emojis commonly used for internal notes
-            if "❌" in line_stripped or "✓" in line_stripped or "✔" in line_stripped:
-                continue
-            
-            # Skip numbered lists that look like internal steps
-            if re.match(r'^\d+\.\s+', line_stripped) and any(
-                word in line_stripped.lower() for word in ['check', 'search', 'find', 'use', 'look', 'call', 'need']
-            ):
-                continue
-            
-            # Skip lines that mention tools by name
-            if any(tool in line_stripped.lower() for tool in ['search_emails', 'search_contacts', 'check_calendar', 'schedule_meeting']):
-                continue
-            
-            clean_lines.append(line_stripped)
-        
-        content = ' '.join(clean_lines)
-        
-        # Remove remaining tool call narration patterns
-        content = re.sub(r"(?:Let me|I'll|I will|I'm going to)\s+(?:check|search|look up|use|call|invoke|see|find).*?(?:\.|!|$)", '', content, flags=re.IGNORECASE)
-        content = re.sub(r"(?:Using|Calling|Invoking|Checking|Looking at|Searching)\s+(?:the\s+)?(?:search_emails|search_contacts|check_calendar|schedule_meeting|calendar|tool|system).*?(?:\.|!|$)", '', content, flags=re.IGNORECASE)
-        
-        # Remove ellipsis lines
-        content = re.sub(r'\.{3,}', '', content)
-        
-        # Clean up whitespace
-        content = re.sub(r'\s{2,}', ' ', content)
-        content = content.strip()
-        
-        # Remove trailing/leading punctuation artifacts
-        content = re.sub(r'^[.,!?\s]+', '', content)
-        content = re.sub(r'\s+[.,]+$', '.', content)
-        
-        # If content is empty or too short after cleaning, return empty to trigger contextual fallback
-        if len(content) < 5:
-            return ""
-        
-        return content
-
-    async def _build_system_prompt(self) -> str:
-        """Build system prompt with business config and current date injected."""
-        prompt = self.BASE_SYSTEM_PROMPT
-        
-        # Inject today's date for relative time understanding
-        now = datetime.now()
-        date_info = f"\n\nCURRENT DATE AND TIME: {now.strftime('%A, %B %d, %Y %H:%M')}"
-        prompt += date_info
-        
-        if self._business_config:
-            business_info = f"\n\nYou work for {self._business_config.ceo_name}."
-            if self._business_config.company_name:
-                business_info += f" The company is {self._business_config.company_name}."
-            if self._business_config.company_description:
-                business_info += f" {self._business_config.company_description}"
-            prompt += business_info
-        
-        return prompt
+        return clean_response(content)
 
     async def decide_action(
         self, transcript: str, context: dict[str, Any]
@@ -347,79 +374,34 @@ NEVER DO: Repeat greetings, ask "how can I help" multiple times, ignore what cal
         Returns:
             List of tool calls to execute.
         """
-        messages = [
-            {"role": "system", "content": await self._build_system_prompt()},
-        ]
-        
-        # Add conversation history if available
-        if context.get("history"):
-            for entry in context["history"][-5:]:  # Last 5 exchanges
-                messages.append({"role": "user", "content": entry.get("user", "")})
-                if entry.get("assistant"):
-                    messages.append({"role": "assistant", "content": entry["assistant"]})
-        
-        messages.append({"role": "user", "content": transcript})
+        # Stable prefix, then history (summary plus recent turns) within the
+        # token budget, then the date
+        messages = self._prompts.messages(
+            self.history.messages(context), transcript, tail=current_date_line()
+        )
 
         try:
-            response = await self._client.post(
-                self.FIREWORKS_API_URL,
-                headers={
-                    "Authorization": f"Bearer {self._api_key}",
-                    "Content-Type": "application/json",
-                },
-                json={
+            self._path_counts["legacy"] += 1
+            self._round_trips += 1
+            data = await self._transport.complete(
+                {
                     "model": self.MODEL,
                     "messages": messages,
                     "tools": self.TOOL_SCHEMAS,
                     "tool_choice": "auto",
                     "max_tokens": 500,
                 },
+                kind="decide",
             )
+            self._prompts.record_usage("decide", data.get("usage"), messages)
             
-            if response.status_code == 404:
-                error_body = response.text
-                logger.error(f"Model not found. Response: {error_body}. Try updating MODEL in reasoning_engine.py")
-                return []
-            
-            response.raise_for_status()
-            data = response.json()
-            
-            tool_calls = []
             choice = data.get("choices", [{}])[0]
             message = choice.get("message", {})
             
-            if message.get("tool_calls"):
-                for tc in message["tool_calls"]:
-                    func = tc.get("function", {})
-                    tool_name = func.get("name")
-                    logger.info(f"AI called tool: {tool_name}")
-                    try:
-                        args = json.loads(func.get("arguments", "{}"))
-                    except json.JSONDecodeError:
-                        args = {}
-                    
-                    if tool_name == "search_emails":
-                        tool_calls.append(ToolCall(Tool.SEARCH_EMAILS, args))
-                    elif tool_name == "search_contacts":
-                        tool_calls.append(ToolCall(Tool.SEARCH_CONTACTS, args))
-                    elif tool_name == "check_calendar":
-                        tool_calls.append(ToolCall(Tool.CHECK_CALENDAR, args))
-                    elif tool_name == "schedule_meeting":
-                        tool_calls.append(ToolCall(Tool.SCHEDULE_MEETING, args))
-                    elif tool_name == "end_call":
-                        tool_calls.append(ToolCall(Tool.END_CALL, args))
-            else:
-                logger.warning(f"AI did not call any tools for: '{transcript[:50]}...'")
-            
-            # FALLBACK: If AI didn't call schedule_meeting but user is clearly asking to schedule
+            tool_calls = self._parse_tool_calls(message)
             if not tool_calls:
-                schedule_keywords = ["schedule", "set up", "book", "appointment", "meeting", "p.m.", "pm", "a.m.", "am", "o'clock"]
-                transcript_lower = transcript.lower()
-                if any(kw in transcript_lower for kw in schedule_keywords):
-                    logger.info("Fallback: Detected scheduling request, parsing manually")
-                    parsed = self._parse_scheduling_request(transcript)
-                    if parsed:
-                        tool_calls.append(ToolCall(Tool.SCHEDULE_MEETING, parsed))
+                logger.warning(f"AI did not call any tools for: '{transcript[:50]}...'")
+                tool_calls = self._fallback_tool_calls(transcript)
             
             return tool_calls
             
@@ -427,20 +409,160 @@ NEVER DO: Repeat greetings, ask "how can I help" multiple times, ignore what cal
             logger.error(f"Failed to decide action: {e}")
             return []
 
-    async def generate_response(
+    def _parse_tool_calls(self, message: dict[str, Any]) -> list[ToolCall]:
+        """Convert the tool calls of a completion message to ToolCall objects."""
+        tool_calls = []
+        for tc in message.get("tool_calls") or []:
+            func = tc.get("function", {})
+            tool_name = func.get("name")
+            logger.info(f"AI called tool: {tool_name}")
+            try:
+                args = json.loads(func.get("arguments") or "{}")
+            except json.JSONDecodeError:
+                args = {}
+            
+            try:
+                tool = Tool(tool_name)
+            except ValueError:
+                continue
+            if tool != Tool.GENERATE_RESPONSE:
+                tool_calls.append(ToolCall(tool, args, call_id=tc.get("id")))
+        return tool_calls
+
+    def _fallback_tool_calls(self, transcript: str) -> list[ToolCall]:
+        """Detect a scheduling request the model did not turn into a tool call."""
+        # FALLBACK: If AI didn't call schedule_meeting but user is clearly asking to schedule
+        schedule_keywords = ["schedule", "set up", "book", "appointment", "meeting", "p.m.", "pm", "a.m.", "am", "o'clock"]
+        transcript_lower = transcript.lower()
+        if any(kw in transcript_lower for kw in schedule_keywords):
+            logger.info("Fallback: Detected scheduling request, parsing manually")
+            parsed = self._parse_scheduling_request(transcript)
+            if parsed:
+                return [ToolCall(Tool.SCHEDULE_MEETING, parsed)]
+        return []
+
+    async def decide_or_respond(
         self, transcript: str, context: dict[str, Any]
-    ) -> str:
-        """Generate a contextual response based on gathered information.
+    ) -> TurnDecision:
+        """Answer directly or request tools in a single completion.
+        
+        The completion gets the full response prompt plus the tool schemas,
+        so turns that need no tools are answered in one round trip. When the
+        model calls tools, pass their results to ``generate_response`` or
+        ``stream_response`` (see ``tool_result_messages``) to continue.
+        
+        Args:
+            transcript: The transcribed caller speech.
+            context: Current conversation context.
+            
+        Returns:
+            A decision holding either a cleaned reply or tool calls.
+        """
+        messages = await self._build_response_messages(transcript, context)
+
+        try:
+            self._round_trips += 1
+            data = await self._transport.complete(
+                {
+                    "model": self.MODEL,
+                    "messages": messages,
+                    "tools": self.TOOL_SCHEMAS,
+                    "tool_choice": "auto",
+                    "max_tokens": 500,
+                    "temperature": 0.4,
+                },
+                kind="decide_or_respond",
+            )
+            self._prompts.record_usage("decide_or_respond", data.get("usage"), messages)
+            message = data.get("choices", [{}])[0].get("message", {})
+        except Exception as e:
+            logger.error(f"Fast-path completion failed: {e}")
+            self._path_counts["fast_error"] += 1
+            return TurnDecision(tool_calls=[], response=self.ERROR_RESPONSE)
+
+        tool_calls = self._parse_tool_calls(message) or self._fallback_tool_calls(transcript)
+        if tool_calls:
+            self._path_counts["fast_tools"] += 1
+            return TurnDecision(tool_calls=tool_calls)
+
+        content = self._clean_ai_response(message.get("content") or "")
+        if len(content) < 10:
+            content = self._fallback_response(context)
+        self._path_counts["fast_direct"] += 1
+        return TurnDecision(tool_calls=[], response=content)
+
+    @staticmethod
+    def tool_result_messages(
+        tool_calls: list[ToolCall], results: list[dict[str, Any]]
+    ) -> list[dict[str, Any]] | None:
+        """Build the messages that return tool results to the model.
+        
+        Args:
+            tool_calls: Tool calls from ``decide_or_respond``.
+            results: Result of each tool call, in the same order.
+            
+        Returns:
+            Assistant tool-call message followed by one tool message per
+            call, or None if a call has no model-assigned ID (e.g. the
+            scheduling fallback), in which case results are only passed
+            through the context.
+        """
+        if not tool_calls or any(tc.call_id is None for tc in tool_calls):
+            return None
+
+        messages: list[dict[str, Any]] = [{
+            "role": "assistant",
+            "content": "",
+            "tool_calls": [
+                {
+                    "id": tc.call_id,
+                    "type": "function",
+                    "function": {"name": tc.tool.value, "arguments": json.dumps(tc.arguments)},
+                }
+                for tc in tool_calls
+            ],
+        }]
+        for tc, result in zip(tool_calls, results):
+            messages.append({
+                "role": "tool",
+                "tool_call_id": tc.call_id,
+                "content": json.dumps(result, default=str),
+            })
+        return messages
+
+    def prompt_stats(self) -> dict[str, Any]:
+        """Get prompt prefix size and token usage (including cached tokens) per request kind."""
+        return self._prompts.stats()
+
+    def path_stats(self) -> dict[str, Any]:
+        """Get counts of reasoning paths taken and LLM round trips."""
+        turns = sum(self._path_counts.values())
+        return {
+            **self._path_counts,
+            "round_trips": self._round_trips,
+            "round_trips_per_turn": self._round_trips / turns if turns else 0.0,
+        }
+
+    async def _build_response_messages(
+        self,
+        transcript: str,
+        context: dict[str, Any],
+        tool_messages: list[dict[str, Any]] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Build the chat messages for response generation.
         
         Args:
             transcript: The transcribed caller speech.
             context: Current conversation context including search results.
+            tool_messages: Tool calls and results to append after the
+                caller's message (fast-path continuation).
             
         Returns:
-            Generated response text.
+            Messages for the chat completions API.
         """
-        # Build system content with updated date and business info
-        system_content = await self._build_system_prompt()
+        # Per-turn content goes after the history so the cached prefix
+        # (instructions and business info) stays byte-identical
+        system_content = current_date_line()
         
         # Add context from searches
         if context.get("contacts"):
@@ -462,6 +584,8 @@ NEVER DO: Repeat greetings, ask "how can I help" multiple times, ignore what cal
             busy_info = "\n".join(context["calendar_busy"])
             check_date = context.get("calendar_check_date", "the requested date")
             system_content += f"\n\nCalendar for {check_date}:\n{busy_info}\n(Other times are available)"
+            if context.get("calendar_open_slots"):
+                system_content += f"\nOpen times: {', '.join(context['calendar_open_slots'])}"
         elif context.get("calendar_available"):
             check_date = context.get("calendar_check_date", "the requested date")
             system_content += f"\n\nCalendar for {check_date}: All times are available."
@@ -470,14 +594,19 @@ NEVER DO: Repeat greetings, ask "how can I help" multiple times, ignore what cal
         if context.get("meeting_scheduled") and context.get("meeting_details"):
             details = context["meeting_details"]
             system_content += f"\n\nMEETING CONFIRMED: '{details.get('title')}' scheduled for {details.get('date')} at {details.get('time')} for {details.get('duration', 30)} minutes."
+        elif context.get("meeting_conflict"):
+            alternatives = " or ".join(context.get("meeting_alternatives") or []) or "another day"
+            system_content += f"\n\nREQUESTED TIME UNAVAILABLE: {context.get('meeting_requested')} is already booked. Offer these open times instead: {alternatives}."
         elif context.get("meeting_error"):
             system_content += f"\n\nMEETING SCHEDULING FAILED: {context['meeting_error']}. Apologize and offer to try again."
 
         # Tell AI that caller has already been greeted
         if context.get("greeted"):
-            system_content += """
+            greeting = context.get("greeting")
+            greeted_with = f' with "{greeting}"' if greeting else ""
+            system_content += f"""
 
-IMPORTANT: You already greeted the caller with "Hello, this is Donna, your AI assistant. How may I help you today?"
+IMPORTANT: You already greeted the caller{greeted_with}
 DO NOT greet again or ask "how can I help" - just respond to what they said."""
         
         # Add strict instruction to prevent tool narration and thinking
@@ -485,42 +614,59 @@ DO NOT greet again or ask "how can I help" - just respond to what they said."""
 
 OUTPUT FORMAT: Reply with ONLY spoken words. 1-2 sentences. No greetings if already greeted. Respond to their actual request."""
 
-        messages = [
-            {"role": "system", "content": system_content},
-        ]
-        
-        # Add conversation history before current message
-        if context.get("history"):
-            for entry in context["history"][-5:]:  # Last 5 exchanges
-                messages.append({"role": "user", "content": entry.get("user", "")})
-                if entry.get("assistant"):
-                    messages.append({"role": "assistant", "content": entry["assistant"]})
+        return self._prompts.messages(
+            self.history.messages(context), transcript, system_content, tool_messages
+        )
+
+    def _response_request(self, messages: list[dict[str, Any]], stream: bool = False) -> dict[str, Any]:
+        """Build the request body for response generation."""
+        body = {
+            "model": self.MODEL,
+            "messages": messages,
+            "max_tokens": 100,  # Very short responses only
+            "temperature": 0.4,  # Lower temperature = less verbose/creative
+            "stop": ["<thinking>", "<reasoning>", "\n\n", "Let me"],  # Stop before reasoning
+        }
+        if stream:
+            body["stream"] = True
+        return body
+
+    def _fallback_response(self, context: dict[str, Any]) -> str:
+        """Contextual reply used when the model's output was cleaned away."""
+        if context.get("meeting_scheduled") and context.get("meeting_details"):
+            details = context["meeting_details"]
+            return f"Done! I've scheduled '{details.get('title')}' for {details.get('time')} on {details.get('date')}. You're all set!"
+        if context.get("meeting_conflict") and context.get("meeting_alternatives"):
+            return f"That time is already taken. I could do {' or '.join(context['meeting_alternatives'])}. Would one of those work?"
+        if context.get("meeting_error"):
+            return "I'm sorry, there was an issue scheduling that meeting. Would you like to try a different time?"
+        if context.get("calendar_busy"):
+            return "I found some conflicts on the calendar. Let me tell you what times are available."
+        return self.DEFAULT_FALLBACK
+
+    async def generate_response(
+        self,
+        transcript: str,
+        context: dict[str, Any],
+        tool_messages: list[dict[str, Any]] | None = None,
+    ) -> str:
+        """Generate a contextual response based on gathered information.
         
-        messages.append({"role": "user", "content": transcript})
+        Args:
+            transcript: The transcribed caller speech.
+            context: Current conversation context including search results.
+            tool_messages: Tool results from ``tool_result_messages`` when
+                continuing a fast-path turn.
+            
+        Returns:
+            Generated response text.
+        """
+        messages = await self._build_response_messages(transcript, context, tool_messages)
 
         try:
-            response = await self._client.post(
-                self.FIREWORKS_API_URL,
-                headers={
-                    "Authorization": f"Bearer {self._api_key}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": self.MODEL,
-                    "messages": messages,
-                    "max_tokens": 100,  # Very short responses only
-                    "temperature": 0.4,  # Lower temperature = less verbose/creative
-                    "stop": ["<thinking>", "<reasoning>", "\n\n", "Let me"],  # Stop before reasoning
-                },
-            )
-            
-            if response.status_code == 404:
-                error_body = response.text
-                logger.error(f"Model not found for response generation. Response: {error_body}")
-                return "I apologize, I'm having trouble processing your request. Could you please repeat that?"
-            
-            response.raise_for_status()
-            data = response.json()
+            self._round_trips += 1
+            data = await self._transport.complete(self._response_request(messages), kind="respond")
+            self._prompts.record_usage("respond", data.get("usage"), messages)
             
             content = data["choices"][0]["message"]["content"]
             
@@ -529,21 +675,101 @@ OUTPUT FORMAT: Reply with ONLY spoken words. 1-2 sentences. No greetings if alre
             
             # If response got wiped, generate contextual fallback
             if len(content) < 10:
-                if context.get("meeting_scheduled") and context.get("meeting_details"):
-                    details = context["meeting_details"]
-                    content = f"Done! I've scheduled '{details.get('title')}' for {details.get('time')} on {details.get('date')}. You're all set!"
-                elif context.get("meeting_error"):
-                    content = "I'm sorry, there was an issue scheduling that meeting. Would you like to try a different time?"
-                elif context.get("calendar_busy"):
-                    content = "I found some conflicts on the calendar. Let me tell you what times are available."
-                else:
-                    content = "How can I help you?"
+                content = self._fallback_response(context)
             
             return content
             
         except Exception as e:
             logger.error(f"Failed to generate response: {e}")
-            return "I apologize, I'm having trouble processing your request. Could you please repeat that?"
+            return self.ERROR_RESPONSE
+
+    async def stream_response(
+        self,
+        transcript: str,
+        context: dict[str, Any],
+        tool_messages: list[dict[str, Any]] | None = None,
+    ) -> AsyncIterator[str]:
+        """Stream a contextual response sentence by sentence.
+        
+        Consumes the Fireworks server-sent event stream and yields each
+        sentence, cleaned, as soon as it is complete so speech synthesis can
+        start before the rest of the reply has been generated.
+        
+        Args:
+            transcript: The transcribed caller speech.
+            context: Current conversation context including search results.
+            tool_messages: Tool results from ``tool_result_messages`` when
+                continuing a fast-path turn.
+            
+        Yields:
+            Cleaned sentences of the response, in order.
+        """
+        messages = await self._build_response_messages(transcript, context, tool_messages)
+        # Reasoning blocks are dropped token by token, before sentence splitting
+        sanitizer = StreamingSanitizer()
+        splitter = SentenceSplitter()
+        spoken = False
+
+        try:
+            self._round_trips += 1
+            async with self._transport.stream(
+                self._response_request(messages, stream=True), kind="respond_stream"
+            ) as response:
+                usage: dict[str, Any] = {}
+                async for delta in self._iter_stream_deltas(response, usage):
+                    for sentence in splitter.feed(sanitizer.feed(delta)):
+                        cleaned = self._clean_ai_response(sentence)
+                        if cleaned:
+                            spoken = True
+                            yield cleaned
+
+            self._prompts.record_usage("respond", usage, messages)
+            remaining = splitter.feed(sanitizer.flush())
+            remaining.append(splitter.flush())
+            for sentence in remaining:
+                cleaned = self._clean_ai_response(sentence)
+                if cleaned:
+                    spoken = True
+                    yield cleaned
+
+        except Exception as e:
+            logger.error(f"Failed to stream response: {e}")
+            if not spoken:
+                yield self.ERROR_RESPONSE
+            return
+
+        # If the whole response got wiped, use the contextual fallback
+        if not spoken:
+            yield self._fallback_response(context)
+
+    @staticmethod
+    async def _iter_stream_deltas(
+        response: httpx.Response, usage: dict[str, Any] | None = None
+    ) -> AsyncIterator[str]:
+        """Yield content deltas from a chat completions SSE stream.
+        
+        Args:
+            response: The streaming response.
+            usage: Filled with the token usage if the stream reports it.
+        """
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                break
+            try:
+                chunk = json.loads(data)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping malformed stream chunk: {data[:100]}")
+                continue
+            if usage is not None and chunk.get("usage"):
+                usage.update(chunk["usage"])
+            choices = chunk.get("choices") or []
+            if choices:
+                content = (choices[0].get("delta") or {}).get("content")
+                if content:
+                    yield content
 
     def _parse_scheduling_request(self, transcript: str) -> dict[str, Any] | None:
         """Parse a scheduling request from transcript without AI.
@@ -769,22 +995,11 @@ OUTPUT FORMAT: Reply with ONLY spoken words. 1-2 sentences. No greetings if alre
                 action_taken="No action."
             )
 
-        system_prompt = await self._build_system_prompt() + """
+        system_prompt = self._prompts.prefix + """
 
 You are analyzing a completed call log. Your job is to summarize the call and determine the final outcome.
 Output a JSON object with the following fields:
-- summary: A concise 1-sentence summary of what the caller wanted.
-- decision: One of ['handled', 'scheduled', 'escalated', 'rejected'].
-- decision_label: A short 2-3 word label for the decision (e.g., "Meeting booked", "Spam rejected").
-- reasoning: Why you made this decision.
-- action_taken: What specific action was taken during the call.
-
-Decision Guidelines:
-- scheduled: If a meeting, appointment, or follow-up was explicitly booked/confirmed.
-- escalated: If the caller needs to speak to the boss/human and you couldn't resolve it, or if it's high priority.
-- rejected: If it was spam, wrong number, or explicitly turned away.
-- handled: If the caller's question was answered or issue resolved automatically without needing further action.
-"""
+""" + OUTCOME_GUIDELINES
 
         messages = [
             {"role": "system", "content": system_prompt},
@@ -792,32 +1007,19 @@ Decision Guidelines:
         ]
 
         try:
-            response = await self._client.post(
-                self.FIREWORKS_API_URL,
-                headers={
-                    "Authorization": f"Bearer {self._api_key}",
-                    "Content-Type": "application/json",
-                },
-                json={
+            data = await self._transport.complete(
+                {
                     "model": self.MODEL,
                     "messages": messages,
                     "response_format": {"type": "json_object"},
                     "max_tokens": 500,
                 },
+                kind="analyze",
             )
-            response.raise_for_status()
-            data = response.json()
+            self._prompts.record_usage("analyze", data.get("usage"), messages)
             content = data["choices"][0]["message"]["content"]
             
-            result = json.loads(content)
-            
-            return CallOutcome(
-                summary=result.get("summary", "No summary available"),
-                decision=result.get("decision", "handled"),
-                decision_label=result.get("decision_label", "Call processed"),
-                reasoning=result.get("reasoning", "No reasoning provided"),
-                action_taken=result.get("action_taken", "Call logged")
-            )
+            return CallOutcome.from_dict(json.loads(content))
             
         except Exception as e:
             logger.error(f"Failed to analyze call outcome: {e}")
@@ -829,9 +1031,138 @@ Decision Guidelines:
                 action_taken="Logged for review"
             )
 
+    async def analyze_call_outcomes(self, transcripts: list[list[str]]) -> list[CallOutcome]:
+        """Analyze several finished calls in a single completion.
+        
+        Unlike ``analyze_call_outcome``, errors are raised so the post-call
+        queue can retry the batch.
+        
+        Args:
+            transcripts: Transcript segments of each call.
+            
+        Returns:
+            One CallOutcome per transcript, in the same order.
+            
+        Raises:
+            ValueError: If the model's reply does not cover every call.
+        """
+        outcomes: list[CallOutcome | None] = [None] * len(transcripts)
+        calls: list[tuple[int, str]] = []
+        for i, transcript in enumerate(transcripts):
+            text = "\n".join(transcript)
+            if text.strip():
+                calls.append((i, text))
+            else:
+                outcomes[i] = CallOutcome(
+                    summary="Empty call",
+                    decision="rejected",
+                    decision_label="No input",
+                    reasoning="Caller did not speak.",
+                    action_taken="No action."
+                )
+        
+        if calls:
+            system_prompt = self._prompts.prefix + """
+
+You are analyzing completed call logs. For each call, summarize it and determine the final outcome.
+Output a JSON object {"calls": [...]} with one entry per call, each with a "call" field (the call number) and the following fields:
+""" + OUTCOME_GUIDELINES
+            log = "\n\n".join(f"=== Call {n} ===\n{text}" for n, (_, text) in enumerate(calls, 1))
+            messages = [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": f"Here are the call transcripts:\n\n{log}"},
+            ]
+            data = await self._transport.complete(
+                {
+                    "model": self.MODEL,
+                    "messages": messages,
+                    "response_format": {"type": "json_object"},
+                    "max_tokens": 400 * len(calls),
+                },
+                kind="analyze",
+            )
+            self._prompts.record_usage("analyze", data.get("usage"), messages)
+            results = json.loads(data["choices"][0]["message"]["content"]).get("calls") or []
+            
+            by_number = {
+                r.get("call"): r for r in results if isinstance(r, dict)
+            }
+            for n, (i, _) in enumerate(calls, 1):
+                result = by_number.get(n, by_number.get(str(n)))
+                if result is None:
+                    raise ValueError(f"Analysis is missing call {n} of {len(calls)}")
+                outcomes[i] = CallOutcome.from_dict(result)
+        
+        return outcomes  # type: ignore[return-value]
+
+    async def summarize_history(
+        self, summary: str, turns: list[dict[str, Any]]
+    ) -> str | None:
+        """Fold older conversation turns into a running summary.
+        
+        Args:
+            summary: Summary of the conversation so far (may be empty).
+            turns: Turns to add, oldest first, each with "user" and "assistant".
+            
+        Returns:
+            The updated summary, or None if summarization failed.
+        """
+        exchanges = "\n".join(
+            f"Caller: {t.get('user', '')}\nReceptionist: {t.get('assistant', '')}" for t in turns
+        )
+        messages = [
+            {
+                "role": "system",
+                "content": (
+                    "You maintain a running summary of a phone call for the receptionist. "
+                    "Update the summary with the new exchanges. Keep names, dates, times, "
+                    "requests and anything already agreed. Reply with the summary only, "
+                    "at most 3 sentences."
+                ),
+            },
+            {
+                "role": "user",
+                "content": f"Summary so far: {summary or '(none)'}\n\nNew exchanges:\n{exchanges}",
+            },
+        ]
+
+        try:
+            data = await self._transport.complete(
+                {
+                    "model": self.MODEL,
+                    "messages": messages,
+                    "max_tokens": 150,
+                    "temperature": 0.2,
+                },
+                kind="summarize",
+            )
+            self._prompts.record_usage("summarize", data.get("usage"), messages)
+            content = data["choices"][0]["message"].get("content") or ""
+        except Exception as e:
+            logger.error(f"Failed to summarize conversation history: {e}")
+            return None
+        
+        # Only drop reasoning blocks: the speech cleanup would discard summary
+        # sentences such as "The caller wants..."
+        content = re.sub(
+            r"<(think|thinking|reasoning|scratchpad|reflection|internal)>.*?</\1>",
+            "",
+            content,
+            flags=re.DOTALL | re.IGNORECASE,
+        )
+        return content.strip() or None
+
+    def transport_stats(self) -> dict[str, Any]:
+        """Get LLM request counters, circuit state and latency histograms."""
+        return self._transport.stats()
+
+    def turn_budget(self) -> AbstractContextManager[None]:
+        """Context in which all LLM requests share one caller turn's deadline."""
+        return self._transport.turn_budget()
+
     async def close(self) -> None:
         """Close the HTTP client."""
-        await self._client.aclose()
+        await self._transport.close()
 
 
 
@@ -0,0 +1,183 @@
+"""Cleanup of model output before it is spoken.
+
+The model sometimes narrates its reasoning or tool use ("Let me check the
+calendar...", ``<thinking>`` blocks, ``*checks notes*``). ``clean_response``
+removes that so only words meant for the caller reach TTS. It runs on every
+reply on the latency path, so all patterns are compiled once here and the
+per-line filters are merged into a single alternation.
+
+``StreamingSanitizer`` drops reasoning blocks from a streamed completion as
+tokens arrive, so the sentence splitter never buffers (and re-scans) them.
+"""
+
+import re
+
+_TAG_BLOCKS = tuple(
+    re.compile(rf"<{tag}>.*?</{tag}>", re.DOTALL | re.IGNORECASE)
+    for tag in ("thinking", "reasoning", "scratchpad", "reflection", "internal", "response", "output")
+)
+_ANY_TAG_BLOCK = re.compile(r"<[^>]+>.*?</[^>]+>", re.DOTALL | re.IGNORECASE)
+_STRAY_TAG = re.compile(r"</?[a-z_]+/?>", re.IGNORECASE)
+
+# Stage directions and bracketed notes
+_ACTION = re.compile(r"\*[^*]+\*")
+_BRACKETED = re.compile(r"\[[^\]]+\]")
+_INTERNAL_ASIDE = re.compile(
+    r"\([^)]*(?:check|search|look|find|use|tool|calendar|email|system|internal)[^)]*\)",
+    re.IGNORECASE,
+)
+
+# Lines that start like internal thought, as one alternation (used with match)
+_REASONING_LINE = re.compile(
+    r"(?:The user|They|So,?\s+the|According to|Looking at|Here,|Actually,|Following|My instructions)"
+    r"|(?:I need to|I should|I will|I'll|Let me|I'm going to|I am going to)"
+    r"|(?:First,|Then,|Next,|After that,|Finally,|Now,|Step \d)"
+    r"|(?:The caller|This means|Based on|Given that|Since)"
+    r"|(?:Checking|Searching|Looking up|Using|Calling|Invoking)"
+    r"|(?:Okay so|Alright so|So basically|Hmm,|Well,\s+(?:the|I|let))",
+    re.IGNORECASE,
+)
+_NOTE_MARKS = re.compile("[❌✓✔]")
+_NUMBERED = re.compile(r"\d+\.\s+")
+_STEP_WORDS = re.compile("check|search|find|use|look|call|need")
+_TOOL_NAMES = re.compile("search_emails|search_contacts|check_calendar|schedule_meeting")
+
+_NARRATION = re.compile(
+    r"(?:Let me|I'll|I will|I'm going to)\s+(?:check|search|look up|use|call|invoke|see|find).*?(?:\.|!|$)",
+    re.IGNORECASE,
+)
+_TOOL_NARRATION = re.compile(
+    r"(?:Using|Calling|Invoking|Checking|Looking at|Searching)\s+(?:the\s+)?"
+    r"(?:search_emails|search_contacts|check_calendar|schedule_meeting|calendar|tool|system).*?(?:\.|!|$)",
+    re.IGNORECASE,
+)
+_ELLIPSIS = re.compile(r"\.{3,}")
+_SPACES = re.compile(r"\s{2,}")
+_LEADING_PUNCTUATION = re.compile(r"^[.,!?\s]+")
+_TRAILING_PUNCTUATION = re.compile(r"\s+[.,]+$")
+
+
+def _is_internal_line(line: str) -> bool:
+    """Whether a (stripped) line reads as reasoning rather than speech."""
+    if _REASONING_LINE.match(line):
+        return True
+    # Bullet points that look like reasoning
+    if line.startswith("- ") and len(line) > 40:
+        return True
+    # Emojis commonly used for internal notes
+    if _NOTE_MARKS.search(line):
+        return True
+    lower = line.lower()
+    # Numbered lists that look like internal steps
+    if _NUMBERED.match(line) and _STEP_WORDS.search(lower):
+        return True
+    # Lines that mention tools by name
+    return bool(_TOOL_NAMES.search(lower))
+
+
+def clean_response(content: str) -> str:
+    """Remove reasoning, tool narration and stage directions from model output.
+
+    Args:
+        content: Raw model output.
+
+    Returns:
+        Text to speak, or "" if too little is left (callers then use a
+        contextual fallback).
+    """
+    # Remove XML-style blocks and stray tags
+    for pattern in _TAG_BLOCKS:
+        content = pattern.sub("", content)
+    content = _ANY_TAG_BLOCK.sub("", content)
+    content = _STRAY_TAG.sub("", content)
+
+    # Remove asterisk/bracket-wrapped actions and asides about internal processing
+    content = _ACTION.sub("", content)
+    content = _BRACKETED.sub("", content)
+    content = _INTERNAL_ASIDE.sub("", content)
+
+    clean_lines = []
+    for line in content.split("\n"):
+        line_stripped = line.strip()
+        # Skip empty lines at the start
+        if not line_stripped and not clean_lines:
+            continue
+        if _is_internal_line(line_stripped):
+            continue
+        clean_lines.append(line_stripped)
+    content = " ".join(clean_lines)
+
+    # Remove remaining tool call narration
+    content = _NARRATION.sub("", content)
+    content = _TOOL_NARRATION.sub("", content)
+    content = _ELLIPSIS.sub("", content)
+
+    # Clean up whitespace and leftover punctuation
+    content = _SPACES.sub(" ", content).strip()
+    content = _LEADING_PUNCTUATION.sub("", content)
+    content = _TRAILING_PUNCTUATION.sub(".", content)
+
+    if len(content) < 5:
+        return ""
+    return content
+
+
+class StreamingSanitizer:
+    """Removes reasoning blocks from streamed text token by token.
+
+    Text outside ``<thinking>``-style blocks is passed through as soon as it
+    cannot be the start of an opening tag; text inside a block is discarded
+    as it arrives. The output still needs ``clean_response`` per sentence.
+    """
+
+    _OPEN = re.compile(r"<(thinking|reasoning|scratchpad|reflection|internal)>", re.IGNORECASE)
+    _CLOSE = {
+        tag: re.compile(rf"</{tag}>", re.IGNORECASE)
+        for tag in ("thinking", "reasoning", "scratchpad", "reflection", "internal")
+    }
+    # Longer than any opening or closing tag, to catch tags split across tokens
+    _TAG_WINDOW = 16
+
+    def __init__(self) -> None:
+        self._pending = ""
+        self._closing: re.Pattern[str] | None = None
+        self.dropped_blocks = 0
+
+    def feed(self, text: str) -> str:
+        """Add streamed text and return the part that is safe to pass on."""
+        self._pending += text
+        out = []
+        while self._pending:
+            if self._closing:
+                match = self._closing.search(self._pending)
+                if not match:
+                    self._pending = self._pending[-self._TAG_WINDOW:]
+                    break
+                self._pending = self._pending[match.end():]
+                self._closing = None
+                self.dropped_blocks += 1
+                continue
+
+            match = self._OPEN.search(self._pending)
+            if match:
+                out.append(self._pending[:match.start()])
+                self._closing = self._CLOSE[match.group(1).lower()]
+                self._pending = self._pending[match.end():]
+                continue
+
+            # Hold back what may be the start of an opening tag
+            start = self._pending.rfind("<")
+            if start != -1 and len(self._pending) - start < self._TAG_WINDOW and ">" not in self._pending[start:]:
+                out.append(self._pending[:start])
+                self._pending = self._pending[start:]
+            else:
+                out.append(self._pending)
+                self._pending = ""
+            break
+        return "".join(out)
+
+    def flush(self) -> str:
+        """Return held-back text at the end of the stream (an unclosed block is dropped)."""
+        remainder = "" if self._closing else self._pending
+        self._pending, self._closing = "", None
+        return remainder
@@ -0,0 +1,348 @@
+"""Write-behind queue for meetings booked during calls.
+
+``schedule_meeting`` used to insert the Google event mid-turn, so a slow
+Google response delayed the spoken confirmation and a retried tool call or
+a repeated request could book the meeting twice. ``SchedulingQueue``
+instead records a tentative hold in the ``meeting_holds`` collection and
+returns at once; a background worker writes held meetings to Google.
+
+- A hold's ``_id`` is an idempotency key derived from the call SID, title
+  and start time, and it is created with an atomic upsert, so the same
+  request within a call always maps to one hold.
+- The Google event ID is derived from the same key. If a write succeeded
+  but was not recorded (timeout, restart), the retry gets HTTP 409 and the
+  hold is marked confirmed instead of creating a duplicate.
+- Failed writes are retried with exponential backoff; after
+  ``max_attempts`` the hold is marked failed and shown in the admin UI,
+  which can requeue it.
+- A worker claims a hold by pushing its ``next_attempt_at`` past a lease,
+  so several workers can share the queue.
+- Availability checks read holds from the collection, so a slot held on
+  one worker is busy on every worker before it reaches Google and the
+  calendar mirror. Once the mirror has synced past a hold's confirmation,
+  only the mirrored event counts, so moving or deleting it in Google frees
+  the slot.
+"""
+
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from googleapiclient.errors import HttpError
+from pymongo import ReturnDocument
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.errors import DuplicateKeyError
+
+from .calendar_gateway import CalendarGateway
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+CONFIRMED = "confirmed"
+FAILED = "failed"
+
+
+def hold_key(call_sid: str, title: str, start: datetime) -> str:
+    """Idempotency key of a meeting request within a call.
+
+    Hex digits are valid Google event ID characters, so the key doubles as
+    the event ID.
+    """
+    raw = f"{call_sid}|{title.strip().lower()}|{start.astimezone(timezone.utc).isoformat()}"
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+class SchedulingQueue:
+    """Records meeting holds in MongoDB and writes them to Google in the background."""
+
+    DEFAULT_MAX_ATTEMPTS = 5
+    DEFAULT_POLL_INTERVAL = 10.0
+    RETRY_BASE_SECONDS = 5.0
+    # How long a claimed hold is left alone before another worker may retry it
+    LEASE = timedelta(seconds=60)
+
+    def __init__(
+        self,
+        gateway: CalendarGateway,
+        collection: AsyncCollection,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ):
+        """Initialize the queue.
+
+        Args:
+            gateway: Google Calendar client used for the writes
+            collection: Hold storage, e.g. ``db_manager.aio.meeting_holds``
+            max_attempts: Google write attempts before a hold is marked failed
+            poll_interval: Seconds between scans for due holds
+        """
+        self._gateway = gateway
+        self._collection = collection
+        self._max_attempts = max_attempts
+        self._poll_interval = poll_interval
+
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+        self.holds = 0
+        self.duplicates = 0
+        self.written = 0
+        self.reconciled = 0
+        self.retries = 0
+        self.failures = 0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def ensure_indexes(self) -> None:
+        """Create the indexes for the due-hold scan and busy-time queries."""
+        await self._collection.create_index([("status", 1), ("next_attempt_at", 1)])
+        await self._collection.create_index([("end_at", 1), ("start_at", 1)])
+
+    def start(self) -> None:
+        """Start writing holds to Google in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background writer (unwritten holds stay pending)."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.process_due()
+            except Exception as e:
+                logger.error(f"Meeting write-behind failed: {e}")
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), self._poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    # ------------------------------------------------------------------
+    # Holds
+    # ------------------------------------------------------------------
+
+    async def find(self, call_sid: str, title: str, start: datetime) -> dict[str, Any] | None:
+        """Get the hold for a meeting request, if it was already made."""
+        return await self._collection.find_one({"_id": hold_key(call_sid, title, start)})
+
+    async def hold(
+        self,
+        call_sid: str,
+        title: str,
+        start: datetime,
+        end: datetime,
+        event: dict[str, Any],
+    ) -> tuple[dict[str, Any], bool]:
+        """Record a tentative meeting and queue its Google write.
+
+        Args:
+            call_sid: Call the meeting was booked on
+            title: Meeting title
+            start: Meeting start (timezone-aware)
+            end: Meeting end (timezone-aware)
+            event: Google event body to insert
+
+        Returns:
+            The hold document and whether it was created (False if the same
+            request was already held)
+        """
+        key = hold_key(call_sid, title, start)
+        now = datetime.now(timezone.utc)
+        doc = {
+            "_id": key,
+            "call_sid": call_sid,
+            "title": title,
+            "start_at": start.astimezone(timezone.utc),
+            "end_at": end.astimezone(timezone.utc),
+            "event": event,
+            "status": PENDING,
+            "attempts": 0,
+            "last_error": None,
+            "html_link": "",
+            "created_at": now,
+            "updated_at": now,
+            "next_attempt_at": now,
+        }
+        try:
+            existing = await self._collection.find_one_and_update(
+                {"_id": key},
+                {"$setOnInsert": {k: v for k, v in doc.items() if k != "_id"}},
+                upsert=True,
+                return_document=ReturnDocument.BEFORE,
+            )
+        except DuplicateKeyError:
+            # A concurrent upsert of the same key won
+            existing = await self._collection.find_one({"_id": key})
+
+        if existing is not None:
+            self.duplicates += 1
+            logger.info(f"Meeting hold {key} already exists ({existing.get('status')})")
+            return existing, False
+
+        self.holds += 1
+        self._wake.set()
+        logger.info(f"Held meeting '{title}' at {start.isoformat()} ({key})")
+        return doc, True
+
+    async def busy_between(
+        self, start: datetime, end: datetime, mirrored_until: datetime | None = None
+    ) -> list[tuple[datetime, datetime]]:
+        """Holds overlapping ``[start, end)`` that the calendar may not show yet.
+
+        Pending holds always count. A confirmed hold only counts until the
+        calendar mirror has synced past its confirmation: after that the
+        mirror has the event, or the owner has moved or deleted it.
+
+        Args:
+            start: Start of the range
+            end: End of the range
+            mirrored_until: Start of the mirror's last successful sync (every
+                confirmed hold counts if None)
+        """
+        confirmed: dict[str, Any] = {"status": CONFIRMED}
+        if mirrored_until is not None:
+            confirmed["confirmed_at"] = {"$gt": mirrored_until.astimezone(timezone.utc)}
+        cursor = self._collection.find(
+            {
+                "$or": [{"status": PENDING}, confirmed],
+                "end_at": {"$gt": start.astimezone(timezone.utc)},
+                "start_at": {"$lt": end.astimezone(timezone.utc)},
+            },
+            {"start_at": 1, "end_at": 1},
+        )
+        return [(_aware(doc["start_at"]), _aware(doc["end_at"])) async for doc in cursor]
+
+    # ------------------------------------------------------------------
+    # Google writes
+    # ------------------------------------------------------------------
+
+    async def process_due(self) -> int:
+        """Write every due pending hold to Google; returns how many were tried."""
+        processed = 0
+        while True:
+            now = datetime.now(timezone.utc)
+            doc = await self._collection.find_one_and_update(
+                {"status": PENDING, "next_attempt_at": {"$lte": now}},
+                {"$set": {"next_attempt_at": now + self.LEASE}},
+                sort=[("next_attempt_at", 1)],
+                return_document=ReturnDocument.AFTER,
+            )
+            if doc is None:
+                return processed
+            await self._write(doc)
+            processed += 1
+
+    async def _write(self, doc: dict[str, Any]) -> None:
+        key = doc["_id"]
+        try:
+            event = await self._gateway.insert_event({**doc["event"], "id": key})
+        except HttpError as e:
+            if getattr(e.resp, "status", None) == 409:
+                # Created by an earlier attempt whose result was lost
+                self.reconciled += 1
+                await self._confirm(key, "")
+                return
+            await self._fail(doc, e)
+            return
+        except Exception as e:
+            await self._fail(doc, e)
+            return
+
+        self.written += 1
+        await self._confirm(key, event.get("htmlLink", ""))
+
+    async def _confirm(self, key: str, html_link: str) -> None:
+        now = datetime.now(timezone.utc)
+        await self._collection.update_one(
+            {"_id": key},
+            {"$set": {
+                "status": CONFIRMED,
+                "html_link": html_link,
+                "last_error": None,
+                "confirmed_at": now,
+                "updated_at": now,
+            }},
+        )
+        logger.info(f"Meeting hold {key} written to Google Calendar")
+
+    async def _fail(self, doc: dict[str, Any], error: Exception) -> None:
+        attempts = doc.get("attempts", 0) + 1
+        now = datetime.now(timezone.utc)
+        update: dict[str, Any] = {"attempts": attempts, "last_error": str(error), "updated_at": now}
+        if attempts >= self._max_attempts:
+            update["status"] = FAILED
+            self.failures += 1
+            logger.error(f"Meeting hold {doc['_id']} failed after {attempts} attempts: {error}")
+        else:
+            update["next_attempt_at"] = now + timedelta(
+                seconds=self.RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+            )
+            self.retries += 1
+            logger.warning(f"Meeting hold {doc['_id']} write failed (attempt {attempts}): {error}")
+        await self._collection.update_one({"_id": doc["_id"]}, {"$set": update})
+
+    # ------------------------------------------------------------------
+    # Admin
+    # ------------------------------------------------------------------
+
+    async def list_holds(self, status: str | None = None, limit: int = 100) -> list[dict[str, Any]]:
+        """Get holds, newest first, optionally filtered by status."""
+        query = {"status": status} if status else {}
+        cursor = self._collection.find(query).sort("created_at", -1).limit(limit)
+        holds = []
+        async for doc in cursor:
+            holds.append({
+                "id": doc["_id"],
+                "call_sid": doc.get("call_sid"),
+                "title": doc.get("title"),
+                "start_at": doc.get("start_at"),
+                "end_at": doc.get("end_at"),
+                "status": doc.get("status"),
+                "attempts": doc.get("attempts", 0),
+                "last_error": doc.get("last_error"),
+                "html_link": doc.get("html_link", ""),
+                "created_at": doc.get("created_at"),
+                "updated_at": doc.get("updated_at"),
+            })
+        return holds
+
+    async def retry(self, key: str) -> bool:
+        """Requeue a failed hold; returns False if there is no failed hold with that key."""
+        now = datetime.now(timezone.utc)
+        doc = await self._collection.find_one_and_update(
+            {"_id": key, "status": FAILED},
+            {"$set": {"status": PENDING, "attempts": 0, "next_attempt_at": now, "updated_at": now}},
+            return_document=ReturnDocument.AFTER,
+        )
+        if doc is None:
+            return False
+        self._wake.set()
+        return True
+
+    def stats(self) -> dict[str, int]:
+        """Get hold and write counters."""
+        return {
+            "holds": self.holds,
+            "duplicates": self.duplicates,
+            "written": self.written,
+            "reconciled": self.reconciled,
+            "retries": self.retries,
+            "failures": self.failures,
+        }
+
+
+def _aware(value: datetime) -> datetime:
+    """MongoDB returns naive UTC datetimes; make them timezone-aware."""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
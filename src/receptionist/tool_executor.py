@@ -0,0 +1,481 @@
+"""Concurrent execution of reasoning engine tool calls.
+
+Tool calls from ``ReasoningEngine.decide_action`` are grouped into stages by
+their dependencies. Calls within a stage run concurrently, each under its own
+timeout, and later stages start only after the earlier ones finish. Handlers
+return context updates instead of mutating the call context; the updates are
+merged in the order the model issued the calls, so the outcome does not
+depend on which tool finished first.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from .availability import AvailabilityEngine, describe_slot
+from .calendar_gateway import CalendarGateway, CalendarUnavailable
+from .calendar_mirror import CalendarMirror
+from .calendar_service import CalendarService
+from .google_auth import authenticate_google, save_credentials
+from .reasoning_engine import Tool, ToolCall
+from .scheduling_queue import SchedulingQueue
+from .vector_search import VectorSearch
+
+logger = logging.getLogger(__name__)
+
+PACIFIC_TZ = ZoneInfo("America/Los_Angeles")
+
+ToolHandler = Callable[[dict[str, Any], dict[str, Any]], Awaitable[dict[str, Any]]]
+
+
+@dataclass
+class ToolTiming:
+    """Timing of a single tool call within a turn."""
+
+    tool: str
+    duration_ms: float
+    status: str  # ok, error, timeout, skipped
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for storage in the call context."""
+        return {
+            "tool": self.tool,
+            "duration_ms": round(self.duration_ms, 1),
+            "status": self.status,
+        }
+
+
+@dataclass
+class ToolExecutionResult:
+    """Merged outcome of all tool calls in a turn."""
+
+    updates: dict[str, Any] = field(default_factory=dict)
+    timings: list[ToolTiming] = field(default_factory=list)
+    should_end_call: bool = False
+    # Per-call result (status plus that call's updates), in call order
+    results: list[dict[str, Any]] = field(default_factory=list)
+
+
+class ToolExecutor:
+    """Runs tool calls concurrently, respecting dependencies between tools."""
+
+    # Tools that must wait for other tools issued in the same turn
+    DEPENDENCIES: dict[Tool, set[Tool]] = {
+        Tool.SCHEDULE_MEETING: {Tool.CHECK_CALENDAR},
+    }
+
+    # Per-tool timeouts in seconds
+    DEFAULT_TIMEOUT = 5.0
+    TIMEOUTS: dict[Tool, float] = {
+        Tool.SEARCH_CONTACTS: 3.0,
+        Tool.SEARCH_EMAILS: 3.0,
+        Tool.CHECK_CALENDAR: 5.0,
+        Tool.SCHEDULE_MEETING: 10.0,
+    }
+
+    # Context key that surfaces a failure of the tool to the response prompt
+    ERROR_KEYS: dict[Tool, str] = {
+        Tool.CHECK_CALENDAR: "calendar_error",
+        Tool.SCHEDULE_MEETING: "meeting_error",
+    }
+
+    def __init__(
+        self,
+        vector_search: VectorSearch | None = None,
+        calendar_service: CalendarService | None = None,
+        timeouts: dict[Tool, float] | None = None,
+        calendar_gateway: CalendarGateway | None = None,
+        calendar_mirror: CalendarMirror | None = None,
+        availability: AvailabilityEngine | None = None,
+        scheduling_queue: SchedulingQueue | None = None,
+    ) -> None:
+        """Initialize the executor.
+
+        Args:
+            vector_search: Vector search for contact/email lookups (optional).
+            calendar_service: Calendar service; enables scheduling (optional).
+            timeouts: Overrides for the per-tool timeouts.
+            calendar_gateway: Google Calendar client for availability checks
+                and scheduling (defaults to one using token.json).
+            calendar_mirror: Local calendar copy that answers availability
+                checks while it is fresh (optional).
+            availability: Free/busy engine for open slots and conflict checks
+                (defaults to one over the gateway and mirror).
+            scheduling_queue: Records meetings as holds and writes them to
+                Google in the background; without it meetings are inserted
+                during the turn (optional).
+        """
+        self._timeouts = {**self.TIMEOUTS, **(timeouts or {})}
+        self._calendar = calendar_gateway or CalendarGateway(authenticate_google, save_credentials)
+        self._scheduling_queue = scheduling_queue
+        self._availability = availability or AvailabilityEngine(
+            self._calendar, calendar_mirror, PACIFIC_TZ, holds=scheduling_queue
+        )
+
+        self._handlers: dict[Tool, ToolHandler] = {
+            Tool.CHECK_CALENDAR: self._check_calendar,
+            Tool.END_CALL: self._end_call,
+        }
+        if vector_search:
+            self._vector_search = vector_search
+            self._handlers[Tool.SEARCH_CONTACTS] = self._search_contacts
+            self._handlers[Tool.SEARCH_EMAILS] = self._search_emails
+        if calendar_service:
+            self._handlers[Tool.SCHEDULE_MEETING] = self._schedule_meeting
+
+        # Aggregate timings per tool: calls, total_ms, max_ms, errors, timeouts
+        self._stats: dict[str, dict[str, float]] = {}
+
+    def register(self, tool: Tool, handler: ToolHandler) -> None:
+        """Register or replace the handler for a tool.
+
+        Args:
+            tool: Tool to handle.
+            handler: Coroutine taking (arguments, context) and returning
+                context updates.
+        """
+        self._handlers[tool] = handler
+
+    def _stages(self, tool_calls: list[ToolCall]) -> list[list[int]]:
+        """Group call indices into stages that can each run concurrently."""
+        stage_of: dict[Tool, int] = {}
+
+        def depth(tool: Tool) -> int:
+            # A tool runs one stage after the deepest dependency present this turn
+            if tool not in stage_of:
+                deps = [tc.tool for tc in tool_calls if tc.tool in self.DEPENDENCIES.get(tool, set())]
+                stage_of[tool] = max((depth(dep) + 1 for dep in deps), default=0)
+            return stage_of[tool]
+
+        stages: dict[int, list[int]] = {}
+        for i, tc in enumerate(tool_calls):
+            stages.setdefault(depth(tc.tool), []).append(i)
+        return [stages[s] for s in sorted(stages)]
+
+    async def execute(
+        self, tool_calls: list[ToolCall], context: dict[str, Any]
+    ) -> ToolExecutionResult:
+        """Run a turn's tool calls and merge their context updates.
+
+        Updates from each stage are applied to ``context`` before the next
+        stage starts, so dependent tools see the results they depend on.
+
+        Args:
+            tool_calls: Tool calls in the order the model issued them.
+            context: Call context; updated in place with the merged results.
+
+        Returns:
+            Merged updates, per-tool timings and the end-call flag.
+        """
+        result = ToolExecutionResult()
+        timings: dict[int, ToolTiming] = {}
+        results: dict[int, dict[str, Any]] = {}
+
+        for stage in self._stages(tool_calls):
+            outcomes = await asyncio.gather(
+                *(self._run(tool_calls[i], context) for i in stage)
+            )
+            stage_updates: dict[str, Any] = {}
+            for i, (updates, timing) in sorted(zip(stage, outcomes)):
+                stage_updates.update(updates)
+                timings[i] = timing
+                results[i] = {"status": timing.status, **updates}
+                if tool_calls[i].tool == Tool.END_CALL:
+                    result.should_end_call = True
+            context.update(stage_updates)
+            result.updates.update(stage_updates)
+
+        result.timings = [timings[i] for i in sorted(timings)]
+        result.results = [results[i] for i in sorted(results)]
+        if result.timings:
+            logger.info(
+                "Tool timings: "
+                + ", ".join(f"{t.tool}={t.duration_ms:.0f}ms ({t.status})" for t in result.timings)
+            )
+        return result
+
+    async def _run(
+        self, tool_call: ToolCall, context: dict[str, Any]
+    ) -> tuple[dict[str, Any], ToolTiming]:
+        """Run one tool call under its timeout and record its timing."""
+        handler = self._handlers.get(tool_call.tool)
+        if handler is None:
+            return {}, ToolTiming(tool_call.tool.value, 0.0, "skipped")
+
+        timeout = self._timeouts.get(tool_call.tool, self.DEFAULT_TIMEOUT)
+        error_key = self.ERROR_KEYS.get(tool_call.tool)
+        started = time.perf_counter()
+        try:
+            updates = await asyncio.wait_for(handler(tool_call.arguments, context), timeout)
+            status = "error" if error_key and error_key in updates else "ok"
+        except asyncio.TimeoutError:
+            logger.error(f"Tool {tool_call.tool.value} timed out after {timeout}s")
+            updates = {error_key: "The request timed out"} if error_key else {}
+            status = "timeout"
+        except Exception as e:
+            logger.error(f"Tool {tool_call.tool.value} failed: {e}")
+            updates = {error_key: str(e)} if error_key else {}
+            status = "error"
+
+        timing = ToolTiming(tool_call.tool.value, (time.perf_counter() - started) * 1000, status)
+        self._record(timing)
+        return updates, timing
+
+    def _record(self, timing: ToolTiming) -> None:
+        """Add a timing to the aggregate per-tool stats."""
+        stats = self._stats.setdefault(
+            timing.tool,
+            {"calls": 0, "total_ms": 0.0, "max_ms": 0.0, "errors": 0, "timeouts": 0},
+        )
+        stats["calls"] += 1
+        stats["total_ms"] += timing.duration_ms
+        stats["max_ms"] = max(stats["max_ms"], timing.duration_ms)
+        if timing.status == "error":
+            stats["errors"] += 1
+        elif timing.status == "timeout":
+            stats["timeouts"] += 1
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Get per-tool call counts and latency figures."""
+        return {
+            tool: {
+                **stats,
+                "avg_ms": stats["total_ms"] / stats["calls"] if stats["calls"] else 0.0,
+            }
+            for tool, stats in self._stats.items()
+        }
+
+    # ------------------------------------------------------------------
+    # Tool handlers
+    # ------------------------------------------------------------------
+
+    async def _search_contacts(
+        self, arguments: dict[str, Any], context: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Look up contacts by name."""
+        name = arguments.get("name", "")
+        if not name:
+            return {}
+
+        results = await self._vector_search.search_contacts(name)
+        contacts = [
+            {
+                "name": r.metadata.get("name"),
+                "email": r.metadata.get("email"),
+                "company": r.metadata.get("company"),
+            }
+            for r in results
+        ]
+        return {"contacts": contacts}
+
+    async def _search_emails(
+        self, arguments: dict[str, Any], context: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Search emails semantically."""
+        query = arguments.get("query", "")
+        if not query:
+            return {}
+
+        results = await self._vector_search.search_emails(query)
+        emails = [
+            {
+                "sender": r.metadata.get("sender"),
+                "subject": r.metadata.get("subject"),
+                "content": r.content[:200] if r.content else "",
+            }
+            for r in results
+        ]
+        return {"emails": emails}
+
+    async def _check_calendar(
+        self, arguments: dict[str, Any], context: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Check calendar availability for a day."""
+        date_str = arguments.get("date", "")
+        if not date_str:
+            return {}
+
+        # Parse date in Pacific timezone
+        check_date = datetime.strptime(date_str, "%Y-%m-%d")
+        check_date = check_date.replace(hour=0, minute=0, second=0, tzinfo=PACIFIC_TZ)
+        end_date = check_date + timedelta(days=1)
+
+        try:
+            events = await self._availability.events_between(check_date, end_date)
+        except CalendarUnavailable:
+            logger.error("Google Calendar service not available")
+            return {}
+
+        logger.info(f"Calendar check for {date_str}: {len(events)} events found")
+        updates = _availability_updates(check_date, events)
+        # On a busy day, name a few open times so the model need not work them out
+        open_slots = []
+        if events:
+            open_slots = await self._availability.open_slots(
+                max(check_date, datetime.now(PACIFIC_TZ)), end_date, timedelta(minutes=30), events=events
+            )
+        updates["calendar_open_slots"] = [
+            slot.strftime("%I:%M %p").lstrip("0") for slot in open_slots
+        ]
+        return updates
+
+    async def _end_call(
+        self, arguments: dict[str, Any], context: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Record the model's request to hang up."""
+        farewell = arguments.get("farewell_message", "Goodbye!")
+        logger.info(f"AI requested end_call with message: {farewell}")
+        return {"end_call_message": farewell}
+
+    async def _schedule_meeting(
+        self, arguments: dict[str, Any], context: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Create a calendar event for the caller."""
+        if not (arguments.get("date") and arguments.get("time")):
+            return {}
+
+        title = arguments.get("title", "Meeting")
+        duration = arguments.get("duration_minutes", 30)
+        logger.info(f"Attempting to schedule: {title} on {arguments['date']} at {arguments['time']}")
+
+        start_time = _meeting_start(arguments["date"], arguments["time"])
+        length = timedelta(minutes=duration)
+
+        # A repeated request in the same call confirms the meeting already held
+        queue = self._scheduling_queue if context.get("call_sid") else None
+        held = await queue.find(context["call_sid"], title, start_time) if queue else None
+
+        # Offer open slots instead of double-booking a taken time
+        if held is None:
+            try:
+                busy = await self._availability.busy_between(start_time, start_time + length)
+                if busy:
+                    alternatives = await self._availability.alternatives(start_time, length)
+                    logger.info(f"Requested time is busy, offering {len(alternatives)} alternatives")
+                    return {
+                        "meeting_scheduled": False,
+                        "meeting_conflict": True,
+                        "meeting_requested": describe_slot(start_time, PACIFIC_TZ),
+                        "meeting_alternatives": [describe_slot(s, PACIFIC_TZ) for s in alternatives],
+                    }
+            except CalendarUnavailable:
+                logger.error("Google Calendar service not available")
+                return {"meeting_error": "Calendar service not authenticated"}
+            except Exception as e:
+                logger.warning(f"Availability check failed, booking without it: {e}")
+
+        event_body = _meeting_event(arguments, start_time, context.get("caller_number"))
+        if queue:
+            # Confirm now; the Google write happens in the background
+            if held is None:
+                held, _ = await queue.hold(
+                    context["call_sid"], title, start_time, start_time + length, event_body
+                )
+            link = held.get("html_link", "")
+        else:
+            try:
+                result = await self._calendar.insert_event(event_body)
+            except CalendarUnavailable:
+                logger.error("Google Calendar service not available")
+                return {"meeting_error": "Calendar service not authenticated"}
+            link = result.get("htmlLink", "")
+
+        # Format time for display (12-hour format)
+        display_time = start_time.strftime("%I:%M %p").lstrip("0")
+        display_date = start_time.strftime("%A, %B %d")
+        logger.info(f"Meeting scheduled: {title} at {display_time} on {display_date}")
+
+        return {
+            "meeting_scheduled": True,
+            "meeting_conflict": False,
+            "meeting_alternatives": [],
+            "meeting_details": {
+                "title": title,
+                "date": display_date,
+                "time": display_time,
+                "duration": duration,
+                "link": link,
+            },
+        }
+
+
+def _availability_updates(check_date: datetime, events: list[dict[str, Any]]) -> dict[str, Any]:
+    """Format a day's events as human-readable busy times."""
+    busy_times = []
+    for event in events:
+        start = event.get("start", {})
+        time_raw = start.get("dateTime", start.get("date", ""))
+        summary = event.get("summary", "Busy")
+
+        # Parse and format time nicely
+        try:
+            if "T" in time_raw:
+                event_time = datetime.fromisoformat(time_raw.replace("Z", "+00:00"))
+                formatted_time = event_time.astimezone(PACIFIC_TZ).strftime("%I:%M %p").lstrip("0")
+            else:
+                formatted_time = "All day"
+        except ValueError:
+            formatted_time = time_raw
+
+        busy_times.append(f"{formatted_time}: {summary}")
+
+    updates: dict[str, Any] = {
+        "calendar_busy": busy_times,
+        "calendar_check_date": check_date.strftime("%A, %B %d"),
+    }
+    if not events:
+        updates["calendar_available"] = True
+    return updates
+
+
+def _meeting_start(date_str: str, time_str: str) -> datetime:
+    """Parse a meeting's date and time as Pacific time."""
+    from dateutil import parser as date_parser
+
+    # Parse date and time robustly
+    try:
+        start_time = date_parser.parse(f"{date_str} {time_str}")
+    except (ValueError, OverflowError):
+        # Try parsing separately
+        d = date_parser.parse(date_str)
+        t = date_parser.parse(time_str)
+        start_time = datetime.combine(d.date(), t.time())
+
+    # Ensure timezone awareness (assuming Pacific as instructed)
+    if start_time.tzinfo is None:
+        return start_time.replace(tzinfo=PACIFIC_TZ)
+    return start_time.astimezone(PACIFIC_TZ)
+
+
+def _meeting_event(
+    arguments: dict[str, Any], start_time: datetime, caller_number: str | None
+) -> dict[str, Any]:
+    """Build the Google Calendar event for a schedule_meeting call."""
+    end_time = start_time + timedelta(minutes=arguments.get("duration_minutes", 30))
+    attendee_name = arguments.get("attendee_name", "")
+    attendee_email = arguments.get("attendee_email", "")
+
+    description = f"Call with {attendee_name}" if attendee_name else "Phone call meeting"
+    if caller_number:
+        description += f"\nCaller: {caller_number}"
+
+    event_body: dict[str, Any] = {
+        'summary': arguments.get("title", "Meeting"),
+        'description': description,
+        'start': {
+            'dateTime': start_time.isoformat(),
+            'timeZone': 'America/Los_Angeles',
+        },
+        'end': {
+            'dateTime': end_time.isoformat(),
+            'timeZone': 'America/Los_Angeles',
+        },
+    }
+    if attendee_email:
+        event_body['attendees'] = [{'email': attendee_email}]
+    return event_body
@@ -0,0 +1,492 @@
+"""Two-tier cache for synthesized speech.
+
+Audio is keyed by a hash of the voice, encoding and text, so the same phrase
+always maps to the same audio ID. The memory tier is an LRU bounded by total
+bytes. The optional disk tier stores one file per audio ID, written
+atomically so several uvicorn workers can share a directory. Files can be
+served directly (``FileResponse`` uses sendfile). Concurrent requests for
+the same phrase share one synthesis.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+Synthesizer = Callable[..., Awaitable[bytes]]
+
+
+class TTSCache:
+    """Byte-budgeted LRU of synthesized audio with a shared disk tier.
+
+    ``start`` kicks off synthesis in the background and returns the audio ID
+    immediately; ``get`` returns the audio, waiting for synthesis in flight
+    in this process or, via the disk tier, in another worker. Pinned audio
+    (see ``pin``) is kept outside the LRU budget and never evicted.
+    """
+
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+    DEFAULT_MAX_DISK_BYTES = 512 * 1024 * 1024
+
+    EXTENSIONS = {"mp3": "mp3", "mulaw": "ulaw"}
+    MEDIA_TYPES = {"mp3": "audio/mpeg", "mulaw": "audio/basic"}
+
+    # How long to wait for another worker that is synthesizing the same audio
+    PEER_WAIT_SECONDS = 10.0
+    PEER_POLL_INTERVAL = 0.05
+
+    _AUDIO_ID = re.compile(r"^[0-9a-f]{32}$")
+
+    def __init__(
+        self,
+        synthesize: Synthesizer,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        directory: str | None = None,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+        namespace: str = "",
+    ):
+        """Initialize the cache.
+
+        Args:
+            synthesize: Coroutine function ``(text, encoding=...) -> bytes``
+                used on a miss, e.g. ``VoicePipeline.synthesize_speech``
+            max_bytes: Memory budget for cached audio
+            directory: Directory for the disk tier (optional)
+            max_disk_bytes: Size the disk tier is pruned to by ``prune``
+            namespace: Extra key component, e.g. the TTS voice, so a voice
+                change does not serve stale audio
+        """
+        self._synthesize = synthesize
+        self._max_bytes = max(1, max_bytes)
+        self._max_disk_bytes = max_disk_bytes
+        self._namespace = namespace
+        self._directory = Path(directory) if directory else None
+        if self._directory:
+            self._directory.mkdir(parents=True, exist_ok=True)
+
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._pinned: dict[str, bytes] = {}
+        self._pinned_ids: set[str] = set()
+        # Encodings of audio in memory or in flight (dropped on eviction)
+        self._encodings: dict[str, str] = {}
+        self._bytes = 0
+        self._pending: dict[str, asyncio.Task[bytes]] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self.syntheses = 0
+        self.synthesis_errors = 0
+
+    def key(self, text: str, encoding: str = "mp3") -> str:
+        """Get the audio ID for a phrase."""
+        digest = hashlib.sha256(f"{self._namespace}\x00{encoding}\x00{text}".encode())
+        return digest.hexdigest()[:32]
+
+    @classmethod
+    def is_valid_id(cls, audio_id: str) -> bool:
+        """Check that an audio ID is well formed (and safe to use in a path)."""
+        return bool(cls._AUDIO_ID.match(audio_id))
+
+    def start(self, text: str, encoding: str = "mp3") -> str:
+        """Make sure audio for a phrase is cached or being synthesized.
+
+        Args:
+            text: Text to speak
+            encoding: Audio encoding passed to the synthesizer
+
+        Returns:
+            The audio ID
+        """
+        audio_id = self.key(text, encoding)
+        if audio_id in self._pinned or audio_id in self._entries or audio_id in self._pending:
+            return audio_id
+
+        # The disk tier is checked off the event loop, by the task
+        self._encodings[audio_id] = encoding
+        self._pending[audio_id] = asyncio.create_task(
+            self._synthesize_entry(audio_id, text, encoding)
+        )
+        return audio_id
+
+    async def _synthesize_entry(self, audio_id: str, text: str, encoding: str) -> bytes:
+        """Load a phrase from the disk tier, or synthesize it into both tiers."""
+        path = self._audio_path(audio_id, encoding)
+        try:
+            if path is not None:
+                audio = await asyncio.to_thread(_read_if_exists, path)
+                if audio is not None:
+                    self.disk_hits += 1
+                    self._remember(audio_id, audio, encoding)
+                    return audio
+                await asyncio.to_thread(self._write_sidecar, audio_id, text, encoding)
+
+            audio = await self._synthesize(text, encoding=encoding)
+            self.syntheses += 1
+            self._remember(audio_id, audio, encoding)
+            if path:
+                await asyncio.to_thread(_atomic_write, path, audio)
+            return audio
+        except Exception:
+            self.synthesis_errors += 1
+            await asyncio.to_thread(self._remove_sidecar, audio_id)
+            raise
+        finally:
+            self._pending.pop(audio_id, None)
+            if audio_id not in self._entries and audio_id not in self._pinned:
+                self._encodings.pop(audio_id, None)
+
+    async def has(self, audio_id: str) -> bool:
+        """Check whether audio is cached or being synthesized, without loading it."""
+        if audio_id in self._pinned or audio_id in self._entries or audio_id in self._pending:
+            return True
+        return await asyncio.to_thread(self.path, audio_id) is not None
+
+    async def store(self, text: str, audio: bytes, encoding: str = "mp3") -> str:
+        """Add audio synthesized elsewhere (e.g. streamed) to both tiers.
+
+        Returns:
+            The audio ID
+        """
+        audio_id = self.key(text, encoding)
+        self._remember(audio_id, audio, encoding)
+        path = self._audio_path(audio_id, encoding)
+        if path is not None:
+            await asyncio.to_thread(self._persist, path, audio_id, text, encoding, audio)
+        return audio_id
+
+    def _persist(self, path: Path, audio_id: str, text: str, encoding: str, audio: bytes) -> None:
+        """Write audio and its sidecar to the disk tier unless already there."""
+        if path.exists():
+            return
+        self._write_sidecar(audio_id, text, encoding)
+        try:
+            _atomic_write(path, audio)
+        except OSError as e:
+            logger.warning(f"Failed to write cached audio {path}: {e}")
+
+    def pin(self, audio_id: str) -> None:
+        """Keep audio in memory regardless of the byte budget."""
+        self._pinned_ids.add(audio_id)
+        audio = self._entries.pop(audio_id, None)
+        if audio is not None:
+            self._bytes -= len(audio)
+            self._pinned[audio_id] = audio
+
+    def unpin(self, audio_id: str) -> None:
+        """Return pinned audio to the LRU."""
+        self._pinned_ids.discard(audio_id)
+        audio = self._pinned.pop(audio_id, None)
+        if audio is not None:
+            self._remember(audio_id, audio, self._encodings.get(audio_id, "mp3"))
+
+    async def get(self, audio_id: str) -> bytes | None:
+        """Get audio by ID.
+
+        Args:
+            audio_id: ID returned by ``start``
+
+        Returns:
+            Audio bytes, or None if unknown or synthesis failed
+        """
+        audio = self._pinned.get(audio_id)
+        if audio is not None:
+            self.hits += 1
+            return audio
+
+        audio = self._entries.get(audio_id)
+        if audio is not None:
+            self._entries.move_to_end(audio_id)
+            self.hits += 1
+            return audio
+
+        task = self._pending.get(audio_id)
+        if task is not None:
+            try:
+                # Shield so one caller giving up does not cancel shared synthesis
+                audio = await asyncio.shield(task)
+                self.hits += 1
+                return audio
+            except Exception as e:
+                logger.error(f"TTS synthesis failed: {e}")
+                self.misses += 1
+                return None
+
+        audio = await self._load(audio_id)
+        if audio is not None:
+            self.hits += 1
+            self.disk_hits += 1
+            return audio
+
+        self.misses += 1
+        return None
+
+    async def get_or_synthesize(self, audio_id: str) -> bytes | None:
+        """Get audio by ID, synthesizing it again if it is nowhere to be found.
+
+        The phrase is recovered from the disk tier's sidecar, so a worker can
+        serve audio another worker started but never finished (or pruned).
+
+        Args:
+            audio_id: ID returned by ``start`` in any worker sharing the disk tier
+
+        Returns:
+            Audio bytes, or None if the phrase is unknown or synthesis failed
+        """
+        audio = await self.get(audio_id)
+        if audio is not None:
+            return audio
+
+        text = await asyncio.to_thread(self.text, audio_id)
+        encoding = await asyncio.to_thread(self.encoding, audio_id)
+        # The sidecar must describe this ID (same voice and encoding)
+        if text is None or self.key(text, encoding) != audio_id:
+            return None
+        logger.info(f"Re-synthesizing TTS audio {audio_id} on miss")
+        return await self.get(self.start(text, encoding))
+
+    async def _load(self, audio_id: str) -> bytes | None:
+        """Read audio from the disk tier, waiting briefly for a peer worker."""
+        if not self._directory or not self.is_valid_id(audio_id):
+            return None
+
+        deadline = time.monotonic() + self.PEER_WAIT_SECONDS
+        encoding = await asyncio.to_thread(self.encoding, audio_id)
+        path = self._audio_path(audio_id, encoding)
+        sidecar = self._sidecar_path(audio_id)
+        while True:
+            try:
+                audio = await asyncio.to_thread(_read_if_exists, path)
+            except OSError as e:
+                logger.warning(f"Failed to read cached audio {path}: {e}")
+                return None
+            if audio is not None:
+                self._remember(audio_id, audio, encoding)
+                return audio
+
+            # A fresh sidecar without audio means another worker is synthesizing
+            in_flight = await asyncio.to_thread(_modified_within, sidecar, self.PEER_WAIT_SECONDS)
+            if not in_flight or time.monotonic() >= deadline:
+                return None
+            await asyncio.sleep(self.PEER_POLL_INTERVAL)
+
+    def _remember(self, audio_id: str, audio: bytes, encoding: str) -> None:
+        """Insert into the memory tier, evicting least recently used audio."""
+        self._encodings[audio_id] = encoding
+        if audio_id in self._pinned_ids:
+            self._pinned[audio_id] = audio
+            return
+        if audio_id in self._entries:
+            self._bytes -= len(self._entries.pop(audio_id))
+        if len(audio) > self._max_bytes:
+            if audio_id not in self._pending:
+                self._encodings.pop(audio_id, None)
+            return
+        self._entries[audio_id] = audio
+        self._bytes += len(audio)
+        while self._bytes > self._max_bytes:
+            evicted_id, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            if evicted_id not in self._pending:
+                self._encodings.pop(evicted_id, None)
+            self.evictions += 1
+
+    def encoding(self, audio_id: str) -> str:
+        """Get the encoding of cached audio (defaults to mp3).
+
+        Audio that is not in memory is looked up in its disk-tier sidecar.
+        """
+        if audio_id in self._encodings:
+            return self._encodings[audio_id]
+        metadata = self._read_sidecar(audio_id)
+        return metadata.get("encoding", "mp3") if metadata else "mp3"
+
+    def media_type(self, audio_id: str) -> str:
+        """Get the HTTP media type of cached audio."""
+        return self.MEDIA_TYPES.get(self.encoding(audio_id), "application/octet-stream")
+
+    def text(self, audio_id: str) -> str | None:
+        """Get the phrase an audio ID was synthesized from, if recorded."""
+        metadata = self._read_sidecar(audio_id)
+        return metadata.get("text") if metadata else None
+
+    def path(self, audio_id: str) -> Path | None:
+        """Get the disk-tier file for an audio ID, if it exists."""
+        if not self._directory or not self.is_valid_id(audio_id):
+            return None
+        path = self._audio_path(audio_id, self.encoding(audio_id))
+        return path if path and path.exists() else None
+
+    async def locate(self, audio_id: str) -> tuple[str, Path | None]:
+        """Get the encoding and disk-tier file of audio without blocking the event loop.
+
+        Returns:
+            The encoding (as ``encoding`` would) and the file, or None if it
+            is not on disk
+        """
+        if not self._directory:
+            return self._encodings.get(audio_id, "mp3"), None
+        return await asyncio.to_thread(self._locate, audio_id)
+
+    def _locate(self, audio_id: str) -> tuple[str, Path | None]:
+        encoding = self.encoding(audio_id)
+        if not self.is_valid_id(audio_id):
+            return encoding, None
+        path = self._audio_path(audio_id, encoding)
+        return encoding, path if path and path.exists() else None
+
+    def _audio_path(self, audio_id: str, encoding: str) -> Path | None:
+        """Get the disk-tier location for audio (whether or not it exists)."""
+        if not self._directory:
+            return None
+        extension = self.EXTENSIONS.get(encoding, "bin")
+        return self._directory / audio_id[:2] / f"{audio_id}.{extension}"
+
+    def _sidecar_path(self, audio_id: str) -> Path:
+        """Get the location of the text sidecar for an audio ID."""
+        return self._directory / audio_id[:2] / f"{audio_id}.json"
+
+    def _write_sidecar(self, audio_id: str, text: str, encoding: str) -> None:
+        """Record the phrase and encoding so other workers can find or rebuild it."""
+        if not self._directory:
+            return
+        try:
+            _atomic_write(
+                self._sidecar_path(audio_id),
+                json.dumps({"text": text, "encoding": encoding}).encode(),
+            )
+        except OSError as e:
+            logger.warning(f"Failed to write TTS sidecar: {e}")
+
+    def _read_sidecar(self, audio_id: str) -> dict[str, Any] | None:
+        """Read the text sidecar for an audio ID."""
+        if not self._directory or not self.is_valid_id(audio_id):
+            return None
+        try:
+            return json.loads(self._sidecar_path(audio_id).read_text())
+        except (OSError, ValueError):
+            return None
+
+    def _remove_sidecar(self, audio_id: str) -> None:
+        """Drop the sidecar of a failed synthesis so peers stop waiting for it."""
+        if self._directory:
+            self._sidecar_path(audio_id).unlink(missing_ok=True)
+
+    def prune(self) -> int:
+        """Shrink the disk tier to ``max_disk_bytes``, least recently used first.
+
+        Returns:
+            Number of audio files removed
+        """
+        if not self._directory:
+            return 0
+
+        files = []
+        for path in self._directory.glob("*/*"):
+            if path.suffix == ".json" or path.name.endswith(".tmp"):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((max(stat.st_atime, stat.st_mtime), stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        for _, size, path in sorted(files):
+            if total <= self._max_disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            path.with_suffix(".json").unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def stats(self) -> dict[str, Any]:
+        """Get hit/miss counters and memory usage."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "evictions": self.evictions,
+            "syntheses": self.syntheses,
+            "synthesis_errors": self.synthesis_errors,
+            "in_flight": len(self._pending),
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "pinned": len(self._pinned),
+            "pinned_bytes": sum(len(audio) for audio in self._pinned.values()),
+            "max_bytes": self._max_bytes,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "persistent": self._directory is not None,
+        }
+
+
+def parse_byte_range(header: str, size: int) -> tuple[int, int] | None:
+    """Parse a single-range HTTP ``Range`` header.
+
+    Args:
+        header: Header value, e.g. ``bytes=0-1023``, ``bytes=1024-`` or ``bytes=-500``
+        size: Total length of the resource
+
+    Returns:
+        Inclusive ``(start, end)`` offsets, or None if the header should be
+        ignored (unsupported unit or multiple ranges)
+
+    Raises:
+        ValueError: If the range cannot be satisfied
+    """
+    unit, _, spec = header.strip().partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            # Suffix range: the last N bytes
+            start = max(0, size - int(last))
+            end = size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end or start < 0:
+        raise ValueError(f"Unsatisfiable range {header!r} for {size} bytes")
+    return start, min(end, size - 1)
+
+
+def _read_if_exists(path: Path) -> bytes | None:
+    """Read a file, or return None if it does not exist."""
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def _modified_within(path: Path, seconds: float) -> bool:
+    """Whether a file exists and was modified in the last ``seconds``."""
+    try:
+        return time.time() - path.stat().st_mtime < seconds
+    except OSError:
+        return False
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """Write a file via a uniquely named temporary file and rename."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
@@ -1,14 +1,20 @@
 """Vector search functionality using Voyage AI embeddings and MongoDB Atlas."""
 
+import asyncio
+import logging
+import random
 from dataclasses import dataclass
 from typing import Any
 
 import voyageai
-from pymongo.collection import Collection
+from pymongo.asynchronous.collection import AsyncCollection
 
 from .config import get_settings
 from .database import DatabaseManager
+from .embedding_cache import EmbeddingCache
+from .local_index import LocalVectorIndex
 
+logger = logging.getLogger(__name__)
 
 @dataclass
 class SearchResult:
@@ -36,19 +42,35 @@ class VectorSearch:
     EMBEDDING_DIMENSIONS = 1024
     DEFAULT_LIMIT = 3
 
+    # Voyage request limits for voyage-2 (texts and total tokens per call)
+    MAX_BATCH_SIZE = 128
+    MAX_BATCH_TOKENS = 320_000
+    MAX_CONCURRENT_BATCHES = 4
+    MAX_BATCH_RETRIES = 3
+    RETRY_BASE_DELAY = 1.0
+
     def __init__(
         self,
         voyage_api_key: str | None = None,
         db_manager: DatabaseManager | None = None,
+        max_concurrent_batches: int = MAX_CONCURRENT_BATCHES,
+        embedding_cache: EmbeddingCache | None = None,
+        local_index: LocalVectorIndex | None = None,
     ):
         """Initialize VectorSearch with Voyage AI client and MongoDB connection.
         
         Args:
             voyage_api_key: Voyage AI API key (defaults to settings)
             db_manager: Database manager instance (defaults to global instance)
+            max_concurrent_batches: Embedding requests allowed in flight at once
+            embedding_cache: Cache for query embeddings (optional)
+            local_index: In-process index used instead of Atlas $vectorSearch (optional)
         """
         self._api_key = voyage_api_key or get_settings().voyage_api_key
-        self._voyage_client = voyageai.Client(api_key=self._api_key)
+        self._voyage_client = voyageai.AsyncClient(api_key=self._api_key)
+        self._max_concurrent_batches = max(1, max_concurrent_batches)
+        self._embedding_cache = embedding_cache
+        self._local_index = local_index
         
         if db_manager is not None:
             self._db_manager = db_manager
@@ -57,14 +79,63 @@ class VectorSearch:
             self._db_manager = get_database()
 
     @property
-    def emails_collection(self) -> Collection:
-        """Get the emails collection."""
-        return self._db_manager.emails
+    def emails_collection(self) -> AsyncCollection:
+        """Get the emails collection (async)."""
+        return self._db_manager.aio.emails
+
+    @property
+    def contacts_collection(self) -> AsyncCollection:
+        """Get the contacts collection (async)."""
+        return self._db_manager.aio.contacts
 
     @property
-    def contacts_collection(self) -> Collection:
-        """Get the contacts collection."""
-        return self._db_manager.contacts
+    def local_index(self) -> LocalVectorIndex | None:
+        """Get the in-process email index, if local search is enabled."""
+        return self._local_index
+
+    def set_local_index(self, index: LocalVectorIndex | None) -> None:
+        """Switch email search to an in-process index (None reverts to Atlas)."""
+        self._local_index = index
+
+    @staticmethod
+    def email_payload(doc: dict[str, Any]) -> dict[str, Any]:
+        """Extract the fields a local index stores alongside each embedding."""
+        return {
+            "sender": doc.get("sender", ""),
+            "subject": doc.get("subject", ""),
+            "body": doc.get("body", ""),
+            "timestamp": doc.get("timestamp"),
+        }
+
+    async def build_local_index(
+        self, nlist: int = 0, nprobe: int = LocalVectorIndex.DEFAULT_NPROBE
+    ) -> LocalVectorIndex:
+        """Build an in-process index from all embedded emails in MongoDB.
+        
+        Args:
+            nlist: Number of IVF lists (0 for exact search)
+            nprobe: IVF lists scanned per query
+            
+        Returns:
+            The populated (and, if requested, trained) index
+        """
+        index = LocalVectorIndex(
+            dimensions=self.EMBEDDING_DIMENSIONS, nlist=nlist, nprobe=nprobe
+        )
+        cursor = self.emails_collection.find(
+            {"embedding": {"$type": "array"}},
+            {"sender": 1, "subject": 1, "body": 1, "timestamp": 1, "embedding": 1},
+        )
+        async for doc in cursor:
+            embedding = doc.get("embedding")
+            if not embedding or len(embedding) != self.EMBEDDING_DIMENSIONS:
+                continue
+            index.upsert(str(doc["_id"]), embedding, self.email_payload(doc))
+        
+        if nlist:
+            index.train()
+        logger.info(f"Built local email index with {len(index)} vectors")
+        return index
 
     async def embed_text(self, text: str) -> list[float]:
         """Generate embedding vector using Voyage AI.
@@ -78,12 +149,135 @@ class VectorSearch:
         if not text or not text.strip():
             raise ValueError("Cannot embed empty text")
         
-        result = self._voyage_client.embed(
+        result = await self._voyage_client.embed(
             texts=[text],
             model=self.EMBEDDING_MODEL,
         )
         return result.embeddings[0]
 
+    async def embed_query(self, query: str) -> list[float]:
+        """Embed a search query, reusing a cached vector when available.
+        
+        Args:
+            query: Search query text
+            
+        Returns:
+            List of 1024 floats representing the embedding vector
+        """
+        if self._embedding_cache is not None:
+            cached = await self._embedding_cache.fetch(query, self.EMBEDDING_MODEL)
+            if cached is not None:
+                return cached
+        
+        embedding = await self.embed_text(query)
+        
+        if self._embedding_cache is not None:
+            await self._embedding_cache.store(query, self.EMBEDDING_MODEL, embedding)
+        return embedding
+
+    def cache_stats(self) -> dict[str, Any] | None:
+        """Get query embedding cache statistics, or None if caching is off."""
+        if self._embedding_cache is None:
+            return None
+        return self._embedding_cache.stats()
+
+    async def embed_texts(
+        self, texts: list[str], allow_partial: bool = False
+    ) -> list[list[float] | None]:
+        """Generate embeddings for many texts using batched Voyage AI requests.
+        
+        Texts are packed into requests that respect Voyage's per-request
+        text count and token limits. Up to ``max_concurrent_batches``
+        requests run at once and each failed batch is retried with
+        exponential backoff. Every batch runs to completion even if another
+        one fails.
+        
+        Args:
+            texts: Texts to embed
+            allow_partial: Return None for the texts of batches that still
+                fail after all retries instead of raising
+            
+        Returns:
+            Embedding vectors in the same order as ``texts`` (None only for
+            failed batches with ``allow_partial``)
+            
+        Raises:
+            ValueError: If any text is empty
+            Exception: If a batch still fails after all retries and
+                ``allow_partial`` is False
+        """
+        if not texts:
+            return []
+        if any(not text or not text.strip() for text in texts):
+            raise ValueError("Cannot embed empty text")
+        
+        embeddings: list[list[float] | None] = [None] * len(texts)
+        semaphore = asyncio.Semaphore(self._max_concurrent_batches)
+        
+        async def run_batch(indices: list[int]) -> None:
+            async with semaphore:
+                vectors = await self._embed_batch([texts[i] for i in indices])
+            for index, vector in zip(indices, vectors):
+                embeddings[index] = vector
+        
+        batches = self._pack_batches(texts)
+        results = await asyncio.gather(
+            *(run_batch(batch) for batch in batches), return_exceptions=True
+        )
+        for batch, result in zip(batches, results):
+            if isinstance(result, BaseException):
+                if not allow_partial:
+                    raise result
+                logger.error(f"Embedding batch of {len(batch)} texts failed: {result}")
+        return embeddings
+
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        """Conservatively estimate the Voyage token count of a text."""
+        # Roughly 4 characters per token for English; 3 leaves headroom
+        return len(text) // 3 + 1
+
+    def _pack_batches(self, texts: list[str]) -> list[list[int]]:
+        """Group text indices into batches within Voyage request limits."""
+        batches: list[list[int]] = []
+        current: list[int] = []
+        current_tokens = 0
+        
+        for index, text in enumerate(texts):
+            tokens = self._estimate_tokens(text)
+            if current and (
+                len(current) >= self.MAX_BATCH_SIZE
+                or current_tokens + tokens > self.MAX_BATCH_TOKENS
+            ):
+                batches.append(current)
+                current = []
+                current_tokens = 0
+            current.append(index)
+            current_tokens += tokens
+        
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Embed one batch, retrying with jittered exponential backoff."""
+        for attempt in range(self.MAX_BATCH_RETRIES):
+            try:
+                result = await self._voyage_client.embed(
+                    texts=texts,
+                    model=self.EMBEDDING_MODEL,
+                )
+                return result.embeddings
+            except Exception as e:
+                if attempt == self.MAX_BATCH_RETRIES - 1:
+                    raise
+                delay = self.RETRY_BASE_DELAY * (2 ** attempt) * (1 + random.random())
+                logger.warning(
+                    f"Embedding batch of {len(texts)} failed ({e}), retrying in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+        return []
+
     async def search_emails(
         self, query: str, limit: int = DEFAULT_LIMIT
     ) -> list[SearchResult]:
@@ -99,8 +293,11 @@ class VectorSearch:
         # Enforce maximum limit of 3 per requirements
         limit = min(limit, self.DEFAULT_LIMIT)
         
-        # Generate query embedding
-        query_embedding = await self.embed_text(query)
+        # Generate query embedding (cached across conversational turns)
+        query_embedding = await self.embed_query(query)
+        
+        if self._local_index is not None:
+            return self._search_local(query_embedding, limit)
         
         # MongoDB Atlas vector search aggregation pipeline
         pipeline = [
@@ -126,9 +323,9 @@ class VectorSearch:
         ]
         
         results = []
-        cursor = self.emails_collection.aggregate(pipeline)
+        cursor = await self.emails_collection.aggregate(pipeline)
         
-        for doc in cursor:
+        async for doc in cursor:
             results.append(
                 SearchResult(
                     content=doc.get("body", ""),
@@ -147,6 +344,22 @@ class VectorSearch:
         
         return results
 
+    def _search_local(self, query_embedding: list[float], limit: int) -> list[SearchResult]:
+        """Search the in-process index, returning Atlas-shaped results."""
+        return [
+            SearchResult(
+                content=payload.get("body", ""),
+                metadata={
+                    "id": doc_id,
+                    "sender": payload.get("sender", ""),
+                    "subject": payload.get("subject", ""),
+                    "timestamp": payload.get("timestamp"),
+                },
+                score=score,
+            )
+            for doc_id, score, payload in self._local_index.search(query_embedding, limit)
+        ]
+
     async def search_contacts(self, name: str) -> list[SearchResult]:
         """Search contacts by name.
         
@@ -165,7 +378,7 @@ class VectorSearch:
         results = []
         cursor = self.contacts_collection.find(query).limit(self.DEFAULT_LIMIT)
         
-        for doc in cursor:
+        async for doc in cursor:
             contact_info = f"{doc.get('name', '')} - {doc.get('email', '')}"
             if doc.get("company"):
                 contact_info += f" ({doc.get('company')})"
@@ -2,12 +2,14 @@
 
 import asyncio
 import logging
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Awaitable, Callable
 
 import httpx
 from deepgram import DeepgramClient, LiveOptions
 
 from .config import Settings
+from .deepgram_pool import DeepgramLivePool, LiveSession, open_live_session
+from .models import BusinessConfig
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +18,8 @@ class VoicePipeline:
     """Handles speech-to-text via Deepgram."""
 
     DEFAULT_GREETING = "Hello, this is Donna, your AI assistant. How may I help you today?"
+    # Use aura-asteria-en for a natural female voice
+    TTS_MODEL = "aura-asteria-en"
 
     def __init__(self, settings: Settings | None = None):
         if settings is None:
@@ -25,61 +29,48 @@ class VoicePipeline:
         self._settings = settings
         self._deepgram_api_key = settings.deepgram_api_key
         self._http_client = httpx.AsyncClient(timeout=30.0)
+        self._live_pool: DeepgramLivePool | None = None
+        self._business_config: BusinessConfig | None = None
+
+    @staticmethod
+    def live_options() -> LiveOptions:
+        """Deepgram live options for 8kHz mulaw telephony audio."""
+        return LiveOptions(
+            model="nova-2",
+            language="en-US",
+            encoding="mulaw",
+            sample_rate=8000,
+            smart_format=True,
+            interim_results=False,
+            utterance_end_ms="1000",
+            vad_events=True,
+        )
+
+    def set_live_pool(self, pool: DeepgramLivePool | None) -> None:
+        """Take live transcription sessions from a pool of pre-opened ones."""
+        self._live_pool = pool
 
     async def transcribe_stream(
-        self, audio_stream: AsyncIterator[bytes]
+        self,
+        audio_stream: AsyncIterator[bytes],
+        on_speech_started: Callable[[], Awaitable[None]] | None = None,
     ) -> AsyncIterator[str]:
-        """Stream audio to Deepgram and yield transcribed text."""
-        transcript_queue: asyncio.Queue[str | None] = asyncio.Queue()
-        connection_ready = asyncio.Event()
+        """Stream audio to Deepgram and yield transcribed text.
         
+        Args:
+            audio_stream: 8kHz mulaw audio chunks.
+            on_speech_started: Called when Deepgram's VAD detects the start
+                of speech, before any transcript (e.g. for barge-in).
+        """
+        session: LiveSession | None = None
         try:
-            deepgram = DeepgramClient(self._deepgram_api_key)
-            dg_connection = deepgram.listen.asyncwebsocket.v("1")
-            
-            async def on_open(self_conn, open_response, **kwargs):
-                logger.info("Deepgram connection opened")
-                connection_ready.set()
-            
-            async def on_message(self_conn, result, **kwargs):
-                try:
-                    sentence = result.channel.alternatives[0].transcript
-                    if sentence and result.is_final:
-                        logger.info(f"Deepgram transcript: {sentence}")
-                        await transcript_queue.put(sentence)
-                except Exception as e:
-                    logger.error(f"Error in on_message: {e}")
-            
-            async def on_error(self_conn, error, **kwargs):
-                logger.error(f"Deepgram error: {error}")
-            
-            async def on_close(self_conn, close, **kwargs):
-                logger.info("Deepgram connection closed")
-                await transcript_queue.put(None)
-            
-            dg_connection.on("Open", on_open)
-            dg_connection.on("Results", on_message)
-            dg_connection.on("Error", on_error)
-            dg_connection.on("Close", on_close)
-            
-            options = LiveOptions(
-                model="nova-2",
-                language="en-US",
-                encoding="mulaw",
-                sample_rate=8000,
-                smart_format=True,
-                interim_results=False,
-                utterance_end_ms="1000",
-                vad_events=True,
-            )
-            
-            # Start connection - this is the key fix
-            if await dg_connection.start(options) is False:
-                logger.error("Failed to start Deepgram")
-                return
-            
-            # Wait for connection to be ready
-            await asyncio.wait_for(connection_ready.wait(), timeout=5.0)
+            if self._live_pool:
+                session = await self._live_pool.acquire()
+            else:
+                session = await open_live_session(
+                    DeepgramClient(self._deepgram_api_key), self.live_options()
+                )
+            session.on_speech_started = on_speech_started
             logger.info("Deepgram ready, starting audio stream")
             
             # Send audio in background
@@ -87,21 +78,18 @@ class VoicePipeline:
                 try:
                     async for chunk in audio_stream:
                         if chunk:
-                            await dg_connection.send(chunk)
+                            await session.send(chunk)
                 except Exception as e:
                     logger.error(f"Send audio error: {e}")
                 finally:
-                    try:
-                        await dg_connection.finish()
-                    except:
-                        pass
+                    await session.finish()
             
             send_task = asyncio.create_task(send_audio())
             
             # Yield transcripts
             while True:
                 try:
-                    transcript = await asyncio.wait_for(transcript_queue.get(), timeout=1.0)
+                    transcript = await asyncio.wait_for(session.transcripts.get(), timeout=1.0)
                     if transcript is None:
                         break
                     yield transcript
@@ -118,21 +106,44 @@ class VoicePipeline:
                 
         except Exception as e:
             logger.error(f"Transcription stream error: {e}")
+        finally:
+            if session:
+                if self._live_pool:
+                    await self._live_pool.release(session)
+                else:
+                    await session.finish()
+
+    @classmethod
+    def greeting_for(cls, business_config: BusinessConfig | None) -> str:
+        """Greeting naming the boss and company from a business configuration."""
+        if business_config is None:
+            return cls.DEFAULT_GREETING
+        assistant = f"This is Donna, {business_config.ceo_name.strip()}'s assistant."
+        company = (business_config.company_name or "").strip()
+        if company:
+            return f"Hello, you've reached {company}. {assistant} How may I help you today?"
+        return f"Hello! {assistant} How may I help you today?"
+
+    def set_business_config(self, config: BusinessConfig | None) -> None:
+        """Use a new business configuration for the greeting."""
+        self._business_config = config
 
     def get_greeting(self) -> str:
-        return self.DEFAULT_GREETING
+        return self.greeting_for(self._business_config)
 
     def is_elevenlabs_enabled(self) -> bool:
         return False
 
-    async def synthesize_speech(self, text: str) -> bytes:
+    async def synthesize_speech(self, text: str, encoding: str = "mp3") -> bytes:
         """Convert text to speech using Deepgram TTS.
         
         Args:
             text: The text to convert to speech.
+            encoding: "mp3" for <Play> URLs, or "mulaw" for raw 8kHz audio
+                that can be sent directly on a Twilio media stream.
             
         Returns:
-            Audio bytes in MP3 format.
+            Audio bytes in the requested encoding.
             
         Raises:
             Exception: If TTS synthesis fails.
@@ -146,11 +157,14 @@ class VoicePipeline:
                 "Content-Type": "application/json",
             }
             
-            # Use aura-asteria-en for a natural female voice
             params = {
-                "model": "aura-asteria-en",
-                "encoding": "mp3",
+                "model": self.TTS_MODEL,
+                "encoding": encoding,
             }
+            if encoding == "mulaw":
+                # Headerless 8kHz audio, the format Twilio media streams expect
+                params["sample_rate"] = 8000
+                params["container"] = "none"
             
             payload = {
                 "text": text
@@ -173,5 +187,49 @@ class VoicePipeline:
             logger.error(f"TTS synthesis error: {e}")
             raise
 
+    async def synthesize_speech_stream(
+        self, text: str, encoding: str = "mulaw"
+    ) -> AsyncIterator[bytes]:
+        """Convert text to speech, yielding audio as Deepgram sends it.
+        
+        Unlike ``synthesize_speech`` the clip is never held in memory as a
+        whole, so playback can start with the first chunk.
+        
+        Args:
+            text: The text to convert to speech.
+            encoding: Audio encoding (raw 8kHz "mulaw" by default).
+            
+        Yields:
+            Audio chunks of arbitrary size.
+            
+        Raises:
+            Exception: If TTS synthesis fails.
+        """
+        params = {
+            "model": self.TTS_MODEL,
+            "encoding": encoding,
+        }
+        if encoding == "mulaw":
+            params["sample_rate"] = 8000
+            params["container"] = "none"
+        
+        async with self._http_client.stream(
+            "POST",
+            "https://api.deepgram.com/v1/speak",
+            headers={
+                "Authorization": f"Token {self._deepgram_api_key}",
+                "Content-Type": "application/json",
+            },
+            params=params,
+            json={"text": text},
+        ) as response:
+            if response.status_code != 200:
+                body = await response.aread()
+                logger.error(f"Deepgram TTS error: {response.status_code} - {body[:200]!r}")
+                raise Exception(f"TTS failed with status {response.status_code}")
+            async for chunk in response.aiter_bytes():
+                if chunk:
+                    yield chunk
+
     async def close(self) -> None:
         await self._http_client.aclose()
@@ -8,18 +8,39 @@ import asyncio
 import base64
 import json
 import logging
+from collections import Counter
+from collections.abc import Callable
 from dataclasses import dataclass
+from functools import partial
 from datetime import datetime
 from typing import Any
 
 from fastapi import WebSocket, WebSocketDisconnect
 
 from .call_manager import CallManager, CallState
-from .reasoning_engine import ReasoningEngine, Tool
+from .conversation_history import ConversationHistory, HistorySummarizer
+from .media_stream import MediaStreamSession, StreamReply
+from .phrase_bank import (
+    DEFAULT_REPLY,
+    GOODBYE,
+    LOOP_GOODBYE,
+    NO_SPEECH_PROMPT,
+    NOT_UNDERSTOOD_PROMPT,
+    TECHNICAL_DIFFICULTIES_GOODBYE,
+)
+from .reasoning_engine import ReasoningEngine, split_sentences
+from .tool_executor import ToolExecutor
+from .tts_cache import TTSCache
 from .vector_search import VectorSearch
 from .voice_pipeline import VoicePipeline
 from .connection_manager import manager as connection_manager
+from .availability import AvailabilityEngine
+from .calendar_gateway import CalendarGateway
+from .calendar_mirror import CalendarMirror
+from .post_call import PostCallQueue, outcome_fields
+from .scheduling_queue import SchedulingQueue
 from .calendar_service import CalendarService
+from .database import DatabaseManager
 
 logger = logging.getLogger(__name__)
 
@@ -223,7 +244,17 @@ class WebhookHandler:
         vector_search: VectorSearch | None = None,
         calendar_service: CalendarService | None = None,
         base_url: str = "",
-        audio_cache: dict[str, bytes] | None = None,
+        tts_cache: TTSCache | None = None,
+        db_manager: DatabaseManager | None = None,
+        stream_responses: bool = False,
+        fast_path: bool = False,
+        media_streams: bool = False,
+        stream_tts: bool = False,
+        calendar_gateway: CalendarGateway | None = None,
+        calendar_mirror: CalendarMirror | None = None,
+        availability: AvailabilityEngine | None = None,
+        scheduling_queue: SchedulingQueue | None = None,
+        post_call_queue: PostCallQueue | None = None,
     ) -> None:
         """Initialize the webhook handler.
         
@@ -234,7 +265,26 @@ class WebhookHandler:
             vector_search: Vector search for context retrieval (optional).
             calendar_service: Calendar service for scheduling (optional).
             base_url: Base URL for TTS audio endpoints (e.g., ngrok URL).
-            audio_cache: Shared dictionary for caching TTS audio bytes.
+            tts_cache: Shared cache for synthesized audio (an in-memory
+                cache is created if omitted).
+            db_manager: Database manager for persisting call records (optional).
+            stream_responses: Stream LLM replies and start TTS per sentence.
+            fast_path: Decide tools and answer in one LLM completion when
+                no tool is needed.
+            media_streams: Converse over a Twilio media stream on
+                ``/audio-stream`` instead of ``<Gather>`` round trips.
+            stream_tts: On media streams, send replies as 20ms frames while
+                Deepgram is still synthesizing them.
+            calendar_gateway: Google Calendar client used by the calendar
+                tools (optional).
+            calendar_mirror: Local calendar copy for availability checks
+                (optional).
+            availability: Free/busy engine used to suggest open slots
+                (optional).
+            scheduling_queue: Write-behind queue for booked meetings
+                (optional).
+            post_call_queue: Background analysis and recording of
+                finished calls (optional; done inline if omitted).
         """
         self._call_manager = call_manager
         self._voice_pipeline = voice_pipeline
@@ -242,51 +292,104 @@ class WebhookHandler:
         self._vector_search = vector_search
         self._calendar_service = calendar_service
         self._base_url = base_url
+        self._db_manager = db_manager
+        self._post_call_queue = post_call_queue
         self._use_elevenlabs = voice_pipeline.is_elevenlabs_enabled() if voice_pipeline else False
         
         # Audio cache for TTS (shared with main app)
-        self._audio_cache = audio_cache if audio_cache is not None else {}
+        self._tts_cache = tts_cache or TTSCache(voice_pipeline.synthesize_speech)
+        self._stream_responses = stream_responses
+        self._fast_path = fast_path
+        self._media_streams = media_streams
+        self._media_sessions: dict[str, MediaStreamSession] = {}
+        self._stream_tts = stream_tts
+        self._media_totals: Counter[str] = Counter()
+        # Replies still being generated for media streams
+        self._stream_replies: set[asyncio.Task[None]] = set()
+        
+        self.tool_executor = ToolExecutor(
+            vector_search=vector_search,
+            calendar_service=calendar_service,
+            calendar_gateway=calendar_gateway,
+            calendar_mirror=calendar_mirror,
+            availability=availability,
+            scheduling_queue=scheduling_queue,
+        )
+        
+        # Older turns are summarized in the background, off the reply path
+        self._history_summarizer = (
+            HistorySummarizer(call_manager, reasoning_engine.summarize_history)
+            if reasoning_engine
+            else None
+        )
     
     def _get_audio_url(self, audio_id: str) -> str:
         """Get the full URL for a cached audio file."""
         return f"{self._base_url}/tts/{audio_id}"
     
-    async def _cache_tts(self, text: str) -> str:
-        """Generate TTS audio and cache it, return the audio ID.
+    def _start_tts(self, text: str) -> str:
+        """Start synthesizing text in the background, return the audio ID.
         
         Args:
             text: Text to convert to speech.
             
         Returns:
-            Audio ID for the cached audio.
+            Audio ID the audio will be cached under.
         """
-        import hashlib
-        text_hash = hashlib.md5(text.encode()).hexdigest()[:12]
+        return self._tts_cache.start(text)
+    
+    async def get_audio(self, audio_id: str) -> bytes | None:
+        """Get cached audio, waiting for synthesis still in progress.
         
-        if text_hash not in self._audio_cache:
-            try:
-                audio_bytes = await self._voice_pipeline.synthesize_speech(text)
-                self._audio_cache[text_hash] = audio_bytes
-                
-            except Exception as e:
-                logger.error(f"TTS caching failed: {e}")
-                return ""
+        Args:
+            audio_id: Audio ID returned by ``_start_tts``.
+            
+        Returns:
+            Audio bytes, or None if unknown or synthesis failed.
+        """
+        return await self._tts_cache.get(audio_id)
+    
+    async def _cache_tts(self, text: str) -> str:
+        """Generate TTS audio and cache it, return the audio ID.
         
-        return text_hash
+        Args:
+            text: Text to convert to speech.
+            
+        Returns:
+            Audio ID for the cached audio, or "" if synthesis failed.
+        """
+        audio_id = self._start_tts(text)
+        if await self.get_audio(audio_id) is None:
+            return ""
+        return audio_id
     
-    async def _add_speech(self, response: TwiMLResponse, text: str) -> TwiMLResponse:
+    async def _add_speech(
+        self,
+        response: TwiMLResponse,
+        text: str,
+        segments: list[str] | None = None,
+    ) -> TwiMLResponse:
         """Add speech using Deepgram TTS for consistent voice.
         
+        The text is played as one clip per sentence. Only the first clip is
+        awaited; later clips keep synthesizing while the first one plays and
+        are served by ``/tts`` as soon as they are ready.
+        
         Args:
             response: TwiML response builder.
             text: Text to speak.
+            segments: Sentences of ``text`` whose synthesis may already have
+                been started (defaults to splitting ``text``).
             
         Returns:
             Updated TwiML response.
         """
-        audio_id = await self._cache_tts(text)
-        if audio_id and self._base_url:
-            response.play(self._get_audio_url(audio_id))
+        segments = segments or split_sentences(text) or [text]
+        audio_ids = [self._start_tts(segment) for segment in segments]
+        
+        if self._base_url and await self.get_audio(audio_ids[0]) is not None:
+            for audio_id in audio_ids:
+                response.play(self._get_audio_url(audio_id))
         else:
             # Fallback to Polly if TTS fails (using Salli-Neural as preferred)
             response.say(text, voice="Polly.Salli-Neural")
@@ -313,11 +416,19 @@ class WebhookHandler:
             request.call_sid, request.from_number
         )
         
-        # Get greeting from voice pipeline
-        greeting = self._voice_pipeline.get_greeting()
-        
         # Build TwiML response with proper conversation flow
         response = TwiMLResponse()
+        
+        if self._media_streams and self._base_url:
+            # The stream session speaks the greeting and runs the conversation;
+            # when it closes the socket, Twilio moves on to the hangup
+            ws_url = self._base_url.replace("https://", "wss://", 1).replace("http://", "ws://", 1)
+            response.connect_stream(f"{ws_url}/audio-stream")
+            response.hangup()
+            return response
+        
+        # Get greeting from voice pipeline
+        greeting = self._voice_pipeline.get_greeting()
         await self._add_speech(response, greeting)
         
         # Gather speech input from caller - this is the conversation loop
@@ -336,7 +447,8 @@ class WebhookHandler:
         """Handle bidirectional audio streaming via WebSocket.
         
         Receives audio from Twilio, transcribes it using the voice pipeline,
-        processes it through the reasoning engine, and sends responses back.
+        processes it through the reasoning engine, and sends responses back
+        as media events on the same socket (see ``MediaStreamSession``).
         
         Args:
             websocket: The WebSocket connection from Twilio.
@@ -345,6 +457,7 @@ class WebhookHandler:
         
         call_sid: str | None = None
         stream_sid: str | None = None
+        session: MediaStreamSession | None = None
         
         try:
             async for message in websocket.iter_text():
@@ -363,20 +476,30 @@ class WebhookHandler:
                         logger.info(
                             f"Stream started: call={call_sid}, stream={stream_sid}"
                         )
+                        if call_sid and stream_sid:
+                            session = MediaStreamSession(
+                                websocket,
+                                stream_sid,
+                                self._tts_cache,
+                                transcribe=self._voice_pipeline.transcribe_stream,
+                                respond=partial(self._respond_on_stream, call_sid),
+                                synthesize_stream=(
+                                    self._voice_pipeline.synthesize_speech_stream
+                                    if self._stream_tts else None
+                                ),
+                            )
+                            self._media_sessions[call_sid] = session
+                            session.start(greeting=self._voice_pipeline.get_greeting())
                     
                     elif event_type == "media":
-                        # Process incoming audio
-                        media_data = data.get("media", {})
-                        payload = media_data.get("payload", "")
-                        
-                        if payload and call_sid:
-                            # Decode base64 audio
-                            audio_bytes = base64.b64decode(payload)
-                            
-                            # Forward to voice pipeline for transcription
-                            await self._process_audio_chunk(
-                                call_sid, audio_bytes, websocket, stream_sid
-                            )
+                        # Forward incoming audio to transcription
+                        payload = data.get("media", {}).get("payload", "")
+                        if payload and session:
+                            session.feed(base64.b64decode(payload))
+                    
+                    elif event_type == "mark":
+                        if session:
+                            session.on_mark(data.get("mark", {}).get("name", ""))
                     
                     elif event_type == "stop":
                         logger.info(f"Stream stopped: {stream_sid}")
@@ -391,42 +514,98 @@ class WebhookHandler:
         except Exception as e:
             logger.error(f"WebSocket error: {e}")
         finally:
-            # Clean up if needed
-            if call_sid:
+            if session:
                 logger.info(f"Cleaning up stream for call: {call_sid}")
+                await session.close()
+                self._media_sessions.pop(call_sid, None)
+                self._media_totals.update(session.stats())
     
-    async def _process_audio_chunk(
-        self,
-        call_sid: str,
-        audio_bytes: bytes,
-        websocket: WebSocket,
-        stream_sid: str | None,
-    ) -> None:
-        """Process an audio chunk from the stream.
+    async def _respond_on_stream(self, call_sid: str, transcript: str) -> StreamReply:
+        """Answer one caller turn on a media stream.
         
-        This is a simplified implementation that collects audio and
-        processes it when silence is detected. A production implementation
-        would use continuous streaming transcription.
+        Mirrors ``handle_process_speech`` but returns sentences for
+        ``MediaStreamSession`` to play instead of TwiML. The reply is
+        returned at once and generated in the background, so each streamed
+        sentence can play while the LLM is still writing the next.
         
         Args:
             call_sid: The call identifier.
-            audio_bytes: Raw audio bytes.
-            websocket: WebSocket for sending responses.
-            stream_sid: The stream identifier.
+            transcript: Final transcript of the caller's turn.
+            
+        Returns:
+            The reply, filled in as it is generated.
         """
-        # Get or create audio buffer for this call
+        logger.info(f"Speech from {call_sid} (stream): '{transcript}'")
+        await connection_manager.broadcast({
+            "call_sid": call_sid,
+            "speaker": "caller",
+            "transcript": transcript,
+            "timestamp": int(datetime.now().timestamp() * 1000)
+        })
+        
         call_state = await self._call_manager.get_call_state(call_sid)
         if not call_state:
-            return
-        
-        # In a production system, this would stream to Deepgram
-        # For now, we accumulate and process in batches
-        # The actual streaming transcription is handled by the
-        # voice_pipeline.transcribe_stream() method
+            logger.warning(f"Call {call_sid} not active")
+            return StreamReply([], end_call=True)
         
-        # Forward audio bytes to voice pipeline (implementation depends on
-        # how the streaming is set up with Deepgram)
-        logger.debug(f"Received {len(audio_bytes)} bytes of audio for {call_sid}")
+        context = call_state.context
+        if "history" not in context:
+            greeted = {
+                "history": [],
+                "greeted": True,
+                "greeting": self._voice_pipeline.get_greeting(),
+            }
+            context.update(greeted)
+            await self._call_manager.update_context(call_sid, greeted)
+        
+        reply = StreamReply()
+        # Keep a reference so the task is not collected; it finishes (and
+        # stores the turn) even if a barge-in stops playback
+        task = asyncio.create_task(self._generate_stream_reply(call_sid, transcript, context, reply))
+        self._stream_replies.add(task)
+        task.add_done_callback(self._stream_replies.discard)
+        return reply
+    
+    async def _generate_stream_reply(
+        self,
+        call_sid: str,
+        transcript: str,
+        context: dict[str, Any],
+        reply: StreamReply,
+    ) -> None:
+        """Generate a media stream reply, passing on sentences as they stream."""
+        should_end_call = False
+        try:
+            response_text, should_end_call, segments = await self._generate_ai_response(
+                transcript, context, call_sid, tts_encoding="mulaw", on_sentence=reply.put
+            )
+            if segments is None:
+                # Not streamed, or the streamed reply was replaced (e.g. a
+                # repeated greeting); sentences already sent cannot be recalled
+                for sentence in split_sentences(response_text) or [response_text]:
+                    reply.put(sentence)
+            
+            await connection_manager.broadcast({
+                "call_sid": call_sid,
+                "speaker": "assistant",
+                "transcript": response_text,
+                "timestamp": int(datetime.now().timestamp() * 1000)
+            })
+        except Exception as e:
+            logger.error(f"Media stream reply error for {call_sid}: {e}")
+        finally:
+            reply.finish(should_end_call)
+    
+    def history_stats(self) -> dict[str, Any] | None:
+        """Get background history summarization counters."""
+        return self._history_summarizer.stats() if self._history_summarizer else None
+    
+    def media_stream_stats(self) -> dict[str, Any]:
+        """Get media stream counters, including calls still connected."""
+        totals = Counter(self._media_totals)
+        for session in self._media_sessions.values():
+            totals.update(session.stats())
+        return {"active": len(self._media_sessions), **totals}
     
     async def handle_process_speech(
         self,
@@ -463,7 +642,7 @@ class WebhookHandler:
         
         # Handle empty speech
         if not speech_result or not speech_result.strip():
-            await self._add_speech(response, "I didn't catch that. Could you please repeat?")
+            await self._add_speech(response, NO_SPEECH_PROMPT)
             response.gather(action="/process-speech")
             return response
         
@@ -478,12 +657,17 @@ class WebhookHandler:
         
         # Initialize history if needed - include the initial greeting so AI knows not to repeat it
         if "history" not in context:
-            context["history"] = []
             # Mark that greeting was already given
-            context["greeted"] = True
+            greeted = {
+                "history": [],
+                "greeted": True,
+                "greeting": self._voice_pipeline.get_greeting(),
+            }
+            context.update(greeted)
+            await self._call_manager.update_context(call_sid, greeted)
             
         # Generate response using reasoning engine (returns tuple with end_call flag)
-        response_text, should_end_call = await self._generate_ai_response(
+        response_text, should_end_call, segments = await self._generate_ai_response(
             speech_result, context, call_sid
         )
         
@@ -496,7 +680,7 @@ class WebhookHandler:
         })
         
         # Build TwiML response
-        await self._add_speech(response, response_text)
+        await self._add_speech(response, response_text, segments)
         
         # End call or continue listening
         if should_end_call:
@@ -512,22 +696,27 @@ class WebhookHandler:
         speech_result: str,
         context: dict[str, Any],
         call_sid: str,
-    ) -> tuple[str, bool]:
+        tts_encoding: str = "mp3",
+        on_sentence: Callable[[str], None] | None = None,
+    ) -> tuple[str, bool, list[str] | None]:
         """Generate an AI response using the reasoning engine.
         
         Args:
             speech_result: The transcribed speech.
             context: Current conversation context.
             call_sid: The call identifier.
+            tts_encoding: Encoding to pre-synthesize streamed sentences in
+                ("mulaw" for media streams).
+            on_sentence: Called with each streamed sentence as soon as the
+                LLM finishes it (optional).
             
         Returns:
-            Tuple of (response_text, should_end_call).
+            Tuple of (response_text, should_end_call, segments), where
+            segments are the streamed sentences of response_text whose
+            synthesis has already started (None when not streamed).
         """
         if not self._reasoning_engine:
-            return ("Thank you for calling. How can I assist you today?", False)
-        
-        # Track if we should end the call
-        should_end_call = False
+            return (DEFAULT_REPLY, False, None)
         
         # Extract caller info from transcript
         caller_info = self._reasoning_engine.extract_caller_info(speech_result)
@@ -548,227 +737,59 @@ class WebhookHandler:
         # If caller is clearly saying goodbye, skip AI and end call
         if any(phrase in speech_lower for phrase in goodbye_phrases) and len(speech_lower) < 50:
             logger.info(f"Caller said goodbye phrase: '{speech_result}' - ending call {call_sid}")
-            return ("You're welcome! Have a great day. Goodbye!", True)
-        
-        # Decide what tools to use
-        tool_calls = await self._reasoning_engine.decide_action(
-            speech_result, context
-        )
-        
-        # Execute tool calls
-        for tc in tool_calls:
-            if tc.tool == Tool.SEARCH_CONTACTS and self._vector_search:
-                name = tc.arguments.get("name", "")
-                if name:
-                    results = await self._vector_search.search_contacts(name)
-                    contacts = [
-                        {
-                            "name": r.metadata.get("name"),
-                            "email": r.metadata.get("email"),
-                            "company": r.metadata.get("company"),
-                        }
-                        for r in results
-                    ]
-                    context["contacts"] = contacts
-                    await self._call_manager.update_context(
-                        call_sid, {"contacts": contacts}
-                    )
-            
-            elif tc.tool == Tool.SEARCH_EMAILS and self._vector_search:
-                query = tc.arguments.get("query", "")
-                if query:
-                    results = await self._vector_search.search_emails(query)
-                    emails = [
-                        {
-                            "sender": r.metadata.get("sender"),
-                            "subject": r.metadata.get("subject"),
-                            "content": r.content[:200] if r.content else "",
-                        }
-                        for r in results
-                    ]
-                    context["emails"] = emails
-                    await self._call_manager.update_context(
-                        call_sid, {"emails": emails}
-                    )
-            
-            elif tc.tool == Tool.CHECK_CALENDAR:
-                # Check calendar availability using google_auth service
-                date_str = tc.arguments.get("date", "")
-                time_pref = tc.arguments.get("time_preference", "")
-                if date_str:
-                    try:
-                        from datetime import datetime, timedelta
-                        from zoneinfo import ZoneInfo
-                        from .google_auth import get_calendar_service
-                        
-                        google_service = get_calendar_service()
-                        if not google_service:
-                            logger.error("Google Calendar service not available")
-                            continue
-                        
-                        # Parse date in Pacific timezone
-                        pacific_tz = ZoneInfo("America/Los_Angeles")
-                        check_date = datetime.strptime(date_str, "%Y-%m-%d")
-                        check_date = check_date.replace(hour=0, minute=0, second=0, tzinfo=pacific_tz)
-                        end_date = check_date + timedelta(days=1)
-                        
-                        # Query Google Calendar directly
-                        events_result = google_service.events().list(
-                            calendarId='primary',
-                            timeMin=check_date.isoformat(),
-                            timeMax=end_date.isoformat(),
-                            maxResults=10,
-                            singleEvents=True,
-                            orderBy='startTime'
-                        ).execute()
-                        
-                        events = events_result.get('items', [])
-                        
-                        # Format availability info in human-readable format
-                        if events:
-                            busy_times = []
-                            for event in events:
-                                start = event.get("start", {})
-                                time_raw = start.get("dateTime", start.get("date", ""))
-                                summary = event.get("summary", "Busy")
-                                
-                                # Parse and format time nicely
-                                try:
-                                    if "T" in time_raw:
-                                        event_time = datetime.fromisoformat(time_raw.replace("Z", "+00:00"))
-                                        event_time_pacific = event_time.astimezone(pacific_tz)
-                                        formatted_time = event_time_pacific.strftime("%I:%M %p").lstrip("0")
-                                    else:
-                                        formatted_time = "All day"
-                                except:
-                                    formatted_time = time_raw
-                                
-                                busy_times.append(f"{formatted_time}: {summary}")
-                            context["calendar_busy"] = busy_times
-                            context["calendar_check_date"] = check_date.strftime("%A, %B %d")
-                        else:
-                            context["calendar_busy"] = []
-                            context["calendar_check_date"] = check_date.strftime("%A, %B %d")
-                            context["calendar_available"] = True
-                        
-                        await self._call_manager.update_context(
-                            call_sid, {
-                                "calendar_busy": context.get("calendar_busy", []),
-                                "calendar_check_date": context.get("calendar_check_date", date_str)
-                            }
-                        )
-                        logger.info(f"Calendar check for {date_str}: {len(events)} events found")
-                    except Exception as e:
-                        logger.error(f"Calendar check failed: {e}")
-                        context["calendar_error"] = str(e)
-            
-            elif tc.tool == Tool.END_CALL:
-                # AI wants to end the call
-                farewell = tc.arguments.get("farewell_message", "Goodbye!")
-                should_end_call = True
-                context["end_call_message"] = farewell
-                logger.info(f"AI requested end_call with message: {farewell}")
-            
-            elif tc.tool == Tool.SCHEDULE_MEETING and self._calendar_service:
-                # Schedule a meeting
-                title = tc.arguments.get("title", "Meeting")
-                date_str = tc.arguments.get("date", "")
-                time_str = tc.arguments.get("time", "")
-                duration = tc.arguments.get("duration_minutes", 30)
-                attendee_name = tc.arguments.get("attendee_name", "")
-                attendee_email = tc.arguments.get("attendee_email", "")
-                
-                if date_str and time_str:
-                    try:
-                        from datetime import datetime, timedelta
-                        from zoneinfo import ZoneInfo
-                        from dateutil import parser as date_parser
-                        
-                        logger.info(f"Attempting to schedule: {title} on {date_str} at {time_str}")
-                        
-                        # Parse date and time robustly
-                        pacific_tz = ZoneInfo("America/Los_Angeles")
-                        
-                        try:
-                            # Try combining them
-                            datetime_str = f"{date_str} {time_str}"
-                            start_time = date_parser.parse(datetime_str)
-                        except:
-                            # Try parsing separately
-                            d = date_parser.parse(date_str)
-                            t = date_parser.parse(time_str)
-                            start_time = datetime.combine(d.date(), t.time())
-                        
-                        # Ensure timezone awareness (assuming Pacific as instructed)
-                        if start_time.tzinfo is None:
-                            start_time = start_time.replace(tzinfo=pacific_tz)
-                        else:
-                            start_time = start_time.astimezone(pacific_tz)
-                            
-                        end_time = start_time + timedelta(minutes=duration)
-                        
-                        # Build description
-                        description = f"Call with {attendee_name}" if attendee_name else "Phone call meeting"
-                        if context.get("caller_number"):
-                            description += f"\nCaller: {context['caller_number']}"
-                        
-                        # Create the event using google_auth service (uses file-based auth)
-                        from .google_auth import get_calendar_service
-                        google_service = get_calendar_service()
-                        
-                        if google_service:
-                            event_body = {
-                                'summary': title,
-                                'description': description,
-                                'start': {
-                                    'dateTime': start_time.isoformat(),
-                                    'timeZone': 'America/Los_Angeles',
-                                },
-                                'end': {
-                                    'dateTime': end_time.isoformat(),
-                                    'timeZone': 'America/Los_Angeles',
-                                },
-                            }
-                            
-                            if attendee_email:
-                                event_body['attendees'] = [{'email': attendee_email}]
-                            
-                            result = google_service.events().insert(
-                                calendarId='primary',
-                                body=event_body
-                            ).execute()
-                            
-                            # Format time for display (12-hour format)
-                            display_time = start_time.strftime("%I:%M %p").lstrip("0")
-                            display_date = start_time.strftime("%A, %B %d")
-                            
-                            context["meeting_scheduled"] = True
-                            context["meeting_details"] = {
-                                "title": title,
-                                "date": display_date,
-                                "time": display_time,
-                                "duration": duration,
-                                "link": result.get("htmlLink", "")
-                            }
-                            await self._call_manager.update_context(
-                                call_sid, {"meeting_scheduled": context["meeting_details"]}
-                            )
-                            logger.info(f"Meeting scheduled: {title} at {display_time} on {display_date}")
-                        else:
-                            context["meeting_error"] = "Calendar service not authenticated"
-                            logger.error("Google Calendar service not available")
-                    except Exception as e:
-                        context["meeting_error"] = str(e)
-                        logger.error(f"Meeting scheduling failed: {e}")
-        
-        # If ending call, use the farewell message directly
-        if should_end_call and context.get("end_call_message"):
-            response_text = context["end_call_message"]
-        else:
-            # Generate response with updated context
-            response_text = await self._reasoning_engine.generate_response(
-                speech_result, context
-            )
+            return (GOODBYE, True, None)
+        
+        # All LLM requests of this turn share one deadline, so a slow or
+        # stuck completion cannot hold the caller for the full timeout
+        with self._reasoning_engine.turn_budget():
+            # Decide what tools to use; the fast path may answer directly instead
+            decision = None
+            if self._fast_path:
+                decision = await self._reasoning_engine.decide_or_respond(speech_result, context)
+                tool_calls = decision.tool_calls
+            else:
+                tool_calls = await self._reasoning_engine.decide_action(
+                    speech_result, context
+                )
+        
+            # Execute tool calls (independent ones concurrently); tools key
+            # meeting holds by call
+            context["call_sid"] = call_sid
+            tool_result = await self.tool_executor.execute(tool_calls, context)
+            if tool_result.updates:
+                await self._call_manager.update_context(call_sid, tool_result.updates)
+            should_end_call = tool_result.should_end_call
+        
+            # If ending call, use the farewell message directly
+            segments: list[str] | None = None
+            tool_messages = None
+            if decision and tool_calls:
+                tool_messages = self._reasoning_engine.tool_result_messages(
+                    tool_calls, tool_result.results
+                )
+        
+            if should_end_call and context.get("end_call_message"):
+                response_text = context["end_call_message"]
+            elif decision and decision.response is not None:
+                # Fast path answered without tools - no second round trip
+                response_text = decision.response
+            elif self._stream_responses:
+                # Start TTS for each sentence as soon as the LLM finishes it
+                segments = []
+                async for sentence in self._reasoning_engine.stream_response(
+                    speech_result, context, tool_messages
+                ):
+                    segments.append(sentence)
+                    self._tts_cache.start(sentence, encoding=tts_encoding)
+                    if on_sentence:
+                        on_sentence(sentence)
+                response_text = " ".join(segments)
+            else:
+                # Generate response with updated context
+                response_text = await self._reasoning_engine.generate_response(
+                    speech_result, context, tool_messages
+                )
+        generated_text = response_text
         
         # Detect if AI is stuck in a loop or generating greetings
         current_lower = response_text.lower().strip()
@@ -789,15 +810,15 @@ class WebhookHandler:
                 # Check if caller is saying goodbye/thanks
                 goodbye_phrases = ["thank", "thanks", "bye", "goodbye", "that's all", "that's it", "no", "nothing"]
                 if any(phrase in speech_result.lower() for phrase in goodbye_phrases):
-                    response_text = "You're welcome! Have a great day. Goodbye!"
+                    response_text = GOODBYE
                     should_end_call = True
                 else:
                     # Something went wrong - end the call gracefully
                     logger.error(f"AI keeps generating greetings, ending call for {call_sid}")
-                    response_text = "I'm having some technical difficulties. Please try calling back in a moment. Goodbye!"
+                    response_text = TECHNICAL_DIFFICULTIES_GOODBYE
                     should_end_call = True
             else:
-                response_text = "I'm sorry, I didn't catch that. Could you please repeat?"
+                response_text = NOT_UNDERSTOOD_PROMPT
         
         # Also check for exact repetition in history (but not for short responses)
         history = context.get("history", [])
@@ -807,16 +828,129 @@ class WebhookHandler:
             # Check for exact repetition
             if current_lower in recent_responses:
                 logger.warning(f"Detected AI loop (exact repeat) - forcing end call for {call_sid}")
-                response_text = "I'm sorry, I'm having trouble understanding. Please call back and I'll be happy to help. Goodbye!"
+                response_text = LOOP_GOODBYE
                 should_end_call = True
         
-        # Store conversation exchange in history
-        history = context.get("history", [])
-        history.append({"user": speech_result, "assistant": response_text})
-        await self._call_manager.update_context(call_sid, {"history": history})
+        # Store conversation exchange in history (older turns move to the summary)
+        call_state = await self._call_manager.edit_context(
+            call_sid,
+            partial(
+                self._reasoning_engine.history.append,
+                user=speech_result,
+                assistant=response_text,
+                tool_timings=[t.to_dict() for t in tool_result.timings],
+            ),
+        )
+        if ConversationHistory.needs_summary(call_state.context):
+            self._history_summarizer.schedule(call_sid)
         
-        return (response_text, should_end_call)
+        # Pre-synthesized segments are stale if the reply was replaced
+        if response_text != generated_text:
+            segments = None
+        
+        return (response_text, should_end_call, segments)
+    
+    @staticmethod
+    def _call_transcript(call_state: CallState) -> list[str]:
+        """Transcript of a call for outcome analysis.
+        
+        Falls back to the conversation history (summary plus the turns
+        still kept) when no raw transcript was recorded.
+        """
+        if call_state.transcript_history:
+            return list(call_state.transcript_history)
+        context = call_state.context
+        transcript = []
+        if context.get("history_summary"):
+            transcript.append(f"(Earlier in the call: {context['history_summary']})")
+        for turn in (context.get("history_pending") or []) + (context.get("history") or []):
+            if turn.get("user"):
+                transcript.append(f"Caller: {turn['user']}")
+            if turn.get("assistant"):
+                transcript.append(f"Receptionist: {turn['assistant']}")
+        return transcript
     
+    async def _record_call(
+        self,
+        call_state: CallState,
+        outcome: str,
+        duration: int,
+        summary: str | None = None,
+    ) -> None:
+        """Analyze a finished call and save its record to the database.
+        
+        With a post-call queue the call is only queued here; analysis and
+        the database write happen in the background.
+        
+        Args:
+            call_state: Final state of the call
+            outcome: Call outcome (the terminal Twilio status, or "failed")
+            duration: Call duration in seconds
+            summary: Summary to use when the call could not be analyzed
+        """
+        transcript = self._call_transcript(call_state)
+        call_doc = {
+            "call_sid": call_state.call_sid,
+            "caller_number": call_state.caller_number,
+            "identified_name": call_state.context.get("caller_name"),
+            "call_purpose": call_state.context.get("call_purpose"),
+            "outcome": outcome,
+            "timestamp": call_state.started_at,
+            "end_timestamp": datetime.now(),
+            "duration": duration,
+            "transcript": transcript,
+        }
+        
+        # Add company if found in context
+        if "contacts" in call_state.context:
+            for contact in call_state.context["contacts"]:
+                if contact.get("company"):
+                    call_doc["company"] = contact["company"]
+                    break
+        
+        if self._post_call_queue:
+            try:
+                await self._post_call_queue.enqueue(call_doc, transcript, summary)
+            except Exception as e:
+                logger.error(f"Failed to queue call record for {call_state.call_sid}: {e}")
+            return
+        
+        # Analyze call outcome if we have a reasoning engine and transcript
+        outcome_data = {}
+        if self._reasoning_engine and transcript:
+            try:
+                # Use modeling for analysis
+                analysis = await self._reasoning_engine.analyze_call_outcome(transcript)
+                outcome_data = analysis.to_dict()
+                logger.info(f"Analyzed call outcome: {analysis.decision_label}")
+            except Exception as e:
+                logger.error(f"Failed to analyze call outcome: {e}")
+        
+        if not self._db_manager:
+            return
+        
+        call_doc.update(outcome_fields(outcome_data, summary))
+        try:
+            await self._db_manager.aio.calls.insert_one(call_doc)
+            logger.info(f"Saved call record for {call_state.call_sid}")
+        except Exception as e:
+            logger.error(f"Failed to save call record: {e}")
+
+    async def finalize_stale_call(self, call_state: CallState, reason: str) -> None:
+        """Record a call the reaper evicted because its status callback never came.
+        
+        Args:
+            call_state: Final state of the call
+            reason: Why it was reaped ("idle" or "max_duration")
+        """
+        duration = int((datetime.now() - call_state.started_at).total_seconds())
+        await self._record_call(
+            call_state,
+            "failed",
+            duration,
+            summary=f"Call ended unexpectedly (no status update from Twilio, {reason} limit reached)",
+        )
+
     async def handle_call_status(self, request: CallStatusRequest) -> dict[str, str]:
         """Process call status updates from Twilio.
         
@@ -837,65 +971,15 @@ class WebhookHandler:
         terminal_statuses = {"completed", "failed", "busy", "no-answer", "canceled"}
         
         if request.call_status in terminal_statuses:
-            try:
-                # Get call state before ending it
-                call_state = await self._call_manager.get_call_state(request.call_sid)
-                
-                if call_state:
-                    # Analyze call outcome if we have a reasoning engine and transcript
-                    outcome_data = {}
-                    if self._reasoning_engine and call_state.transcript_history:
-                        try:
-                            # Use modeling for analysis
-                            outcome = await self._reasoning_engine.analyze_call_outcome(
-                                call_state.transcript_history
-                            )
-                            outcome_data = outcome.to_dict()
-                            logger.info(f"Analyzed call outcome: {outcome.decision_label}")
-                        except Exception as e:
-                            logger.error(f"Failed to analyze call outcome: {e}")
-                    
-                    # Persist to database
-                    from .database import get_database
-                    from datetime import datetime
-                    
-                    db = get_database()
-                    if db:
-                        call_doc = {
-                            "call_sid": call_state.call_sid,
-                            "caller_number": call_state.caller_number,
-                            "identified_name": call_state.context.get("caller_name"),
-                            "call_purpose": call_state.context.get("call_purpose"),
-                            "outcome": request.call_status,
-                            "timestamp": call_state.started_at,
-                            "end_timestamp": datetime.now(),
-                            "duration": request.call_duration or 0,
-                            "transcript": call_state.transcript_history,
-                            # Add analysis fields
-                            "summary": outcome_data.get("summary", "No summary available"),
-                            "decision": outcome_data.get("decision", "handled"),
-                            "decision_label": outcome_data.get("decision_label", "Call Processed"),
-                            "reasoning": outcome_data.get("reasoning", ""),
-                            "action_taken": outcome_data.get("action_taken", ""),
-                        }
-                        
-                        # Add company if found in context
-                        if "contacts" in call_state.context:
-                            for contact in call_state.context["contacts"]:
-                                if contact.get("company"):
-                                    call_doc["company"] = contact["company"]
-                                    break
-                        
-                        try:
-                            db.calls.insert_one(call_doc)
-                            logger.info(f"Saved call record for {request.call_sid}")
-                        except Exception as e:
-                            logger.error(f"Failed to save call record: {e}")
-
+            # Claim the call so the stale-call reaper cannot record it twice
+            call_state = await self._call_manager.claim_call(request.call_sid)
+            if call_state:
+                await self._record_call(
+                    call_state, request.call_status, request.call_duration or 0
+                )
                 await self._call_manager.end_call(request.call_sid)
-                
-            except KeyError:
-                # Call already ended or never started
+            else:
+                # Call already ended, reaped or never started
                 logger.debug(f"Call {request.call_sid} not found in active calls")
         
         return {"status": "ok"}
@@ -0,0 +1,113 @@
+"""Shared test fakes."""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from pymongo import ReturnDocument
+
+
+class FakeCursor:
+    """Async cursor over a snapshot of matching documents."""
+
+    def __init__(self, docs):
+        self._docs = docs
+
+    def sort(self, field, direction=1):
+        self._docs.sort(key=lambda d: d.get(field), reverse=direction == -1)
+        return self
+
+    def limit(self, count):
+        self._docs = self._docs[:count]
+        return self
+
+    async def __aiter__(self):
+        for doc in self._docs:
+            yield doc
+
+
+class FakeCollection:
+    """In-memory stand-in for the subset of ``AsyncCollection`` the queues use."""
+
+    OPERATORS = {
+        "$lte": lambda value, bound: value is not None and value <= bound,
+        "$lt": lambda value, bound: value is not None and value < bound,
+        "$gte": lambda value, bound: value is not None and value >= bound,
+        "$gt": lambda value, bound: value is not None and value > bound,
+        "$in": lambda value, options: value in options,
+        "$nin": lambda value, options: value not in options,
+    }
+
+    def __init__(self, docs=()):
+        self.docs = [dict(d) for d in docs]
+        self.queries = []
+
+    def doc(self, doc_id):
+        """Get the stored document with this ``_id`` (not a copy)."""
+        return next(d for d in self.docs if d.get("_id") == doc_id)
+
+    def _matches(self, doc, query):
+        for field, condition in query.items():
+            if field == "$or":
+                if not any(self._matches(doc, option) for option in condition):
+                    return False
+            elif isinstance(condition, dict):
+                if not all(self.OPERATORS[op](doc.get(field), arg) for op, arg in condition.items()):
+                    return False
+            elif doc.get(field) != condition:
+                return False
+        return True
+
+    def _first(self, query, sort=None):
+        matches = [d for d in self.docs if self._matches(d, query)]
+        for field, direction in reversed(sort or []):
+            matches.sort(key=lambda d: d.get(field), reverse=direction == -1)
+        return matches[0] if matches else None
+
+    def _insert(self, query, update):
+        doc = {k: v for k, v in query.items() if not isinstance(v, dict)}
+        doc.update(update.get("$setOnInsert", {}))
+        doc.update(update.get("$set", {}))
+        doc.setdefault("_id", f"fake-{len(self.docs)}")
+        self.docs.append(doc)
+        return doc
+
+    def find(self, query, projection=None):
+        self.queries.append(query)
+        return FakeCursor([dict(d) for d in self.docs if self._matches(d, query)])
+
+    async def find_one(self, query):
+        doc = self._first(query)
+        return dict(doc) if doc is not None else None
+
+    async def find_one_and_update(self, query, update, upsert=False, sort=None,
+                                  return_document=ReturnDocument.BEFORE):
+        doc = self._first(query, sort)
+        if doc is None:
+            if upsert:
+                inserted = self._insert(query, update)
+                if return_document == ReturnDocument.AFTER:
+                    return dict(inserted)
+            return None
+        before = dict(doc)
+        doc.update(update.get("$set", {}))
+        return dict(doc) if return_document == ReturnDocument.AFTER else before
+
+    async def update_one(self, query, update, upsert=False):
+        doc = self._first(query)
+        if doc is not None:
+            doc.update(update.get("$set", {}))
+            return SimpleNamespace(matched_count=1, upserted_id=None)
+        if upsert:
+            return SimpleNamespace(matched_count=0, upserted_id=self._insert(query, update)["_id"])
+        return SimpleNamespace(matched_count=0, upserted_id=None)
+
+    async def delete_one(self, query):
+        doc = self._first(query)
+        if doc is not None:
+            self.docs.remove(doc)
+
+
+def make_due(collection):
+    """Make every document in a queue collection due now."""
+    for doc in collection.docs:
+        doc["next_attempt_at"] = datetime.now(timezone.utc)
@@ -0,0 +1,63 @@
+"""Tests for free/busy computation and slot suggestions."""
+
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from src.receptionist.availability import AvailabilityEngine, WorkingHours, free_gaps, merge_busy
+
+PACIFIC = ZoneInfo("America/Los_Angeles")
+# A Monday, far enough ahead that no slot is in the past
+MONDAY = datetime(2030, 3, 4, tzinfo=PACIFIC)
+
+
+def at(day, hour, minute=0):
+    return MONDAY + timedelta(days=day, hours=hour, minutes=minute)
+
+
+def event(start, end, **extra):
+    return {"start": {"dateTime": start.isoformat()}, "end": {"dateTime": end.isoformat()}, **extra}
+
+
+class FakeGateway:
+    def __init__(self, events):
+        self.events = events
+        self.queries = 0
+
+    async def list_events(self, time_min, time_max, max_results=10):
+        self.queries += 1
+        return [
+            e for e in self.events
+            if datetime.fromisoformat(e["start"]["dateTime"]) < time_max
+            and datetime.fromisoformat(e["end"]["dateTime"]) > time_min
+        ]
+
+
+def test_merge_and_gaps_within_working_hours():
+    busy = merge_busy([(at(0, 10), at(0, 11)), (at(0, 9), at(0, 10, 30)), (at(0, 13), at(0, 14))])
+    assert busy == [(at(0, 9), at(0, 11)), (at(0, 13), at(0, 14))]
+
+    # Friday through Monday: the weekend has no working hours
+    windows = WorkingHours().windows(at(-3, 0), at(1, 0), PACIFIC)
+    assert windows == [(at(-3, 9), at(-3, 17)), (at(0, 9), at(0, 17))]
+    assert free_gaps(busy, windows[1:]) == [(at(0, 11), at(0, 13)), (at(0, 14), at(0, 17))]
+
+
+async def test_alternatives_near_requested_time():
+    gateway = FakeGateway([
+        event(at(0, 9), at(0, 12)),
+        event(at(0, 12), at(0, 17), summary="Offsite"),
+        event(at(1, 9), at(1, 10)),
+        event(at(1, 14), at(1, 15), transparency="transparent"),
+    ])
+    engine = AvailabilityEngine(gateway, suggestions=3)
+
+    assert not await engine.is_free(at(0, 14), at(0, 15))
+    assert await engine.is_free(at(1, 14), at(1, 15))
+
+    # Monday is fully booked; Tuesday's slots closest to 2pm, an hour apart
+    slots = await engine.alternatives(at(0, 14), timedelta(hours=1))
+    assert slots == [at(1, 13), at(1, 14), at(1, 15)]
+
+    slots = await engine.open_slots(at(1, 0), at(2, 0), timedelta(minutes=30))
+    assert slots == [at(1, 10), at(1, 10, 30), at(1, 11)]
+    assert engine.stats()["live_queries"] == gateway.queries
@@ -0,0 +1,137 @@
+"""Tests for the Google Calendar gateway."""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.receptionist.calendar_gateway import CalendarGateway, CalendarUnavailable
+from src.receptionist.reasoning_engine import Tool, ToolCall
+from src.receptionist.tool_executor import ToolExecutor
+
+
+class FakeCredentials:
+    def __init__(self, expires_in: float = 3600):
+        self.refresh_token = "refresh"
+        self.expiry = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(seconds=expires_in)
+        self.refreshed = 0
+
+    @property
+    def valid(self):
+        return self.expiry > datetime.now(timezone.utc).replace(tzinfo=None)
+
+    def refresh(self, request):
+        self.refreshed += 1
+        self.expiry = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(hours=1)
+
+
+class FakeRequest:
+    def __init__(self, result, delay=0.0):
+        self._result = result
+        self._delay = delay
+
+    def execute(self, **kwargs):
+        time.sleep(self._delay)
+        return self._result
+
+
+class FakeService:
+    def __init__(self, items, delay=0.0):
+        self.items = items
+        self.delay = delay
+
+    def events(self):
+        return self
+
+    def list(self, **kwargs):
+        return FakeRequest({"items": self.items}, self.delay)
+
+
+def make_gateway(service, credentials=None, **kwargs):
+    loads = []
+
+    def load():
+        loads.append(1)
+        return credentials
+
+    builds = []
+
+    def build(creds):
+        builds.append(creds)
+        return service
+
+    gateway = CalendarGateway(load, build_service=build, **kwargs)
+    return gateway, loads, builds
+
+
+async def test_reuses_credentials_and_service_without_blocking_loop():
+    service = FakeService([{"summary": "Standup"}], delay=0.2)
+    gateway, loads, builds = make_gateway(service, FakeCredentials(), max_workers=1)
+    day = datetime(2025, 3, 3, tzinfo=timezone.utc)
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        for _ in range(10):
+            await asyncio.sleep(0.02)
+            ticks += 1
+
+    events, _ = await asyncio.gather(
+        gateway.list_events(day, day + timedelta(days=1)), ticker()
+    )
+    assert events == [{"summary": "Standup"}]
+    assert ticks == 10
+
+    await gateway.list_events(day, day + timedelta(days=1))
+    assert len(loads) == 1
+    assert len(builds) == 1
+    assert gateway.stats()["calls"] == 2
+    await gateway.stop()
+
+
+async def test_background_refresh_before_expiry():
+    credentials = FakeCredentials(expires_in=60)
+    saved = []
+    gateway = CalendarGateway(
+        lambda: credentials,
+        saved.append,
+        refresh_margin_seconds=300,
+        build_service=lambda creds: FakeService([]),
+    )
+
+    # Requests do not wait on a refresh while the token is still valid
+    await gateway._credentials_ready()
+    assert credentials.refreshed == 0
+
+    await gateway._credentials_ready(gateway._refresh_margin)
+    assert credentials.refreshed == 1
+    assert saved == [credentials]
+    assert gateway.stats()["refreshes"] == 1
+    await gateway.stop()
+
+
+async def test_unconnected_calendar_is_not_reloaded_every_call():
+    gateway, loads, _ = make_gateway(FakeService([]), credentials=None)
+    day = datetime(2025, 3, 3, tzinfo=timezone.utc)
+
+    for _ in range(3):
+        with pytest.raises(CalendarUnavailable):
+            await gateway.list_events(day, day + timedelta(days=1))
+    assert len(loads) == 1
+    await gateway.stop()
+
+
+async def test_check_calendar_uses_gateway():
+    service = FakeService([{"summary": "Standup", "start": {"dateTime": "2025-03-03T17:00:00Z"}}])
+    gateway, _, _ = make_gateway(service, FakeCredentials())
+    executor = ToolExecutor(calendar_gateway=gateway)
+
+    result = await executor.execute(
+        [ToolCall(tool=Tool.CHECK_CALENDAR, arguments={"date": "2025-03-03"})], {}
+    )
+
+    assert result.updates["calendar_busy"] == ["9:00 AM: Standup"]
+    assert result.updates["calendar_check_date"] == "Monday, March 03"
+    await gateway.stop()
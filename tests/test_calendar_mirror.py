@@ -0,0 +1,89 @@
+"""Tests for the local calendar mirror."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+
+from googleapiclient.errors import HttpError
+
+from src.receptionist.calendar_mirror import CalendarMirror, EventIntervalIndex
+
+DAY = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+
+
+def event(event_id, start_hour, end_hour, **extra):
+    return {
+        "id": event_id,
+        "summary": event_id,
+        "start": {"dateTime": (DAY + timedelta(hours=start_hour)).isoformat()},
+        "end": {"dateTime": (DAY + timedelta(hours=end_hour)).isoformat()},
+        **extra,
+    }
+
+
+class FakeGateway:
+    """Serves queued list_changes pages and records the tokens it was sent."""
+
+    def __init__(self, *pages):
+        self.pages = list(pages)
+        self.requests = []
+
+    async def list_changes(self, sync_token=None, page_token=None, time_min=None):
+        self.requests.append(sync_token)
+        page = self.pages.pop(0)
+        if isinstance(page, Exception):
+            raise page
+        return page
+
+
+def test_interval_index_overlaps():
+    index = EventIntervalIndex()
+    index.upsert("offsite", 0, 100, {"id": "offsite"})
+    index.upsert("standup", 50, 55, {"id": "standup"})
+    index.upsert("lunch", 60, 70, {"id": "lunch"})
+
+    assert [e["id"] for e in index.overlapping(52, 65)] == ["offsite", "standup", "lunch"]
+    assert [e["id"] for e in index.overlapping(100, 200)] == []
+
+    index.upsert("lunch", 150, 160, {"id": "lunch"})
+    assert index.remove("standup")
+    assert [e["id"] for e in index.overlapping(52, 65)] == ["offsite"]
+    assert index.prune(120) == 1
+    assert len(index) == 1
+
+
+async def test_incremental_sync_and_expired_token():
+    gateway = FakeGateway(
+        {"items": [event("standup", 9, 10)], "nextPageToken": "p2"},
+        {"items": [event("lunch", 12, 13)], "nextSyncToken": "t1"},
+        {"items": [{"id": "standup", "status": "cancelled"}], "nextSyncToken": "t2"},
+        HttpError(Mock(status=410, reason="Gone"), b""),
+        {"items": [event("review", 15, 16)], "nextSyncToken": "t3"},
+    )
+    mirror = CalendarMirror(gateway)
+
+    before = datetime.now(timezone.utc)
+    assert await mirror.sync() == 2
+    assert mirror.synced_at >= before
+    events = mirror.events_between(DAY, DAY + timedelta(days=1))
+    assert [e["summary"] for e in events] == ["standup", "lunch"]
+
+    assert await mirror.sync() == 1
+    assert [e["summary"] for e in mirror.events_between(DAY, DAY + timedelta(days=1))] == ["lunch"]
+
+    # An expired sync token replaces the mirror with a full listing
+    assert await mirror.sync() == 1
+    assert [e["summary"] for e in mirror.events_between(DAY, DAY + timedelta(days=1))] == ["review"]
+    assert gateway.requests == [None, None, "t1", "t2", None]
+    assert mirror.stats()["full_syncs"] == 2
+
+
+async def test_stale_mirror_defers_to_live_query():
+    mirror = CalendarMirror(FakeGateway({"items": [], "nextSyncToken": "t1"}), max_staleness_seconds=60)
+    assert mirror.events_between(DAY, DAY + timedelta(days=1)) is None
+
+    await mirror.sync()
+    assert mirror.events_between(DAY, DAY + timedelta(days=1)) == []
+
+    mirror._last_synced -= 120
+    assert mirror.events_between(DAY, DAY + timedelta(days=1)) is None
+    assert mirror.stats()["stale_misses"] == 2
@@ -0,0 +1,132 @@
+"""Tests for call state management over a versioned store."""
+
+import asyncio
+
+import pytest
+
+from src.receptionist.call_manager import CallManager, CallStateConflict
+from src.receptionist.call_state_store import InMemoryCallStateStore
+
+
+async def test_workers_sharing_a_store_see_each_others_turns():
+    """Test a call started on one worker can be continued on another."""
+    store = InMemoryCallStateStore()
+    first = CallManager(store=store, cache_seconds=0)
+    second = CallManager(store=store, cache_seconds=0)
+
+    await first.start_call("CA1", "+15550100")
+    await second.update_context("CA1", {"caller_name": "Ana"})
+    await first.update_transcript("CA1", "Hi, this is Ana")
+
+    state = await second.get_call_state("CA1")
+    assert state.context == {"caller_name": "Ana"}
+    assert state.transcript_history == ["Hi, this is Ana"]
+    assert state.version == 2
+
+    await second.end_call("CA1")
+    assert await first.get_call_state("CA1") is None
+    assert await first.active_call_sids() == []
+
+
+async def test_stale_cached_state_is_retried():
+    """Test an update based on a stale read is re-applied to the latest state."""
+    store = InMemoryCallStateStore()
+    first = CallManager(store=store, cache_seconds=60)
+    second = CallManager(store=store, cache_seconds=0)
+
+    await first.start_call("CA1", "+15550100")
+    await second.update_context("CA1", {"history": ["turn 1"]})
+    # first still caches version 0
+    await first.update_context("CA1", {"caller_name": "Ana"})
+
+    state = await second.get_call_state("CA1")
+    assert state.context == {"history": ["turn 1"], "caller_name": "Ana"}
+    assert first.stats()["version_conflicts"] == 1
+
+
+async def test_cached_reads_are_copies_and_expire():
+    """Test unsaved edits stay local and calls ended elsewhere leave the cache."""
+    store = InMemoryCallStateStore()
+    first = CallManager(store=store, cache_seconds=0.05)
+    second = CallManager(store=store, cache_seconds=0)
+
+    await first.start_call("CA1", "+15550100")
+    (await first.get_call_state("CA1")).context["greeted"] = True
+    assert (await first.get_call_state("CA1")).context == {}
+
+    await second.end_call("CA1")
+    await asyncio.sleep(0.06)
+    await first.start_call("CA2", "+15550101")
+    assert first.stats()["cached_calls"] == 1
+
+
+async def test_expired_calls_disappear():
+    """Test abandoned calls expire from the store."""
+    manager = CallManager(ttl_seconds=0, cache_seconds=0)
+    await manager.start_call("CA1", "+15550100")
+
+    assert await manager.get_call_state("CA1") is None
+    with pytest.raises(KeyError):
+        await manager.update_context("CA1", {"caller_name": "Ana"})
+
+
+async def test_persistent_conflict_raises():
+    """Test an update gives up after repeated conflicts."""
+    class RacingStore(InMemoryCallStateStore):
+        async def replace(self, call_sid, doc, expected_version, ttl_seconds):
+            return False
+
+    manager = CallManager(store=RacingStore(), cache_seconds=0)
+    await manager.start_call("CA1", "+15550100")
+
+    with pytest.raises(CallStateConflict):
+        await manager.update_context("CA1", {"caller_name": "Ana"})
+
+
+async def test_history_is_capped():
+    """Test a call's history keeps only the most recent turns."""
+    manager = CallManager(cache_seconds=0, max_history_turns=3, max_context_bytes=170)
+    await manager.start_call("CA1", "+15550100")
+
+    for turn in range(10):
+        state = await manager.get_call_state("CA1")
+        history = state.context.get("history", []) + [f"turn {turn}"]
+        await manager.update_context("CA1", {"history": history})
+    await manager.update_context("CA1", {"history": history + ["x" * 150]})
+
+    state = await manager.get_call_state("CA1")
+    assert state.context["history"] == ["x" * 150]
+    assert manager.stats()["trimmed"] > 0
+
+
+async def test_reaper_finalizes_stale_calls_once():
+    """Test stale calls are finalized by exactly one worker and evicted."""
+    store = InMemoryCallStateStore()
+    first = CallManager(store=store, cache_seconds=0, idle_timeout_seconds=0)
+    second = CallManager(store=store, cache_seconds=0, idle_timeout_seconds=0)
+    await first.start_call("CA1", "+15550100")
+    finalized = []
+
+    async def finalize(state, reason):
+        finalized.append((state.call_sid, reason))
+
+    reaped = await asyncio.gather(
+        first.reap_stale_calls(finalize), second.reap_stale_calls(finalize)
+    )
+
+    assert sum(reaped) == 1
+    assert finalized == [("CA1", "idle")]
+    assert await first.active_call_sids() == []
+    assert (await first.live_stats())["live_calls"] == 0
+    assert await first.claim_call("CA1") is None
+
+
+async def test_active_calls_are_not_reaped():
+    """Test calls within their limits survive a sweep."""
+    manager = CallManager(cache_seconds=0)
+    await manager.start_call("CA1", "+15550100")
+
+    assert await manager.reap_stale_calls() == 0
+    stats = await manager.live_stats()
+    assert stats["live_calls"] == 1
+    assert stats["state_bytes"] > 0
@@ -0,0 +1,51 @@
+"""Tests for bounded conversation history and background summarization."""
+
+import asyncio
+
+from src.receptionist.call_manager import CallManager
+from src.receptionist.conversation_history import ConversationHistory, HistorySummarizer
+
+
+def test_old_turns_leave_the_buffer_and_prompt_fits_budget():
+    """Test turns beyond the buffer become pending and prompts stay in budget."""
+    history = ConversationHistory(max_turns=3, token_budget=30)
+    context = {"history_summary": "Ana wants a demo."}
+    for turn in range(5):
+        history.append(context, f"question {turn} " * 5, f"answer {turn}")
+
+    assert [t["user"].split()[1] for t in context["history"]] == ["2", "3", "4"]
+    assert [t["user"].split()[1] for t in context["history_pending"]] == ["0", "1"]
+    assert ConversationHistory.needs_summary(context)
+
+    messages = history.messages(context)
+    assert messages[0] == {"role": "system", "content": "Summary of the earlier conversation: Ana wants a demo."}
+    # Only the latest turn fits next to the summary
+    assert [m["content"] for m in messages[1:]] == ["question 4 " * 5, "answer 4"]
+
+
+async def test_summarizer_folds_pending_turns_into_summary():
+    """Test pending turns are summarized in the background and cleared."""
+    manager = CallManager(cache_seconds=0)
+    await manager.start_call("CA1", "+15550100")
+    history = ConversationHistory(max_turns=1)
+    for turn in range(3):
+        await manager.edit_context("CA1", lambda ctx, t=turn: history.append(ctx, f"q{t}", f"a{t}"))
+
+    calls = []
+
+    async def summarize(summary, turns):
+        calls.append((summary, [t["user"] for t in turns]))
+        await asyncio.sleep(0)
+        return "Caller asked q0 and q1."
+
+    summarizer = HistorySummarizer(manager, summarize)
+    summarizer.schedule("CA1")
+    summarizer.schedule("CA1")
+    while summarizer.stats()["running"]:
+        await asyncio.sleep(0)
+
+    state = await manager.get_call_state("CA1")
+    assert calls[0] == ("", ["q0", "q1"])
+    assert state.context["history_summary"] == "Caller asked q0 and q1."
+    assert state.context["history_pending"] == []
+    assert [t["user"] for t in state.context["history"]] == ["q2"]
@@ -0,0 +1,87 @@
+"""Tests for the pre-opened Deepgram live session pool."""
+
+import asyncio
+
+import pytest
+
+from src.receptionist.deepgram_pool import DeepgramLivePool, DeepgramPoolExhausted
+
+
+class FakeConnection:
+    """Deepgram live connection that opens immediately."""
+
+    def __init__(self):
+        self.handlers = {}
+        self.keepalives = 0
+        self.finished = False
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    async def start(self, options):
+        asyncio.get_running_loop().call_soon(
+            lambda: asyncio.ensure_future(self.handlers["Open"](self, None))
+        )
+        return True
+
+    async def keep_alive(self):
+        self.keepalives += 1
+
+    async def finish(self):
+        self.finished = True
+
+
+class FakeClient:
+    def __init__(self):
+        self.connections = []
+        self.listen = self
+        self.asyncwebsocket = self
+
+    def v(self, version):
+        connection = FakeConnection()
+        self.connections.append(connection)
+        return connection
+
+
+async def wait_for_idle(pool, count):
+    for _ in range(100):
+        if pool.stats()["idle"] == count:
+            return
+        await asyncio.sleep(0.01)
+
+
+async def test_calls_get_warm_sessions_and_pool_refills():
+    """Test acquire hands out a pre-opened session and a replacement opens."""
+    client = FakeClient()
+    pool = DeepgramLivePool(client, options=None, min_idle=1, keepalive_interval=0.02)
+    pool.start()
+    await wait_for_idle(pool, 1)
+
+    session = await pool.acquire()
+    assert session.connection is client.connections[0]
+    await wait_for_idle(pool, 1)
+    assert len(client.connections) == 2
+
+    await asyncio.sleep(0.05)
+    assert client.connections[1].keepalives > 0
+
+    await pool.release(session)
+    assert client.connections[0].finished
+    stats = pool.stats()
+    assert stats["warm_acquires"] == 1
+    assert stats["cold_acquires"] == 0
+    assert stats["in_use"] == 0
+    await pool.stop()
+    assert client.connections[1].finished
+
+
+async def test_acquire_respects_session_limit():
+    """Test sessions beyond max_sessions are refused."""
+    pool = DeepgramLivePool(FakeClient(), options=None, min_idle=0, max_sessions=1)
+
+    session = await pool.acquire()
+    with pytest.raises(DeepgramPoolExhausted):
+        await pool.acquire()
+
+    await pool.release(session)
+    assert pool.stats()["cold_acquires"] == 1
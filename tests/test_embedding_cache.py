@@ -0,0 +1,72 @@
+"""Tests for the query embedding cache."""
+
+from src.receptionist.embedding_cache import EmbeddingCache
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_normalized_queries_share_entry():
+    """Test case, whitespace and edge punctuation do not change the key."""
+    cache = EmbeddingCache()
+    cache.put("Project update from Acme", "voyage-2", [0.1, 0.2])
+
+    assert cache.get("  project   update from ACME? ", "voyage-2") == [0.1, 0.2]
+    assert cache.hits == 1
+
+
+def test_model_is_part_of_key():
+    """Test the same text embedded by another model is a miss."""
+    cache = EmbeddingCache()
+    cache.put("hello", "voyage-2", [1.0])
+
+    assert cache.get("hello", "voyage-3") is None
+    assert cache.misses == 1
+
+
+def test_lru_eviction():
+    """Test least recently used entries are evicted first."""
+    cache = EmbeddingCache(max_entries=2)
+    cache.put("a", "m", [1.0])
+    cache.put("b", "m", [2.0])
+    cache.get("a", "m")
+    cache.put("c", "m", [3.0])
+
+    assert cache.get("b", "m") is None
+    assert cache.get("a", "m") == [1.0]
+    assert cache.evictions == 1
+
+
+def test_ttl_expiry():
+    """Test entries expire after the TTL."""
+    clock = FakeClock()
+    cache = EmbeddingCache(ttl_seconds=60, clock=clock)
+    cache.put("hello", "m", [1.0])
+
+    clock.now += 61
+
+    assert cache.get("hello", "m") is None
+    assert cache.stats()["size"] == 0
+
+
+async def test_disk_store_survives_restart(tmp_path):
+    """Test a new cache instance reads entries persisted by a previous one."""
+    path = str(tmp_path / "embeddings.db")
+    cache = EmbeddingCache(path=path)
+    await cache.store("hello", "m", [0.25, -0.5])
+    cache.close()
+
+    restarted = EmbeddingCache(path=path)
+
+    # The synchronous lookup stays in memory
+    assert restarted.get("hello", "m") is None
+    assert await restarted.fetch("hello", "m") == [0.25, -0.5]
+    assert restarted.get("hello", "m") == [0.25, -0.5]
+    assert restarted.stats()["disk_hits"] == 1
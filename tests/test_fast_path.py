@@ -0,0 +1,72 @@
+"""Tests for the single-round-trip reasoning fast path."""
+
+import json
+from unittest.mock import MagicMock
+
+import httpx
+
+from src.receptionist.reasoning_engine import ReasoningEngine, Tool
+
+
+def make_engine(message, requests):
+    """Create a ReasoningEngine that answers every completion with ``message``."""
+    def handler(request):
+        requests.append(json.loads(request.content))
+        return httpx.Response(200, json={"choices": [{"message": message}]})
+
+    engine = ReasoningEngine(settings=MagicMock(fireworks_api_key="test"))
+    engine._transport.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return engine
+
+
+async def test_direct_answer_takes_one_round_trip():
+    """Test a tool-free turn returns the cleaned reply from one completion."""
+    requests = []
+    engine = make_engine({"content": "Mr. Lee is out today, but I can take a message."}, requests)
+
+    decision = await engine.decide_or_respond("Is Mr. Lee in?", {})
+
+    assert decision.tool_calls == []
+    assert decision.response == "Mr. Lee is out today, but I can take a message."
+    assert requests[0]["tools"] == ReasoningEngine.TOOL_SCHEMAS
+    assert engine.path_stats()["fast_direct"] == 1
+    assert engine.path_stats()["round_trips_per_turn"] == 1.0
+    await engine.close()
+
+
+async def test_tool_calls_continue_with_results():
+    """Test tool calls are returned with IDs and their results fed back."""
+    requests = []
+    engine = make_engine(
+        {
+            "content": None,
+            "tool_calls": [{
+                "id": "call_1",
+                "type": "function",
+                "function": {"name": "check_calendar", "arguments": '{"date": "2025-01-06"}'},
+            }],
+        },
+        requests,
+    )
+
+    decision = await engine.decide_or_respond("Is Monday free?", {})
+
+    assert decision.response is None
+    assert decision.tool_calls[0].tool == Tool.CHECK_CALENDAR
+    assert decision.tool_calls[0].call_id == "call_1"
+
+    tool_messages = engine.tool_result_messages(
+        decision.tool_calls, [{"status": "ok", "calendar_busy": []}]
+    )
+    await engine.generate_response("Is Monday free?", {}, tool_messages)
+
+    continuation = requests[1]["messages"]
+    assert continuation[-2]["tool_calls"][0]["id"] == "call_1"
+    assert continuation[-1] == {
+        "role": "tool",
+        "tool_call_id": "call_1",
+        "content": '{"status": "ok", "calendar_busy": []}',
+    }
+    assert engine.path_stats()["fast_tools"] == 1
+    assert engine.path_stats()["round_trips"] == 2
+    await engine.close()
@@ -0,0 +1,124 @@
+"""Tests for incremental local index sync."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.receptionist.index_sync import EmailIndexSync
+from src.receptionist.local_index import LocalVectorIndex
+from src.receptionist.vector_search import VectorSearch
+from tests.conftest import FakeCollection
+
+T0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def email_doc(doc_id, value):
+    """Build a stored email document with a constant embedding."""
+    return {
+        "_id": doc_id,
+        "sender": "alice@example.com",
+        "subject": f"Subject {doc_id}",
+        "body": "Body",
+        "timestamp": datetime(2024, 1, 1),
+        "embedding": [value] * VectorSearch.EMBEDDING_DIMENSIONS,
+    }
+
+
+async def test_change_events_update_index(tmp_path):
+    """Test inserts, embedding removal and deletes are applied and snapshotted."""
+    index = LocalVectorIndex(dimensions=VectorSearch.EMBEDDING_DIMENSIONS)
+    sync = EmailIndexSync(MagicMock(), index, index_path=str(tmp_path), snapshot_interval=0)
+
+    await sync._apply_change(
+        {"operationType": "insert", "documentKey": {"_id": "a"}, "fullDocument": email_doc("a", 1.0)}
+    )
+    await sync._apply_change(
+        {"operationType": "insert", "documentKey": {"_id": "b"}, "fullDocument": email_doc("b", 0.5)}
+    )
+    assert len(index) == 2
+    assert index.search([1.0] * VectorSearch.EMBEDDING_DIMENSIONS, limit=1)[0][2]["subject"] == "Subject a"
+
+    unembedded = {**email_doc("b", 0.5), "embedding": None}
+    await sync._apply_change(
+        {"operationType": "update", "documentKey": {"_id": "b"}, "fullDocument": unembedded}
+    )
+    await sync._apply_change({"operationType": "delete", "documentKey": {"_id": "a"}})
+    assert len(index) == 0
+
+    index.sync_state["resume_token"] = {"_data": "token"}
+    await sync.stop()
+
+    loaded = LocalVectorIndex.load(tmp_path)
+    assert len(loaded) == 0
+    assert loaded.sync_state == {"resume_token": {"_data": "token"}}
+    assert sync.stats()["applied_changes"] == 4
+
+
+async def test_remove_drops_email_immediately():
+    """Test route-side removal takes effect without waiting for the feed."""
+    index = LocalVectorIndex(dimensions=VectorSearch.EMBEDDING_DIMENSIONS)
+    index.upsert("a", [1.0] * VectorSearch.EMBEDDING_DIMENSIONS, {})
+    sync = EmailIndexSync(MagicMock(), index)
+
+    await sync.remove("a")
+
+    assert "a" not in index
+
+
+class SteppingClock:
+    """Time source that advances a fixed step on every read."""
+
+    def __init__(self, step):
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+
+async def run_polls(sync, collection, polls):
+    """Run the polling loop until it has queried for changes ``polls`` times."""
+    task = asyncio.create_task(sync._poll())
+    while sum("updated_at" in q for q in collection.queries) < polls:
+        await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+async def test_polling_reconciles_deletes_once_per_interval():
+    """Test the full ID scan runs on start and then once per reconcile interval."""
+    collection = FakeCollection()
+    index = LocalVectorIndex(dimensions=VectorSearch.EMBEDDING_DIMENSIONS)
+    index.sync_state["watermark"] = T0.isoformat()
+    sync = EmailIndexSync(
+        collection, index, poll_interval=0, reconcile_interval=600, clock=SteppingClock(250)
+    )
+
+    await run_polls(sync, collection, 6)
+
+    # Polls at t=250..1500: reconciles at 250 (start) and 1000
+    assert collection.queries.count({}) == 2
+
+
+async def test_polling_skips_documents_already_applied_at_watermark(tmp_path):
+    """Test re-read documents at the watermark do not dirty the index again."""
+    collection = FakeCollection([
+        {**email_doc("a", 1.0), "updated_at": T0},
+        {**email_doc("b", 0.5), "updated_at": T0 + timedelta(seconds=1)},
+    ])
+    index = LocalVectorIndex(dimensions=VectorSearch.EMBEDDING_DIMENSIONS)
+    index.sync_state["watermark"] = T0.isoformat()
+    sync = EmailIndexSync(collection, index, index_path=str(tmp_path), poll_interval=0, snapshot_interval=0)
+    saves = []
+    save = index.save
+    index.save = lambda path: (saves.append(path), save(path))
+
+    await run_polls(sync, collection, 3)
+
+    assert len(index) == 2
+    assert sync.stats()["applied_changes"] == 2
+    assert len(saves) == 1
@@ -0,0 +1,108 @@
+"""Tests for the resilient LLM transport."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.receptionist.llm_transport import LLMTransport, LLMUnavailable
+
+URL = "https://llm.test/v1/chat/completions"
+OK = {"choices": [{"message": {"content": "Hello there."}}]}
+
+
+def make_transport(handler, **kwargs):
+    """Create a transport whose client answers with ``handler``."""
+    transport = LLMTransport(
+        URL, "key", "primary",
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        **kwargs,
+    )
+    transport.RETRY_BACKOFF = 0.001
+    return transport
+
+
+async def test_retries_server_errors_then_succeeds():
+    """Test 429/5xx responses are retried and the success is returned."""
+    statuses = [503, 429]
+
+    def handler(request):
+        if statuses:
+            return httpx.Response(statuses.pop(0), headers={"retry-after": "0"})
+        return httpx.Response(200, json=OK)
+
+    transport = make_transport(handler)
+    assert await transport.complete({"messages": []}, kind="respond") == OK
+    stats = transport.stats()
+    assert stats["retries"] == 2
+    assert stats["latency"]["respond"]["count"] == 1
+
+
+async def test_client_errors_are_not_retried():
+    """Test a 400 fails immediately without tripping the breaker."""
+    transport = make_transport(lambda request: httpx.Response(400), breaker_failures=1)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await transport.complete({"messages": []}, kind="respond")
+    assert transport.stats()["retries"] == 0
+    assert not transport.circuit_open
+
+
+async def test_open_circuit_switches_to_fallback_model():
+    """Test repeated failures route requests to the fallback model."""
+    models = []
+
+    def handler(request):
+        model = json.loads(request.content)["model"]
+        models.append(model)
+        return httpx.Response(500) if model == "primary" else httpx.Response(200, json=OK)
+
+    transport = make_transport(handler, fallback_model="backup", max_retries=0, breaker_failures=2)
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPStatusError):
+            await transport.complete({"model": "primary"}, kind="respond")
+
+    assert transport.circuit_open
+    assert await transport.complete({"model": "primary"}, kind="respond") == OK
+    assert models == ["primary", "primary", "backup"]
+
+
+async def test_open_circuit_without_fallback_fails_fast():
+    """Test an open circuit without a fallback raises without a request."""
+    transport = make_transport(lambda request: httpx.Response(502), max_retries=0, breaker_failures=1)
+    with pytest.raises(httpx.HTTPStatusError):
+        await transport.complete({}, kind="respond")
+
+    with pytest.raises(LLMUnavailable):
+        await transport.complete({}, kind="respond")
+
+
+async def test_slow_request_is_hedged():
+    """Test a request slower than the endpoint's p95 is raced by a hedge."""
+    calls = 0
+
+    async def handler(request):
+        nonlocal calls
+        calls += 1
+        if calls == 2:
+            await asyncio.sleep(5)
+        return httpx.Response(200, json=OK)
+
+    transport = make_transport(handler, hedge=True, hedge_min_samples=1)
+    await transport.complete({}, kind="respond")
+
+    assert await asyncio.wait_for(transport.complete({}, kind="respond"), 1) == OK
+    assert transport.stats()["hedges"] == 1
+    assert transport.stats()["hedge_wins"] == 1
+
+
+async def test_turn_budget_caps_requests():
+    """Test requests fail fast once the turn's budget is spent."""
+    transport = make_transport(lambda request: httpx.Response(200, json=OK))
+    with transport.turn_budget(0.2):
+        assert await transport.complete({}, kind="respond") == OK
+        await asyncio.sleep(0.2)
+        with pytest.raises(LLMUnavailable):
+            await transport.complete({}, kind="respond")
+    assert transport.stats()["deadline_exceeded"] == 1
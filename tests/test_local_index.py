@@ -0,0 +1,112 @@
+"""Tests for the in-process vector index."""
+
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+
+from src.receptionist.local_index import LocalVectorIndex
+from src.receptionist.vector_search import SearchResult, VectorSearch
+
+
+def random_vectors(count, dimensions=16, seed=0):
+    """Generate random unit vectors."""
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(count, dimensions)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def build_index(vectors, **kwargs):
+    """Create an index holding the given vectors with IDs "0", "1", ..."""
+    index = LocalVectorIndex(dimensions=vectors.shape[1], **kwargs)
+    for i, vector in enumerate(vectors):
+        index.upsert(str(i), vector.tolist(), {"subject": f"Email {i}", "body": f"Body {i}"})
+    return index
+
+
+def test_exact_search_matches_brute_force():
+    """Test top-k results equal a brute-force cosine ranking."""
+    vectors = random_vectors(200)
+    index = build_index(vectors)
+    query = random_vectors(1, seed=1)[0]
+
+    results = index.search(query.tolist(), limit=5)
+
+    expected = np.argsort(-(vectors @ query))[:5]
+    assert [doc_id for doc_id, _, _ in results] == [str(i) for i in expected]
+    assert results[0][1] >= results[-1][1]
+    assert 0.0 <= results[-1][1] <= 1.0
+
+
+def test_upsert_replaces_and_remove_deletes():
+    """Test upserting an existing ID replaces it and removal compacts the index."""
+    vectors = random_vectors(3)
+    index = build_index(vectors)
+
+    index.upsert("0", vectors[2].tolist(), {"subject": "Updated"})
+    assert len(index) == 3
+    assert index.search(vectors[2].tolist(), limit=1)[0][1] > 0.99
+
+    assert index.remove("1") is True
+    assert index.remove("1") is False
+    assert len(index) == 2
+    assert "1" not in index
+    assert {doc_id for doc_id, _, _ in index.search(vectors[0].tolist(), limit=5)} == {"0", "2"}
+
+
+def test_save_and_load_memory_mapped(tmp_path):
+    """Test a saved index loads memory-mapped with identical results."""
+    vectors = random_vectors(50)
+    index = build_index(vectors)
+    index.upsert("dated", vectors[0].tolist(), {"timestamp": datetime(2024, 1, 1, 9, 30)})
+    index.save(tmp_path)
+
+    loaded = LocalVectorIndex.load(tmp_path)
+    query = vectors[7].tolist()
+
+    assert isinstance(loaded._vectors, np.memmap)
+    assert loaded.search(query, limit=3) == index.search(query, limit=3)
+    assert loaded.search(vectors[0].tolist(), limit=2)[1][2]["timestamp"] == datetime(2024, 1, 1, 9, 30)
+
+    # Mutations after loading must not touch the file on disk
+    loaded.upsert("new", vectors[1].tolist(), {})
+    assert len(LocalVectorIndex.load(tmp_path)) == 51
+
+
+def test_ivf_search_finds_clustered_neighbors():
+    """Test the IVF layer returns the nearest neighbor for clustered data."""
+    rng = np.random.default_rng(2)
+    centers = random_vectors(8, seed=3)
+    vectors = np.repeat(centers, 60, axis=0) + rng.normal(scale=0.05, size=(480, 16))
+    index = build_index(vectors.astype(np.float32), nlist=8, nprobe=2)
+
+    assert index.train() is True
+
+    query = vectors[100]
+    assert index.search(query.tolist(), limit=1)[0][0] == "100"
+
+
+def test_train_skipped_for_small_index():
+    """Test IVF training is skipped when there are too few vectors."""
+    index = build_index(random_vectors(10), nlist=8)
+
+    assert index.train() is False
+    assert index.is_trained is False
+
+
+async def test_vector_search_uses_local_index():
+    """Test search_emails returns SearchResult objects from the local index."""
+    vectors = random_vectors(5, dimensions=VectorSearch.EMBEDDING_DIMENSIONS)
+    index = build_index(vectors)
+    vector_search = VectorSearch(
+        voyage_api_key="test_key", db_manager=MagicMock(), local_index=index
+    )
+    vector_search.embed_text = AsyncMock(return_value=vectors[3].tolist())
+
+    results = await vector_search.search_emails("quarterly report")
+
+    assert len(results) == 3
+    assert isinstance(results[0], SearchResult)
+    assert results[0].metadata["id"] == "3"
+    assert results[0].metadata["subject"] == "Email 3"
+    assert results[0].content == "Body 3"
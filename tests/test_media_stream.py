@@ -0,0 +1,216 @@
+"""Tests for the real-time media stream conversation loop."""
+
+import asyncio
+import base64
+
+from src.receptionist.media_stream import MediaStreamSession, StreamReply, frame_audio
+from src.receptionist.tts_cache import TTSCache
+
+
+class FakeWebSocket:
+    """Collects messages sent to Twilio."""
+
+    def __init__(self):
+        self.sent = []
+        self.closed = False
+
+    async def send_json(self, message):
+        self.sent.append(message)
+
+    async def close(self):
+        self.closed = True
+
+    def events(self, name):
+        return [m for m in self.sent if m["event"] == name]
+
+
+async def synthesize(text, encoding="mp3"):
+    return text.encode()
+
+
+def make_session(websocket, transcribe, respond, **kwargs):
+    return MediaStreamSession(
+        websocket, "MZ1", TTSCache(synthesize), transcribe, respond, **kwargs
+    )
+
+
+async def test_transcripts_are_answered_on_the_socket():
+    """Test the greeting and each reply are sent as media events."""
+    websocket = FakeWebSocket()
+    greeted = asyncio.Event()
+
+    async def transcribe(audio, on_speech_started):
+        frames = [frame async for frame in audio]
+        assert frames == [b"\x7f" * 160]
+        await greeted.wait()
+        yield "Can I book a meeting?"
+
+    async def respond(transcript):
+        return StreamReply(["Sure, what day works?"], end_call=True)
+
+    session = make_session(websocket, transcribe, respond)
+    session.start(greeting="Hello, this is Donna.")
+    session.feed(b"\x7f" * 160)
+    session._put_inbound(None)
+
+    for _ in range(100):
+        if websocket.events("mark"):
+            break
+        await asyncio.sleep(0.01)
+    session.on_mark(websocket.events("mark")[0]["mark"]["name"])
+    greeted.set()
+
+    for _ in range(100):
+        if len(websocket.events("mark")) == 2:
+            break
+        await asyncio.sleep(0.01)
+    payloads = [base64.b64decode(m["media"]["payload"]) for m in websocket.events("media")]
+    assert [p.rstrip(b"\xff") for p in payloads] == [b"Hello, this is Donna.", b"Sure, what day works?"]
+    assert {len(p) for p in payloads} == {160}
+    assert all(m["streamSid"] == "MZ1" for m in websocket.sent)
+
+    # The call ends once Twilio reports the last clip played
+    session.on_mark(websocket.events("mark")[1]["mark"]["name"])
+    for _ in range(100):
+        if websocket.closed:
+            break
+        await asyncio.sleep(0.01)
+    assert websocket.closed
+    assert session.stats()["turns"] == 1
+    await session.close()
+
+
+async def test_barge_in_clears_playback():
+    """Test caller speech clears audio that has not finished playing."""
+    websocket = FakeWebSocket()
+    speech_started = asyncio.Event()
+
+    async def transcribe(audio, on_speech_started):
+        await speech_started.wait()
+        await on_speech_started()
+        async for _ in audio:
+            pass
+        return
+        yield
+
+    async def respond(transcript):
+        return StreamReply([])
+
+    session = make_session(websocket, transcribe, respond)
+    session.start(greeting="Hello, this is Donna. How may I help you today?")
+    for _ in range(100):
+        if websocket.events("mark"):
+            break
+        await asyncio.sleep(0.01)
+    assert session.speaking
+
+    speech_started.set()
+    for _ in range(100):
+        if websocket.events("clear"):
+            break
+        await asyncio.sleep(0.01)
+    assert not session.speaking
+    assert session.stats()["barge_ins"] == 1
+    await session.close()
+
+
+async def test_sentences_play_as_generated_and_stale_replies_are_dropped():
+    """Test a reply plays before it is complete, unless a barge-in outdates it."""
+    websocket = FakeWebSocket()
+    turns = asyncio.Queue()
+    replies = [StreamReply(), StreamReply()]
+
+    async def transcribe(audio, on_speech_started):
+        while (transcript := await turns.get()) is not None:
+            yield transcript
+
+    async def respond(transcript):
+        return replies.pop(0)
+
+    session = make_session(websocket, transcribe, respond)
+    session.start()
+
+    # The first sentence is sent while the rest of the reply is generating
+    turns.put_nowait("Is Mr. Lee in?")
+    first = replies[0]
+    first.put("Let me check.")
+    for _ in range(100):
+        if websocket.events("mark"):
+            break
+        await asyncio.sleep(0.01)
+    assert len(websocket.events("mark")) == 1
+
+    # The caller talks over the rest; its sentences must not play
+    turns.put_nowait("Actually, never mind.")
+    for _ in range(100):
+        if session._generation == 2:
+            break
+        await asyncio.sleep(0.01)
+    first.put("He is out today.")
+    first.finish()
+    replies[0].put("No problem.")
+    replies[0].finish()
+    for _ in range(100):
+        if len(websocket.events("mark")) == 2:
+            break
+        await asyncio.sleep(0.01)
+
+    payloads = [base64.b64decode(m["media"]["payload"]).rstrip(b"\xff") for m in websocket.events("media")]
+    assert payloads == [b"Let me check.", b"No problem."]
+    assert session.stats()["turns"] == 2
+    await session.close()
+
+
+async def test_inbound_audio_drops_oldest_when_full():
+    """Test a slow transcriber does not block the socket reader."""
+    async def transcribe(audio, on_speech_started):
+        return
+        yield
+
+    session = make_session(FakeWebSocket(), transcribe, None, max_inbound_frames=2)
+    for frame in (b"1", b"2", b"3"):
+        session.feed(frame)
+
+    assert session.stats()["dropped_frames"] == 1
+    assert [session._inbound.get_nowait() for _ in range(2)] == [b"2", b"3"]
+
+
+async def test_uncached_sentences_stream_as_frames():
+    """Test streamed TTS is sent in 20ms frames and then cached."""
+    websocket = FakeWebSocket()
+    cache = TTSCache(synthesize)
+
+    async def synthesize_stream(text):
+        for _ in range(3):
+            yield b"\x01" * 100
+
+    async def transcribe(audio, on_speech_started):
+        return
+        yield
+
+    session = MediaStreamSession(
+        websocket, "MZ1", cache, transcribe, None, synthesize_stream=synthesize_stream
+    )
+    session.start(greeting="One moment please.")
+    for _ in range(100):
+        if websocket.events("mark"):
+            break
+        await asyncio.sleep(0.01)
+
+    frames = [base64.b64decode(m["media"]["payload"]) for m in websocket.events("media")]
+    assert [len(f) for f in frames] == [160, 160]
+    assert frames[1] == b"\x01" * 140 + b"\xff" * 20
+    assert await cache.has(cache.key("One moment please.", "mulaw"))
+    assert session.stats()["streamed_clips"] == 1
+    await session.close()
+
+
+async def test_frame_audio_pads_last_frame():
+    """Test arbitrary chunks are re-cut into fixed frames."""
+    async def chunks():
+        yield b"a" * 5
+        yield b"b" * 6
+
+    assert [f async for f in frame_audio(chunks(), frame_bytes=4)] == [
+        b"aaaa", b"abbb", b"bbb\xff"
+    ]
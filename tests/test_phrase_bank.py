@@ -0,0 +1,68 @@
+"""Tests for the pre-warmed TTS phrase bank."""
+
+from src.receptionist.models import BusinessConfig
+from src.receptionist.phrase_bank import NO_SPEECH_PROMPT, PhraseBank
+from src.receptionist.tts_cache import TTSCache
+from src.receptionist.voice_pipeline import VoicePipeline
+
+
+async def test_warm_synthesizes_each_clip_once_and_pins_it():
+    """Test phrases are synthesized per sentence and survive LRU pressure."""
+    calls = []
+
+    async def synthesize(text, encoding="mp3"):
+        calls.append(text)
+        return b"x" * 100
+
+    cache = TTSCache(synthesize, max_bytes=150)
+    bank = PhraseBank(cache)
+
+    ready = await bank.warm()
+
+    assert ready == len(bank.segments()) == len(calls)
+    assert "I didn't catch that." in calls
+    assert "Could you please repeat?" in calls
+
+    # Filling the LRU does not evict pinned phrases
+    for i in range(5):
+        await cache.get(cache.start(f"Other reply number {i}."))
+    calls.clear()
+    await bank.warm()
+    assert calls == []
+    assert await cache.get(cache.key("I didn't catch that.")) is not None
+    assert bank.stats()["warmups"] == 2
+
+
+async def test_warm_reports_failed_clips():
+    """Test synthesis failures are counted rather than raised."""
+    async def synthesize(text, encoding="mp3"):
+        if text == NO_SPEECH_PROMPT.split(". ")[0] + ".":
+            raise RuntimeError("TTS down")
+        return b"audio"
+
+    bank = PhraseBank(TTSCache(synthesize))
+    bank.start()
+
+    assert await bank.wait(timeout=1.0)
+    assert bank.stats()["failed"] == 1
+
+
+async def test_config_change_prepares_the_new_greeting():
+    """Test the greeting clips follow the business configuration."""
+    calls = []
+
+    async def synthesize(text, encoding="mp3"):
+        calls.append(text)
+        return b"audio"
+
+    bank = PhraseBank(TTSCache(synthesize))
+    await bank.warm(BusinessConfig(ceo_name="Maya", company_name="Acme"))
+    calls.clear()
+
+    config = BusinessConfig(ceo_name="Maya", company_name="Globex")
+    await bank.warm(config)
+
+    assert calls == ["Hello, you've reached Globex."]
+    assert VoicePipeline.greeting_for(config).startswith(calls[0])
+    assert VoicePipeline.DEFAULT_GREETING not in bank.phrases(config)
+    assert bank.phrases()[0] == VoicePipeline.DEFAULT_GREETING
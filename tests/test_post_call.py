@@ -0,0 +1,95 @@
+"""Tests for batched post-call analysis."""
+
+import json
+from unittest.mock import MagicMock
+
+import httpx
+
+from src.receptionist.post_call import PostCallQueue
+from src.receptionist.reasoning_engine import CallOutcome, ReasoningEngine
+from tests.conftest import FakeCollection, make_due
+
+
+async def test_calls_are_batched_and_upserted():
+    batches = []
+
+    async def analyze(transcripts):
+        batches.append(transcripts)
+        return [
+            CallOutcome(t[0], "handled", "Question answered", "", "Answered") for t in transcripts
+        ]
+
+    jobs, calls = FakeCollection(), FakeCollection()
+    queue = PostCallQueue(jobs, calls, analyze, batch_size=2)
+
+    for sid in ["CA1", "CA2", "CA3"]:
+        assert await queue.enqueue({"call_sid": sid, "outcome": "completed"}, [f"{sid} asked"])
+    assert not await queue.enqueue({"call_sid": "CA1", "outcome": "completed"}, ["CA1 asked"])
+
+    assert await queue.process_batch() == 2
+    assert await queue.process_batch() == 1
+    assert await queue.process_batch() == 0
+    assert [len(b) for b in batches] == [2, 1]
+    assert jobs.docs == []
+    assert sorted(c["summary"] for c in calls.docs) == ["CA1 asked", "CA2 asked", "CA3 asked"]
+    assert queue.stats()["duplicates"] == 1
+
+
+async def test_failed_analysis_is_retried_then_recorded():
+    async def analyze(transcripts):
+        raise httpx.ConnectError("down")
+
+    jobs, calls = FakeCollection(), FakeCollection()
+    queue = PostCallQueue(jobs, calls, analyze, max_attempts=2)
+    await queue.enqueue({"call_sid": "CA1", "outcome": "failed"}, ["Hello?"], summary="Call ended unexpectedly")
+
+    await queue.process_batch()
+    assert calls.docs == [] and jobs.docs[0]["attempts"] == 1
+    make_due(jobs)
+    await queue.process_batch()
+
+    assert jobs.docs == []
+    assert calls.docs[0]["decision_label"] == "Processing Error"
+    assert calls.docs[0]["summary"] == "Call ended unexpectedly"
+    assert queue.stats()["failures"] == 1
+
+
+async def test_failed_batch_is_analyzed_call_by_call():
+    async def analyze(transcripts):
+        if len(transcripts) > 1 or transcripts[0] == ["garbled"]:
+            raise ValueError("Unparseable analysis")
+        return [CallOutcome(transcripts[0][0], "handled", "Question answered", "", "Answered")]
+
+    jobs, calls = FakeCollection(), FakeCollection()
+    queue = PostCallQueue(jobs, calls, analyze, batch_size=3)
+    for sid, transcript in [("CA1", "Hi"), ("CA2", "garbled"), ("CA3", "Bye")]:
+        await queue.enqueue({"call_sid": sid, "outcome": "completed"}, [transcript])
+
+    assert await queue.process_batch() == 3
+
+    assert sorted(c["call_sid"] for c in calls.docs) == ["CA1", "CA3"]
+    assert [(j["_id"], j["attempts"]) for j in jobs.docs] == [("CA2", 1)]
+    assert queue.stats()["split_batches"] == 1
+
+
+async def test_engine_analyzes_several_calls_in_one_completion():
+    requests = []
+
+    def handler(request):
+        requests.append(json.loads(request.content))
+        content = {"calls": [
+            {"call": 2, "summary": "Wants a demo", "decision": "scheduled", "decision_label": "Meeting booked"},
+            {"call": 1, "summary": "Sales pitch", "decision": "rejected", "decision_label": "Spam rejected"},
+        ]}
+        return httpx.Response(200, json={"choices": [{"message": {"content": json.dumps(content)}}]})
+
+    engine = ReasoningEngine(settings=MagicMock(fireworks_api_key="test"))
+    engine._transport.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    outcomes = await engine.analyze_call_outcomes([["Buy our SEO"], [], ["Can I book a demo?"]])
+
+    assert [o.decision for o in outcomes] == ["rejected", "rejected", "scheduled"]
+    assert outcomes[1].decision_label == "No input"
+    assert len(requests) == 1
+    assert "=== Call 2 ===\nCan I book a demo?" in requests[0]["messages"][1]["content"]
+    await engine.close()
@@ -0,0 +1,75 @@
+"""Tests for prefix-stable prompt assembly and token usage accounting."""
+
+import json
+from unittest.mock import MagicMock
+
+import httpx
+
+from src.receptionist.models import BusinessConfig
+from src.receptionist.prompt_builder import PromptBuilder
+from src.receptionist.reasoning_engine import ReasoningEngine
+
+
+def test_prefix_is_reused_until_business_config_changes():
+    """Test the prefix is built once per business config."""
+    builder = PromptBuilder("Base.", BusinessConfig(ceo_name="Ana"))
+    first = builder.prefix
+
+    assert builder.prefix is first
+    builder.set_business_config(BusinessConfig(ceo_name="Ana"))
+    assert builder.prefix is first
+    builder.set_business_config(BusinessConfig(ceo_name="Ben", company_name="Acme"))
+    assert builder.prefix == "Base.\n\nYou work for Ben. The company is Acme."
+    assert builder.prefix_builds == 2
+
+
+async def test_volatile_content_follows_the_stable_prefix():
+    """Test date and retrieved context are sent after the prefix and history."""
+    requests = []
+
+    def handler(request):
+        requests.append(json.loads(request.content))
+        return httpx.Response(200, json={
+            "choices": [{"message": {"content": "Ana is free at three this afternoon."}}],
+            "usage": {"prompt_tokens": 900, "completion_tokens": 12,
+                      "prompt_tokens_details": {"cached_tokens": 800}},
+        })
+
+    engine = ReasoningEngine(
+        settings=MagicMock(fireworks_api_key="test"),
+        business_config=BusinessConfig(ceo_name="Ana"),
+    )
+    engine._transport.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    context = {"history": [{"user": "Hi", "assistant": "Hello!"}], "calendar_available": True}
+
+    await engine.generate_response("Is Ana free?", context)
+    await engine.generate_response("Is Ana free?", {**context, "calendar_check_date": "Friday"})
+
+    first, second = (r["messages"] for r in requests)
+    assert first[0] == second[0]
+    assert "CURRENT DATE AND TIME" not in first[0]["content"]
+    assert [m["role"] for m in first] == ["system", "user", "assistant", "system", "user"]
+    assert "Calendar for the requested date" in first[3]["content"]
+
+    usage = engine.prompt_stats()["usage"]["respond"]
+    assert usage["requests"] == 2
+    assert usage["cache_hit_ratio"] == round(1600 / 1800, 3)
+    await engine.close()
+
+
+async def test_response_prompt_quotes_the_spoken_greeting():
+    """Test the model is told the greeting the caller actually heard."""
+    requests = []
+
+    def handler(request):
+        requests.append(json.loads(request.content))
+        return httpx.Response(200, json={"choices": [{"message": {"content": "Sure, one moment."}}]})
+
+    engine = ReasoningEngine(settings=MagicMock(fireworks_api_key="test"))
+    engine._transport.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    greeting = "Hello, you've reached Acme. This is Donna, Ana's assistant. How may I help you today?"
+
+    await engine.generate_response("Is Ana in?", {"history": [], "greeted": True, "greeting": greeting})
+
+    assert f'You already greeted the caller with "{greeting}"' in requests[0]["messages"][-2]["content"]
+    await engine.close()
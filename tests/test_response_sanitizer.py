@@ -0,0 +1,54 @@
+"""Tests for the precompiled response sanitizer."""
+
+import json
+from pathlib import Path
+
+from src.receptionist.reasoning_engine import SentenceSplitter
+from src.receptionist.response_sanitizer import StreamingSanitizer, clean_response
+
+CORPUS = Path(__file__).parent / "data" / "model_outputs.jsonl"
+
+
+def load_corpus():
+    with CORPUS.open() as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def test_matches_recorded_cleanup_of_model_outputs():
+    """Test every corpus output cleans to what the previous cleaner produced."""
+    for sample in load_corpus():
+        assert clean_response(sample["output"]) == sample["cleaned"], sample["output"]
+
+
+def stream_clean(text, chunk_size):
+    """Run text through the streaming pipeline in fixed-size chunks."""
+    sanitizer, splitter, spoken = StreamingSanitizer(), SentenceSplitter(), []
+    for i in range(0, len(text), chunk_size):
+        spoken += splitter.feed(sanitizer.feed(text[i:i + chunk_size]))
+    spoken += splitter.feed(sanitizer.flush())
+    spoken.append(splitter.flush())
+    return [c for c in map(clean_response, spoken) if c]
+
+
+def test_streaming_drops_reasoning_blocks_split_across_tokens():
+    """Test reasoning blocks are removed whatever the token boundaries."""
+    text = (
+        "<thinking>The caller wants Friday. I should check.</thinking>"
+        "Friday at 3 works for Dr. Patel. <reasoning>confirm</reasoning>Shall I book it?"
+    )
+    for chunk_size in (1, 2, 3, 7, len(text)):
+        assert stream_clean(text, chunk_size) == [
+            "Friday at 3 works for Dr. Patel.",
+            "Shall I book it?",
+        ]
+
+
+def test_streaming_holds_back_only_possible_tags():
+    """Test ordinary text is passed on immediately and partial tags are held."""
+    sanitizer = StreamingSanitizer()
+    assert sanitizer.feed("Sure, <b>") == "Sure, <b>"
+    assert sanitizer.feed("see you <thin") == "see you "
+    assert sanitizer.feed("king>plan") == ""
+    assert sanitizer.flush() == ""
+    assert sanitizer.feed("Bye <3") == "Bye "
+    assert sanitizer.flush() == "<3"
@@ -0,0 +1,84 @@
+"""Tests for idempotent meeting holds and the Google write-behind."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+
+from googleapiclient.errors import HttpError
+
+from src.receptionist.scheduling_queue import CONFIRMED, FAILED, PENDING, SchedulingQueue, hold_key
+from tests.conftest import FakeCollection, make_due
+
+START = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) + timedelta(days=1)
+END = START + timedelta(hours=1)
+
+
+class FakeGateway:
+    """Inserts events, failing with the queued errors first."""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.inserted = []
+
+    async def insert_event(self, body):
+        if self.errors:
+            raise self.errors.pop(0)
+        self.inserted.append(body)
+        return {"id": body["id"], "htmlLink": f"https://calendar/{body['id']}"}
+
+
+async def test_repeated_request_maps_to_one_hold():
+    collection = FakeCollection()
+    queue = SchedulingQueue(FakeGateway(), collection)
+
+    doc, created = await queue.hold("CA1", "Demo", START, END, {"summary": "Demo"})
+    assert created and doc["status"] == PENDING
+    _, created = await queue.hold("CA1", " demo ", START, END, {"summary": "Demo"})
+    assert not created
+    assert len(collection.docs) == 1
+
+    # Another worker sharing the collection sees the slot as busy
+    other_worker = SchedulingQueue(FakeGateway(), collection)
+    assert await other_worker.busy_between(START, END) == [(START, END)]
+    assert await other_worker.busy_between(END, END + timedelta(hours=1)) == []
+
+    assert await queue.process_due() == 1
+    hold = collection.doc(hold_key("CA1", "Demo", START))
+    assert hold["status"] == CONFIRMED
+    assert hold["html_link"].endswith(hold["_id"])
+
+    # Once the calendar mirror has synced past the confirmation, the mirror
+    # is the source of truth (the owner may have moved or deleted the event)
+    confirmed_at = hold["confirmed_at"]
+    assert await queue.busy_between(START, END, confirmed_at - timedelta(seconds=1)) == [(START, END)]
+    assert await queue.busy_between(START, END, confirmed_at) == []
+    assert queue.stats()["duplicates"] == 1
+
+
+async def test_lost_write_reconciles_and_failures_can_be_retried():
+    gateway = FakeGateway(
+        HttpError(Mock(status=409, reason="Conflict"), b""),
+        HttpError(Mock(status=503, reason="Unavailable"), b""),
+        HttpError(Mock(status=503, reason="Unavailable"), b""),
+    )
+    collection = FakeCollection()
+    queue = SchedulingQueue(gateway, collection, max_attempts=2)
+
+    # The event already exists under the hold's ID: confirmed, not re-created
+    await queue.hold("CA1", "Demo", START, END, {"summary": "Demo"})
+    await queue.process_due()
+    assert collection.doc(hold_key("CA1", "Demo", START))["status"] == CONFIRMED
+    assert queue.stats()["reconciled"] == 1
+
+    doc, _ = await queue.hold("CA2", "Intro", START, END, {"summary": "Intro"})
+    await queue.process_due()
+    assert collection.doc(doc["_id"])["status"] == PENDING
+    make_due(collection)
+    await queue.process_due()
+    assert collection.doc(doc["_id"])["status"] == FAILED
+    assert await queue.busy_between(START, END) == [(START, END)]  # CA1's confirmed hold only
+
+    assert await queue.retry(doc["_id"])
+    assert not await queue.retry(doc["_id"])
+    await queue.process_due()
+    assert collection.doc(doc["_id"])["status"] == CONFIRMED
+    assert gateway.inserted == [{"summary": "Intro", "id": doc["_id"]}]
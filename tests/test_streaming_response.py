@@ -0,0 +1,67 @@
+"""Tests for streamed, sentence-split LLM responses."""
+
+import json
+from unittest.mock import MagicMock
+
+import httpx
+
+from src.receptionist.reasoning_engine import ReasoningEngine, SentenceSplitter, split_sentences
+
+
+def sse_body(*deltas):
+    """Build a chat completions SSE body from content deltas."""
+    lines = [
+        "data: " + json.dumps({"choices": [{"delta": {"content": delta}}]})
+        for delta in deltas
+    ]
+    lines.append("data: [DONE]")
+    return "\n\n".join(lines) + "\n\n"
+
+
+def make_engine(handler):
+    """Create a ReasoningEngine whose HTTP client uses a mock transport."""
+    engine = ReasoningEngine(settings=MagicMock(fireworks_api_key="test"))
+    engine._transport.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return engine
+
+
+def test_splitter_emits_sentences_as_they_complete():
+    """Test sentences are returned once followed by whitespace."""
+    splitter = SentenceSplitter()
+
+    assert splitter.feed("Sure, Dr. Smith is free") == []
+    assert splitter.feed(" at 3 p.m. tomorrow. I'll") == ["Sure, Dr. Smith is free at 3 p.m. tomorrow."]
+    assert splitter.feed(" book it now.") == []
+    assert splitter.flush() == "I'll book it now."
+
+
+def test_splitter_keeps_tags_and_short_fragments_together():
+    """Test boundaries inside open tags and very short fragments are skipped."""
+    assert split_sentences("<thinking>Check. Then book.</thinking> Done, all booked.") == [
+        "<thinking>Check. Then book.</thinking> Done, all booked."
+    ]
+    assert split_sentences("Okay. That slot is open. Want it?") == [
+        "Okay. That slot is open.",
+        "Want it?",
+    ]
+
+
+async def test_stream_response_yields_cleaned_sentences():
+    """Test SSE deltas are reassembled into cleaned sentences."""
+    body = sse_body("Great news", "! Ms. Lee is free", " on Monday.", " *checks notes* Shall I", " book it?")
+    engine = make_engine(lambda request: httpx.Response(200, text=body))
+
+    sentences = [s async for s in engine.stream_response("Is she free?", {})]
+
+    assert sentences == ["Great news! Ms. Lee is free on Monday.", "Shall I book it?"]
+    await engine.close()
+
+
+async def test_stream_response_error_yields_apology():
+    """Test a failed request yields the standard error reply."""
+    engine = make_engine(lambda request: httpx.Response(500, text="boom"))
+
+    sentences = [s async for s in engine.stream_response("Hello", {})]
+
+    assert sentences == [ReasoningEngine.ERROR_RESPONSE]
+    await engine.close()
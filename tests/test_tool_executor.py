@@ -0,0 +1,93 @@
+"""Tests for concurrent tool execution."""
+
+import asyncio
+import time
+
+from src.receptionist.reasoning_engine import Tool, ToolCall
+from src.receptionist.tool_executor import ToolExecutor
+
+
+def sleeper(delay, updates, log=None, name=None):
+    """Build a handler that sleeps and returns fixed context updates."""
+    async def handler(arguments, context):
+        if log is not None:
+            log.append(f"start:{name}")
+        await asyncio.sleep(delay)
+        if log is not None:
+            log.append(f"end:{name}")
+        return updates
+    return handler
+
+
+async def test_independent_tools_run_concurrently():
+    """Test three 0.1s tools finish in roughly one tool's latency."""
+    executor = ToolExecutor()
+    executor.register(Tool.SEARCH_CONTACTS, sleeper(0.1, {"contacts": ["a"]}))
+    executor.register(Tool.SEARCH_EMAILS, sleeper(0.1, {"emails": ["b"]}))
+    executor.register(Tool.CHECK_CALENDAR, sleeper(0.1, {"calendar_busy": []}))
+    context = {}
+
+    started = time.perf_counter()
+    result = await executor.execute(
+        [
+            ToolCall(Tool.SEARCH_CONTACTS, {}),
+            ToolCall(Tool.SEARCH_EMAILS, {}),
+            ToolCall(Tool.CHECK_CALENDAR, {}),
+        ],
+        context,
+    )
+
+    assert time.perf_counter() - started < 0.25
+    assert context == {"contacts": ["a"], "emails": ["b"], "calendar_busy": []}
+    assert [t.tool for t in result.timings] == ["search_contacts", "search_emails", "check_calendar"]
+    assert all(t.status == "ok" for t in result.timings)
+
+
+async def test_schedule_waits_for_calendar_check():
+    """Test a dependent tool starts after its dependency, whatever the call order."""
+    log = []
+    executor = ToolExecutor()
+    executor.register(Tool.CHECK_CALENDAR, sleeper(0.05, {}, log, "check"))
+    executor.register(Tool.SCHEDULE_MEETING, sleeper(0, {}, log, "schedule"))
+
+    await executor.execute(
+        [ToolCall(Tool.SCHEDULE_MEETING, {}), ToolCall(Tool.CHECK_CALENDAR, {})], {}
+    )
+
+    assert log == ["start:check", "end:check", "start:schedule", "end:schedule"]
+
+
+async def test_timeout_cancels_tool_and_reports_error():
+    """Test a slow tool is cancelled and its error key is set."""
+    executor = ToolExecutor(timeouts={Tool.CHECK_CALENDAR: 0.01})
+    executor.register(Tool.CHECK_CALENDAR, sleeper(1.0, {"calendar_busy": []}))
+    context = {}
+
+    result = await executor.execute([ToolCall(Tool.CHECK_CALENDAR, {})], context)
+
+    assert result.timings[0].status == "timeout"
+    assert "calendar_error" in context
+    assert executor.stats()["check_calendar"]["timeouts"] == 1
+
+
+async def test_updates_merge_in_call_order():
+    """Test later calls win on key conflicts regardless of finish order."""
+    executor = ToolExecutor()
+    executor.register(Tool.SEARCH_CONTACTS, sleeper(0.05, {"summary": "contacts"}))
+    executor.register(Tool.SEARCH_EMAILS, sleeper(0, {"summary": "emails"}))
+
+    result = await executor.execute(
+        [ToolCall(Tool.SEARCH_CONTACTS, {}), ToolCall(Tool.SEARCH_EMAILS, {})], {}
+    )
+
+    assert result.updates["summary"] == "emails"
+
+
+async def test_end_call_sets_flag():
+    """Test end_call returns the farewell and the end-call flag."""
+    result = await ToolExecutor().execute(
+        [ToolCall(Tool.END_CALL, {"farewell_message": "Bye now"})], {}
+    )
+
+    assert result.should_end_call is True
+    assert result.updates == {"end_call_message": "Bye now"}
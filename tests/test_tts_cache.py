@@ -0,0 +1,118 @@
+"""Tests for the TTS audio cache."""
+
+import asyncio
+
+import pytest
+
+from src.receptionist.tts_cache import TTSCache, parse_byte_range
+
+
+class FakeSynthesizer:
+    """Counts synthesis calls and returns the text as audio bytes."""
+
+    def __init__(self, delay=0.0, fail=False):
+        self.calls = 0
+        self.delay = delay
+        self.fail = fail
+
+    async def __call__(self, text, encoding="mp3"):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("TTS down")
+        return f"{encoding}:{text}".encode()
+
+
+async def test_concurrent_requests_share_one_synthesis():
+    """Test the same phrase requested twice is synthesized once."""
+    synthesize = FakeSynthesizer(delay=0.01)
+    cache = TTSCache(synthesize)
+
+    first = cache.start("Hello there")
+    second = cache.start("Hello there")
+    results = await asyncio.gather(cache.get(first), cache.get(second))
+
+    assert first == second
+    assert results == [b"mp3:Hello there", b"mp3:Hello there"]
+    assert synthesize.calls == 1
+    assert cache.key("Hello there", "mulaw") != first
+
+
+async def test_byte_budget_evicts_least_recently_used():
+    """Test memory stays under the byte budget, evicting LRU audio first."""
+    cache = TTSCache(FakeSynthesizer(), max_bytes=20)
+    a = cache.start("aaaaaa")  # 10 bytes each with the "mp3:" prefix
+    await cache.get(a)
+    b = cache.start("bbbbbb")
+    await cache.get(b)
+    await cache.get(a)
+    c = cache.start("cccccc")
+    await cache.get(c)
+
+    assert cache.stats()["bytes"] <= 20
+    assert cache.stats()["evictions"] == 1
+    assert await cache.get(b) is None
+    assert await cache.get(a) == b"mp3:aaaaaa"
+    assert b not in cache._encodings and len(cache._encodings) == 2
+
+
+async def test_disk_tier_survives_restart(tmp_path):
+    """Test a new cache (or another worker) serves audio from the shared directory."""
+    synthesize = FakeSynthesizer()
+    cache = TTSCache(synthesize, directory=str(tmp_path))
+    audio_id = cache.start("Thanks for calling", encoding="mulaw")
+    await cache.get(audio_id)
+
+    restarted = TTSCache(synthesize, directory=str(tmp_path))
+
+    assert await restarted.get(audio_id) == b"mulaw:Thanks for calling"
+    assert restarted.path(audio_id).suffix == ".ulaw"
+    assert restarted.media_type(audio_id) == "audio/basic"
+    assert await restarted.locate(audio_id) == ("mulaw", restarted.path(audio_id))
+    assert restarted.text(audio_id) == "Thanks for calling"
+    assert restarted.stats()["disk_hits"] == 1
+    assert synthesize.calls == 1
+
+    # Starting a phrase already on disk loads it instead of synthesizing
+    again = TTSCache(synthesize, directory=str(tmp_path))
+    assert again.start("Thanks for calling", encoding="mulaw") == audio_id
+    assert await again.get(audio_id) == b"mulaw:Thanks for calling"
+    assert again.stats()["disk_hits"] == 1
+    assert synthesize.calls == 1
+
+
+async def test_failed_synthesis_is_a_miss():
+    """Test synthesis errors return None and are counted."""
+    cache = TTSCache(FakeSynthesizer(fail=True))
+
+    assert await cache.get(cache.start("Hello")) is None
+    assert cache.stats()["synthesis_errors"] == 1
+    assert not TTSCache.is_valid_id("../../etc/passwd")
+
+
+async def test_other_worker_resynthesizes_on_miss(tmp_path):
+    """Test a worker without the audio rebuilds it from the recorded text."""
+    first = TTSCache(FakeSynthesizer(), directory=str(tmp_path))
+    audio_id = first.start("See you soon")
+    await first.get(audio_id)
+    first.path(audio_id).unlink()
+
+    synthesize = FakeSynthesizer()
+    second = TTSCache(synthesize, directory=str(tmp_path))
+    # The sidecar is fresh, so this worker first waits briefly for a peer
+    second.PEER_WAIT_SECONDS = 0.05
+
+    assert await second.get_or_synthesize(audio_id) == b"mp3:See you soon"
+    assert synthesize.calls == 1
+    assert await second.get_or_synthesize("0" * 32) is None
+
+
+def test_parse_byte_range():
+    """Test single byte ranges, suffix ranges and unsatisfiable ranges."""
+    assert parse_byte_range("bytes=0-99", 1000) == (0, 99)
+    assert parse_byte_range("bytes=900-", 1000) == (900, 999)
+    assert parse_byte_range("bytes=-100", 1000) == (900, 999)
+    assert parse_byte_range("bytes=0-5000", 1000) == (0, 999)
+    assert parse_byte_range("bytes=0-1,5-6", 1000) is None
+    with pytest.raises(ValueError):
+        parse_byte_range("bytes=1000-", 1000)
@@ -0,0 +1,96 @@
+"""Tests for VectorSearch embedding batching."""
+
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+import pytest
+
+from src.receptionist.vector_search import VectorSearch
+
+
+def create_vector_search():
+    """Create a VectorSearch instance with a mocked Voyage client."""
+    vector_search = VectorSearch(voyage_api_key="test_key", db_manager=MagicMock())
+    vector_search._voyage_client = Mock()
+    vector_search._voyage_client.embed = AsyncMock(
+        side_effect=lambda texts, model: Mock(
+            embeddings=[[float(len(text))] for text in texts]
+        )
+    )
+    return vector_search
+
+
+def test_pack_batches_respects_count_limit():
+    """Test batches never exceed the Voyage text count limit."""
+    vector_search = create_vector_search()
+    texts = ["hello"] * (VectorSearch.MAX_BATCH_SIZE * 2 + 1)
+
+    batches = vector_search._pack_batches(texts)
+
+    assert len(batches) == 3
+    assert all(len(batch) <= VectorSearch.MAX_BATCH_SIZE for batch in batches)
+    assert sorted(i for batch in batches for i in batch) == list(range(len(texts)))
+
+
+def test_pack_batches_respects_token_limit():
+    """Test large texts are split across batches by estimated tokens."""
+    vector_search = create_vector_search()
+    large_text = "x" * (VectorSearch.MAX_BATCH_TOKENS * 2)  # ~2/3 of the token budget
+
+    batches = vector_search._pack_batches([large_text, large_text, "small"])
+
+    assert batches == [[0], [1, 2]]
+
+
+async def test_embed_texts_preserves_order():
+    """Test embeddings come back in input order across batches."""
+    vector_search = create_vector_search()
+    texts = [f"text {'x' * i}" for i in range(VectorSearch.MAX_BATCH_SIZE + 10)]
+
+    embeddings = await vector_search.embed_texts(texts)
+
+    assert embeddings == [[float(len(text))] for text in texts]
+    assert vector_search._voyage_client.embed.await_count == 2
+
+
+async def test_embed_texts_retries_failed_batch(monkeypatch):
+    """Test a failed batch is retried before succeeding."""
+    vector_search = create_vector_search()
+    vector_search._voyage_client.embed = AsyncMock(
+        side_effect=[RuntimeError("rate limited"), Mock(embeddings=[[1.0]])]
+    )
+    monkeypatch.setattr(VectorSearch, "RETRY_BASE_DELAY", 0)
+
+    embeddings = await vector_search.embed_texts(["hello"])
+
+    assert embeddings == [[1.0]]
+    assert vector_search._voyage_client.embed.await_count == 2
+
+
+async def test_embed_texts_keeps_batches_that_succeeded(monkeypatch):
+    """Test a batch that exhausts its retries only loses its own texts."""
+    vector_search = create_vector_search()
+    succeed = vector_search._voyage_client.embed.side_effect
+
+    async def embed(texts, model):
+        if texts[0] == "bad":
+            raise RuntimeError("rejected")
+        return succeed(texts, model)
+
+    vector_search._voyage_client.embed = AsyncMock(side_effect=embed)
+    monkeypatch.setattr(VectorSearch, "RETRY_BASE_DELAY", 0)
+    texts = ["bad"] * VectorSearch.MAX_BATCH_SIZE + ["good"]
+
+    embeddings = await vector_search.embed_texts(texts, allow_partial=True)
+
+    assert embeddings[:-1] == [None] * VectorSearch.MAX_BATCH_SIZE
+    assert embeddings[-1] == [4.0]
+    with pytest.raises(RuntimeError):
+        await vector_search.embed_texts(texts)
+
+
+async def test_embed_texts_rejects_empty_text():
+    """Test empty texts are rejected before any request is made."""
+    vector_search = create_vector_search()
+
+    with pytest.raises(ValueError):
+        await vector_search.embed_texts(["hello", "  "])